@@ -16,13 +16,19 @@ echo "PostgreSQL is ready!"
 echo "Checking database initialization..."
 cd /app
 
-# Create database and schema if it doesn't exist (handled by PostgreSQL init scripts)
-# Run database seeding
-if [ "${SKIP_DB_SEED}" != "true" ]; then
-    echo "Running database seeding..."
-    python scripts/seed_database.py
+# One-shot init phase (database, migrations, bootstrap admin, seeding when
+# SKIP_DB_SEED != true); workers then boot with APP_INIT_ON_STARTUP=false.
+if [ "${SKIP_APP_INIT}" != "true" ]; then
+    echo "Running application init..."
+    python superviseme.py init --db postgresql
 else
-    echo "Skipping database seeding (SKIP_DB_SEED=true)"
+    echo "Skipping application init (SKIP_APP_INIT=true)"
+fi
+
+# Publish the fingerprinted assets to the volume nginx serves /static/dist from.
+# Old fingerprints stay, so pages rendered before a deploy keep loading.
+if [ -d /srv/static-dist ] && [ -d superviseme/static/dist ]; then
+    cp -a superviseme/static/dist/. /srv/static-dist/
 fi
 
 echo "Initialization complete!"
@@ -0,0 +1,45 @@
+"""
+Gunicorn configuration for SuperviseMe
+The app is preloaded in the master so workers share its code and templates
+copy-on-write; database pools, the scheduler and HTTP sessions are created
+after fork, in each worker (superviseme/utils/process_lifecycle.py).
+"""
+import os
+import sys
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8080")
+# gunicorn reads WEB_CONCURRENCY itself when `workers` is not set
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+if preload_app:
+    # Must happen before the master imports wsgi:app
+    from superviseme.utils.process_lifecycle import defer_until_fork
+    defer_until_fork()
+
+
+def when_ready(server):
+    if preload_app:
+        # Workers inherit the compiled templates instead of each loading them
+        from superviseme.utils.template_cache import warm_templates
+        warm_templates(server.app.wsgi())
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        from superviseme.utils.process_lifecycle import dispose_in_parent
+        dispose_in_parent()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from superviseme.utils.process_lifecycle import post_fork_worker
+        post_fork_worker()
+
+
+def worker_exit(server, worker):
+    # Hand the scheduler lease over right away instead of letting it expire
+    task_scheduler = sys.modules.get("superviseme.utils.task_scheduler")
+    if task_scheduler is not None and task_scheduler.scheduler is not None:
+        task_scheduler.shutdown_scheduler()
@@ -0,0 +1,52 @@
+"""add telegram digest frequency
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 09:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    columns = {c["name"] for c in inspector.get_columns("user_mgmt")}
+
+    with op.batch_alter_table("user_mgmt", schema=None) as batch_op:
+        if "telegram_frequency" not in columns:
+            batch_op.add_column(sa.Column("telegram_frequency", sa.String(length=10), nullable=True))
+
+    # Digest runs pick up unsent notifications inside a recent time window.
+    indexes = {ix["name"] for ix in inspector.get_indexes("notification")}
+    if "ix_notification_telegram_sent_created_at" not in indexes:
+        op.create_index(
+            "ix_notification_telegram_sent_created_at",
+            "notification",
+            ["telegram_sent", "created_at"],
+            unique=False,
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    indexes = {ix["name"] for ix in inspector.get_indexes("notification")}
+    if "ix_notification_telegram_sent_created_at" in indexes:
+        op.drop_index("ix_notification_telegram_sent_created_at", table_name="notification")
+
+    columns = {c["name"] for c in inspector.get_columns("user_mgmt")}
+    if "telegram_frequency" in columns:
+        with op.batch_alter_table("user_mgmt", schema=None) as batch_op:
+            batch_op.drop_column("telegram_frequency")
@@ -0,0 +1,66 @@
+"""add orcid incremental sync
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 12:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    user_columns = {c["name"] for c in inspector.get_columns("user_mgmt")}
+    with op.batch_alter_table("user_mgmt", schema=None) as batch_op:
+        if "orcid_sync_state" not in user_columns:
+            batch_op.add_column(sa.Column("orcid_sync_state", sa.Text(), nullable=True))
+
+    activity_columns = {c["name"] for c in inspector.get_columns("orcid_activity")}
+    with op.batch_alter_table("orcid_activity", schema=None) as batch_op:
+        if "put_code" not in activity_columns:
+            batch_op.add_column(sa.Column("put_code", sa.String(length=50), nullable=True))
+        if "last_modified" not in activity_columns:
+            batch_op.add_column(sa.Column("last_modified", sa.BigInteger(), nullable=True))
+
+    # Incremental syncs diff stored activities against ORCID put-codes per user.
+    indexes = {ix["name"] for ix in inspector.get_indexes("orcid_activity")}
+    if "ix_orcid_activity_user_id_put_code" not in indexes:
+        op.create_index(
+            "ix_orcid_activity_user_id_put_code",
+            "orcid_activity",
+            ["user_id", "put_code"],
+            unique=False,
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    indexes = {ix["name"] for ix in inspector.get_indexes("orcid_activity")}
+    if "ix_orcid_activity_user_id_put_code" in indexes:
+        op.drop_index("ix_orcid_activity_user_id_put_code", table_name="orcid_activity")
+
+    activity_columns = {c["name"] for c in inspector.get_columns("orcid_activity")}
+    with op.batch_alter_table("orcid_activity", schema=None) as batch_op:
+        if "last_modified" in activity_columns:
+            batch_op.drop_column("last_modified")
+        if "put_code" in activity_columns:
+            batch_op.drop_column("put_code")
+
+    user_columns = {c["name"] for c in inspector.get_columns("user_mgmt")}
+    if "orcid_sync_state" in user_columns:
+        with op.batch_alter_table("user_mgmt", schema=None) as batch_op:
+            batch_op.drop_column("orcid_sync_state")
@@ -0,0 +1,84 @@
+"""add current status
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 15:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+# (parent table, history table, foreign key column)
+STATUS_TABLES = (
+    ("thesis", "thesis_status", "thesis_id"),
+    ("research_project", "research_project_status", "project_id"),
+)
+
+
+def _backfill(parent, history, fk):
+    # Latest entry per parent: newest updated_at, ties broken by insertion order.
+    latest = (
+        f"SELECT h.{{column}} FROM {history} h WHERE h.{fk} = {parent}.id "
+        f"ORDER BY h.updated_at DESC, h.id DESC LIMIT 1"
+    )
+    op.execute(
+        f"UPDATE {parent} SET "
+        f"current_status = ({latest.format(column='status')}), "
+        f"current_status_at = ({latest.format(column='updated_at')})"
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    for parent, history, fk in STATUS_TABLES:
+        columns = {c["name"] for c in inspector.get_columns(parent)}
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            if "current_status" not in columns:
+                batch_op.add_column(sa.Column("current_status", sa.String(length=20), nullable=True))
+            if "current_status_at" not in columns:
+                batch_op.add_column(sa.Column("current_status_at", sa.Integer(), nullable=True))
+
+        # Status-filtered listings use the first index; refreshing the
+        # materialized value after a status write uses the second.
+        parent_indexes = {ix["name"] for ix in inspector.get_indexes(parent)}
+        if f"ix_{parent}_current_status" not in parent_indexes:
+            op.create_index(f"ix_{parent}_current_status", parent, ["current_status"], unique=False)
+
+        history_indexes = {ix["name"] for ix in inspector.get_indexes(history)}
+        if f"ix_{history}_{fk}_updated_at" not in history_indexes:
+            op.create_index(f"ix_{history}_{fk}_updated_at", history, [fk, "updated_at"], unique=False)
+
+        _backfill(parent, history, fk)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    for parent, history, fk in STATUS_TABLES:
+        history_indexes = {ix["name"] for ix in inspector.get_indexes(history)}
+        if f"ix_{history}_{fk}_updated_at" in history_indexes:
+            op.drop_index(f"ix_{history}_{fk}_updated_at", table_name=history)
+
+        parent_indexes = {ix["name"] for ix in inspector.get_indexes(parent)}
+        if f"ix_{parent}_current_status" in parent_indexes:
+            op.drop_index(f"ix_{parent}_current_status", table_name=parent)
+
+        columns = {c["name"] for c in inspector.get_columns(parent)}
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            if "current_status_at" in columns:
+                batch_op.drop_column("current_status_at")
+            if "current_status" in columns:
+                batch_op.drop_column("current_status")
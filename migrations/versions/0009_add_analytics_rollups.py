@@ -0,0 +1,136 @@
+"""add analytics rollups
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 17:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def _counter(name):
+    return sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+
+
+# Range scans used when rolling up the days since the last build
+SOURCE_INDEXES = (
+    ("ix_thesis_update_created_at", "thesis_update", ["created_at"]),
+    ("ix_todo_created_at", "todo", ["created_at"]),
+    ("ix_todo_completed_at", "todo", ["completed_at"]),
+    ("ix_thesis_status_updated_at", "thesis_status", ["updated_at"]),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    tables = set(inspector.get_table_names())
+
+    if "analytics_thesis_daily" not in tables:
+        op.create_table(
+            "analytics_thesis_daily",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("thesis_id", sa.Integer(), nullable=False),
+            sa.Column("day", sa.Integer(), nullable=False),
+            _counter("student_updates"),
+            _counter("supervisor_updates"),
+            _counter("todos_created"),
+            _counter("todos_completed"),
+            _counter("status_changes"),
+            sa.ForeignKeyConstraint(["thesis_id"], ["thesis.id"], name=op.f("fk_analytics_thesis_daily_thesis_id_thesis")),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_analytics_thesis_daily")),
+            sa.UniqueConstraint("thesis_id", "day", name=op.f("uq_analytics_thesis_daily_thesis_id_day")),
+        )
+        op.create_index(op.f("ix_analytics_thesis_daily_day"), "analytics_thesis_daily", ["day"], unique=False)
+
+    if "analytics_supervisor_weekly" not in tables:
+        op.create_table(
+            "analytics_supervisor_weekly",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("supervisor_id", sa.Integer(), nullable=False),
+            sa.Column("week_start", sa.Integer(), nullable=False),
+            _counter("theses"),
+            _counter("student_updates"),
+            _counter("supervisor_updates"),
+            _counter("todos_created"),
+            _counter("todos_completed"),
+            _counter("todos_overdue"),
+            _counter("inactive_theses"),
+            sa.Column("computed_at", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(
+                ["supervisor_id"], ["user_mgmt.id"], name=op.f("fk_analytics_supervisor_weekly_supervisor_id_user_mgmt")
+            ),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_analytics_supervisor_weekly")),
+            sa.UniqueConstraint(
+                "supervisor_id", "week_start", name=op.f("uq_analytics_supervisor_weekly_supervisor_id_week_start")
+            ),
+        )
+        op.create_index(
+            op.f("ix_analytics_supervisor_weekly_week_start"), "analytics_supervisor_weekly", ["week_start"], unique=False
+        )
+
+    if "analytics_department_weekly" not in tables:
+        op.create_table(
+            "analytics_department_weekly",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("department", sa.String(length=15), nullable=False),
+            sa.Column("week_start", sa.Integer(), nullable=False),
+            _counter("theses"),
+            _counter("student_updates"),
+            _counter("supervisor_updates"),
+            _counter("todos_completed"),
+            _counter("completed_theses"),
+            _counter("completion_days_total"),
+            sa.Column("computed_at", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_analytics_department_weekly")),
+            sa.UniqueConstraint(
+                "department", "week_start", name=op.f("uq_analytics_department_weekly_department_week_start")
+            ),
+        )
+        op.create_index(
+            op.f("ix_analytics_department_weekly_week_start"), "analytics_department_weekly", ["week_start"], unique=False
+        )
+
+    if "analytics_watermark" not in tables:
+        op.create_table(
+            "analytics_watermark",
+            sa.Column("name", sa.String(length=50), nullable=False),
+            sa.Column("value", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("name", name=op.f("pk_analytics_watermark")),
+        )
+
+    for index_name, table, columns in SOURCE_INDEXES:
+        indexes = {ix["name"] for ix in inspector.get_indexes(table)}
+        if index_name not in indexes:
+            op.create_index(index_name, table, columns, unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    for index_name, table, _ in SOURCE_INDEXES:
+        indexes = {ix["name"] for ix in inspector.get_indexes(table)}
+        if index_name in indexes:
+            op.drop_index(index_name, table_name=table)
+
+    tables = set(inspector.get_table_names())
+    for table in (
+        "analytics_watermark",
+        "analytics_department_weekly",
+        "analytics_supervisor_weekly",
+        "analytics_thesis_daily",
+    ):
+        if table in tables:
+            op.drop_table(table)
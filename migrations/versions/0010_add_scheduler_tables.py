@@ -0,0 +1,68 @@
+"""add scheduler job store, leader lease and job run history
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 19:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    tables = set(inspector.get_table_names())
+
+    if "scheduler_jobs" not in tables:
+        op.create_table(
+            "scheduler_jobs",
+            sa.Column("id", sa.Unicode(length=191), nullable=False),
+            sa.Column("next_run_time", sa.Float(precision=25), nullable=True),
+            sa.Column("job_state", sa.LargeBinary(), nullable=False),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_scheduler_jobs")),
+        )
+        op.create_index(op.f("ix_scheduler_jobs_next_run_time"), "scheduler_jobs", ["next_run_time"], unique=False)
+
+    if "scheduler_lease" not in tables:
+        op.create_table(
+            "scheduler_lease",
+            sa.Column("name", sa.String(length=50), nullable=False),
+            sa.Column("owner", sa.String(length=255), nullable=False),
+            sa.Column("acquired_at", sa.Integer(), nullable=False),
+            sa.Column("expires_at", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("name", name=op.f("pk_scheduler_lease")),
+        )
+
+    if "scheduler_job_run" not in tables:
+        op.create_table(
+            "scheduler_job_run",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("job_id", sa.String(length=100), nullable=False),
+            sa.Column("owner", sa.String(length=255), nullable=False),
+            sa.Column("started_at", sa.Integer(), nullable=False),
+            sa.Column("finished_at", sa.Integer(), nullable=True),
+            sa.Column("duration_ms", sa.Integer(), nullable=True),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("result", sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_scheduler_job_run")),
+        )
+        op.create_index(op.f("ix_scheduler_job_run_started_at"), "scheduler_job_run", ["started_at"], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    tables = set(inspector.get_table_names())
+    for table in ("scheduler_job_run", "scheduler_lease", "scheduler_jobs"):
+        if table in tables:
+            op.drop_table(table)
@@ -0,0 +1,63 @@
+"""add user search indexes
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 21:00:00
+
+"""
+
+from alembic import op
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+# Case-insensitive prefix search within a role (superviseme/utils/user_search.py)
+PREFIX_INDEXES = (
+    ("ix_user_mgmt_name_prefix", "name"),
+    ("ix_user_mgmt_surname_prefix", "surname"),
+    ("ix_user_mgmt_username_prefix", "username"),
+)
+
+# Assignment status lookups (does this user author / supervise a thesis?)
+ASSIGNMENT_INDEXES = (
+    ("ix_thesis_author_id", "thesis", ["author_id"]),
+    ("ix_thesis_supervisor_supervisor_id", "thesis_supervisor", ["supervisor_id"]),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    existing = {ix["name"] for ix in inspector.get_indexes("user_mgmt")}
+    # text_pattern_ops lets PostgreSQL use the index for LIKE 'prefix%' under any collation
+    opclass = " text_pattern_ops" if bind.dialect.name == "postgresql" else ""
+    for index_name, column in PREFIX_INDEXES:
+        if index_name not in existing:
+            op.execute(f"CREATE INDEX {index_name} ON user_mgmt (user_type, lower({column}){opclass})")
+
+    for index_name, table, columns in ASSIGNMENT_INDEXES:
+        indexes = {ix["name"] for ix in inspector.get_indexes(table)}
+        if index_name not in indexes:
+            op.create_index(index_name, table, columns, unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    for index_name, table, _ in ASSIGNMENT_INDEXES:
+        indexes = {ix["name"] for ix in inspector.get_indexes(table)}
+        if index_name in indexes:
+            op.drop_index(index_name, table_name=table)
+
+    existing = {ix["name"] for ix in inspector.get_indexes("user_mgmt")}
+    for index_name, _ in PREFIX_INDEXES:
+        if index_name in existing:
+            op.drop_index(index_name, table_name="user_mgmt")
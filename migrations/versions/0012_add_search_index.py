@@ -0,0 +1,140 @@
+"""add full-text search index
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 22:00:00
+
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# (source_type, table, scope column, title expression, body expression);
+# mirrors SEARCH_SOURCES in superviseme/utils/search_index.py
+SEARCH_SOURCES = (
+    ("update", "thesis_update", "thesis_id", "NULL", "content"),
+    ("meeting_note", "meeting_note", "thesis_id", "title", "content"),
+    ("todo", "todo", "thesis_id", "title", "COALESCE(description, '')"),
+    ("objective", "thesis_objective", "thesis_id", "title", "description"),
+    ("hypothesis", "thesis_hypothesis", "thesis_id", "title", "description"),
+    ("resource", "resource", "thesis_id", "resource_type",
+     "TRIM(COALESCE(description, '') || ' ' || resource_url)"),
+    ("project_update", "research_project_update", "project_id", "NULL", "content"),
+    ("project_meeting_note", "research_project_meeting_note", "project_id", "title", "content"),
+    ("project_todo", "research_project_todo", "project_id", "title", "COALESCE(description, '')"),
+    ("project_objective", "research_project_objective", "project_id", "title", "description"),
+    ("project_hypothesis", "research_project_hypothesis", "project_id", "title", "description"),
+    ("project_resource", "research_project_resource", "project_id", "resource_type",
+     "TRIM(COALESCE(description, '') || ' ' || resource_url)"),
+)
+
+# External-content FTS5 table over search_document, kept in sync by triggers
+SQLITE_FTS = (
+    (
+        "CREATE VIRTUAL TABLE search_fts USING fts5("
+        "title, body, content='search_document', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    ),
+    (
+        "CREATE TRIGGER search_document_ai AFTER INSERT ON search_document BEGIN "
+        "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+    ),
+    (
+        "CREATE TRIGGER search_document_ad AFTER DELETE ON search_document BEGIN "
+        "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END"
+    ),
+    (
+        "CREATE TRIGGER search_document_au AFTER UPDATE ON search_document BEGIN "
+        "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+    ),
+)
+
+# 'simple' = no stemming or stop words, like FTS5's unicode61 tokenizer
+POSTGRES_FTS = (
+    (
+        "ALTER TABLE search_document ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', COALESCE(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', body), 'B')) STORED"
+    ),
+    "CREATE INDEX ix_search_document_search_vector ON search_document USING gin (search_vector)",
+)
+
+
+def _backfill():
+    for source_type, table, scope, title, body in SEARCH_SOURCES:
+        thesis_id = "thesis_id" if scope == "thesis_id" else "NULL"
+        project_id = "project_id" if scope == "project_id" else "NULL"
+        author_id = "NULL" if table.endswith("resource") else "author_id"
+        op.execute(
+            "INSERT INTO search_document "
+            "(source_type, source_id, thesis_id, project_id, author_id, title, body, created_at) "
+            f"SELECT '{source_type}', id, {thesis_id}, {project_id}, {author_id}, {title}, {body}, created_at "
+            f"FROM {table} WHERE NOT EXISTS (SELECT 1 FROM search_document d "
+            f"WHERE d.source_type = '{source_type}' AND d.source_id = {table}.id)"
+        )
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    tables = set(inspector.get_table_names())
+
+    if "search_document" not in tables:
+        op.create_table(
+            "search_document",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("source_type", sa.String(length=30), nullable=False),
+            sa.Column("source_id", sa.Integer(), nullable=False),
+            sa.Column("thesis_id", sa.Integer(), nullable=True),
+            sa.Column("project_id", sa.Integer(), nullable=True),
+            sa.Column("author_id", sa.Integer(), nullable=True),
+            sa.Column("title", sa.String(length=255), nullable=True),
+            sa.Column("body", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_search_document")),
+            sa.UniqueConstraint("source_type", "source_id", name="uq_search_document_source"),
+        )
+        op.create_index(op.f("ix_search_document_thesis_id"), "search_document", ["thesis_id"], unique=False)
+        op.create_index(op.f("ix_search_document_project_id"), "search_document", ["project_id"], unique=False)
+
+    if bind.dialect.name == "sqlite" and "search_fts" not in tables:
+        try:
+            for statement in SQLITE_FTS:
+                op.execute(statement)
+        except sa.exc.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE over search_document
+            logger.warning("FTS5 is not available; full-text search will use LIKE")
+    elif bind.dialect.name == "postgresql":
+        columns = {c["name"] for c in inspector.get_columns("search_document")} if "search_document" in tables else set()
+        if "search_vector" not in columns:
+            for statement in POSTGRES_FTS:
+                op.execute(statement)
+
+    _backfill()
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    tables = set(inspector.get_table_names())
+
+    if bind.dialect.name == "sqlite":
+        for trigger in ("search_document_ai", "search_document_ad", "search_document_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS search_fts")
+
+    if "search_document" in tables:
+        op.drop_table("search_document")
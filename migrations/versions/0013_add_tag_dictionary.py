@@ -0,0 +1,131 @@
+"""add tag dictionary
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 23:00:00
+
+"""
+
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+TAG_KEY_LENGTH = 50
+
+# (join table, owner column)
+TAG_TABLES = (
+    ("thesis_tag", "thesis_id"),
+    ("update_tag", "update_id"),
+)
+
+# Mirrors refresh_tag_counts in superviseme/utils/tags.py
+TAG_COUNTS = (
+    "UPDATE tag SET "
+    "thesis_count = (SELECT COUNT(DISTINCT tt.thesis_id) FROM thesis_tag tt WHERE tt.tag_id = tag.id), "
+    "public_thesis_count = (SELECT COUNT(DISTINCT tt.thesis_id) FROM thesis_tag tt "
+    "JOIN thesis t ON t.id = tt.thesis_id WHERE tt.tag_id = tag.id "
+    "AND t.is_public AND t.author_id IS NULL AND NOT t.frozen), "
+    "update_count = (SELECT COUNT(DISTINCT ut.update_id) FROM update_tag ut WHERE ut.tag_id = tag.id)"
+)
+
+
+def _fold(value):
+    # Same folding as superviseme.utils.tags.fold_tag
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())[:TAG_KEY_LENGTH]
+
+
+def _backfill(bind):
+    tag = sa.table("tag", sa.column("id", sa.Integer), sa.column("key", sa.String),
+                   sa.column("name", sa.String))
+    known = {row.key: row.id for row in bind.execute(sa.select(tag.c.id, tag.c.key))}
+
+    # First-entered spelling becomes the display name
+    names = {}
+    for table, _ in TAG_TABLES:
+        for (raw,) in bind.execute(sa.text(f"SELECT tag FROM {table} WHERE tag_id IS NULL ORDER BY id")):
+            names.setdefault(_fold(raw), raw.strip()[:TAG_KEY_LENGTH])
+    new_keys = [key for key in names if key not in known]
+    if new_keys:
+        op.bulk_insert(tag, [{"key": key, "name": names[key]} for key in new_keys])
+        known = {row.key: row.id for row in bind.execute(sa.select(tag.c.id, tag.c.key))}
+
+    for table, _ in TAG_TABLES:
+        raw_tags = [raw for (raw,) in bind.execute(sa.text(f"SELECT DISTINCT tag FROM {table} WHERE tag_id IS NULL"))]
+        if raw_tags:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET tag_id = :tag_id WHERE tag = :tag AND tag_id IS NULL"),
+                [{"tag_id": known[_fold(raw)], "tag": raw} for raw in raw_tags],
+            )
+
+    op.execute(TAG_COUNTS)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    tables = set(inspector.get_table_names())
+
+    if "tag" not in tables:
+        op.create_table(
+            "tag",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("key", sa.String(length=50), nullable=False),
+            sa.Column("name", sa.String(length=50), nullable=False),
+            sa.Column("thesis_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("public_thesis_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("update_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_tag")),
+            sa.UniqueConstraint("key", name=op.f("uq_tag_key")),
+        )
+
+    added = []
+    for table, _ in TAG_TABLES:
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        if "tag_id" not in columns:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.add_column(sa.Column("tag_id", sa.Integer(), nullable=True))
+            added.append(table)
+
+    _backfill(bind)
+
+    for table, owner in TAG_TABLES:
+        if table in added:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.alter_column("tag_id", existing_type=sa.Integer(), nullable=False)
+                batch_op.create_foreign_key(batch_op.f(f"fk_{table}_tag_id_tag"), "tag", ["tag_id"], ["id"])
+
+        # Tag filters look up owners by tag id; tag counts scan the same index
+        indexes = {ix["name"] for ix in inspector.get_indexes(table)}
+        if f"ix_{table}_tag_id_{owner}" not in indexes:
+            op.create_index(f"ix_{table}_tag_id_{owner}", table, ["tag_id", owner], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    for table, owner in TAG_TABLES:
+        indexes = {ix["name"] for ix in inspector.get_indexes(table)}
+        if f"ix_{table}_tag_id_{owner}" in indexes:
+            op.drop_index(f"ix_{table}_tag_id_{owner}", table_name=table)
+
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        if "tag_id" in columns:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.drop_constraint(batch_op.f(f"fk_{table}_tag_id_tag"), type_="foreignkey")
+                batch_op.drop_column("tag_id")
+
+    if "tag" in set(inspector.get_table_names()):
+        op.drop_table("tag")
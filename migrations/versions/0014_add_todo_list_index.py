@@ -0,0 +1,41 @@
+"""add todo list index
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-20 00:00:00
+
+"""
+
+from alembic import op
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+# Todo pages filter theses by status and priority and page by creation time;
+# the per-thesis summary groups over the same columns
+TODO_LIST_INDEX = "ix_todo_thesis_id_status_priority_created_at"
+TODO_LIST_COLUMNS = ["thesis_id", "status", "priority", "created_at"]
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    indexes = {ix["name"] for ix in inspector.get_indexes("todo")}
+    if TODO_LIST_INDEX not in indexes:
+        op.create_index(TODO_LIST_INDEX, "todo", TODO_LIST_COLUMNS, unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    indexes = {ix["name"] for ix in inspector.get_indexes("todo")}
+    if TODO_LIST_INDEX in indexes:
+        op.drop_index(TODO_LIST_INDEX, table_name="todo")
@@ -0,0 +1,82 @@
+"""add todo sort ranks
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-20 02:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+# Display order, first to last; mirrors TODO_STATUSES / TODO_PRIORITIES in
+# superviseme/utils/todo_queries.py. The first value gets the highest rank,
+# unknown values rank 0.
+TODO_RANKS = (
+    ("status_rank", "status", ("pending", "completed", "cancelled")),
+    ("priority_rank", "priority", ("high", "medium", "low")),
+)
+
+OLD_TODO_LIST_INDEX = "ix_todo_thesis_id_status_priority_created_at"
+OLD_TODO_LIST_COLUMNS = ["thesis_id", "status", "priority", "created_at"]
+
+# Integer keys in list order let the index serve both the keyset predicate
+# and ORDER BY, which CASE expressions over the text columns could not
+TODO_LIST_INDEX = "ix_todo_thesis_id_status_rank_priority_rank_created_at_id"
+TODO_LIST_COLUMNS = ["thesis_id", "status_rank", "priority_rank", "created_at", "id"]
+
+
+def _backfill(rank_column, column, values):
+    whens = " ".join(
+        f"WHEN '{value}' THEN {len(values) - position}" for position, value in enumerate(values)
+    )
+    op.execute(f"UPDATE todo SET {rank_column} = CASE {column} {whens} ELSE 0 END")
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    # A plain ADD COLUMN works on every backend here; a batch operation
+    # would reflect todo's foreign key targets for nothing.
+    columns = {c["name"] for c in inspector.get_columns("todo")}
+    for rank_column, _, _ in TODO_RANKS:
+        if rank_column not in columns:
+            op.add_column(
+                "todo", sa.Column(rank_column, sa.Integer(), nullable=False, server_default=sa.text("0"))
+            )
+
+    for rank_column, column, values in TODO_RANKS:
+        _backfill(rank_column, column, values)
+
+    indexes = {ix["name"] for ix in inspector.get_indexes("todo")}
+    if OLD_TODO_LIST_INDEX in indexes:
+        op.drop_index(OLD_TODO_LIST_INDEX, table_name="todo")
+    if TODO_LIST_INDEX not in indexes:
+        op.create_index(TODO_LIST_INDEX, "todo", TODO_LIST_COLUMNS, unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    indexes = {ix["name"] for ix in inspector.get_indexes("todo")}
+    if TODO_LIST_INDEX in indexes:
+        op.drop_index(TODO_LIST_INDEX, table_name="todo")
+    if OLD_TODO_LIST_INDEX not in indexes:
+        op.create_index(OLD_TODO_LIST_INDEX, "todo", OLD_TODO_LIST_COLUMNS, unique=False)
+
+    columns = {c["name"] for c in inspector.get_columns("todo")}
+    with op.batch_alter_table("todo", schema=None) as batch_op:
+        for rank_column, _, _ in TODO_RANKS:
+            if rank_column in columns:
+                batch_op.drop_column(rank_column)
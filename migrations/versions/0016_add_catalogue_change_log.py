@@ -0,0 +1,43 @@
+"""add catalogue change log
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-20 04:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if "catalogue_change" not in set(inspector.get_table_names()):
+        op.create_table(
+            "catalogue_change",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("thesis_ids", sa.Text(), nullable=True),
+            sa.Column("supervisor_ids", sa.Text(), nullable=True),
+            sa.Column("rebuild", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_catalogue_change")),
+        )
+        op.create_index(op.f("ix_catalogue_change_created_at"), "catalogue_change", ["created_at"], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if "catalogue_change" in set(inspector.get_table_names()):
+        op.drop_table("catalogue_change")
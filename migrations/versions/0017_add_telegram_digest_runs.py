@@ -0,0 +1,41 @@
+"""add telegram digest runs
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-20 06:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0017"
+down_revision = "0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    # No rows: the first run of each frequency falls back to a recent window
+    if "telegram_digest_run" not in set(inspector.get_table_names()):
+        op.create_table(
+            "telegram_digest_run",
+            sa.Column("frequency", sa.String(length=10), nullable=False),
+            sa.Column("watermark", sa.Integer(), nullable=False),
+            sa.Column("last_run_at", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("frequency", name=op.f("pk_telegram_digest_run")),
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if "telegram_digest_run" in set(inspector.get_table_names()):
+        op.drop_table("telegram_digest_run")
@@ -0,0 +1,42 @@
+"""add shared login rate limits
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-20 08:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0018"
+down_revision = "0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if "login_rate_limit" not in set(inspector.get_table_names()):
+        op.create_table(
+            "login_rate_limit",
+            sa.Column("scope", sa.String(length=20), nullable=False),
+            sa.Column("key", sa.String(length=255), nullable=False),
+            sa.Column("tokens", sa.Float(), nullable=False),
+            sa.Column("updated_at", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("scope", "key", name=op.f("pk_login_rate_limit")),
+        )
+        op.create_index(op.f("ix_login_rate_limit_updated_at"), "login_rate_limit", ["updated_at"], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if "login_rate_limit" in set(inspector.get_table_names()):
+        op.drop_table("login_rate_limit")
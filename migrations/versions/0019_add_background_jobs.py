@@ -0,0 +1,56 @@
+"""add background jobs
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-20 10:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = "0019"
+down_revision = "0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if "background_job" not in set(inspector.get_table_names()):
+        op.create_table(
+            "background_job",
+            sa.Column("id", sa.String(length=32), nullable=False),
+            sa.Column("kind", sa.String(length=50), nullable=False),
+            sa.Column("label", sa.String(length=255), nullable=True),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("payload", sa.Text(), nullable=True),
+            sa.Column("data", sa.LargeBinary(), nullable=True),
+            sa.Column("progress", sa.Text(), nullable=True),
+            sa.Column("result", sa.Text(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("owner", sa.String(length=255), nullable=True),
+            sa.Column("created_by", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+            sa.Column("started_at", sa.Integer(), nullable=True),
+            sa.Column("heartbeat_at", sa.Integer(), nullable=True),
+            sa.Column("finished_at", sa.Integer(), nullable=True),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_background_job")),
+        )
+        op.create_index(
+            "ix_background_job_status_created_at", "background_job", ["status", "created_at"], unique=False
+        )
+        op.create_index(op.f("ix_background_job_finished_at"), "background_job", ["finished_at"], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if "background_job" in set(inspector.get_table_names()):
+        op.drop_table("background_job")
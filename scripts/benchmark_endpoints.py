@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark script for SuperviseMe application.
+Generates (or reuses) a synthetic dataset, measures p50/p95 latency, SQL query
+count and peak memory of key endpoints per role, and fails when a budget in
+benchmarks/budgets.json or the stored baseline is exceeded.
+
+Usage:
+    python scripts/benchmark_endpoints.py
+    python scripts/benchmark_endpoints.py --scale 0.05 --only admin_dashboard public_catalogue
+    python scripts/benchmark_endpoints.py --update-baseline
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to import superviseme
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+BENCHMARK_DIR = os.path.join(REPO_ROOT, "benchmarks")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark SuperviseMe endpoints on a synthetic dataset")
+    parser.add_argument("--scale", type=float, default=0.01, help="Synthetic dataset scale (1.0 = 50k users)")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic dataset seed")
+    parser.add_argument("--database", help="SQLite file for the dataset (default: reused file in the temp dir)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per endpoint")
+    parser.add_argument("--only", nargs="+", help="Scenario names to run")
+    parser.add_argument("--budgets", default=os.path.join(BENCHMARK_DIR, "budgets.json"))
+    parser.add_argument("--baseline", default=os.path.join(BENCHMARK_DIR, "baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    return parser.parse_args()
+
+
+def load_json(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def prepare_app(args):
+    database = args.database or os.path.join(
+        tempfile.gettempdir(), f"superviseme_benchmark_{args.seed}_{args.scale:g}.db"
+    )
+    os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.abspath(database)}"
+    os.environ["ENABLE_SCHEDULER"] = "false"
+    os.environ["FLASK_SKIP_USER_INIT"] = "1"
+    os.environ.setdefault("FLASK_ENV", "development")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+    from superviseme import create_app
+    from superviseme.utils.analytics_rollups import build_rollups, get_rollup_status
+    from superviseme.utils.synthetic_data import SyntheticDataGenerator, scaled
+
+    app = create_app(db_type="sqlite", skip_user_init=True)
+    app.config["WTF_CSRF_ENABLED"] = False
+    with app.app_context():
+        # Resumes (or no-ops) on a database generated by an earlier run
+        SyntheticDataGenerator(scaled(args.scale), seed=args.seed).run()
+        if get_rollup_status()["last_built_at"] is None:
+            build_rollups(full=True)
+    return app, database
+
+
+def resolve_context(app):
+    """Pick the benchmarked accounts: the busiest thesis, its supervisor and student"""
+    from sqlalchemy import func, select
+
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Supervisor, Thesis_Update, User_mgmt
+    from superviseme.utils.synthetic_data import SYNTHETIC_ADMIN
+
+    with app.app_context():
+        thesis_id = db.session.scalar(
+            select(Thesis_Update.thesis_id).group_by(Thesis_Update.thesis_id)
+            .order_by(func.count().desc(), Thesis_Update.thesis_id).limit(1)
+        )
+        thesis = db.session.get(Thesis, thesis_id)
+        supervisor_id = db.session.scalar(
+            select(Thesis_Supervisor.supervisor_id).where(Thesis_Supervisor.thesis_id == thesis_id).limit(1)
+        )
+        public_thesis_id = db.session.scalar(
+            select(Thesis.id).where(Thesis.is_public.is_(True), Thesis.author_id.is_(None)).limit(1)
+        )
+        emails = {
+            "admin": db.session.scalar(select(User_mgmt.email).where(User_mgmt.username == SYNTHETIC_ADMIN)),
+            "supervisor": db.session.get(User_mgmt, supervisor_id).email,
+            "student": db.session.get(User_mgmt, thesis.author_id).email,
+        }
+    return emails, {"thesis_id": thesis_id, "public_thesis_id": public_thesis_id}
+
+
+def main():
+    args = parse_args()
+    app, database = prepare_app(args)
+
+    from superviseme.utils.benchmarks import SCENARIOS, check_results, measure_request
+    from superviseme.utils.synthetic_data import SYNTHETIC_PASSWORD
+
+    emails, placeholders = resolve_context(app)
+    clients = {"anonymous": app.test_client()}
+    for role, email in emails.items():
+        clients[role] = app.test_client()
+        clients[role].post("/login", data={"email": email, "password": SYNTHETIC_PASSWORD})
+
+    results = {}
+    print(f"{'scenario':32} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KiB':>9}")
+    for scenario in SCENARIOS:
+        if args.only and scenario.name not in args.only:
+            continue
+        if "{public_thesis_id}" in scenario.path and placeholders["public_thesis_id"] is None:
+            print(f"{scenario.name:32} skipped (no public thesis in the dataset)")
+            continue
+        with app.app_context():
+            result = measure_request(
+                clients[scenario.role], scenario.path.format(**placeholders),
+                repeat=args.repeat, warmup=args.warmup,
+            )
+        results[scenario.name] = result
+        print(f"{scenario.name:32} {result['status']:>6} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+              f"{result['queries']:>8} {result['peak_kib']:>9}")
+
+    report = {"dataset": {"scale": args.scale, "seed": args.seed, "database": database}, "scenarios": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.update_baseline:
+        report["dataset"].pop("database")
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_json(args.baseline)
+    if baseline and baseline.get("dataset", {}).get("scale") != args.scale:
+        print("Baseline was recorded at a different scale; comparing against budgets only")
+        baseline = None
+    if baseline and baseline.get("dataset", {}).get("seed") != args.seed:
+        print("Baseline was recorded with a different seed; comparing against budgets only")
+        baseline = None
+
+    violations = check_results(results, budgets=load_json(args.budgets), baseline=baseline)
+    if violations:
+        print("\nBenchmark: FAILED")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+
+    print("\nBenchmark: PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
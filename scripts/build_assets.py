@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Static asset build for SuperviseMe application.
+Fingerprints everything under superviseme/static/assets into
+superviseme/static/dist, writes dist/manifest.json for static_url() and
+pre-generates .gz/.br variants served with immutable cache headers.
+
+Usage:
+    python scripts/build_assets.py
+    python scripts/build_assets.py --brotli-quality 5   # faster local builds
+"""
+import argparse
+import logging
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+
+from superviseme.utils.assets import DEFAULT_BROTLI_QUALITY, build_assets
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build fingerprinted, precompressed static assets")
+    parser.add_argument("--static-dir", default=os.path.join(REPO_ROOT, "superviseme", "static"))
+    parser.add_argument("--brotli-quality", type=int, default=DEFAULT_BROTLI_QUALITY,
+                        help="0-11; lower is faster to build, slightly larger to download")
+    parser.add_argument("--no-brotli", action="store_true", help="Write only .gz variants")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    summary = build_assets(args.static_dir, brotli_quality=None if args.no_brotli else args.brotli_quality)
+    print(f"{summary['files']} files ({summary['bytes'] / 1024 / 1024:.1f} MB), "
+          f"{summary['gz']} .gz, {summary['br']} .br in {summary['elapsed_ms'] / 1000:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Bulk import script for SuperviseMe application.
+Imports users or theses from a CSV or JSONL file and prints a JSON report.
+
+Usage:
+    python scripts/bulk_import.py users students.csv --default-password changeme
+    python scripts/bulk_import.py theses theses.jsonl --publisher admin --dry-run
+"""
+import argparse
+import json
+import os
+import sys
+
+# Add parent directory to path to import superviseme
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from superviseme import create_app
+from superviseme.models import User_mgmt
+from superviseme.utils.bulk_import import (
+    DEFAULT_HASH_PROCESSES,
+    IMPORT_CHUNK_SIZE,
+    detect_format,
+    import_theses,
+    import_users,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bulk import users or theses into SuperviseMe")
+    parser.add_argument("kind", choices=["users", "theses"], help="What the file contains")
+    parser.add_argument("path", help="CSV or JSONL file to import")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from extension)")
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, do not write anything")
+    parser.add_argument("--default-password", help="Password for user rows without one")
+    parser.add_argument("--workers", type=int, default=DEFAULT_HASH_PROCESSES,
+                        help="Processes used for password hashing")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per transaction")
+    parser.add_argument("--publisher", default="admin", help="Username recorded as publisher of imported theses")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    fmt = detect_format(args.path, args.format)
+
+    db_type = "postgresql" if os.getenv("PG_HOST") else "sqlite"
+    app = create_app(db_type=db_type, skip_user_init=True)
+
+    with app.app_context(), open(args.path, encoding="utf-8-sig", newline="") as stream:
+        if args.kind == "users":
+            report = import_users(
+                stream, fmt,
+                default_password=args.default_password,
+                dry_run=args.dry_run,
+                processes=args.workers,
+                chunk_size=args.chunk_size,
+            )
+        else:
+            publisher = User_mgmt.query.filter_by(username=args.publisher).first()
+            if publisher is None:
+                print(f"ERROR: publisher {args.publisher} not found")
+                return 1
+            report = import_theses(
+                stream, fmt, publisher_id=publisher.id, dry_run=args.dry_run, chunk_size=args.chunk_size
+            )
+
+    print(json.dumps(report, indent=2))
+    return 0 if not report["failed"] else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Verify that materialized thesis/project statuses match their status history.
+
+Usage:
+  python scripts/check_current_status.py
+  python scripts/check_current_status.py --repair
+"""
+
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repair", action="store_true", help="Recompute mismatched rows from the status history")
+    args = parser.parse_args()
+
+    from superviseme import create_app
+    from superviseme.utils.current_status import check_current_status
+
+    db_type = "postgresql" if os.getenv("PG_HOST") else "sqlite"
+    app = create_app(db_type=db_type, skip_user_init=True)
+    with app.app_context():
+        report = check_current_status(repair=args.repair)
+
+    has_error = False
+    for table, result in report.items():
+        print(f"{table}: {result['checked']} checked, {result['mismatched']} mismatched, {result['repaired']} repaired")
+        for mismatch in result["mismatches"]:
+            print(f"  - id {mismatch['id']}: stored {mismatch['stored']!r}, expected {mismatch['expected']!r}")
+        if result["mismatched"] and not args.repair:
+            has_error = True
+
+    if has_error:
+        print("Current status check: FAILED (run with --repair)")
+        return 1
+
+    print("Current status check: PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -35,8 +35,15 @@ def _load_sqlite_schema(db_path):
     conn = sqlite3.connect(db_path)
     try:
         cur = conn.cursor()
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        table_names = [row[0] for row in cur.fetchall()]
+        cur.execute("SELECT name, sql FROM sqlite_master WHERE type='table'")
+        rows = cur.fetchall()
+        # Virtual tables (e.g. the FTS5 search index) and their shadow tables
+        # are owned by migrations, not models.
+        virtual = [name for name, sql in rows if (sql or "").upper().startswith("CREATE VIRTUAL TABLE")]
+        table_names = [
+            name for name, _ in rows
+            if not any(name == vt or name.startswith(f"{vt}_") for vt in virtual)
+        ]
         db_tables = {}
         for table in table_names:
             cur.execute(f"PRAGMA table_info('{table}')")
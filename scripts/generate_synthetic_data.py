@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for SuperviseMe.
+Fills an empty, migrated database with a large deterministic dataset for load
+and regression testing. Re-running the same command resumes an interrupted run.
+
+Usage:
+    python scripts/generate_synthetic_data.py                  # full scale: 50k users, 20k theses, 2M updates...
+    python scripts/generate_synthetic_data.py --scale 0.01 --seed 7
+    python scripts/generate_synthetic_data.py --users 5000 --updates 100000 --rollups
+"""
+import argparse
+import json
+import os
+import sys
+
+# Add parent directory to path to import superviseme
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from superviseme import create_app
+from superviseme.utils.synthetic_data import (
+    DEFAULT_CHUNK_SIZE,
+    SYNTHETIC_PASSWORD,
+    SyntheticDataGenerator,
+    SyntheticScale,
+    scaled,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic SuperviseMe dataset")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same data")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier applied to the full-scale counts")
+    for field in SyntheticScale._fields:
+        parser.add_argument(f"--{field}", type=int, help=f"Override the number of {field}")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per transaction")
+    parser.add_argument("--stages", nargs="+", choices=SyntheticDataGenerator.STAGES,
+                        help="Only run these stages (default: all)")
+    parser.add_argument("--rollups", action="store_true", help="Build the analytics rollups afterwards")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    scale = scaled(args.scale)._replace(
+        **{field: getattr(args, field) for field in SyntheticScale._fields if getattr(args, field) is not None}
+    )
+
+    db_type = "postgresql" if os.getenv("PG_HOST") else "sqlite"
+    app = create_app(db_type=db_type, skip_user_init=True)
+
+    def progress(stage, done, total):
+        print(f"\r{stage}: {done}/{total}", end="\n" if done == total else "", flush=True)
+
+    with app.app_context():
+        generator = SyntheticDataGenerator(scale, seed=args.seed, chunk_size=args.chunk_size, progress=progress)
+        try:
+            report = generator.run(stages=args.stages)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+        if args.rollups:
+            from superviseme.utils.analytics_rollups import build_rollups
+            report["rollups"] = build_rollups(full=True)
+
+    report["password"] = SYNTHETIC_PASSWORD
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Load test script for SuperviseMe application.
+Starts gunicorn on a synthetic dataset for each requested worker count, drives
+it with concurrent student/supervisor/admin/anonymous sessions and reports
+throughput, latency percentiles, error rates and database pool peaks.
+
+Usage:
+    python scripts/load_test.py --workers 1 2 4 --concurrency 32 --duration 60
+    python scripts/load_test.py --smoke
+    python scripts/load_test.py --base-url http://localhost:8080 --concurrency 16   # existing server
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import superviseme
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import requests
+
+SERVER_START_TIMEOUT = 60
+ACCOUNTS_PER_ROLE = 50
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test SuperviseMe with realistic role mixes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Gunicorn worker counts to compare")
+    parser.add_argument("--threads", type=int, default=1, help="Gunicorn threads per worker")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per worker count")
+    parser.add_argument("--processes", type=int, help="Client processes (default: one per CPU, at most concurrency)")
+    parser.add_argument("--scale", type=float, default=0.01, help="Synthetic dataset scale (1.0 = 50k users)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", help="SQLite file for the dataset (default: reused file in the temp dir)")
+    parser.add_argument("--port", type=int, default=0, help="Port for the local server (default: a free port)")
+    parser.add_argument("--base-url", help="Load an already running server instead (accounts must exist)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Fail above this error rate")
+    parser.add_argument("--smoke", action="store_true", help="Short CI run: tiny dataset, 2 workers, 5 seconds")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.smoke:
+        args.workers, args.concurrency, args.duration, args.scale = [2], 4, 5, 0.002
+    return args
+
+
+def prepare_dataset(args):
+    """Generate (or reuse) the synthetic database and collect the accounts virtual users log in with"""
+    database = os.path.abspath(args.database or os.path.join(
+        tempfile.gettempdir(), f"superviseme_load_{args.seed}_{args.scale:g}.db"
+    ))
+    os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{database}"
+    os.environ["ENABLE_SCHEDULER"] = "false"
+    os.environ["FLASK_SKIP_USER_INIT"] = "1"
+    os.environ.setdefault("FLASK_ENV", "development")
+    os.environ.setdefault("SECRET_KEY", "load-test-secret-key")
+
+    from sqlalchemy import select
+
+    from superviseme import create_app, db
+    from superviseme.models import Thesis, Thesis_Supervisor, User_mgmt
+    from superviseme.utils.synthetic_data import (
+        SYNTHETIC_ADMIN,
+        SYNTHETIC_PASSWORD,
+        SyntheticDataGenerator,
+        scaled,
+    )
+
+    app = create_app(db_type="sqlite", skip_user_init=True)
+    with app.app_context():
+        SyntheticDataGenerator(scaled(args.scale), seed=args.seed).run()
+
+        students = [
+            {"email": email, "password": SYNTHETIC_PASSWORD, "thesis_id": thesis_id}
+            for email, thesis_id in db.session.execute(
+                select(User_mgmt.email, Thesis.id).join(Thesis, Thesis.author_id == User_mgmt.id)
+                .order_by(Thesis.id).limit(ACCOUNTS_PER_ROLE)
+            )
+        ]
+        supervised = {}
+        for supervisor_id, thesis_id in db.session.execute(
+            select(Thesis_Supervisor.supervisor_id, Thesis_Supervisor.thesis_id).order_by(Thesis_Supervisor.id)
+        ):
+            supervised.setdefault(supervisor_id, []).append(thesis_id)
+        supervisor_emails = dict(db.session.execute(
+            select(User_mgmt.id, User_mgmt.email).where(User_mgmt.id.in_(list(supervised)[:ACCOUNTS_PER_ROLE]))
+        ).all())
+        supervisors = [
+            {"email": email, "password": SYNTHETIC_PASSWORD, "thesis_ids": supervised[supervisor_id][:20]}
+            for supervisor_id, email in sorted(supervisor_emails.items())
+        ]
+        admin_email = db.session.scalar(select(User_mgmt.email).where(User_mgmt.username == SYNTHETIC_ADMIN))
+        public_ids = db.session.scalars(
+            select(Thesis.id).where(Thesis.is_public.is_(True), Thesis.author_id.is_(None)).limit(ACCOUNTS_PER_ROLE)
+        ).all()
+
+    accounts = {
+        "student": students,
+        "supervisor": supervisors,
+        "admin": [{"email": admin_email, "password": SYNTHETIC_PASSWORD}],
+    }
+    return database, accounts, {"public_thesis_ids": list(public_ids)}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database, workers, threads, port):
+    env = dict(os.environ)
+    env.update({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{database}",
+        "ENABLE_SCHEDULER": "false",
+        "FLASK_SKIP_USER_INIT": "1",
+        # Size each worker's database pool for this run
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        # All virtual users share one client IP
+        "LOGIN_RATE_LIMIT_IP": "1000000/60",
+    })
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--workers", str(workers), "--threads", str(threads),
+         "--bind", f"127.0.0.1:{port}", "--log-level", "warning", "--timeout", "120", "wsgi:app"],
+        cwd=REPO_ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("gunicorn did not become healthy in time")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def print_summary(label, summary):
+    pool = summary["pool"]
+    pool_text = (
+        f"pool peak {pool.get('checked_out')}/{pool.get('size')}+{pool.get('max_overflow', 0)}"
+        f" (saturation {pool.get('saturation')})" if pool else "pool n/a"
+    )
+    print(f"\n== {label}: {summary['throughput_rps']} req/s, p50 {summary['p50_ms']} ms, "
+          f"p95 {summary['p95_ms']} ms, p99 {summary['p99_ms']} ms, "
+          f"errors {summary['errors']}/{summary['requests']}, {pool_text}")
+    print(f"   {'step':28} {'requests':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for step, stats in summary["steps"].items():
+        print(f"   {step:28} {stats['requests']:>8} {stats['errors']:>7} {stats['p50_ms']:>9} "
+              f"{stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+
+
+def main():
+    args = parse_args()
+    from superviseme.utils.load_testing import run_load
+
+    processes = args.processes or min(os.cpu_count() or 1, args.concurrency)
+    database, accounts, context = prepare_dataset(args)
+    runs = {}
+
+    targets = [("external", None)] if args.base_url else [(f"{workers} workers", workers) for workers in args.workers]
+    for label, workers in targets:
+        process = None
+        if workers is None:
+            base_url = args.base_url
+        else:
+            process, base_url = start_server(database, workers, args.threads, args.port or free_port())
+        try:
+            summary = run_load(
+                base_url, accounts, context,
+                concurrency=args.concurrency, duration=args.duration, processes=processes, seed=args.seed,
+            )
+        finally:
+            if process is not None:
+                stop_server(process)
+        runs[label] = summary
+        print_summary(label, summary)
+
+    report = {
+        "dataset": {"scale": args.scale, "seed": args.seed, "database": database},
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "runs": runs,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    failed = [label for label, summary in runs.items() if summary["error_rate"] > args.max_error_rate]
+    if failed:
+        print(f"\nLoad test: FAILED (error rate above {args.max_error_rate:.1%} for {', '.join(failed)})")
+        return 1
+    print("\nLoad test: PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
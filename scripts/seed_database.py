@@ -17,6 +17,8 @@ load_dotenv()
 
 from superviseme import create_app, db
 from superviseme.models import User_mgmt, Thesis, Thesis_Status, Thesis_Supervisor, Thesis_Tag
+from superviseme.utils.tags import refresh_tag_counts
+from superviseme.utils.thesis_catalogue import invalidate_catalogue
 from werkzeug.security import generate_password_hash
 import time
 
@@ -51,6 +53,9 @@ def seed_database():
         Thesis_Status.query.delete()
         Thesis.query.delete()
         User_mgmt.query.delete()
+        # Bulk deletes skip the tag and catalogue listeners
+        refresh_tag_counts(db.session.connection())
+        invalidate_catalogue()
         db.session.commit()
 
         # Create admin user
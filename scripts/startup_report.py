@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Startup time report for SuperviseMe application.
+Boots the app the way a gunicorn worker does (init phase already done,
+APP_INIT_ON_STARTUP=false) in fresh interpreters and reports import time,
+create_app phases and the slowest imported modules, failing when the median
+boot exceeds the budget.
+
+Usage:
+    python scripts/startup_report.py
+    python scripts/startup_report.py --runs 10 --budget-ms 800 --with-init
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Runs in a fresh interpreter so imports are cold
+BOOT_SNIPPET = """
+import json, time
+started = time.perf_counter()
+import superviseme
+imported = time.perf_counter()
+app = superviseme.create_app(db_type="sqlite", skip_user_init=True)
+finished = time.perf_counter()
+print(json.dumps({
+    "import_ms": round((imported - started) * 1000, 1),
+    "create_app_ms": round((finished - imported) * 1000, 1),
+    "total_ms": round((finished - started) * 1000, 1),
+    "phases": app.config["STARTUP_REPORT"]["phases"],
+}))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure SuperviseMe worker boot time")
+    parser.add_argument("--runs", type=int, default=5, help="Cold boots to measure")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="Fail when the median boot is slower")
+    parser.add_argument("--database", help="SQLite file to boot against (default: a fresh file in the temp dir)")
+    parser.add_argument("--with-init", action="store_true", help="Also time boots that run the init phase")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imported modules to list")
+    return parser.parse_args()
+
+
+def boot_env(database, run_init):
+    env = dict(os.environ)
+    env.update({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{database}",
+        "APP_INIT_ON_STARTUP": "true" if run_init else "false",
+        "ENABLE_SCHEDULER": "false",
+        "FLASK_SKIP_USER_INIT": "1",
+    })
+    env.setdefault("FLASK_ENV", "development")
+    env.setdefault("SECRET_KEY", "startup-report-secret-key")
+    return env
+
+
+def boot(env, importtime=False):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", BOOT_SNIPPET]
+    result = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report, result.stderr
+
+
+def slowest_imports(importtime_output, top):
+    """Top-level packages by cumulative import time (microseconds) from -X importtime"""
+    packages = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        # Nested imports are indented; only the outermost line of each tree counts
+        if not cumulative.strip().isdigit() or raw_name.startswith("  "):
+            continue
+        name = raw_name.strip()
+        packages[name] = packages.get(name, 0) + int(cumulative)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def summarize(label, reports):
+    totals = [report["total_ms"] for report in reports]
+    phases = {}
+    for report in reports:
+        for phase, ms in report["phases"].items():
+            phases.setdefault(phase, []).append(ms)
+    print(f"\n== {label}: median {statistics.median(totals):.0f} ms "
+          f"(import {statistics.median(r['import_ms'] for r in reports):.0f} ms, "
+          f"create_app {statistics.median(r['create_app_ms'] for r in reports):.0f} ms), "
+          f"max {max(totals):.0f} ms over {len(reports)} runs")
+    for phase, values in phases.items():
+        print(f"   {phase:12} {statistics.median(values):>8.1f} ms")
+    return statistics.median(totals)
+
+
+def main():
+    args = parse_args()
+    database = os.path.abspath(args.database or os.path.join(tempfile.gettempdir(), "superviseme_startup.db"))
+
+    # One init run prepares the database, as `python superviseme.py init` does in deployments
+    boot(boot_env(database, run_init=True))
+
+    reports = [boot(boot_env(database, run_init=False))[0] for _ in range(args.runs)]
+    median = summarize("worker boot (APP_INIT_ON_STARTUP=false)", reports)
+
+    if args.with_init:
+        summarize("boot with init phase", [boot(boot_env(database, run_init=True))[0] for _ in range(args.runs)])
+
+    _, importtime_output = boot(boot_env(database, run_init=False), importtime=True)
+    print("\n   slowest imports during a worker boot:")
+    for name, micros in slowest_imports(importtime_output, args.top):
+        print(f"   {name:40} {micros / 1000:>8.1f} ms")
+
+    if median > args.budget_ms:
+        print(f"\nStartup: FAILED (median {median:.0f} ms > budget {args.budget_ms:.0f} ms)")
+        return 1
+    print(f"\nStartup: PASSED (median {median:.0f} ms <= budget {args.budget_ms:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
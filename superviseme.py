@@ -38,9 +38,39 @@ def start_app(db_type="sqlite", debug=False, host="localhost", port=8080):
     app.run(debug=debug, host=host, port=port)
 
 
+def run_init(db_type="sqlite"):
+    """One-shot init phase: database, migrations, bootstrap admin and optional seeding"""
+    create_app(db_type=db_type, run_init=True)
+    _run_seed_if_needed()
+
+
+def start_scheduler(db_type="sqlite"):
+    """Run only the background scheduler, so web workers can set ENABLE_SCHEDULER=false"""
+    from superviseme.utils.task_scheduler import run_scheduler
+
+    app = create_app(db_type=db_type, skip_user_init=True)
+    run_scheduler(app)
+
+
+def start_job_worker(db_type="sqlite"):
+    """Run only queued background jobs (large deletes, uploaded imports)"""
+    from superviseme.utils.background_jobs import run_job_worker
+
+    app = create_app(db_type=db_type, skip_user_init=True)
+    run_job_worker(app)
+
+
 if __name__ == "__main__":
     parser = ArgumentParser()
 
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["web", "init", "scheduler", "jobs"],
+        default="web",
+        help="run the web app (default), the one-shot init phase, the standalone job scheduler "
+        "or a background job worker",
+    )
     parser.add_argument(
         "-x", "--host", default="localhost", help="host address to run the app on"
     )
@@ -58,4 +88,11 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    start_app(db_type=args.db, debug=args.debug, host=args.host, port=args.port)
+    if args.command == "init":
+        run_init(db_type=args.db)
+    elif args.command == "scheduler":
+        start_scheduler(db_type=args.db)
+    elif args.command == "jobs":
+        start_job_worker(db_type=args.db)
+    else:
+        start_app(db_type=args.db, debug=args.debug, host=args.host, port=args.port)
@@ -1,6 +1,7 @@
 import os
 import re
 import shutil
+import click
 from urllib.parse import urlparse, unquote
 from dotenv import load_dotenv
 from flask import Flask, jsonify, request, render_template
@@ -8,8 +9,6 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_mail import Mail
 from flask_wtf.csrf import CSRFProtect, CSRFError
-from flask_migrate import Migrate
-from authlib.integrations.flask_client import OAuth
 from sqlalchemy import MetaData
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -17,6 +16,12 @@ from sqlalchemy import create_engine, text
 import time
 import logging
 
+from superviseme.utils.assets import init_assets
+from superviseme.utils.oauth_clients import LazyOAuth
+from superviseme.utils.process_lifecycle import register_app, run_in_worker
+from superviseme.utils.startup import StartupTimer
+from superviseme.utils.template_cache import configure_template_cache, warm_templates
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 client_processes = {}
@@ -34,8 +39,8 @@ login_manager = LoginManager()
 login_manager.login_view = "auth.login"
 mail = Mail()
 csrf = CSRFProtect()
-migrate = Migrate()
-oauth = OAuth()
+# authlib (and its HTTP stack) is imported on the first Google/ORCID login
+oauth = LazyOAuth()
 
 INSECURE_SECRET_KEY_VALUES = {
     "",
@@ -72,20 +77,32 @@ def _validate_postgres_dbname(dbname):
         )
 
 
-def create_postgresql_db(app):
+def _postgresql_settings():
     user = os.getenv("PG_USER", "postgres")
     password = os.getenv("PG_PASSWORD", "password")
     host = os.getenv("PG_HOST", "localhost")
     port = os.getenv("PG_PORT", "5432")
     dbname = os.getenv("PG_DBNAME", "dashboard")
     _validate_postgres_dbname(dbname)
+    return user, password, host, port, dbname
+
+
+def _configure_postgresql(app):
+    user, password, host, port, dbname = _postgresql_settings()
 
     app.config["SQLALCHEMY_DATABASE_URI"] = f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
 
     app.config["SQLALCHEMY_BINDS"] = {
         "db_admin": f"postgresql://{user}:{password}@{host}:{port}/{dbname}",
     }
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {}
+    from superviseme.utils.db_pool import postgresql_engine_options
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = postgresql_engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+
+
+def create_postgresql_db(app):
+    """Create the configured PostgreSQL database if it does not exist yet"""
+    user, password, host, port, dbname = _postgresql_settings()
 
     admin_uri = f"postgresql://{user}:{password}@{host}:{port}/postgres"
     created_db = False
@@ -235,16 +252,113 @@ def _bootstrap_sqlite_db_if_missing(sqlite_uri):
     _stamp_sqlite_db_head(target_path)
 
 
-def create_app(db_type="sqlite", skip_user_init=False):
+def _ensure_admin_user(app):
+    """
+    Insert the admin user if it doesn't exist, or keep their password in sync
+    with ADMIN_BOOTSTRAP_PASSWORD so that the value set in .env always works.
+    """
+    from .models import User_mgmt
+
+    with app.app_context():
+        # Check if the admin user exists (only if tables exist)
+        try:
+            bootstrap_password = os.getenv("ADMIN_BOOTSTRAP_PASSWORD", "")
+            admin_user = User_mgmt.query.filter_by(username="admin").first()
+            if not admin_user:
+                if not bootstrap_password:
+                    app.logger.warning(
+                        "Admin user missing but ADMIN_BOOTSTRAP_PASSWORD is not set; skipping bootstrap admin creation."
+                    )
+                else:
+                    hashed_pw = generate_password_hash(
+                        bootstrap_password, method=app.config["PASSWORD_HASH_METHOD"]
+                    )
+                    new_admin = User_mgmt(
+                        username="admin",
+                        name="Dr.",
+                        surname="God",
+                        email="admin@supervise.me",
+                        password=hashed_pw,
+                        user_type="admin",
+                        joined_on=int(time.time()),
+                    )
+                    db.session.add(new_admin)
+                    db.session.commit()
+            elif bootstrap_password and not check_password_hash(
+                admin_user.password, bootstrap_password
+            ):
+                # Admin exists but their stored password no longer matches the
+                # configured ADMIN_BOOTSTRAP_PASSWORD – re-sync it so the value
+                # in .env always allows login (useful after password rotations or
+                # a fresh clone with an existing database).
+                admin_user.password = generate_password_hash(
+                    bootstrap_password, method=app.config["PASSWORD_HASH_METHOD"]
+                )
+                db.session.commit()
+                app.logger.info(
+                    "Admin password synchronised with ADMIN_BOOTSTRAP_PASSWORD."
+                )
+        except Exception as e:
+            # Database tables don't exist yet, that's okay during initialization
+            print(f"Note: Database tables not found during app creation: {e}")
+
+
+def _init_migrate(app):
+    """Register Flask-Migrate and the `flask db` commands (imports alembic)"""
+    if "migrate" not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db, render_as_batch=True)
+
+
+def initialize_app(app, skip_user_init=False):
+    """
+    One-shot init phase: create or bootstrap the database, apply pending
+    migrations and make sure the bootstrap admin exists.
+
+    Deployments run it once (`python superviseme.py init`) before starting
+    workers with APP_INIT_ON_STARTUP=false, so worker boot only wires config
+    and blueprints.
+    """
+    database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if database_uri.startswith("sqlite"):
+        # Bootstrap only when missing; never overwrite an existing DB file.
+        _bootstrap_sqlite_db_if_missing(database_uri)
+    else:
+        create_postgresql_db(app)
+
+    _init_migrate(app)
+    # Ensure the database schema is up to date before any queries are made.
+    _run_db_upgrade(app)
+
+    if not skip_user_init:
+        _ensure_admin_user(app)
+
+
+def create_app(db_type="sqlite", skip_user_init=False, run_init=None):
+    """
+    Build the application.
+
+    run_init: also run the init phase (initialize_app) in this process.
+    Defaults to APP_INIT_ON_STARTUP (true); workers started after a separate
+    `python superviseme.py init` set it to false and boot with config and
+    blueprints only.
+    """
+    timer = StartupTimer()
     load_dotenv(override=False)
+    if run_init is None:
+        run_init = os.getenv("APP_INIT_ON_STARTUP", "true").lower() in ("1", "true", "yes")
     app = Flask(__name__, static_url_path="/static")
 
     # Trust proxy headers from nginx so that url_for(_external=True) generates
     # the correct scheme/host and session cookies are scoped correctly.
     # Only enabled when USE_PROXY_FIX=true to avoid header-spoofing risk when
     # the app is exposed directly without a trusted reverse proxy.
+    # TRUSTED_PROXY_COUNT is the number of proxies that append to
+    # X-Forwarded-For, so request.remote_addr (and the per-IP login limit)
+    # sees the real client rather than nginx.
     if os.getenv("USE_PROXY_FIX", "false").lower() in ("1", "true", "yes"):
-        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
+        proxy_count = max(1, int(os.getenv("TRUSTED_PROXY_COUNT", "1")))
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_count, x_proto=1, x_host=1, x_prefix=1)
 
     # When Flask-Migrate CLI (flask db ...) invokes the app factory it does not
     # pass skip_user_init=True, so honour the env var as a secondary opt-out.
@@ -271,111 +385,64 @@ def create_app(db_type="sqlite", skip_user_init=False):
     app.config["MAIL_PASSWORD"] = os.getenv("MAIL_PASSWORD", "")
     app.config["MAIL_DEFAULT_SENDER"] = os.getenv("MAIL_DEFAULT_SENDER", "noreply@superviseme.local")
 
+    # Password hashing cost and login throttling (per process)
+    app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+    app.config["LOGIN_RATE_LIMIT_IP"] = os.getenv("LOGIN_RATE_LIMIT_IP", "20/300")
+    app.config["LOGIN_RATE_LIMIT_ACCOUNT"] = os.getenv("LOGIN_RATE_LIMIT_ACCOUNT", "5/300")
+
     if db_type == "sqlite":
         sqlite_uri = os.getenv(
             "SQLALCHEMY_DATABASE_URI",
             f"sqlite:///{BASE_DIR}/db/dashboard.db",
         )
-        # Bootstrap only when missing; never overwrite an existing DB file.
-        _bootstrap_sqlite_db_if_missing(sqlite_uri)
         app.config["SQLALCHEMY_DATABASE_URI"] = sqlite_uri
         app.config["SQLALCHEMY_BINDS"] = {
             "db_admin": sqlite_uri,
        #     "db_exp": f"sqlite:///{BASE_DIR}/db/dummy.db",
         }
-        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-            "connect_args": {"check_same_thread": False}
-        }
+        from superviseme.utils.db_pool import sqlite_engine_options
+
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = sqlite_engine_options(sqlite_uri)
 
     elif db_type == "postgresql":
-        create_postgresql_db(app)
+        _configure_postgresql(app)
     else:
         raise ValueError("Unsupported db_type, use 'sqlite' or 'postgresql'")
 
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Before any extension touches app.jinja_env
+    configure_template_cache(app)
+    timer.mark("config")
 
     db.init_app(app)
-    migrate.init_app(app, db, render_as_batch=True)
+    register_app(app)
     login_manager.init_app(app)
     mail.init_app(app)
     csrf.init_app(app)
-    oauth.init_app(app)
-
-    # Configure Google OAuth
-    oauth.register(
-        name='google',
-        client_id=os.getenv("GOOGLE_CLIENT_ID"),
-        client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
-        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-        client_kwargs={'scope': 'openid email profile'}
-    )
-
-    # Configure ORCID OAuth
-    oauth.register(
-        name='orcid',
-        client_id=os.getenv("ORCID_CLIENT_ID"),
-        client_secret=os.getenv("ORCID_CLIENT_SECRET"),
-        access_token_url='https://orcid.org/oauth/token',
-        authorize_url='https://orcid.org/oauth/authorize',
-        api_base_url='https://pub.orcid.org/v3.0/',
-        client_kwargs={'scope': app.config["ORCID_SCOPE"]}
-    )
-
-    # Ensure the database schema is up to date before any queries are made.
-    _run_db_upgrade(app)
+    # `flask db ...` runs inside a click context and needs Flask-Migrate
+    if run_init or click.get_current_context(silent=True) is not None:
+        _init_migrate(app)
+    timer.mark("extensions")
 
-    from .models import User_mgmt
-
-    # insert the admin user if it doesn't exist, or keep their password in sync
-    # with ADMIN_BOOTSTRAP_PASSWORD so that the value set in .env always works.
-    if not skip_user_init:
-        with app.app_context():
-            # Check if the admin user exists (only if tables exist)
-            try:
-                bootstrap_password = os.getenv("ADMIN_BOOTSTRAP_PASSWORD", "")
-                admin_user = User_mgmt.query.filter_by(username="admin").first()
-                if not admin_user:
-                    if not bootstrap_password:
-                        app.logger.warning(
-                            "Admin user missing but ADMIN_BOOTSTRAP_PASSWORD is not set; skipping bootstrap admin creation."
-                        )
-                    else:
-                        hashed_pw = generate_password_hash(
-                            bootstrap_password, method="pbkdf2:sha256"
-                        )
-                        new_admin = User_mgmt(
-                            username="admin",
-                            name="Dr.",
-                            surname="God",
-                            email="admin@supervise.me",
-                            password=hashed_pw,
-                            user_type="admin",
-                            joined_on=int(time.time()),
-                        )
-                        db.session.add(new_admin)
-                        db.session.commit()
-                elif bootstrap_password and not check_password_hash(
-                    admin_user.password, bootstrap_password
-                ):
-                    # Admin exists but their stored password no longer matches the
-                    # configured ADMIN_BOOTSTRAP_PASSWORD – re-sync it so the value
-                    # in .env always allows login (useful after password rotations or
-                    # a fresh clone with an existing database).
-                    admin_user.password = generate_password_hash(
-                        bootstrap_password, method="pbkdf2:sha256"
-                    )
-                    db.session.commit()
-                    app.logger.info(
-                        "Admin password synchronised with ADMIN_BOOTSTRAP_PASSWORD."
-                    )
-            except Exception as e:
-                # Database tables don't exist yet, that's okay during initialization
-                print(f"Note: Database tables not found during app creation: {e}")
+    if run_init:
+        initialize_app(app, skip_user_init=skip_user_init)
+        timer.mark("init")
 
     @login_manager.user_loader
     def load_user(user_id):
-        print(f"Loading user with ID: {user_id}")
-        return User_mgmt.query.get(int(user_id))
+        from superviseme.utils.user_cache import get_user_principal
+        return get_user_principal(int(user_id))
+
+    # Keep materialized thesis/project statuses in sync with status history writes
+    import superviseme.utils.current_status  # noqa: F401
+    # Keep the full-text search index in sync with content writes
+    import superviseme.utils.search_index  # noqa: F401
+    # Resolve tag ids and keep tag counts in sync with tag and thesis writes
+    import superviseme.utils.tags  # noqa: F401
+    # Keep the in-memory public catalogue index in step with thesis writes
+    import superviseme.utils.thesis_catalogue  # noqa: F401
+    # Keep todo sort ranks in step with status and priority writes
+    import superviseme.utils.todo_queries  # noqa: F401
 
     # Register your blueprints here as before
     from superviseme.routes.auth import auth as auth_blueprint
@@ -405,6 +472,7 @@ def create_app(db_type="sqlite", skip_user_init=False):
     # Register error handlers
     from superviseme.routes.errors import errors as errors_blueprint
     app.register_blueprint(errors_blueprint)
+    timer.mark("blueprints")
 
     @app.errorhandler(CSRFError)
     def handle_csrf_error(error):
@@ -459,17 +527,20 @@ def create_app(db_type="sqlite", skip_user_init=False):
     from superviseme.utils.logging_config import setup_logging, log_request_response
     loggers = setup_logging(app)
     log_request_response(app, loggers)
+    timer.mark("logging")
 
     # Initialize scheduler only when explicitly enabled, so it can run in a single worker/service.
     enable_scheduler = os.getenv("ENABLE_SCHEDULER", "true").lower() == "true"
     if enable_scheduler and not app.testing:
         from superviseme.utils.task_scheduler import init_scheduler
-        init_scheduler(app)
+        # Under gunicorn --preload this waits for post_fork, so threads start in the worker
+        run_in_worker(init_scheduler, app)
     else:
         app.logger.info(
             "Background scheduler disabled for this process",
             extra={"event_type": "scheduler_disabled", "enable_scheduler": enable_scheduler},
         )
+    timer.mark("scheduler")
 
     # Register template filters
     @app.template_filter('format_todo_links')
@@ -552,4 +623,18 @@ def create_app(db_type="sqlite", skip_user_init=False):
         
         return MomentWrapper(datetime.now())
 
+    # static_url() and immutable caching for fingerprinted assets (scripts/build_assets.py)
+    init_assets(app)
+    timer.mark("filters")
+
+    # Compile every template once per deploy; workers load the cached bytecode
+    if run_init and os.getenv("TEMPLATE_WARMUP", "true").lower() == "true":
+        app.config["TEMPLATE_WARMUP_REPORT"] = warm_templates(app)
+        timer.mark("templates")
+    app.config["STARTUP_REPORT"] = timer.report()
+    app.logger.info(
+        f"App created in {app.config['STARTUP_REPORT']['total_ms']} ms "
+        f"({', '.join(f'{phase} {ms}' for phase, ms in timer.phases.items())})",
+        extra={"event_type": "startup", **app.config["STARTUP_REPORT"]},
+    )
     return app
@@ -1,4 +1,5 @@
 from flask_login import UserMixin
+from sqlalchemy import func
 
 from . import db
 
@@ -27,10 +28,12 @@ class User_mgmt(UserMixin, db.Model):
     telegram_user_id = db.Column(db.String(50), nullable=True)  # Telegram user ID for bot notifications
     telegram_enabled = db.Column(db.Boolean, default=False, nullable=False)  # Enable/disable Telegram notifications
     telegram_notification_types = db.Column(db.Text, nullable=True)  # JSON string of enabled notification types
+    telegram_frequency = db.Column(db.String(10), nullable=True)  # Per-user delivery override: immediate, hourly, daily
 
     # ORCID Integration
     orcid_access_token = db.Column(db.String(255), nullable=True)
     orcid_refresh_token = db.Column(db.String(255), nullable=True)
+    orcid_sync_state = db.Column(db.Text, nullable=True)  # JSON: per-section ETag / last-modified of the last sync
 
     thesis = db.relationship(
         "Thesis",
@@ -40,6 +43,17 @@ class User_mgmt(UserMixin, db.Model):
     )
 
 
+# Case-insensitive prefix search within a role (superviseme/utils/user_search.py).
+# text_pattern_ops lets PostgreSQL use them for LIKE 'prefix%' under any collation.
+for _column in ("name", "surname", "username"):
+    db.Index(
+        f"ix_user_mgmt_{_column}_prefix",
+        User_mgmt.user_type,
+        func.lower(getattr(User_mgmt, _column)).label(f"{_column}_lower"),
+        postgresql_ops={f"{_column}_lower": "text_pattern_ops"},
+    )
+
+
 class Thesis(db.Model):
     __tablename__ = "thesis"
     id = db.Column(db.Integer, primary_key=True)
@@ -55,8 +69,17 @@ class Thesis(db.Model):
     frozen = db.Column(db.Boolean, default=False)
     level = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.Integer, nullable=False)
+    # Latest Thesis_Status, maintained by superviseme.utils.current_status
+    current_status = db.Column(db.String(20), nullable=True)
+    current_status_at = db.Column(db.Integer, nullable=True)
     publisher = db.relationship("User_mgmt", foreign_keys=[publisher_id], backref="published_theses", lazy=True)
 
+    __table_args__ = (
+        db.Index("ix_thesis_current_status", "current_status"),
+        # Does this user author a thesis? (user search assignment status)
+        db.Index("ix_thesis_author_id", "author_id"),
+    )
+
 
 class Thesis_Status(db.Model):
     __tablename__ = "thesis_status"
@@ -67,6 +90,12 @@ class Thesis_Status(db.Model):
 
     thesis = db.relationship("Thesis", backref="status", lazy=True)
 
+    __table_args__ = (
+        db.Index("ix_thesis_status_thesis_id_updated_at", "thesis_id", "updated_at"),
+        # Analytics rollups scan status changes by time
+        db.Index("ix_thesis_status_updated_at", "updated_at"),
+    )
+
 
 class Thesis_Supervisor(db.Model):
     __tablename__ = "thesis_supervisor"
@@ -78,14 +107,30 @@ class Thesis_Supervisor(db.Model):
     thesis = db.relationship("Thesis", backref="supervisors", lazy=True)
     supervisor = db.relationship("User_mgmt", backref="supervised_theses", lazy=True)
 
+    __table_args__ = (db.Index("ix_thesis_supervisor_supervisor_id", "supervisor_id"),)
+
+
+class Tag(db.Model):
+    # One row per folded tag key; the counts are maintained by superviseme.utils.tags
+    __tablename__ = "tag"
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(50), nullable=False, unique=True)  # Case- and accent-folded form
+    name = db.Column(db.String(50), nullable=False)  # Display form, as first entered
+    thesis_count = db.Column(db.Integer, nullable=False, default=0)
+    public_thesis_count = db.Column(db.Integer, nullable=False, default=0)  # Theses in the public catalogue
+    update_count = db.Column(db.Integer, nullable=False, default=0)
+
 
 class Thesis_Tag(db.Model):
     __tablename__ = "thesis_tag"
     id = db.Column(db.Integer, primary_key=True)
     thesis_id = db.Column(db.Integer, db.ForeignKey("thesis.id"), nullable=False)
+    tag_id = db.Column(db.Integer, db.ForeignKey("tag.id"), nullable=False)  # Set from `tag` on write
     tag = db.Column(db.String(50), nullable=False)
     thesis = db.relationship("Thesis", backref="tags", lazy=True)
 
+    __table_args__ = (db.Index("ix_thesis_tag_tag_id_thesis_id", "tag_id", "thesis_id"),)
+
 
 class Thesis_Interest(db.Model):
     __tablename__ = "thesis_interest"
@@ -107,10 +152,13 @@ class Update_Tag(db.Model):
     __tablename__ = "update_tag"
     id = db.Column(db.Integer, primary_key=True)
     update_id = db.Column(db.Integer, db.ForeignKey("thesis_update.id"), nullable=False)
+    tag_id = db.Column(db.Integer, db.ForeignKey("tag.id"), nullable=False)  # Set from `tag` on write
     tag = db.Column(db.String(50), nullable=False)
     frozen = db.Column(db.Boolean, default=False)
     update = db.relationship("Thesis_Update", backref="tags", lazy=True)
 
+    __table_args__ = (db.Index("ix_update_tag_tag_id_update_id", "tag_id", "update_id"),)
+
 
 class Thesis_Update(db.Model):
     __tablename__ = "thesis_update"
@@ -123,6 +171,9 @@ class Thesis_Update(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.Integer, nullable=False)
 
+    # Analytics rollups scan updates by time
+    __table_args__ = (db.Index("ix_thesis_update_created_at", "created_at"),)
+
 
 class Resource(db.Model):
     __tablename__ = "resource"
@@ -180,11 +231,25 @@ class Todo(db.Model):
     completed_at = db.Column(db.Integer, nullable=True)  # Unix timestamp when marked complete
     created_at = db.Column(db.Integer, nullable=False)
     updated_at = db.Column(db.Integer, nullable=False)
+    # List order keys derived from status and priority (higher lists first),
+    # kept in step by the listeners in superviseme/utils/todo_queries.py
+    status_rank = db.Column(db.Integer, nullable=False, default=0)
+    priority_rank = db.Column(db.Integer, nullable=False, default=0)
 
     thesis = db.relationship("Thesis", backref="todos", lazy=True)
     author = db.relationship("User_mgmt", foreign_keys=[author_id], backref="created_todos", lazy=True)
     assigned_to = db.relationship("User_mgmt", foreign_keys=[assigned_to_id], backref="assigned_todos", lazy=True)
 
+    __table_args__ = (
+        db.Index(
+            "ix_todo_thesis_id_status_rank_priority_rank_created_at_id",
+            "thesis_id", "status_rank", "priority_rank", "created_at", "id",
+        ),
+        # Analytics rollups scan todos by creation and completion time
+        db.Index("ix_todo_created_at", "created_at"),
+        db.Index("ix_todo_completed_at", "completed_at"),
+    )
+
 
 class Todo_Reference(db.Model):
     __tablename__ = "todo_reference"
@@ -219,6 +284,9 @@ class Notification(db.Model):
     actor = db.relationship("User_mgmt", foreign_keys=[actor_id], backref="sent_notifications", lazy=True)
     thesis = db.relationship("Thesis", backref="notifications", lazy=True)
 
+    # Digest runs pick up unsent notifications created since their watermark
+    __table_args__ = (db.Index("ix_notification_telegram_sent_created_at", "telegram_sent", "created_at"),)
+
 
 class MeetingNote(db.Model):
     __tablename__ = "meeting_note"
@@ -256,6 +324,14 @@ class TelegramBotConfig(db.Model):
     frequency_settings = db.Column(db.Text, nullable=True)  # JSON string of frequency settings (immediate, digest, etc.)
 
 
+class TelegramDigestRun(db.Model):
+    # Last completed digest run per frequency; the next run covers notifications created since the watermark
+    __tablename__ = "telegram_digest_run"
+    frequency = db.Column(db.String(10), primary_key=True)  # "hourly" or "daily"
+    watermark = db.Column(db.Integer, nullable=False)
+    last_run_at = db.Column(db.Integer, nullable=False)
+
+
 class ResearchProject(db.Model):
     __tablename__ = "research_project"
     id = db.Column(db.Integer, primary_key=True)
@@ -265,9 +341,14 @@ class ResearchProject(db.Model):
     frozen = db.Column(db.Boolean, default=False)
     level = db.Column(db.Text, nullable=True)  # e.g., "research", "pilot", "full-scale"
     created_at = db.Column(db.Integer, nullable=False)
+    # Latest ResearchProject_Status, maintained by superviseme.utils.current_status
+    current_status = db.Column(db.String(20), nullable=True)
+    current_status_at = db.Column(db.Integer, nullable=True)
 
     researcher = db.relationship("User_mgmt", backref="research_projects", lazy=True)
 
+    __table_args__ = (db.Index("ix_research_project_current_status", "current_status"),)
+
 
 class ResearchProject_Collaborator(db.Model):
     __tablename__ = "research_project_collaborator"
@@ -304,6 +385,10 @@ class ResearchProject_Status(db.Model):
 
     project = db.relationship("ResearchProject", backref="status_history", lazy=True)
 
+    __table_args__ = (
+        db.Index("ix_research_project_status_project_id_updated_at", "project_id", "updated_at"),
+    )
+
 
 class ResearchProject_Update(db.Model):
     __tablename__ = "research_project_update"
@@ -428,7 +513,160 @@ class OrcidActivity(db.Model):
     publication_date = db.Column(db.String(20), nullable=True) # YYYY or YYYY-MM
     url = db.Column(db.String(500), nullable=True)
     external_ids = db.Column(db.Text, nullable=True) # JSON string
+    put_code = db.Column(db.String(50), nullable=True) # ORCID put-code, stable per item
+    last_modified = db.Column(db.BigInteger, nullable=True) # ORCID last-modified-date (ms since epoch)
     created_at = db.Column(db.Integer, nullable=False)
     updated_at = db.Column(db.Integer, nullable=False)
 
     user = db.relationship("User_mgmt", backref="orcid_activities", lazy=True)
+
+
+class Analytics_Thesis_Daily(db.Model):
+    __tablename__ = "analytics_thesis_daily"
+    id = db.Column(db.Integer, primary_key=True)
+    thesis_id = db.Column(db.Integer, db.ForeignKey("thesis.id"), nullable=False)
+    day = db.Column(db.Integer, nullable=False)  # UTC midnight (Unix timestamp)
+    student_updates = db.Column(db.Integer, nullable=False, default=0)
+    supervisor_updates = db.Column(db.Integer, nullable=False, default=0)
+    todos_created = db.Column(db.Integer, nullable=False, default=0)
+    todos_completed = db.Column(db.Integer, nullable=False, default=0)
+    status_changes = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint("thesis_id", "day", name="uq_analytics_thesis_daily_thesis_id_day"),
+        db.Index("ix_analytics_thesis_daily_day", "day"),
+    )
+
+
+class Analytics_Supervisor_Weekly(db.Model):
+    __tablename__ = "analytics_supervisor_weekly"
+    id = db.Column(db.Integer, primary_key=True)
+    supervisor_id = db.Column(db.Integer, db.ForeignKey("user_mgmt.id"), nullable=False)
+    week_start = db.Column(db.Integer, nullable=False)  # Monday, UTC midnight (Unix timestamp)
+    theses = db.Column(db.Integer, nullable=False, default=0)
+    student_updates = db.Column(db.Integer, nullable=False, default=0)
+    supervisor_updates = db.Column(db.Integer, nullable=False, default=0)
+    todos_created = db.Column(db.Integer, nullable=False, default=0)
+    todos_completed = db.Column(db.Integer, nullable=False, default=0)
+    todos_overdue = db.Column(db.Integer, nullable=False, default=0)  # Snapshot at computed_at
+    inactive_theses = db.Column(db.Integer, nullable=False, default=0)  # Snapshot at computed_at
+    computed_at = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "supervisor_id", "week_start", name="uq_analytics_supervisor_weekly_supervisor_id_week_start"
+        ),
+        db.Index("ix_analytics_supervisor_weekly_week_start", "week_start"),
+    )
+
+
+class Analytics_Department_Weekly(db.Model):
+    __tablename__ = "analytics_department_weekly"
+    id = db.Column(db.Integer, primary_key=True)
+    department = db.Column(db.String(15), nullable=False)  # Student's degree programme (user_mgmt.cdl)
+    week_start = db.Column(db.Integer, nullable=False)
+    theses = db.Column(db.Integer, nullable=False, default=0)
+    student_updates = db.Column(db.Integer, nullable=False, default=0)
+    supervisor_updates = db.Column(db.Integer, nullable=False, default=0)
+    todos_completed = db.Column(db.Integer, nullable=False, default=0)
+    completed_theses = db.Column(db.Integer, nullable=False, default=0)
+    completion_days_total = db.Column(db.Integer, nullable=False, default=0)
+    computed_at = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("department", "week_start", name="uq_analytics_department_weekly_department_week_start"),
+        db.Index("ix_analytics_department_weekly_week_start", "week_start"),
+    )
+
+
+class Analytics_Watermark(db.Model):
+    __tablename__ = "analytics_watermark"
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.Integer, nullable=False)
+
+
+class Login_Rate_Limit(db.Model):
+    # Login token bucket per client IP or account, shared by every worker
+    __tablename__ = "login_rate_limit"
+    scope = db.Column(db.String(20), primary_key=True)  # "ip" or "account"
+    key = db.Column(db.String(255), primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False, index=True)  # Wall-clock seconds
+
+
+class Scheduler_Job(db.Model):
+    # Layout of APScheduler's SQLAlchemyJobStore table, so migrations own it
+    __tablename__ = "scheduler_jobs"
+    id = db.Column(db.Unicode(191), primary_key=True)
+    next_run_time = db.Column(db.Float(25), index=True)
+    job_state = db.Column(db.LargeBinary, nullable=False)
+
+
+class Scheduler_Lease(db.Model):
+    __tablename__ = "scheduler_lease"
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(255), nullable=False)  # "<host>:<pid>:<random>" of the holding process
+    acquired_at = db.Column(db.Integer, nullable=False)
+    expires_at = db.Column(db.Integer, nullable=False)
+
+
+class Catalogue_Change(db.Model):
+    # Committed catalogue changes, replayed by the other workers' in-memory catalogue index
+    __tablename__ = "catalogue_change"
+    id = db.Column(db.Integer, primary_key=True)
+    thesis_ids = db.Column(db.Text, nullable=True)  # JSON list
+    supervisor_ids = db.Column(db.Text, nullable=True)  # JSON list
+    rebuild = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.Integer, nullable=False, index=True)
+
+
+class Scheduler_Job_Run(db.Model):
+    __tablename__ = "scheduler_job_run"
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(100), nullable=False)
+    owner = db.Column(db.String(255), nullable=False)
+    started_at = db.Column(db.Integer, nullable=False, index=True)
+    finished_at = db.Column(db.Integer, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+    status = db.Column(db.String(20), nullable=False)  # running, success, error
+    result = db.Column(db.Text, nullable=True)  # Job summary (JSON) or the error message
+
+
+class Background_Job(db.Model):
+    # Queued admin work (large deletes, uploaded imports), run by superviseme.utils.background_jobs
+    __tablename__ = "background_job"
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex, handed out as the job id
+    kind = db.Column(db.String(50), nullable=False)
+    label = db.Column(db.String(255), nullable=True)  # What the job works on, for display
+    status = db.Column(db.String(20), nullable=False)  # queued, running, done, failed
+    payload = db.Column(db.Text, nullable=True)  # JSON arguments for the handler; cleared with data
+    data = db.Column(db.LargeBinary, nullable=True)  # Uploaded file, cleared once the job finishes
+    progress = db.Column(db.Text, nullable=True)  # JSON, reported by the handler while running
+    result = db.Column(db.Text, nullable=True)  # JSON
+    error = db.Column(db.Text, nullable=True)
+    owner = db.Column(db.String(255), nullable=True)  # Process running the job
+    created_by = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.Integer, nullable=False)
+    started_at = db.Column(db.Integer, nullable=True)
+    heartbeat_at = db.Column(db.Integer, nullable=True)
+    finished_at = db.Column(db.Integer, nullable=True, index=True)
+
+    __table_args__ = (db.Index("ix_background_job_status_created_at", "status", "created_at"),)
+
+
+class Search_Document(db.Model):
+    # One row per searchable item, kept in sync by superviseme.utils.search_index.
+    # The full-text index over title/body is dialect specific (FTS5 / tsvector), see migration 0012.
+    __tablename__ = "search_document"
+    id = db.Column(db.Integer, primary_key=True)
+    source_type = db.Column(db.String(30), nullable=False)  # e.g. "update", "meeting_note", "project_todo"
+    source_id = db.Column(db.Integer, nullable=False)
+    thesis_id = db.Column(db.Integer, nullable=True, index=True)  # Scope for thesis content
+    project_id = db.Column(db.Integer, nullable=True, index=True)  # Scope for research project content
+    author_id = db.Column(db.Integer, nullable=True)
+    title = db.Column(db.String(255), nullable=True)
+    body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (db.UniqueConstraint("source_type", "source_id", name="uq_search_document_source"),)
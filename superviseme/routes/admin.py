@@ -1,26 +1,40 @@
-from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify
+from flask import Blueprint, current_app, render_template, redirect, url_for, request, flash, jsonify
 from flask_login import login_required, current_user
 from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import aliased
-from werkzeug.security import generate_password_hash
 from superviseme.models import *
 from superviseme.utils.miscellanea import check_privileges
-from superviseme.utils.task_scheduler import trigger_weekly_reports_now, get_scheduler_status
 from superviseme.utils.weekly_notifications import preview_weekly_supervisor_report
 from superviseme.utils.thesis_management import delete_thesis_with_dependencies
+from superviseme.utils.cascade_delete import delete_or_schedule, get_delete_job
 from superviseme.utils.thesis_interest import (
     accept_interest_and_close_others,
     close_interests_after_direct_assignment,
     decline_interest,
 )
 from superviseme.utils.logging_config import log_security_event
+from superviseme.utils.telegram_digest import parse_frequency_settings
 from superviseme.utils.thesis_public import (
     normalize_thesis_descriptions,
     parse_bool,
     set_thesis_keywords,
 )
 from superviseme import db
+from superviseme.utils.password_security import hash_password
+from superviseme.utils.user_search import ASSIGNMENT_FILTERS, cached_search_users, typeahead_args
+from superviseme.utils.search_index import SEARCH_LIST_LIMIT, rebuild_search_index, search_content
+from superviseme.utils.bulk_import import detect_format, get_import_job, schedule_import
+from superviseme.utils.tags import find_thesis_tag, tag_facets
+from superviseme.utils.analytics_rollups import (
+    DEFAULT_SERIES_WEEKS,
+    build_rollups,
+    department_series,
+    get_rollup_status,
+    supervisors_overview,
+)
 import datetime
+import json
+import os
 import time
 
 admin = Blueprint("admin", __name__)
@@ -91,7 +105,7 @@ def dashboard():
     # for each supervisor get the list of available theses not assigned to students
     available_theses = [{"thesis": thesis} for thesis in Thesis.query.filter(Thesis.author_id.is_(None)).all()]
 
-    return render_template("/admin/admin_dashboard.html", current_user=current_user,
+    return render_template("admin/admin_dashboard.html", current_user=current_user,
                            user_counts=user_counts, thesis_counts=thesis_counts,
                            theses_by_supervisor=theses_by_supervisor, available_theses=available_theses, supervisors=supervisors, datetime=datetime, dt=datetime.datetime.fromtimestamp, str=str)
 
@@ -105,7 +119,7 @@ def users():
     privilege_check = check_privileges(current_user.username, role="admin")
     if privilege_check is not True:
         return privilege_check
-    return render_template("/admin/users.html", current_user=current_user)
+    return render_template("admin/users.html", current_user=current_user)
 
 
 @admin.route("/admin/create_user", methods=["POST"])
@@ -143,7 +157,7 @@ def create_user():
     new_user = User_mgmt(
         email=email,
         username=username,
-        password=generate_password_hash(password, method="pbkdf2:sha256"),
+        password=hash_password(password),
         name=name,
         surname=surname,
         cdl=cdl,
@@ -171,16 +185,28 @@ def delete_user(uid):
     if user:
         deleted_username = user.username
         deleted_user_type = user.user_type
-        # Delete related thesis data if user is a student
-        if user.user_type == "student":
-            # Remove thesis assignments
-            Thesis.query.filter_by(author_id=uid).update({"author_id": None})
-        
-        # Delete related supervisor assignments
-        if user.user_type == "supervisor":
-            Thesis_Supervisor.query.filter_by(supervisor_id=uid).delete()
-        
-        db.session.delete(user)
+        # Theses are kept (author cleared); everything the user owns or authored goes.
+        counts, job_id = delete_or_schedule(
+            User_mgmt, [uid],
+            reassign_to=current_user.id if current_user.id != uid else None,
+            label=f"user {deleted_username}",
+        )
+        details = {"username": deleted_username, "user_type": deleted_user_type}
+        if job_id:
+            _audit_admin_action(
+                action="delete_user",
+                target_type="user",
+                target_id=uid,
+                status="queued",
+                details={**details, "job_id": job_id},
+            )
+            flash("User deletion is running in the background")
+            return {
+                "status": "accepted",
+                "job_id": job_id,
+                "progress_url": url_for("admin.delete_job_status", job_id=job_id),
+            }, 202
+
         db.session.commit()
         flash("User deleted successfully")
         _audit_admin_action(
@@ -188,7 +214,7 @@ def delete_user(uid):
             target_type="user",
             target_id=uid,
             status="success",
-            details={"username": deleted_username, "user_type": deleted_user_type},
+            details={**details, "deleted": counts},
         )
     else:
         flash("User not found")
@@ -202,6 +228,20 @@ def delete_user(uid):
     return {"status": "success"}, 200
 
 
+@admin.route("/admin/delete_jobs/<job_id>")
+@login_required
+def delete_job_status(job_id):
+    """Progress of a background cascade delete"""
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    job = get_delete_job(job_id)
+    if job is None:
+        return {"status": "error", "message": "Job not found"}, 404
+    return {"status": "success", "job": job}, 200
+
+
 @admin.route("/admin/update_user", methods=["POST"])
 @login_required
 def update_user():
@@ -271,7 +311,7 @@ def reset_user_password(user_id):
             "message": "new_password is required and must be at least 12 characters long.",
         }, 400
 
-    user.password = generate_password_hash(new_password, method="pbkdf2:sha256")
+    user.password = hash_password(new_password)
     
     db.session.commit()
     _audit_admin_action(
@@ -315,7 +355,7 @@ def user_detail(user_id):
             .all()
         )
     
-    return render_template("/admin/user_detail.html",
+    return render_template("admin/user_detail.html",
                          current_user=current_user,
                          user=user,
                          researcher_supervisor_role=researcher_supervisor_role,
@@ -420,10 +460,27 @@ def theses():
     privilege_check = check_privileges(current_user.username, role="admin")
     if privilege_check is not True:
         return privilege_check
-    students = User_mgmt.query.filter_by(user_type="student").all()
-    supervisors = User_mgmt.query.filter_by(user_type="supervisor").all()
-    return render_template("/admin/theses.html", current_user=current_user,
-                           students=students, supervisors=supervisors)
+    # Student and supervisor pickers load candidates from /admin/api/users/search
+    return render_template("admin/theses.html", current_user=current_user)
+
+
+@admin.route("/admin/api/users/search")
+@login_required
+def search_users_typeahead():
+    """
+    Typeahead candidates: users whose name, surname or username start with q,
+    optionally restricted by role (repeatable) and assignment status
+    """
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    roles = [role for value in request.args.getlist("role") for role in value.split(",") if role]
+    assignment = request.args.get("assignment")
+    if assignment and assignment not in ASSIGNMENT_FILTERS:
+        return {"error": f"assignment must be one of {', '.join(ASSIGNMENT_FILTERS)}"}, 400
+    results = cached_search_users(roles=tuple(roles) or None, assignment=assignment, **typeahead_args(request.args))
+    return {"results": results}, 200
 
 
 @admin.route("/admin/theses_data", methods=["GET", "POST"])
@@ -467,6 +524,11 @@ def theses_data():
             )
         )
 
+    # status filter (materialized latest status, indexed)
+    status = request.args.get("status")
+    if status:
+        stmt = stmt.where(Thesis.current_status == status)
+
     # sorting
     sort = request.args.get("sort")
     if sort:
@@ -512,6 +574,7 @@ def theses_data():
                 "level": thesis.level,
                 "author_cdl": author.cdl if author else None,
                 "assigned": "True" if author else "False",
+                "status": thesis.current_status,
             }
             for thesis, author in results
         ],
@@ -803,11 +866,7 @@ def thesis_detail(thesis_id):
         Thesis_Interest.created_at.desc()
     ).all()
     
-    # Get all students and supervisors for reassignment
-    students = User_mgmt.query.filter_by(user_type="student").all()
-    all_supervisors = User_mgmt.query.filter_by(user_type="supervisor").all()
-    
-    return render_template("/admin/thesis_detail.html", 
+    return render_template("admin/thesis_detail.html", 
                          current_user=current_user,
                          thesis=thesis,
                          author=author,
@@ -816,8 +875,6 @@ def thesis_detail(thesis_id):
                          tags=tags,
                          updates=updates,
                          interests=interests,
-                         students=students,
-                         all_supervisors=all_supervisors,
                          datetime=datetime.datetime)
 
 
@@ -979,7 +1036,7 @@ def add_thesis_tag():
     
     if tag and thesis_id:
         # Check if tag already exists
-        existing_tag = Thesis_Tag.query.filter_by(thesis_id=thesis_id, tag=tag).first()
+        existing_tag = find_thesis_tag(thesis_id, tag)
         if not existing_tag:
             new_tag = Thesis_Tag(
                 thesis_id=thesis_id,
@@ -1060,7 +1117,7 @@ def theses_settings():
         }
     }
     
-    return render_template("/admin/theses_settings.html", 
+    return render_template("admin/theses_settings.html", 
                          current_user=current_user, 
                          stats=stats)
 
@@ -1084,7 +1141,7 @@ def notify_settings():
         "pending_notifications": 0  # Placeholder for future implementation
     }
     
-    return render_template("/admin/notify_settings.html",
+    return render_template("admin/notify_settings.html",
                          current_user=current_user,
                          stats=stats)
 
@@ -1132,17 +1189,13 @@ def misc():
         "tag_stats": {}
     }
     
-    # Get popular tags
+    # Get popular tags (precomputed counts in the tag dictionary)
     try:
-        tag_counts = db.session.query(Thesis_Tag.tag, db.func.count(Thesis_Tag.tag))\
-            .group_by(Thesis_Tag.tag)\
-            .order_by(db.func.count(Thesis_Tag.tag).desc())\
-            .limit(10).all()
-        activity_summary["tag_stats"] = {tag: count for tag, count in tag_counts}
+        activity_summary["tag_stats"] = {row["name"]: row["count"] for row in tag_facets(limit=10, public=False)}
     except Exception:
         pass
     
-    return render_template("/admin/miscellanea.html",
+    return render_template("admin/miscellanea.html",
                          current_user=current_user,
                          system_info=system_info,
                          activity_summary=activity_summary,
@@ -1226,6 +1279,55 @@ def system_stats():
         return {"status": "error", "message": str(e)}, 500
 
 
+@admin.route("/admin/api/analytics/departments")
+@login_required
+def analytics_departments():
+    """Weekly activity and completion series per department, from the rollup tables"""
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    weeks = request.args.get("weeks", DEFAULT_SERIES_WEEKS, type=int)
+    return {
+        "status": "success",
+        "data": department_series(weeks, department=request.args.get("department") or None),
+        **get_rollup_status(),
+    }, 200
+
+
+@admin.route("/admin/api/analytics/supervisors")
+@login_required
+def analytics_supervisors():
+    """Supervisor workload over the last weeks, from the rollup tables"""
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    weeks = request.args.get("weeks", DEFAULT_SERIES_WEEKS, type=int)
+    return {"status": "success", "data": supervisors_overview(weeks), **get_rollup_status()}, 200
+
+
+@admin.route("/admin/api/analytics/rebuild", methods=["POST"])
+@login_required
+def analytics_rebuild():
+    """Bring the analytics rollups up to date now (full=1 rebuilds from scratch)"""
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    full = parse_bool(request.values.get("full"))
+    summary = build_rollups(full=full)
+    _audit_admin_action(
+        "analytics_rebuild",
+        "analytics",
+        status="success" if summary["success"] else "error",
+        details={"full": full},
+    )
+    if not summary["success"]:
+        return {"status": "error", "message": summary["error"]}, 500
+    return {"status": "success", "summary": summary}, 200
+
+
 @admin.route("/admin/api/export_data")
 @login_required
 def export_data():
@@ -1256,7 +1358,10 @@ def export_data():
         
         # Export theses
         theses_data = []
-        theses = Thesis.query.all()
+        theses_query = Thesis.query
+        if request.args.get("status"):
+            theses_query = theses_query.filter(Thesis.current_status == request.args["status"])
+        theses = theses_query.all()
         for thesis in theses:
             # Get author info
             author = User_mgmt.query.get(thesis.author_id) if thesis.author_id else None
@@ -1280,9 +1385,6 @@ def export_data():
             for tag in thesis_tags:
                 tags.append(tag.tag)
             
-            # Get latest status
-            latest_status = Thesis_Status.query.filter_by(thesis_id=thesis.id).order_by(Thesis_Status.updated_at.desc()).first()
-            
             theses_data.append({
                 "id": thesis.id,
                 "title": thesis.title,
@@ -1298,7 +1400,7 @@ def export_data():
                 } if author else None,
                 "supervisors": supervisors,
                 "tags": tags,
-                "status": latest_status.status if latest_status else None
+                "status": thesis.current_status
             })
         
         export_data = {
@@ -1360,7 +1462,10 @@ def export_data_csv():
             theses_writer = csv.writer(theses_csv)
             theses_writer.writerow(['ID', 'Title', 'Description', 'Level', 'Author', 'Author Email', 'Supervisors', 'Status', 'Frozen', 'Created At'])
             
-            theses = Thesis.query.all()
+            theses_query = Thesis.query
+            if request.args.get("status"):
+                theses_query = theses_query.filter(Thesis.current_status == request.args["status"])
+            theses = theses_query.all()
             for thesis in theses:
                 author = User_mgmt.query.get(thesis.author_id) if thesis.author_id else None
                 
@@ -1372,15 +1477,12 @@ def export_data_csv():
                     if supervisor:
                         supervisors.append(f"{supervisor.name} {supervisor.surname}")
                 
-                # Get latest status
-                latest_status = Thesis_Status.query.filter_by(thesis_id=thesis.id).order_by(Thesis_Status.updated_at.desc()).first()
-                
                 theses_writer.writerow([
                     thesis.id, thesis.title, thesis.description, thesis.level,
                     f"{author.name} {author.surname}" if author else "Unassigned",
                     author.email if author else "",
                     "; ".join(supervisors),
-                    latest_status.status if latest_status else "No status",
+                    thesis.current_status or "No status",
                     thesis.frozen,
                     datetime.datetime.fromtimestamp(thesis.created_at).isoformat() if thesis.created_at else ''
                 ])
@@ -1400,6 +1502,72 @@ def export_data_csv():
 
 
 # Miscellanea functionality endpoints
+def _run_bulk_import(kind):
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return {"status": "error", "message": "No import file provided"}, 400
+    try:
+        fmt = detect_format(upload.filename, request.form.get("format"))
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+
+    dry_run = parse_bool(request.form.get("dry_run"))
+    if kind == "users":
+        options = {"default_password": request.form.get("default_password") or None}
+    else:
+        options = {"publisher_id": current_user.id}
+    # Large imports outlive the request timeout; queue them for the background job runner
+    job_id = schedule_import(
+        kind, upload.stream, fmt, filename=upload.filename, created_by=current_user.id, dry_run=dry_run, **options
+    )
+
+    _audit_admin_action(
+        f"bulk_import_{kind}",
+        kind,
+        status="queued",
+        details={"filename": upload.filename, "dry_run": dry_run, "job_id": job_id},
+    )
+    return {
+        "status": "accepted",
+        "job_id": job_id,
+        "progress_url": url_for("admin.import_job_status", job_id=job_id),
+    }, 202
+
+
+@admin.route("/admin/import/users", methods=["POST"])
+@login_required
+def import_users_file():
+    """Bulk import users from an uploaded CSV or JSONL file"""
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+    return _run_bulk_import("users")
+
+
+@admin.route("/admin/import/theses", methods=["POST"])
+@login_required
+def import_theses_file():
+    """Bulk import theses from an uploaded CSV or JSONL file"""
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+    return _run_bulk_import("theses")
+
+
+@admin.route("/admin/import/jobs/<job_id>")
+@login_required
+def import_job_status(job_id):
+    """Progress and report of a background bulk import"""
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    job = get_import_job(job_id)
+    if job is None:
+        return {"status": "error", "message": "Job not found"}, 404
+    return {"status": "success", "job": job}, 200
+
+
 @admin.route("/admin/api/export_data_action", methods=["POST"])
 @login_required
 def export_data_action():
@@ -1571,6 +1739,7 @@ def notifications():
         return privilege_check
     
     # Get scheduler status
+    from superviseme.utils.task_scheduler import get_scheduler_status
     scheduler_status = get_scheduler_status()
     
     # Get all supervisors for testing
@@ -1578,7 +1747,8 @@ def notifications():
     
     return render_template("admin/notifications.html", 
                          scheduler_status=scheduler_status,
-                         supervisors=supervisors)
+                         supervisors=supervisors,
+                         datetime=datetime.datetime)
 
 
 @admin.route("/admin/notifications/trigger", methods=["POST"])
@@ -1592,6 +1762,7 @@ def trigger_notifications():
         return privilege_check
     
     try:
+        from superviseme.utils.task_scheduler import trigger_weekly_reports_now
         results = trigger_weekly_reports_now()
         flash(f"Weekly reports triggered successfully. Sent: {results.get('emails_sent', 0)}, Failed: {results.get('emails_failed', 0)}")
     except Exception as e:
@@ -1623,18 +1794,18 @@ def preview_notification(supervisor_id):
 
 
 
-@admin.route("/admin/search", methods=["POST"])
+@admin.route("/admin/search", methods=["GET", "POST"])
 @login_required
 def search():
     """
     Handle search requests from admin interface.
-    Search across users and theses.
+    Search across users, theses and the content of all theses and projects.
     """
     privilege_check = check_privileges(current_user.username, role="admin")
     if privilege_check is not True:
         return privilege_check
     
-    search_term = request.form.get("search_term", "").strip()
+    search_term = request.values.get("search_term", "").strip()
     
     # Validate search term
     if not search_term:
@@ -1654,7 +1825,7 @@ def search():
                 User_mgmt.email.ilike(f"%{search_term}%"),
                 User_mgmt.cdl.ilike(f"%{search_term}%")
             )
-        ).all()
+        ).limit(SEARCH_LIST_LIMIT).all()
     
     # Search for theses
     theses = []
@@ -1665,16 +1836,34 @@ def search():
                 Thesis.description.ilike(f"%{search_term}%"),
                 Thesis.level.ilike(f"%{search_term}%")
             )
-        ).all()
+        ).limit(SEARCH_LIST_LIMIT).all()
+
+    content = search_content(current_user, search_term, page=request.args.get("page", 1, type=int))
     
     return render_template("admin/search_results.html", 
                          users=users, 
                          theses=theses, 
+                         content=content,
                          search_term=search_term,
                          user_type="admin",
                          dt=datetime.datetime.fromtimestamp)
 
 
+@admin.route("/admin/api/search/rebuild", methods=["POST"])
+@login_required
+def rebuild_search():
+    """
+    Re-index all searchable content, e.g. after restoring a backup or bulk SQL changes
+    """
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    indexed = rebuild_search_index()
+    db.session.commit()
+    return {"indexed": indexed}, 200
+
+
 @admin.route("/admin/notifications/status")
 @login_required
 def notification_status():
@@ -1686,12 +1875,46 @@ def notification_status():
         return privilege_check
     
     try:
+        from superviseme.utils.task_scheduler import get_scheduler_status
         status = get_scheduler_status()
         return jsonify(status)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@admin.route("/admin/api/scheduler/runs")
+@login_required
+def scheduler_job_runs():
+    """
+    History of scheduled job runs with their duration and outcome
+    """
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    limit = min(request.args.get("limit", 50, type=int) or 50, 500)
+    from superviseme.utils.task_scheduler import get_job_runs
+    return {"runs": get_job_runs(job_id=request.args.get("job_id"), limit=limit)}, 200
+
+
+@admin.route("/admin/api/templates/render_times")
+@login_required
+def template_render_times():
+    """
+    Render count and timings per template in the worker answering the request
+    """
+    privilege_check = check_privileges(current_user.username, role="admin")
+    if privilege_check is not True:
+        return privilege_check
+
+    from superviseme.utils.template_cache import render_stats
+    return {
+        "pid": os.getpid(),
+        "cache_dir": current_app.config.get("TEMPLATE_CACHE_DIR"),
+        "templates": render_stats(current_app),
+    }, 200
+
+
 # Telegram Bot Configuration Routes
 
 @admin.route("/admin/telegram/config", methods=["GET", "POST"])
@@ -1724,9 +1947,14 @@ def telegram_config():
             config.webhook_url = data.get("webhook_url", "")
             config.is_active = data.get("is_active", True)
             config.notification_types = data.get("notification_types", "[]")
-            config.frequency_settings = data.get("frequency_settings", "{}")
+            config.frequency_settings = json.dumps(
+                parse_frequency_settings(data.get("frequency_settings", "{}"))
+            )
             
             db.session.commit()
+
+            from superviseme.utils.telegram_service import get_telegram_service
+            get_telegram_service().invalidate_config()
             
             return jsonify({"success": True, "message": "Telegram configuration saved successfully"})
             
@@ -1775,9 +2003,8 @@ def test_telegram_bot():
     try:
         from superviseme.utils.telegram_service import get_telegram_service
         service = get_telegram_service()
-        # Clear cached config to reload from database
-        service._config = None
-        service.bot = None
+        # Drop cached config/client so the test reflects the database state
+        service.invalidate_config()
         result = service.test_bot_connection()
         return jsonify(result)
     except Exception as e:
@@ -1,10 +1,11 @@
 from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app, session
 from flask_login import login_user, login_required, logout_user, login_manager, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy import or_
 from superviseme.models import User_mgmt, Thesis
 from superviseme import db, oauth
+from superviseme.utils.db_pool import pool_status
 from superviseme.utils.logging_config import log_login_attempt, log_logout, log_privilege_escalation_attempt
+from superviseme.utils.password_security import get_login_guard, hash_password
 import time
 import os
 from urllib.parse import urljoin
@@ -50,31 +51,45 @@ def index():
 
 @auth.route("/health")
 def health():
-    """Health check endpoint for monitoring"""
-    return {"status": "healthy", "service": "SuperviseMe"}, 200
+    """Health check endpoint for monitoring, with this worker's database pool usage"""
+    return {
+        "status": "healthy",
+        "service": "SuperviseMe",
+        "database": {"pool": pool_status(db.engine)},
+    }, 200
 
 
 @auth.route("/login")
 def login():
     google_enabled = bool(os.getenv("GOOGLE_CLIENT_ID"))
     orcid_enabled = bool(os.getenv("ORCID_CLIENT_ID"))
-    return render_template("/login.html", google_enabled=google_enabled, orcid_enabled=orcid_enabled)
+    return render_template("login.html", google_enabled=google_enabled, orcid_enabled=orcid_enabled)
 
 
 @auth.route("/login", methods=["POST"])
 def login_post():
     if request.method == "GET":
-        return render_template("/login.html")
+        return render_template("login.html")
     # login code goes here
     email = request.form.get("email")
     password = request.form.get("password")
     remember = True if request.form.get("remember") else False
 
+    guard = get_login_guard()
+    limited = guard.check_rate_limit(request.remote_addr, email)
+    if limited:
+        log_login_attempt(email or 'unknown', False, request.remote_addr, details=f"Rate limited ({limited})")
+        flash("Too many login attempts. Please wait a few minutes and try again.")
+        return login(), 429
+
     user = User_mgmt.query.filter_by(email=email).first()
 
     # check if the user actually exists,
-    # take the user-supplied password, hash it, and compare it to the hashed password in the database
-    if not user or not check_password_hash(user.password, password):
+    # take the user-supplied password, hash it, and compare it to the hashed password in the database.
+    password_ok = bool(user) and guard.verify_and_upgrade(user, password or "")
+
+    if not password_ok:
+        guard.record_failure(email)
         # Log failed login attempt
         log_login_attempt(email or 'unknown', False, request.remote_addr)
         flash("Please check your login details and try again.")
@@ -82,6 +97,11 @@ def login_post():
             url_for("auth.login")
         )  # if the user doesn't exist or password is wrong, reload the page
 
+    guard.record_success(email)
+    if db.session.is_modified(user):
+        # Password was rehashed to the configured cost
+        db.session.commit()
+
     if not user.is_enabled:
         log_login_attempt(user.username, False, request.remote_addr, details="User disabled")
         flash("Your account is pending approval. Please wait for an admin to enable it.")
@@ -149,7 +169,7 @@ def google_callback():
             username=username,
             name=name,
             surname=surname,
-            password=generate_password_hash(password, method="pbkdf2:sha256"),
+            password=hash_password(password),
             user_type="student", # Default to student
             joined_on=int(time.time()),
             google_id=google_id,
@@ -260,7 +280,7 @@ def orcid_callback():
             username=username,
             name=given_name[:15], # Limit to 15 chars as per model
             surname=family_name[:15],
-            password=generate_password_hash(password, method="pbkdf2:sha256"),
+            password=hash_password(password),
             user_type="student", # Default to student
             joined_on=int(time.time()),
             orcid_id=orcid_id,
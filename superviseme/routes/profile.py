@@ -1,14 +1,15 @@
 from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, current_app, session
 from flask_login import login_required, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from superviseme.models import User_mgmt, Thesis, Thesis_Supervisor, OrcidActivity
 from superviseme import db, oauth
 import datetime
 import json
 from flask import make_response
-from superviseme.utils.orcid_client import fetch_orcid_activities
 from superviseme.utils.bibtex_generator import generate_bibtex
 from superviseme.utils.miscellanea import user_has_supervisor_role
+from superviseme.utils.telegram_digest import normalize_frequency
+from superviseme.utils.password_security import hash_password
 from urllib.parse import urljoin
 
 profile = Blueprint("profile", __name__)
@@ -48,7 +49,7 @@ def profile_page():
         supervised_rels = Thesis_Supervisor.query.filter_by(supervisor_id=current_user.id).all()
         supervised_theses = [Thesis.query.get(rel.thesis_id) for rel in supervised_rels if Thesis.query.get(rel.thesis_id)]
     
-    return render_template("/profile.html",
+    return render_template("profile.html",
                          user=current_user,
                          authored_theses=authored_theses,
                          supervised_theses=supervised_theses,
@@ -144,7 +145,7 @@ def change_password():
         return redirect(url_for("profile.profile_page"))
     
     # Update password
-    current_user.password = generate_password_hash(new_password, method="pbkdf2:sha256")
+    current_user.password = hash_password(new_password)
     db.session.commit()
     
     flash("Password changed successfully", "success")
@@ -155,13 +156,16 @@ def change_password():
 @login_required
 def sync_orcid():
     """
-    Sync activities from ORCID.
+    Sync activities from ORCID. A "full" form value re-reads every section
+    even when ORCID reports it unchanged.
     """
     if not current_user.orcid_id:
         flash("Please link your ORCID account first.", "error")
         return redirect(url_for("profile.orcid_publications"))
 
-    result = fetch_orcid_activities(current_user)
+    from superviseme.utils.orcid_client import fetch_orcid_activities
+    force = request.form.get("full", "").lower() in ("1", "true", "on")
+    result = fetch_orcid_activities(current_user, force=force)
 
     if result["success"]:
         flash(result["message"], "success")
@@ -223,6 +227,9 @@ def telegram_config():
             # Handle notification types
             notification_types = data.get("notification_types", [])
             current_user.telegram_notification_types = json.dumps(notification_types)
+
+            # Empty frequency means "follow the global default"
+            current_user.telegram_frequency = normalize_frequency(data.get("telegram_frequency"))
             
             db.session.commit()
             
@@ -252,7 +259,8 @@ def telegram_config():
             "config": {
                 "telegram_user_id": current_user.telegram_user_id or "",
                 "telegram_enabled": current_user.telegram_enabled,
-                "notification_types": notification_types
+                "notification_types": notification_types,
+                "telegram_frequency": current_user.telegram_frequency or ""
             }
         })
 
@@ -275,9 +283,6 @@ def verify_telegram():
         
         from superviseme.utils.telegram_service import get_telegram_service
         service = get_telegram_service()
-        # Ensure latest admin config/token is used.
-        service.bot = None
-        service._bot_token = None
         result = service.verify_user_chat(telegram_user_id)
         
         if result["success"]:
@@ -310,9 +315,6 @@ def test_telegram():
         from superviseme.utils.telegram_service import get_telegram_service
 
         service = get_telegram_service()
-        # Ensure latest admin config/token is used.
-        service.bot = None
-        service._bot_token = None
         result = service.send_notification(
             current_user.id,
             "test",
@@ -348,9 +350,6 @@ def telegram_bot_info():
         from superviseme.utils.telegram_service import get_telegram_service
 
         service = get_telegram_service()
-        # Ensure latest admin config/token is used.
-        service.bot = None
-        service._bot_token = None
         info = service.get_bot_info()
 
         if not info:
@@ -1,103 +1,57 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, render_template, request, url_for
 from flask_login import current_user
-from sqlalchemy import or_
 
 from superviseme.models import Thesis, Thesis_Interest, Thesis_Supervisor, Thesis_Tag, User_mgmt
+from superviseme.utils.tags import DEFAULT_SUGGESTIONS, MATCH_ANY, suggest_tags
+from superviseme.utils.thesis_catalogue import FACETS, parse_catalogue_query, search_catalogue
 
 public = Blueprint("public", __name__)
 
 
-def _normalize_query(value):
-    return (value or "").strip()
+def _catalogue_url(query, facet=None, value=None):
+    """Catalogue URL for the current filters, with value toggled in facet"""
+    args = {"q": query.q, "keywords": query.keywords}
+    if query.match != MATCH_ANY:
+        args["match"] = query.match
+    for name in FACETS:
+        values = list(query.selected.get(name, ()))
+        if name == facet:
+            values = [v for v in values if v != value] if value in values else values + [value]
+        args[name] = values
+    return url_for("public.public_thesis_dashboard", **{key: val for key, val in args.items() if val})
 
 
 @public.route("/theses")
 def public_thesis_dashboard():
-    q = _normalize_query(request.args.get("q"))
-    supervisor = _normalize_query(request.args.get("supervisor"))
-    topic = _normalize_query(request.args.get("topic"))
-    keywords = _normalize_query(request.args.get("keywords"))
-
-    query = (
-        Thesis.query.filter(
-            Thesis.is_public.is_(True),
-            Thesis.author_id.is_(None),
-            Thesis.frozen.is_(False),
-        )
-        .outerjoin(Thesis_Supervisor, Thesis_Supervisor.thesis_id == Thesis.id)
-        .outerjoin(User_mgmt, User_mgmt.id == Thesis_Supervisor.supervisor_id)
-        .outerjoin(Thesis_Tag, Thesis_Tag.thesis_id == Thesis.id)
-    )
-
-    if q:
-        like_q = f"%{q}%"
-        query = query.filter(
-            or_(
-                Thesis.title.ilike(like_q),
-                Thesis.short_description.ilike(like_q),
-                Thesis.long_description.ilike(like_q),
-                Thesis.description.ilike(like_q),
-                Thesis.topic.ilike(like_q),
-                Thesis.prerequisites.ilike(like_q),
-                User_mgmt.name.ilike(like_q),
-                User_mgmt.surname.ilike(like_q),
-                Thesis_Tag.tag.ilike(like_q),
-            )
-        )
-
-    if supervisor:
-        like_supervisor = f"%{supervisor}%"
-        query = query.filter(
-            or_(
-                User_mgmt.name.ilike(like_supervisor),
-                User_mgmt.surname.ilike(like_supervisor),
-                (User_mgmt.name + " " + User_mgmt.surname).ilike(like_supervisor),
-            )
-        )
-
-    if topic:
-        query = query.filter(Thesis.topic.ilike(f"%{topic}%"))
-
-    if keywords:
-        keyword_terms = [k.strip() for k in keywords.split(",") if k.strip()]
-        if keyword_terms:
-            query = query.filter(
-                or_(*[Thesis_Tag.tag.ilike(f"%{term}%") for term in keyword_terms])
-            )
-
-    theses = query.order_by(Thesis.created_at.desc()).distinct().all()
-
-    # Preload related info for rendering without N+1 in templates.
-    thesis_ids = [th.id for th in theses]
-    supervisors_by_thesis = {th_id: [] for th_id in thesis_ids}
-    tags_by_thesis = {th_id: [] for th_id in thesis_ids}
-
-    if thesis_ids:
-        supervisor_rows = (
-            Thesis_Supervisor.query.join(User_mgmt, User_mgmt.id == Thesis_Supervisor.supervisor_id)
-            .filter(Thesis_Supervisor.thesis_id.in_(thesis_ids))
-            .all()
-        )
-        for row in supervisor_rows:
-            supervisors_by_thesis.setdefault(row.thesis_id, []).append(row.supervisor)
-
-        for tag in Thesis_Tag.query.filter(Thesis_Tag.thesis_id.in_(thesis_ids)).all():
-            tags_by_thesis.setdefault(tag.thesis_id, []).append(tag.tag)
+    # Served from the in-memory catalogue index (superviseme.utils.thesis_catalogue)
+    query = parse_catalogue_query(request.args)
+    page = search_catalogue(query)
+    for facet, values in page.facets.items():
+        for item in values:
+            item["url"] = _catalogue_url(query, facet, item["value"])
 
     return render_template(
         "public/theses_dashboard.html",
-        theses=theses,
-        supervisors_by_thesis=supervisors_by_thesis,
-        tags_by_thesis=tags_by_thesis,
+        theses=page.theses,
+        supervisors_by_thesis=page.supervisors_by_thesis,
+        tags_by_thesis=page.tags_by_thesis,
+        facets=page.facets,
         filters={
-            "q": q,
-            "supervisor": supervisor,
-            "topic": topic,
-            "keywords": keywords,
+            "q": query.q,
+            "keywords": query.keywords,
+            "match": query.match,
+            "selected": query.selected,
         },
     )
 
 
+@public.route("/theses/api/tags")
+def public_tag_suggestions():
+    """Keyword autocomplete for the catalogue: tags in use by public theses, by prefix"""
+    limit = request.args.get("limit", DEFAULT_SUGGESTIONS, type=int)
+    return {"results": suggest_tags(request.args.get("q", ""), limit=limit)}, 200
+
+
 @public.route("/theses/<int:thesis_id>")
 def public_thesis_detail(thesis_id):
     thesis = Thesis.query.filter_by(
@@ -3,6 +3,7 @@ from flask_login import login_required, current_user
 from sqlalchemy import select, and_, func, or_
 from superviseme.utils.miscellanea import check_privileges, user_has_supervisor_role
 from superviseme.utils.thesis_management import delete_thesis_with_dependencies
+from superviseme.utils.cascade_delete import delete_records
 from superviseme.utils.thesis_interest import (
     accept_interest_and_close_others,
     close_interests_after_direct_assignment,
@@ -15,8 +16,10 @@ from superviseme.utils.thesis_public import (
 )
 from superviseme.models import *
 from superviseme import db
+from superviseme.utils.password_security import hash_password
+from superviseme.utils.search_index import SEARCH_LIST_LIMIT, search_content
+from superviseme.utils.tags import find_update_tag
 from datetime import datetime
-from werkzeug.security import generate_password_hash
 import time
 
 researcher = Blueprint("researcher", __name__)
@@ -190,15 +193,13 @@ def delete_project(project_id):
         return jsonify({"status": "error", "message": "Project not found or access denied"}), 404
 
     try:
-        # Remove collaborators first
-        ResearchProject_Collaborator.query.filter_by(project_id=project_id).delete()
-        
-        # Remove the project
-        db.session.delete(project)
+        # Collaborators, updates, todos, notes and their cross-references go with it
+        delete_records(ResearchProject, [project_id])
         db.session.commit()
 
         return jsonify({"status": "success", "message": "Project deleted successfully"})
     except Exception as e:
+        db.session.rollback()
         return jsonify({"status": "error", "message": f"Error deleting project: {e}"}), 500
 
 
@@ -344,9 +345,6 @@ def project_detail(project_id):
     # Get recent todos (last 5)
     recent_todos = ResearchProject_Todo.query.filter_by(project_id=project_id).order_by(ResearchProject_Todo.created_at.desc()).limit(5).all()
 
-    # Get current status
-    current_status = ResearchProject_Status.query.filter_by(project_id=project_id).order_by(ResearchProject_Status.updated_at.desc()).first()
-
     return render_template(
         "researcher/project_detail.html",
         current_user=current_user,
@@ -363,7 +361,6 @@ def project_detail(project_id):
         meeting_notes_count=meeting_notes_count,
         recent_updates=recent_updates,
         recent_todos=recent_todos,
-        current_status=current_status,
         datetime=datetime,
         dt=datetime.fromtimestamp
     )
@@ -517,19 +514,10 @@ def supervisor_theses():
     thesis_supervisors = Thesis_Supervisor.query.filter_by(supervisor_id=current_user.id).all()
     theses = [ts.thesis for ts in thesis_supervisors]
 
-    # Get all available students for assignment dropdown (students without active thesis assignments)
-    available_students = User_mgmt.query.filter(
-        User_mgmt.user_type == "student",
-        ~User_mgmt.id.in_(
-            db.session.query(Thesis.author_id).filter(Thesis.author_id.isnot(None))
-        )
-    ).all()
-
     return render_template(
         "researcher/supervisor_theses.html",
         current_user=current_user,
         theses=theses,
-        available_students=available_students,
         has_supervisor_role=True,
         datetime=datetime,
         dt=datetime.fromtimestamp,
@@ -583,14 +571,6 @@ def supervisor_thesis_detail(thesis_id):
         Thesis_Interest.created_at.desc()
     ).all()
     
-    # Get available students for assignment (only students without active thesis assignments)
-    available_students = User_mgmt.query.filter(
-        User_mgmt.user_type == "student",
-        ~User_mgmt.id.in_(
-            db.session.query(Thesis.author_id).filter(Thesis.author_id.isnot(None))
-        )
-    ).all()
-    
     # Get meeting notes for this thesis
     meeting_notes = MeetingNote.query.filter_by(thesis_id=thesis_id).order_by(MeetingNote.created_at.desc()).all()
 
@@ -607,7 +587,6 @@ def supervisor_thesis_detail(thesis_id):
         supervisors=supervisors,
         thesis_tags=thesis_tags,
         interests=interests,
-        available_students=available_students,
         meeting_notes=meeting_notes,
         has_supervisor_role=True,
         datetime=datetime,
@@ -781,7 +760,7 @@ def tag_update():
             for tag in tags.split(','):
                 tag = tag.strip()
                 if tag:
-                    existing_tag = Update_Tag.query.filter_by(update_id=update_id, tag=tag).first()
+                    existing_tag = find_update_tag(update_id, tag)
                     if not existing_tag:
                         new_tag = Update_Tag(
                             update_id=update_id,
@@ -1567,7 +1546,7 @@ def create_student():
             name=name,
             surname=surname,
             email=email,
-            password=generate_password_hash(password, method='pbkdf2:sha256'),
+            password=hash_password(password),
             user_type="student",
             cdl=cdl,
             gender=gender,
@@ -1623,7 +1602,7 @@ def edit_student(student_id):
         # Update password if provided
         new_password = request.form.get("password")
         if new_password:
-            student.password = generate_password_hash(new_password, method='pbkdf2:sha256')
+            student.password = hash_password(new_password)
         
         db.session.commit()
         flash("Student updated successfully")
@@ -1663,14 +1642,9 @@ def delete_student(student_id):
         return redirect(url_for("researcher.supervisor_students"))
 
     try:
-        theses = Thesis.query.filter_by(author_id=student_id).all()
-        for thesis in theses:
-            success, error = delete_thesis_with_dependencies(thesis.id)
-            if not success:
-                flash(f"Error deleting thesis '{thesis.title}': {error}")
-                return redirect(url_for("researcher.supervisor_students"))
-
-        db.session.delete(student)
+        thesis_ids = db.session.scalars(select(Thesis.id).where(Thesis.author_id == student_id)).all()
+        delete_records(Thesis, thesis_ids)
+        delete_records(User_mgmt, [student_id])
         db.session.commit()
         flash("Student and associated data deleted successfully")
     except Exception as e:
@@ -2026,30 +2000,26 @@ def remove_meeting_note_reference(note_id, reference_id):
     return redirect(url_for("researcher.supervisor_meeting_note_detail", note_id=note_id))
 
 
-@researcher.route("/researcher/supervisor/search", methods=["POST"])
+@researcher.route("/researcher/supervisor/search", methods=["GET", "POST"])
 @login_required
 def supervisor_search():
     """
-    Handle searching for theses or supervisees within researcher context
+    Handle searching for theses or supervisees within researcher context, and
+    for the content of the researcher's projects and supervised theses
     """
     privilege_check = check_privileges(current_user.username, role="researcher")
     if privilege_check is not True:
         return privilege_check
     
-    # Check if researcher has supervisor privileges
-    supervisor_role = Supervisor_Role.query.filter_by(
-        researcher_id=current_user.id, active=True
-    ).first()
-    if not supervisor_role:
-        flash("You need supervisor privileges to access this feature.")
-        return redirect(url_for("researcher.dashboard"))
+    # Theses and supervisees need supervisor privileges; project content does not
+    is_supervisor = user_has_supervisor_role(current_user)
     
-    search_term = request.form.get("search_term", "").strip()
+    search_term = request.values.get("search_term", "").strip()
 
     # Validate search term
     if not search_term:
         flash("Please enter a search term.", "warning")
-        return redirect(url_for('researcher.supervisor_dashboard'))
+        return redirect(url_for('researcher.supervisor_dashboard' if is_supervisor else 'researcher.dashboard'))
 
     # Search for theses supervised by current user
     thesis_supervisors = Thesis_Supervisor.query.filter_by(supervisor_id=current_user.id).all()
@@ -2058,7 +2028,7 @@ def supervisor_search():
     theses = []
     supervisees = []
     
-    if search_term:
+    if search_term and is_supervisor:
         # Search for supervised theses
         theses = Thesis.query.filter(
             and_(
@@ -2069,7 +2039,7 @@ def supervisor_search():
                     Thesis.level.ilike(f"%{search_term}%")
                 )
             )
-        ).all()
+        ).limit(SEARCH_LIST_LIMIT).all()
 
         # Search for supervisees (students with supervised theses)
         supervised_student_ids = [thesis.author_id for thesis in Thesis.query.filter(Thesis.id.in_(supervised_thesis_ids)).all() if thesis.author_id]
@@ -2083,13 +2053,17 @@ def supervisor_search():
                     User_mgmt.email.ilike(f"%{search_term}%")
                 )
             )
-        ).all()
+        ).limit(SEARCH_LIST_LIMIT).all()
+
+    content = search_content(current_user, search_term, page=request.args.get("page", 1, type=int))
 
     return render_template("researcher/supervisor_search_results.html", 
                          theses=theses, 
                          supervisees=supervisees,
+                         content=content,
                          search_term=search_term,
-                         user_type="researcher")
+                         user_type="researcher",
+                         dt=datetime.fromtimestamp)
 
 
 # ============================================================================
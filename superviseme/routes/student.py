@@ -1,15 +1,20 @@
 from flask import Blueprint, request, render_template, redirect, url_for, jsonify, flash
 from flask_login import login_required, current_user
-from sqlalchemy import and_, or_
 from superviseme.utils.miscellanea import check_privileges
 from superviseme.utils.activity_tracker import update_user_activity
 from superviseme.models import *
 from superviseme import db
+from superviseme.utils.search_index import search_content
+from superviseme.utils.tags import find_update_tag
+from superviseme.utils.todo_queries import TodoFilters, query_todos, todo_page_response, todo_summary
 from datetime import datetime
 import time
 
 student = Blueprint("student", __name__)
 
+# Todo statuses shown on the dashboard
+OPEN_TODO_STATUSES = ("pending", "cancelled")
+
 
 @student.route("/student/express_interest/<int:thesis_id>", methods=["POST"])
 @login_required
@@ -115,12 +120,9 @@ def dashboard():
             thesis_id=thesis.id
         ).order_by(Thesis_Update.created_at.desc()).limit(5).all()
         
-        # Get todos for the thesis
-        todos = Todo.query.filter_by(thesis_id=thesis.id).order_by(
-            Todo.status.asc(),  # pending first
-            Todo.priority.desc(),  # high priority first
-            Todo.created_at.desc()
-        ).all()
+        # Open todos for the thesis, most urgent first
+        todos = query_todos([thesis.id], TodoFilters(statuses=OPEN_TODO_STATUSES)).todos
+        todo_counts = todo_summary([thesis.id])[thesis.id]
         
         # Get supervisor info for todo assignment
         supervisor_info = None
@@ -135,6 +137,7 @@ def dashboard():
         }
         recent_updates = []
         todos = []
+        todo_counts = None
         supervisor_info = None
         
     return render_template("student/student_dashboard.html", 
@@ -142,6 +145,7 @@ def dashboard():
                          thesis_stats=thesis_stats,
                          recent_updates=recent_updates,
                          todos=todos,
+                         todo_counts=todo_counts,
                          supervisor_info=supervisor_info,
                          dt=datetime.fromtimestamp)
 
@@ -200,8 +204,15 @@ def thesis_data():
     objectives = Thesis_Objective.query.filter_by(thesis_id=thesis.id).order_by(Thesis_Objective.created_at.desc()).all()
     hypotheses = Thesis_Hypothesis.query.filter_by(thesis_id=thesis.id).order_by(Thesis_Hypothesis.created_at.desc()).all()
     
-    # Get todos
-    todos = Todo.query.filter_by(thesis_id=thesis.id).order_by(Todo.created_at.desc()).all()
+    # One page of todos, most urgent first, and the thesis' todo counts
+    try:
+        todo_page = query_todos([thesis.id], after=request.args.get("after"))
+    except ValueError:
+        todo_page = query_todos([thesis.id])
+    todo_counts = todo_summary([thesis.id])[thesis.id]
+    next_todos_url = None
+    if todo_page.next_cursor:
+        next_todos_url = url_for("student.thesis_data", after=todo_page.next_cursor, _anchor="todos")
     
     # Get meeting notes
     meeting_notes = MeetingNote.query.filter_by(thesis_id=thesis.id).order_by(MeetingNote.created_at.desc()).all()
@@ -212,10 +223,31 @@ def thesis_data():
     return render_template("student/thesis.html", thesis=thesis, supervisors=supervisors,
                            tags=tags, updates=updates, parent_updates=parent_updates,
                            comments_by_parent=comments_by_parent, resources=resources, 
-                           objectives=objectives, hypotheses=hypotheses, todos=todos, 
+                           objectives=objectives, hypotheses=hypotheses, todos=todo_page.todos,
+                           todo_counts=todo_counts, next_todos_url=next_todos_url,
                            meeting_notes=meeting_notes, thesis_statuses=thesis_statuses, dt=datetime.fromtimestamp)
 
 
+@student.route("/student/api/todos")
+@login_required
+def list_todos():
+    """
+    Todos of the student's thesis, filtered by status, priority, assignee and
+    overdue and paged with the after cursor, with the thesis' todo counts
+    """
+    privilege_check = check_privileges(current_user.username, role="student")
+    if privilege_check is not True:
+        return privilege_check
+
+    thesis_ids = db.session.execute(
+        db.select(Thesis.id).where(Thesis.author_id == current_user.id)
+    ).scalars().all()
+    try:
+        return todo_page_response(thesis_ids, request.args), 200
+    except ValueError:
+        return {"error": "invalid cursor"}, 400
+
+
 @student.route("/student/post_update", methods=["POST"])
 @login_required
 def post_update():
@@ -461,7 +493,7 @@ def remove_update_tag():
     ).first()
     
     if update:
-        update_tag = Update_Tag.query.filter_by(update_id=update_id, tag=tag).first()
+        update_tag = find_update_tag(update_id, tag)
         if update_tag:
             db.session.delete(update_tag)
             db.session.commit()
@@ -813,18 +845,19 @@ def toggle_todo(todo_id):
     return redirect(url_for('student.dashboard'))
 
 
-@student.route("/student/search", methods=["POST"])
+@student.route("/student/search", methods=["GET", "POST"])
 @login_required
 def search():
     """
     Handle search requests from student interface.
-    Search within student's thesis context.
+    Full-text search over the updates, meeting notes, todos, objectives,
+    hypotheses and resources of the student's thesis.
     """
     privilege_check = check_privileges(current_user.username, role="student")
     if privilege_check is not True:
         return privilege_check
     
-    search_term = request.form.get("search_term", "").strip()
+    search_term = request.values.get("search_term", "").strip()
     
     # Validate search term
     if not search_term:
@@ -836,50 +869,11 @@ def search():
     # Get student's thesis
     thesis = Thesis.query.filter_by(author_id=current_user.id).first()
     
-    # Search for updates and resources within student's thesis
-    updates = []
-    resources = []
-    todos = []
-    
-    if search_term and thesis:
-        # Search in thesis updates
-        updates = Thesis_Update.query.filter(
-            and_(
-                Thesis_Update.thesis_id == thesis.id,
-                or_(
-                    Thesis_Update.content.ilike(f"%{search_term}%"),
-                    Thesis_Update.update_type.ilike(f"%{search_term}%")
-                )
-            )
-        ).all()
-        
-        # Search in thesis resources
-        resources = Resource.query.filter(
-            and_(
-                Resource.thesis_id == thesis.id,
-                or_(
-                    Resource.description.ilike(f"%{search_term}%"),
-                    Resource.resource_url.ilike(f"%{search_term}%"),
-                    Resource.resource_type.ilike(f"%{search_term}%")
-                )
-            )
-        ).all()
-        
-        # Search in todos
-        todos = Todo.query.filter(
-            and_(
-                Todo.thesis_id == thesis.id,
-                or_(
-                    Todo.title.ilike(f"%{search_term}%"),
-                    Todo.description.ilike(f"%{search_term}%")
-                )
-            )
-        ).all()
+    # Scoped to the student's thesis inside the query
+    content = search_content(current_user, search_term, page=request.args.get("page", 1, type=int))
     
     return render_template("student/search_results.html", 
-                         updates=updates, 
-                         resources=resources, 
-                         todos=todos,
+                         content=content,
                          thesis=thesis,
                          search_term=search_term,
                          user_type="student",
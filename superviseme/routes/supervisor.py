@@ -5,6 +5,8 @@ from sqlalchemy.orm import joinedload
 from superviseme.utils.miscellanea import check_privileges
 from superviseme.utils.activity_tracker import get_inactive_students
 from superviseme.utils.thesis_management import delete_thesis_with_dependencies
+from superviseme.utils.cascade_delete import delete_records
+from superviseme.utils.analytics_rollups import DEFAULT_SERIES_WEEKS, get_rollup_status, supervisor_series
 from superviseme.utils.thesis_interest import (
     accept_interest_and_close_others,
     close_interests_after_direct_assignment,
@@ -17,8 +19,18 @@ from superviseme.utils.thesis_public import (
 )
 from superviseme.models import *
 from superviseme import db
+from superviseme.utils.password_security import hash_password
+from superviseme.utils.user_search import cached_search_users, typeahead_args
+from superviseme.utils.search_index import SEARCH_LIST_LIMIT, search_content
+from superviseme.utils.tags import find_thesis_tag, find_update_tag
+from superviseme.utils.todo_queries import (
+    parse_todo_filters,
+    query_todos,
+    todo_page_response,
+    todo_summary,
+    todo_totals,
+)
 from datetime import datetime
-from werkzeug.security import generate_password_hash
 import time
 
 supervisor = Blueprint("supervisor", __name__)
@@ -73,26 +85,29 @@ def dashboard():
 
         ).scalars().all()
 
-    # Get todos for supervised theses
+    # First page of todos for supervised theses, plus per-thesis counts
     supervised_thesis_ids = [ts.thesis_id for ts in thesis_supervisors]
-    todos = []
-    students_info = {}
-    if supervised_thesis_ids:
-        todos = Todo.query.filter(Todo.thesis_id.in_(supervised_thesis_ids)).order_by(
-            Todo.status.asc(),  # pending first
-            Todo.priority.desc(),  # high priority first
-            Todo.created_at.desc()
-        ).all()
-        
-        # Get student information for each thesis
-        for ts in theses_by_supervisor:
-            if ts["student"]:
-                students_info[ts["thesis"].id] = ts["student"]
+    todo_filters = parse_todo_filters(request.args)
+    try:
+        todo_page = query_todos(supervised_thesis_ids, todo_filters, after=request.args.get("after"))
+    except ValueError:
+        todo_page = query_todos(supervised_thesis_ids, todo_filters)
+    todo_counts = todo_summary(supervised_thesis_ids)
+
+    # Get student information for each thesis
+    students_info = {ts["thesis"].id: ts["student"] for ts in theses_by_supervisor if ts["student"]}
+
+    next_todos_url = None
+    if todo_page.next_cursor:
+        next_todos_url = url_for("supervisor.dashboard", **{**request.args.to_dict(), "after": todo_page.next_cursor},
+                                 _anchor="todos")
 
-    return render_template("/supervisor/supervisor_dashboard.html", current_user=current_user,
+    return render_template("supervisor/supervisor_dashboard.html", current_user=current_user,
                            user_counts=user_counts, thesis_counts=thesis_counts,
                            theses_by_supervisor=theses_by_supervisor, available_theses=available_theses_by_supervisor, 
-                           todos=todos, students_info=students_info, dt=datetime.fromtimestamp, str=str)
+                           todos=todo_page.todos, todo_counts=todo_counts, todo_totals=todo_totals(todo_counts),
+                           next_todos_url=next_todos_url, students_info=students_info,
+                           dt=datetime.fromtimestamp, str=str)
 
 @supervisor.route("/supervisor/supervisee")
 @login_required
@@ -199,14 +214,6 @@ def thesis_detail(thesis_id):
     objectives = Thesis_Objective.query.filter_by(thesis_id=thesis_id).order_by(Thesis_Objective.created_at.desc()).all()
     hypotheses = Thesis_Hypothesis.query.filter_by(thesis_id=thesis_id).order_by(Thesis_Hypothesis.created_at.desc()).all()
 
-    # Get all students for assignment dropdown (only students without active thesis assignments)
-    available_students = User_mgmt.query.filter(
-        User_mgmt.user_type == "student",
-        ~User_mgmt.id.in_(
-            db.session.query(Thesis.author_id).filter(Thesis.author_id.isnot(None))
-        )
-    ).all()
-
     # Get todos for this thesis for reference dropdown
     todos = Todo.query.filter_by(thesis_id=thesis_id).order_by(Todo.created_at.desc()).all()
     
@@ -216,11 +223,46 @@ def thesis_detail(thesis_id):
     return render_template("supervisor/thesis_detail.html", thesis=thesis, updates=updates,
                            supervisors=supervisors, author=author, objectives=objectives, 
                            hypotheses=hypotheses, thesis_tags=thesis_tags, resources=resources,
-                           available_students=available_students, todos=todos, meeting_notes=meeting_notes,
+                           todos=todos, meeting_notes=meeting_notes,
                            interests=interests,
                            dt=datetime.fromtimestamp)
 
 
+@supervisor.route("/supervisor/api/students/search")
+@login_required
+def search_students_typeahead():
+    """
+    Typeahead candidates for assigning a thesis: students without a thesis
+    whose name, surname or username start with q
+    """
+    privilege_check = check_privileges(current_user.username, role="supervisor")
+    if privilege_check is not True:
+        return privilege_check
+
+    results = cached_search_users(roles=("student",), assignment="unassigned", **typeahead_args(request.args))
+    return {"results": results}, 200
+
+
+@supervisor.route("/supervisor/api/todos")
+@login_required
+def list_todos():
+    """
+    Todos of the supervised theses, filtered by status, priority, assignee,
+    overdue and thesis and paged with the after cursor, with per-thesis counts
+    """
+    privilege_check = check_privileges(current_user.username, role="supervisor")
+    if privilege_check is not True:
+        return privilege_check
+
+    thesis_ids = db.session.execute(
+        select(Thesis_Supervisor.thesis_id).where(Thesis_Supervisor.supervisor_id == current_user.id)
+    ).scalars().all()
+    try:
+        return todo_page_response(thesis_ids, request.args), 200
+    except ValueError:
+        return {"error": "invalid cursor"}, 400
+
+
 @supervisor.route("/supervisor/post_update", methods=["POST"])
 @login_required
 def post_update():
@@ -451,7 +493,7 @@ def tag_thesis():
 
     tag_items = [t.strip() for t in tags.split(",") if t and t.strip()]
     for tag in tag_items:
-        existing = Thesis_Tag.query.filter_by(thesis_id=thesis_id, tag=tag).first()
+        existing = find_thesis_tag(thesis_id, tag)
         if not existing:
             db.session.add(Thesis_Tag(thesis_id=thesis_id, tag=tag))
 
@@ -510,7 +552,7 @@ def tag_update():
 
     tag_items = [t.strip() for t in tags.split(",") if t and t.strip()]
     for tag in tag_items:
-        existing = Update_Tag.query.filter_by(update_id=update_id, tag=tag).first()
+        existing = find_update_tag(update_id, tag)
         if not existing:
             db.session.add(Update_Tag(update_id=update_id, tag=tag))
 
@@ -809,18 +851,18 @@ def remove_thesis_supervisor():
     return theses_data()
 
 
-@supervisor.route("/supervisor/search", methods=["POST"])
+@supervisor.route("/supervisor/search", methods=["GET", "POST"])
 @login_required
 def search():
     """
-    This route handles searching for theses or supervisees. It retrieves the search term from the form,
-    performs a search in the database, and returns the results.
+    This route handles searching for theses, supervisees and the content of supervised theses.
+    It retrieves the search term from the form, performs a search in the database, and returns the results.
     """
     privilege_check = check_privileges(current_user.username, role="supervisor")
     if privilege_check is not True:
         return privilege_check
     
-    search_term = request.form.get("search_term", "").strip()
+    search_term = request.values.get("search_term", "").strip()
 
     # Validate search term
     if not search_term:
@@ -847,7 +889,7 @@ def search():
                     Thesis.level.ilike(f"%{search_term}%")
                 )
             )
-        ).all()
+        ).limit(SEARCH_LIST_LIMIT).all()
 
         # Search for supervisees (students with supervised theses)
         supervised_student_ids = [thesis.author_id for thesis in Thesis.query.filter(Thesis.id.in_(supervised_thesis_ids)).all() if thesis.author_id]
@@ -861,13 +903,17 @@ def search():
                     User_mgmt.email.ilike(f"%{search_term}%")
                 )
             )
-        ).all()
+        ).limit(SEARCH_LIST_LIMIT).all()
+
+    content = search_content(current_user, search_term, page=request.args.get("page", 1, type=int))
 
     return render_template("supervisor/search_results.html", 
                          theses=theses, 
                          supervisees=supervisees,
+                         content=content,
                          search_term=search_term,
-                         user_type="supervisor")
+                         user_type="supervisor",
+                         dt=datetime.fromtimestamp)
 
 
 @supervisor.route("/supervisor/freeze_updates", methods=["POST"])
@@ -1144,7 +1190,7 @@ def tag_student_update():
     
     if update and tag_text:
         # Check if tag already exists
-        existing_tag = Update_Tag.query.filter_by(update_id=update_id, tag=tag_text).first()
+        existing_tag = find_update_tag(update_id, tag_text)
         if not existing_tag:
             new_tag = Update_Tag(
                 update_id=update_id,
@@ -1339,7 +1385,7 @@ def create_student():
     new_student = User_mgmt(
         email=email,
         username=username,
-        password=generate_password_hash(password, method="pbkdf2:sha256"),
+        password=hash_password(password),
         name=name,
         surname=surname,
         cdl=cdl,
@@ -1394,7 +1440,7 @@ def edit_student(student_id):
         if new_password != password2:
             flash("Passwords do not match")
             return redirect(request.referrer)
-        student.password = generate_password_hash(new_password, method="pbkdf2:sha256")
+        student.password = hash_password(new_password)
     
     db.session.commit()
     flash(f"Student {student.name} {student.surname} updated successfully")
@@ -1466,14 +1512,13 @@ def delete_student(student_id):
         flash(f"Cannot delete student {student.name} {student.surname}. Student has active thesis assignments.")
         return redirect(url_for('supervisor.supervisee_data'))
     
+    student_name = f"{student.name} {student.surname}"
     try:
-        # Remove thesis assignments (set author_id to None for completed/frozen theses)
-        Thesis.query.filter_by(author_id=student_id).update({"author_id": None})
-        
-        # Delete the student
-        db.session.delete(student)
+        # Completed/frozen theses are kept with their author cleared; the student's
+        # interests, todos, notifications and other authored records are removed.
+        delete_records(User_mgmt, [student_id])
         db.session.commit()
-        flash(f"Student {student.name} {student.surname} deleted successfully")
+        flash(f"Student {student_name} deleted successfully")
     except Exception as e:
         db.session.rollback()
         flash(f"Error deleting student: {e}")
@@ -2089,3 +2134,21 @@ def delete_meeting_note(note_id):
     
     flash("Meeting note deleted successfully")
     return redirect(url_for('supervisor.thesis_detail', thesis_id=thesis_id))
+
+
+@supervisor.route("/supervisor/api/analytics")
+@login_required
+def workload_analytics():
+    """
+    Weekly workload series for the current supervisor, from the rollup tables
+    """
+    privilege_check = check_privileges(current_user.username, role="supervisor")
+    if privilege_check is not True:
+        return privilege_check
+
+    weeks = request.args.get("weeks", DEFAULT_SERIES_WEEKS, type=int)
+    return jsonify({
+        "status": "success",
+        "data": supervisor_series(current_user.id, weeks),
+        **get_rollup_status(),
+    })
@@ -0,0 +1,132 @@
+/**
+ * SuperviseMe Typeahead
+ * User pickers that fetch candidates as you type instead of listing every user
+ *
+ * Markup:
+ *   <div class="typeahead position-relative" data-typeahead-url="/admin/api/users/search"
+ *        data-typeahead-params="role=student" data-typeahead-required="true">
+ *       <input type="text" class="form-control typeahead-input" autocomplete="off">
+ *       <input type="hidden" name="student_id">
+ *       <div class="dropdown-menu typeahead-menu w-100"></div>
+ *   </div>
+ */
+
+const TYPEAHEAD_DELAY_MS = 200;
+const TYPEAHEAD_LIMIT = 10;
+
+$(document).ready(function() {
+    $('.typeahead').each(function() {
+        initTypeahead($(this));
+    });
+});
+
+function initTypeahead(widget) {
+    const input = widget.find('.typeahead-input');
+    const hidden = widget.find('input[type="hidden"]');
+    const menu = widget.find('.typeahead-menu');
+    let timer = null;
+    let requestSeq = 0;
+    let active = -1;
+
+    function hideMenu() {
+        menu.removeClass('show').empty();
+        active = -1;
+    }
+
+    function choose(item) {
+        input.val(item.data('label'));
+        hidden.val(item.data('id')).trigger('change');
+        input.removeClass('is-invalid');
+        hideMenu();
+    }
+
+    function highlight(index) {
+        const items = menu.find('.dropdown-item');
+        if (!items.length) {
+            return;
+        }
+        active = (index + items.length) % items.length;
+        items.removeClass('active').eq(active).addClass('active');
+    }
+
+    function render(results) {
+        menu.empty();
+        if (!results.length) {
+            menu.append($('<span class="dropdown-item-text text-muted small"></span>').text('No matches'));
+        }
+        results.forEach(function(user) {
+            $('<a class="dropdown-item" href="#"></a>')
+                .text(user.label)
+                .data({id: user.id, label: user.label})
+                .appendTo(menu);
+        });
+        menu.addClass('show');
+        active = -1;
+    }
+
+    function search(query) {
+        const seq = ++requestSeq;
+        const params = new URLSearchParams(widget.data('typeahead-params') || '');
+        params.set('q', query);
+        params.set('limit', TYPEAHEAD_LIMIT);
+        $.getJSON(widget.data('typeahead-url') + '?' + params.toString())
+            .done(function(data) {
+                // Ignore answers to keystrokes the user has already typed past
+                if (seq === requestSeq) {
+                    render(data.results || []);
+                }
+            })
+            .fail(function(xhr, status, error) {
+                console.error('Typeahead search failed:', error);
+            });
+    }
+
+    input.on('input', function() {
+        hidden.val('');
+        clearTimeout(timer);
+        const query = input.val().trim();
+        if (!query) {
+            requestSeq++;
+            hideMenu();
+            return;
+        }
+        timer = setTimeout(function() {
+            search(query);
+        }, TYPEAHEAD_DELAY_MS);
+    });
+
+    input.on('keydown', function(event) {
+        if (!menu.hasClass('show')) {
+            return;
+        }
+        if (event.key === 'ArrowDown') {
+            event.preventDefault();
+            highlight(active + 1);
+        } else if (event.key === 'ArrowUp') {
+            event.preventDefault();
+            highlight(active - 1);
+        } else if (event.key === 'Enter' && active >= 0) {
+            event.preventDefault();
+            choose(menu.find('.dropdown-item').eq(active));
+        } else if (event.key === 'Escape') {
+            hideMenu();
+        }
+    });
+
+    // mousedown fires before the input's blur hides the menu
+    menu.on('mousedown', '.dropdown-item', function(event) {
+        event.preventDefault();
+        choose($(this));
+    });
+
+    input.on('blur', function() {
+        hideMenu();
+    });
+
+    widget.closest('form').on('submit', function(event) {
+        if (widget.data('typeahead-required') && !hidden.val()) {
+            event.preventDefault();
+            input.addClass('is-invalid').focus();
+        }
+    });
+}
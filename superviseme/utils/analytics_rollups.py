@@ -0,0 +1,484 @@
+"""
+Analytics rollups for SuperviseMe
+Builds daily per-thesis and weekly per-supervisor/per-department aggregates
+incrementally from a high-water mark, and serves time series from them
+"""
+
+import datetime
+import logging
+import threading
+import time
+
+from sqlalchemy import and_, case, delete, distinct, func, insert, literal, or_, select
+
+from superviseme import db
+from superviseme.models import (
+    Analytics_Department_Weekly,
+    Analytics_Supervisor_Weekly,
+    Analytics_Thesis_Daily,
+    Analytics_Watermark,
+    Thesis,
+    Thesis_Status,
+    Thesis_Supervisor,
+    Thesis_Update,
+    Todo,
+    User_mgmt,
+)
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+WATERMARK_NAME = "rollups"
+
+# Each build also re-aggregates this much time before the previous build, so
+# rows written late (slow transactions, imports with past timestamps) are counted.
+LATE_EVENT_GRACE_SECONDS = DAY_SECONDS
+
+# A supervised, assigned, unfinished thesis with no update for this long counts as inactive
+INACTIVITY_DAYS = 14
+
+# Statuses that mark a thesis as finished, for time-to-completion
+COMPLETED_STATUSES = ("completed", "approved")
+CLOSED_TODO_STATUSES = ("completed", "cancelled")
+
+# Department of a thesis is its student's degree programme (user_mgmt.cdl)
+UNASSIGNED_DEPARTMENT = "unassigned"
+
+DEFAULT_SERIES_WEEKS = 12
+MAX_SERIES_WEEKS = 104
+
+INSERT_CHUNK_SIZE = 1000
+
+_build_lock = threading.Lock()
+
+
+def day_start(timestamp):
+    return int(timestamp) - int(timestamp) % DAY_SECONDS
+
+
+def week_start(timestamp):
+    """Monday 00:00 UTC of the week containing timestamp (1970-01-01 was a Thursday)"""
+    day = day_start(timestamp)
+    return day - ((day // DAY_SECONDS + 3) % 7) * DAY_SECONDS
+
+
+def _day_expr(column):
+    return column - column % DAY_SECONDS
+
+
+def _week_expr(day_column):
+    return day_column - ((day_column // DAY_SECONDS + 3) % 7) * DAY_SECONDS
+
+
+def _get_watermark():
+    row = db.session.get(Analytics_Watermark, WATERMARK_NAME)
+    return row.value if row else None
+
+
+def _set_watermark(value):
+    row = db.session.get(Analytics_Watermark, WATERMARK_NAME)
+    if row is None:
+        db.session.add(Analytics_Watermark(name=WATERMARK_NAME, value=value, updated_at=int(time.time())))
+    else:
+        row.value = value
+        row.updated_at = int(time.time())
+
+
+def _insert_rows(model, rows):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.session.execute(insert(model), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def _earliest_event():
+    candidates = [
+        db.session.scalar(select(func.min(Thesis_Update.created_at))),
+        db.session.scalar(select(func.min(Todo.created_at))),
+        db.session.scalar(select(func.min(Thesis_Status.updated_at))),
+    ]
+    candidates = [value for value in candidates if value is not None]
+    return min(candidates) if candidates else None
+
+
+def _rebuild_thesis_daily(since_day):
+    """Re-aggregate per-thesis daily counters for every day from since_day on"""
+    counters = {}
+
+    def _add(rows, *fields):
+        for thesis_id, day, *values in rows:
+            entry = counters.setdefault((thesis_id, int(day)), {
+                "thesis_id": thesis_id,
+                "day": int(day),
+                "student_updates": 0,
+                "supervisor_updates": 0,
+                "todos_created": 0,
+                "todos_completed": 0,
+                "status_changes": 0,
+            })
+            for field, value in zip(fields, values):
+                entry[field] += int(value or 0)
+
+    update_day = _day_expr(Thesis_Update.created_at)
+    by_student = case((Thesis_Update.author_id == Thesis.author_id, 1), else_=0)
+    _add(
+        db.session.execute(
+            select(Thesis_Update.thesis_id, update_day, func.sum(by_student), func.count() - func.sum(by_student))
+            .join(Thesis, Thesis.id == Thesis_Update.thesis_id)
+            .where(Thesis_Update.created_at >= since_day)
+            .group_by(Thesis_Update.thesis_id, update_day)
+        ),
+        "student_updates", "supervisor_updates",
+    )
+
+    created_day = _day_expr(Todo.created_at)
+    _add(
+        db.session.execute(
+            select(Todo.thesis_id, created_day, func.count())
+            .where(Todo.created_at >= since_day)
+            .group_by(Todo.thesis_id, created_day)
+        ),
+        "todos_created",
+    )
+
+    completed_day = _day_expr(Todo.completed_at)
+    _add(
+        db.session.execute(
+            select(Todo.thesis_id, completed_day, func.count())
+            .where(Todo.completed_at >= since_day)
+            .group_by(Todo.thesis_id, completed_day)
+        ),
+        "todos_completed",
+    )
+
+    status_day = _day_expr(Thesis_Status.updated_at)
+    _add(
+        db.session.execute(
+            select(Thesis_Status.thesis_id, status_day, func.count())
+            .where(Thesis_Status.updated_at >= since_day)
+            .group_by(Thesis_Status.thesis_id, status_day)
+        ),
+        "status_changes",
+    )
+
+    db.session.execute(delete(Analytics_Thesis_Daily).where(Analytics_Thesis_Daily.day >= since_day))
+    _insert_rows(Analytics_Thesis_Daily, list(counters.values()))
+    return len(counters)
+
+
+def _rebuild_supervisor_weekly(first_week, now):
+    """Re-aggregate supervisor weeks from first_week on; snapshot metrics only for the current week"""
+    daily = Analytics_Thesis_Daily
+    week = _week_expr(daily.day)
+    current_week = week_start(now)
+
+    rows = {}
+    flows = db.session.execute(
+        select(
+            Thesis_Supervisor.supervisor_id, week,
+            func.count(distinct(daily.thesis_id)),
+            func.sum(daily.student_updates), func.sum(daily.supervisor_updates),
+            func.sum(daily.todos_created), func.sum(daily.todos_completed),
+        )
+        .join(Thesis_Supervisor, Thesis_Supervisor.thesis_id == daily.thesis_id)
+        .where(daily.day >= first_week)
+        .group_by(Thesis_Supervisor.supervisor_id, week)
+    )
+    for supervisor_id, week_value, theses, student_updates, supervisor_updates, created, completed in flows:
+        rows[(supervisor_id, int(week_value))] = {
+            "supervisor_id": supervisor_id,
+            "week_start": int(week_value),
+            "theses": int(theses or 0),
+            "student_updates": int(student_updates or 0),
+            "supervisor_updates": int(supervisor_updates or 0),
+            "todos_created": int(created or 0),
+            "todos_completed": int(completed or 0),
+            "todos_overdue": 0,
+            "inactive_theses": 0,
+            "computed_at": now,
+        }
+
+    # Snapshots of past weeks cannot be recomputed; carry them over.
+    previous = db.session.execute(
+        select(
+            Analytics_Supervisor_Weekly.supervisor_id, Analytics_Supervisor_Weekly.week_start,
+            Analytics_Supervisor_Weekly.todos_overdue, Analytics_Supervisor_Weekly.inactive_theses,
+        ).where(
+            Analytics_Supervisor_Weekly.week_start >= first_week,
+            Analytics_Supervisor_Weekly.week_start < current_week,
+        )
+    )
+    for supervisor_id, week_value, overdue, inactive in previous:
+        row = rows.setdefault((supervisor_id, week_value), _empty_supervisor_week(supervisor_id, week_value, now))
+        row["todos_overdue"], row["inactive_theses"] = overdue, inactive
+
+    overdue = db.session.execute(
+        select(Thesis_Supervisor.supervisor_id, func.count(Todo.id))
+        .join(Todo, Todo.thesis_id == Thesis_Supervisor.thesis_id)
+        .where(Todo.due_date < now, Todo.status.notin_(CLOSED_TODO_STATUSES))
+        .group_by(Thesis_Supervisor.supervisor_id)
+    )
+    for supervisor_id, count in overdue:
+        row = rows.setdefault((supervisor_id, current_week), _empty_supervisor_week(supervisor_id, current_week, now))
+        row["todos_overdue"] = count
+
+    last_activity = (
+        select(daily.thesis_id, func.max(daily.day).label("last_day"))
+        .where(daily.student_updates + daily.supervisor_updates > 0)
+        .group_by(daily.thesis_id)
+        .subquery()
+    )
+    inactive = db.session.execute(
+        select(Thesis_Supervisor.supervisor_id, func.count(Thesis.id))
+        .join(Thesis, Thesis.id == Thesis_Supervisor.thesis_id)
+        .outerjoin(last_activity, last_activity.c.thesis_id == Thesis.id)
+        .where(
+            Thesis.author_id.isnot(None),
+            or_(Thesis.frozen.is_(False), Thesis.frozen.is_(None)),
+            or_(Thesis.current_status.is_(None), Thesis.current_status.notin_(COMPLETED_STATUSES)),
+            Thesis.created_at < now - INACTIVITY_DAYS * DAY_SECONDS,
+            or_(last_activity.c.last_day.is_(None), last_activity.c.last_day < now - INACTIVITY_DAYS * DAY_SECONDS),
+        )
+        .group_by(Thesis_Supervisor.supervisor_id)
+    )
+    for supervisor_id, count in inactive:
+        row = rows.setdefault((supervisor_id, current_week), _empty_supervisor_week(supervisor_id, current_week, now))
+        row["inactive_theses"] = count
+
+    db.session.execute(
+        delete(Analytics_Supervisor_Weekly).where(Analytics_Supervisor_Weekly.week_start >= first_week)
+    )
+    _insert_rows(Analytics_Supervisor_Weekly, list(rows.values()))
+    return len(rows)
+
+
+def _empty_supervisor_week(supervisor_id, week_value, now):
+    return {
+        "supervisor_id": supervisor_id,
+        "week_start": week_value,
+        "theses": 0,
+        "student_updates": 0,
+        "supervisor_updates": 0,
+        "todos_created": 0,
+        "todos_completed": 0,
+        "todos_overdue": 0,
+        "inactive_theses": 0,
+        "computed_at": now,
+    }
+
+
+def _rebuild_department_weekly(first_week, now):
+    """Re-aggregate department weeks from first_week on"""
+    daily = Analytics_Thesis_Daily
+    week = _week_expr(daily.day)
+    department = func.coalesce(User_mgmt.cdl, literal(UNASSIGNED_DEPARTMENT))
+
+    rows = {}
+
+    def _row(dept, week_value):
+        return rows.setdefault((dept, int(week_value)), {
+            "department": dept,
+            "week_start": int(week_value),
+            "theses": 0,
+            "student_updates": 0,
+            "supervisor_updates": 0,
+            "todos_completed": 0,
+            "completed_theses": 0,
+            "completion_days_total": 0,
+            "computed_at": now,
+        })
+
+    flows = db.session.execute(
+        select(
+            department, week,
+            func.count(distinct(daily.thesis_id)),
+            func.sum(daily.student_updates), func.sum(daily.supervisor_updates), func.sum(daily.todos_completed),
+        )
+        .join(Thesis, Thesis.id == daily.thesis_id)
+        .outerjoin(User_mgmt, User_mgmt.id == Thesis.author_id)
+        .where(daily.day >= first_week)
+        .group_by(department, week)
+    )
+    for dept, week_value, theses, student_updates, supervisor_updates, completed in flows:
+        row = _row(dept, week_value)
+        row.update(
+            theses=int(theses or 0),
+            student_updates=int(student_updates or 0),
+            supervisor_updates=int(supervisor_updates or 0),
+            todos_completed=int(completed or 0),
+        )
+
+    # Time to completion: thesis creation to its first completed-type status
+    first_completion = (
+        select(Thesis_Status.thesis_id, func.min(Thesis_Status.updated_at).label("completed_at"))
+        .where(Thesis_Status.status.in_(COMPLETED_STATUSES))
+        .group_by(Thesis_Status.thesis_id)
+        .subquery()
+    )
+    completions = db.session.execute(
+        select(department, first_completion.c.completed_at, Thesis.created_at)
+        .select_from(first_completion)
+        .join(Thesis, Thesis.id == first_completion.c.thesis_id)
+        .outerjoin(User_mgmt, User_mgmt.id == Thesis.author_id)
+        .where(first_completion.c.completed_at >= first_week)
+    )
+    for dept, completed_at, created_at in completions:
+        row = _row(dept, week_start(completed_at))
+        row["completed_theses"] += 1
+        row["completion_days_total"] += max(0, int(completed_at) - int(created_at or completed_at)) // DAY_SECONDS
+
+    db.session.execute(
+        delete(Analytics_Department_Weekly).where(Analytics_Department_Weekly.week_start >= first_week)
+    )
+    _insert_rows(Analytics_Department_Weekly, list(rows.values()))
+    return len(rows)
+
+
+def build_rollups(now=None, full=False):
+    """
+    Bring the rollup tables up to date
+
+    Only days since the previous build (minus LATE_EVENT_GRACE_SECONDS) are
+    re-aggregated from the live tables; weekly rollups are then rebuilt for the
+    affected weeks from the daily rollup. ``full`` rebuilds everything.
+
+    Returns:
+        dict: Build summary
+    """
+    now = int(now or time.time())
+    with _build_lock:
+        started = time.monotonic()
+        watermark = None if full else _get_watermark()
+        since = _earliest_event() if watermark is None else watermark - LATE_EVENT_GRACE_SECONDS
+        if since is None:
+            since = now
+        since_day = day_start(since)
+        first_week = week_start(since_day)
+
+        try:
+            thesis_days = _rebuild_thesis_daily(since_day)
+            supervisor_weeks = _rebuild_supervisor_weekly(first_week, now)
+            department_weeks = _rebuild_department_weekly(first_week, now)
+            _set_watermark(now)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Analytics rollup build failed: {e}")
+            return {"success": False, "error": str(e)}
+
+    summary = {
+        "success": True,
+        "full": watermark is None,
+        "since": since_day,
+        "thesis_days": thesis_days,
+        "supervisor_weeks": supervisor_weeks,
+        "department_weeks": department_weeks,
+        "duration_seconds": round(time.monotonic() - started, 3),
+    }
+    logger.info(f"Analytics rollups built: {summary}")
+    return summary
+
+
+def _series_weeks(weeks, now=None):
+    weeks = max(1, min(int(weeks or DEFAULT_SERIES_WEEKS), MAX_SERIES_WEEKS))
+    last = week_start(now or time.time())
+    return [last - offset * WEEK_SECONDS for offset in range(weeks - 1, -1, -1)]
+
+
+def _week_label(week_value):
+    return datetime.datetime.fromtimestamp(week_value, tz=datetime.timezone.utc).date().isoformat()
+
+
+SUPERVISOR_FIELDS = (
+    "theses", "student_updates", "supervisor_updates", "todos_created",
+    "todos_completed", "todos_overdue", "inactive_theses",
+)
+DEPARTMENT_FIELDS = (
+    "theses", "student_updates", "supervisor_updates", "todos_completed",
+    "completed_theses", "completion_days_total",
+)
+
+
+def _fill_series(week_values, by_week, fields):
+    series = []
+    for week_value in week_values:
+        row = by_week.get(week_value)
+        point = {"week_start": week_value, "week": _week_label(week_value)}
+        point.update({field: (getattr(row, field) if row is not None else 0) for field in fields})
+        series.append(point)
+    return series
+
+
+def supervisor_series(supervisor_id, weeks=DEFAULT_SERIES_WEEKS, now=None):
+    """Weekly workload series for one supervisor, oldest week first, gaps filled with zeros"""
+    week_values = _series_weeks(weeks, now)
+    rows = Analytics_Supervisor_Weekly.query.filter(
+        Analytics_Supervisor_Weekly.supervisor_id == supervisor_id,
+        Analytics_Supervisor_Weekly.week_start >= week_values[0],
+    ).all()
+    return _fill_series(week_values, {row.week_start: row for row in rows}, SUPERVISOR_FIELDS)
+
+
+def supervisors_overview(weeks=DEFAULT_SERIES_WEEKS, now=None):
+    """Per-supervisor totals over the window plus the latest snapshot values"""
+    week_values = _series_weeks(weeks, now)
+    weekly = Analytics_Supervisor_Weekly
+    totals = db.session.execute(
+        select(
+            weekly.supervisor_id, User_mgmt.name, User_mgmt.surname,
+            func.sum(weekly.student_updates), func.sum(weekly.supervisor_updates),
+            func.sum(weekly.todos_created), func.sum(weekly.todos_completed),
+        )
+        .join(User_mgmt, User_mgmt.id == weekly.supervisor_id)
+        .where(weekly.week_start >= week_values[0])
+        .group_by(weekly.supervisor_id, User_mgmt.name, User_mgmt.surname)
+    ).all()
+    current = {
+        row.supervisor_id: row
+        for row in weekly.query.filter(weekly.week_start == week_values[-1]).all()
+    }
+    overview = []
+    for supervisor_id, name, surname, student_updates, supervisor_updates, created, completed in totals:
+        snapshot = current.get(supervisor_id)
+        overview.append({
+            "supervisor_id": supervisor_id,
+            "name": name,
+            "surname": surname,
+            "student_updates": int(student_updates or 0),
+            "supervisor_updates": int(supervisor_updates or 0),
+            "todos_created": int(created or 0),
+            "todos_completed": int(completed or 0),
+            "todos_overdue": snapshot.todos_overdue if snapshot else 0,
+            "inactive_theses": snapshot.inactive_theses if snapshot else 0,
+        })
+    overview.sort(key=lambda item: (-item["todos_overdue"], -item["inactive_theses"], item["supervisor_id"]))
+    return overview
+
+
+def department_series(weeks=DEFAULT_SERIES_WEEKS, department=None, now=None):
+    """Weekly series per department, oldest week first"""
+    week_values = _series_weeks(weeks, now)
+    query = Analytics_Department_Weekly.query.filter(Analytics_Department_Weekly.week_start >= week_values[0])
+    if department:
+        query = query.filter(Analytics_Department_Weekly.department == department)
+
+    by_department = {}
+    for row in query.all():
+        by_department.setdefault(row.department, {})[row.week_start] = row
+
+    series = {}
+    for dept, by_week in sorted(by_department.items()):
+        points = _fill_series(week_values, by_week, DEPARTMENT_FIELDS)
+        for point in points:
+            completed = point["completed_theses"]
+            point["avg_days_to_completion"] = (
+                round(point["completion_days_total"] / completed, 1) if completed else None
+            )
+        series[dept] = points
+    return series
+
+
+def get_rollup_status():
+    """When the rollups were last built"""
+    row = db.session.get(Analytics_Watermark, WATERMARK_NAME)
+    return {"last_built_at": row.value if row else None}
@@ -0,0 +1,203 @@
+"""
+Static asset pipeline for SuperviseMe
+Builds content-fingerprinted, precompressed copies of superviseme/static/assets
+into static/dist with a manifest, and serves them with immutable cache headers
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+import time
+
+from flask import current_app, request, send_from_directory, url_for
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DIR = "assets"
+OUTPUT_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 12
+ONE_YEAR = 31536000
+
+# Sources for the shipped files; never referenced by a page
+SOURCE_ONLY_SUFFIXES = (".scss", ".less", ".yml", ".backup", ".md")
+COMPRESSIBLE_SUFFIXES = (".css", ".js", ".svg", ".json", ".map", ".txt", ".ttf", ".eot", ".xml", ".html")
+# Below this, compression saves less than a packet
+MIN_COMPRESS_SIZE = 1024
+DEFAULT_BROTLI_QUALITY = 11
+# Precompressed variants, best first, as (Accept-Encoding token, file suffix)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+class AssetManifest:
+    """Maps source paths ("assets/css/x.css") to fingerprinted ones ("dist/assets/css/x.<hash>.css")"""
+
+    def __init__(self, files=None):
+        self.files = files or {}
+        self.fingerprinted = frozenset(self.files.values())
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, encoding="utf-8") as handle:
+                return cls(json.load(handle))
+        except FileNotFoundError:
+            return cls()
+
+    def resolve(self, filename):
+        return self.files.get(filename, filename)
+
+
+def _fingerprint(relpath, content):
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    stem, ext = posixpath.splitext(relpath)
+    return f"{stem}.{digest}{ext}"
+
+
+def _rewrite_css_urls(relpath, content, manifest):
+    """Point url() references at fingerprinted files, keeping them relative to the stylesheet"""
+    base = posixpath.dirname(relpath)
+
+    def replace(match):
+        quote, ref = match.group(1), match.group(2).strip()
+        if ref.startswith(("data:", "http:", "https:", "//", "/", "#")):
+            return match.group(0)
+        path, sep, suffix = ref, "", ""
+        split = re.search(r"[?#]", ref)
+        if split:
+            path, sep, suffix = ref[:split.start()], ref[split.start()], ref[split.start() + 1:]
+        target = posixpath.normpath(posixpath.join(base, path))
+        if target not in manifest:
+            return match.group(0)
+        hashed = posixpath.join(posixpath.dirname(path), posixpath.basename(manifest[target]))
+        return f"url({quote}{hashed}{sep}{suffix}{quote})"
+
+    return CSS_URL.sub(replace, content.decode("utf-8")).encode("utf-8")
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.write(content)
+
+
+def _precompress(path, content, brotli, brotli_quality):
+    """Write .gz (and .br) next to path when they are smaller; returns the suffixes written"""
+    written = []
+    variants = [(".gz", gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(content, quality=brotli_quality)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(content):
+            _write(path + suffix, compressed)
+            written.append(suffix)
+    return written
+
+
+def build_assets(static_folder, brotli_quality=DEFAULT_BROTLI_QUALITY):
+    """
+    Fingerprint every asset under static/assets into static/dist
+
+    dist keeps each file under its original name too, so references the
+    pipeline does not rewrite (source maps, script-loaded files) still resolve.
+    Stylesheets are processed last so their url() references can point at
+    fingerprinted fonts and images. brotli_quality=None skips .br variants.
+
+    Returns:
+        dict: file and compression counts, output size and elapsed ms
+    """
+    started = time.perf_counter()
+    brotli = None
+    if brotli_quality is not None:
+        try:
+            import brotli
+        except ImportError:
+            logger.warning("brotli not installed; writing only .gz variants")
+
+    output_root = os.path.join(static_folder, OUTPUT_DIR)
+    shutil.rmtree(output_root, ignore_errors=True)
+
+    sources = []
+    for root, _, names in os.walk(os.path.join(static_folder, SOURCE_DIR)):
+        for name in names:
+            if name.endswith(SOURCE_ONLY_SUFFIXES):
+                continue
+            relpath = os.path.relpath(os.path.join(root, name), static_folder).replace(os.sep, "/")
+            sources.append(relpath)
+    sources.sort(key=lambda relpath: (relpath.endswith(".css"), relpath))
+
+    manifest = {}
+    summary = {"files": 0, "gz": 0, "br": 0, "bytes": 0}
+    for relpath in sources:
+        with open(os.path.join(static_folder, relpath), "rb") as handle:
+            content = handle.read()
+        if relpath.endswith(".css"):
+            content = _rewrite_css_urls(relpath, content, manifest)
+
+        hashed = _fingerprint(relpath, content)
+        manifest[relpath] = f"{OUTPUT_DIR}/{hashed}"
+        _write(os.path.join(output_root, relpath), content)
+        hashed_path = os.path.join(output_root, hashed)
+        _write(hashed_path, content)
+
+        summary["files"] += 1
+        summary["bytes"] += len(content)
+        if relpath.endswith(COMPRESSIBLE_SUFFIXES) and len(content) >= MIN_COMPRESS_SIZE:
+            for suffix in _precompress(hashed_path, content, brotli, brotli_quality):
+                summary[suffix[1:]] += 1
+
+    with open(os.path.join(output_root, MANIFEST_NAME), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=1, sort_keys=True)
+
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(
+        f"Built {summary['files']} assets into {output_root} "
+        f"({summary['gz']} .gz, {summary['br']} .br) in {summary['elapsed_ms']} ms"
+    )
+    return summary
+
+
+def static_url(filename):
+    """URL of a static file, fingerprinted when the asset build produced one"""
+    manifest = current_app.extensions.get("asset_manifest")
+    return url_for("static", filename=manifest.resolve(filename) if manifest else filename)
+
+
+def _serve_static(filename):
+    manifest = current_app.extensions.get("asset_manifest")
+    if manifest is None or filename not in manifest.fingerprinted:
+        return current_app.send_static_file(filename)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    static_folder = current_app.static_folder
+    response = None
+    for encoding, suffix in ENCODINGS:
+        if encoding in request.accept_encodings and os.path.isfile(os.path.join(static_folder, filename + suffix)):
+            response = send_from_directory(static_folder, filename + suffix, mimetype=mimetype, max_age=ONE_YEAR)
+            response.content_encoding = encoding
+            break
+    if response is None:
+        response = send_from_directory(static_folder, filename, mimetype=mimetype, max_age=ONE_YEAR)
+    # The name changes with the content, so browsers never need to revalidate
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def init_assets(app):
+    """Load the asset manifest, expose static_url() to templates and serve fingerprinted files"""
+    manifest_path = os.getenv("ASSET_MANIFEST") or os.path.join(app.static_folder, OUTPUT_DIR, MANIFEST_NAME)
+    app.extensions["asset_manifest"] = AssetManifest.load(manifest_path)
+    if not app.extensions["asset_manifest"].files:
+        logger.debug(f"No asset manifest at {manifest_path}; serving unversioned static files")
+    app.add_template_global(static_url)
+    app.view_functions["static"] = _serve_static
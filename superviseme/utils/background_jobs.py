@@ -0,0 +1,254 @@
+"""
+Background job queue for SuperviseMe
+Admin requests that outlive a web request (large cascade deletes, uploaded
+imports) are stored as rows in background_job. The scheduler leader, or a
+dedicated `superviseme.py jobs` process, claims and runs them, so every web
+worker sees the same job status and a recycled worker loses nothing.
+"""
+
+import json
+import logging
+import signal
+import threading
+import time
+import uuid
+
+from sqlalchemy import delete, select, update
+from werkzeug.utils import import_string
+
+from superviseme import db
+from superviseme.models import Background_Job
+from superviseme.utils.leader_lease import make_owner_id
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(job) returning the JSON result; imported lazily to avoid
+# import cycles with the modules that enqueue
+JOB_HANDLERS = {
+    "cascade_delete": "superviseme.utils.cascade_delete.run_delete_job",
+    "import_users": "superviseme.utils.bulk_import.run_import_job",
+    "import_theses": "superviseme.utils.bulk_import.run_import_job",
+}
+
+# A running job that has not reported progress for this long lost its worker
+JOB_STALE_SECONDS = 900
+
+# Finished jobs stay readable for progress polling this long
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+# Seconds between queue polls of the dedicated job worker
+JOB_POLL_SECONDS = 1
+
+JOB_ERROR_MAX_LENGTH = 2000
+
+
+class QueuedJob:
+    """A claimed job as seen by its handler"""
+
+    def __init__(self, row):
+        self.id = row.id
+        self.kind = row.kind
+        self.label = row.label
+        self.payload = json.loads(row.payload) if row.payload else {}
+        self.data = row.data
+
+    def report_progress(self, progress):
+        """Publish partial progress; also proves the job is still alive"""
+        table = Background_Job.__table__
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(table).where(table.c.id == self.id).values(
+                    progress=json.dumps(progress, default=str), heartbeat_at=int(time.time()),
+                )
+            )
+
+
+def enqueue_job(kind, payload=None, data=None, label=None, created_by=None):
+    """
+    Queue a job for the background runner, committed on its own connection
+
+    Args:
+        kind: key of JOB_HANDLERS
+        payload: JSON-serializable arguments for the handler
+        data: optional bytes (an uploaded file)
+
+    Returns:
+        str: job id for get_job()
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown background job kind {kind}")
+    job_id = uuid.uuid4().hex
+    with db.engine.begin() as conn:
+        conn.execute(
+            Background_Job.__table__.insert().values(
+                id=job_id,
+                kind=kind,
+                label=label,
+                status="queued",
+                payload=json.dumps(payload or {}),
+                data=data,
+                created_by=created_by,
+                created_at=int(time.time()),
+            )
+        )
+    return job_id
+
+
+def get_job(job_id, kinds=None):
+    """
+    Status of a job, as seen by any process
+
+    Args:
+        kinds: only find jobs of these kinds
+
+    Returns:
+        dict | None: job_id, kind, label, status, payload (until the job
+        finishes; may hold secrets, not for display), progress, result,
+        error, created_at, started_at, finished_at
+    """
+    table = Background_Job.__table__
+    query = select(
+        table.c.id, table.c.kind, table.c.label, table.c.status, table.c.payload, table.c.progress,
+        table.c.result, table.c.error, table.c.created_at, table.c.started_at, table.c.finished_at,
+    ).where(table.c.id == job_id)
+    if kinds is not None:
+        query = query.where(table.c.kind.in_(kinds))
+    row = db.session.execute(query).first()
+    if row is None:
+        return None
+    return {
+        "job_id": row.id,
+        "kind": row.kind,
+        "label": row.label,
+        "status": row.status,
+        "payload": json.loads(row.payload) if row.payload else None,
+        "progress": json.loads(row.progress) if row.progress else None,
+        "result": json.loads(row.result) if row.result else None,
+        "error": row.error,
+        "created_at": row.created_at,
+        "started_at": row.started_at,
+        "finished_at": row.finished_at,
+    }
+
+
+def _claim_next_job(owner):
+    """Mark the oldest queued job as running for owner; None when the queue is empty"""
+    table = Background_Job.__table__
+    while True:
+        now = int(time.time())
+        with db.engine.begin() as conn:
+            job_id = conn.scalar(
+                select(table.c.id).where(table.c.status == "queued").order_by(table.c.created_at).limit(1)
+            )
+            if job_id is None:
+                return None
+            # Another runner may claim the same row first; then try the next one
+            claimed = conn.execute(
+                update(table).where(table.c.id == job_id, table.c.status == "queued").values(
+                    status="running", owner=owner, started_at=now, heartbeat_at=now,
+                )
+            ).rowcount
+            if claimed:
+                return conn.execute(select(table).where(table.c.id == job_id)).one()
+
+
+def _finish_job(job_id, status, result=None, error=None):
+    table = Background_Job.__table__
+    with db.engine.begin() as conn:
+        conn.execute(
+            update(table).where(table.c.id == job_id).values(
+                status=status,
+                result=json.dumps(result, default=str) if result is not None else None,
+                error=error[:JOB_ERROR_MAX_LENGTH] if error else None,
+                payload=None,
+                data=None,
+                finished_at=int(time.time()),
+            )
+        )
+
+
+def _expire_jobs(now=None):
+    """Fail jobs whose worker went away and drop old finished jobs"""
+    now = int(now if now is not None else time.time())
+    table = Background_Job.__table__
+    with db.engine.begin() as conn:
+        stale = conn.execute(
+            update(table)
+            .where(table.c.status == "running", table.c.heartbeat_at < now - JOB_STALE_SECONDS)
+            .values(
+                status="failed",
+                error="The worker running this job stopped before it finished",
+                payload=None,
+                data=None,
+                finished_at=now,
+            )
+        ).rowcount
+        conn.execute(delete(table).where(table.c.finished_at < now - JOB_RETENTION_SECONDS))
+    if stale:
+        logger.warning(f"Marked {stale} stale background job(s) as failed")
+    return stale
+
+
+def _run_job(row):
+    job = QueuedJob(row)
+    try:
+        handler = import_string(JOB_HANDLERS[job.kind])
+        result = handler(job)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Background job {job.id} ({job.kind} {job.label}) failed: {e}")
+        _finish_job(job.id, "failed", error=str(e))
+        return False
+    _finish_job(job.id, "done", result=result)
+    return True
+
+
+def has_pending_jobs():
+    """Whether a job is queued or running (possibly stale)"""
+    table = Background_Job.__table__
+    return db.session.scalar(
+        select(table.c.id).where(table.c.status.in_(("queued", "running"))).limit(1)
+    ) is not None
+
+
+def run_pending_jobs(max_jobs=None, owner=None):
+    """
+    Run queued jobs one after another until the queue is empty
+
+    Safe to call from several processes at once: each job is claimed by
+    exactly one of them.
+
+    Returns:
+        dict: number of jobs done, failed and expired
+    """
+    owner = owner or make_owner_id()
+    results = {"done": 0, "failed": 0, "expired": _expire_jobs()}
+    while max_jobs is None or results["done"] + results["failed"] < max_jobs:
+        row = _claim_next_job(owner)
+        if row is None:
+            break
+        results["done" if _run_job(row) else "failed"] += 1
+    return results
+
+
+def run_job_worker(app, poll_interval=JOB_POLL_SECONDS):
+    """
+    Run queued jobs as a standalone process until SIGTERM/SIGINT, so they
+    never take time from web workers
+    """
+    stopped = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopped.set())
+
+    owner = make_owner_id()
+    logger.info(f"Background job worker {owner} running")
+    while not stopped.is_set():
+        with app.app_context():
+            try:
+                results = run_pending_jobs(owner=owner)
+                if results["done"] or results["failed"]:
+                    logger.info(f"Background jobs processed: {results}")
+            except Exception as e:
+                logger.error(f"Background job worker error: {str(e)}")
+        stopped.wait(poll_interval)
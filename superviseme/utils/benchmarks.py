@@ -0,0 +1,155 @@
+"""
+Endpoint benchmarks for SuperviseMe
+Measures latency, SQL query count and peak memory of requests made through the
+Flask test client and checks them against budgets and a stored baseline
+"""
+
+import logging
+import time
+import tracemalloc
+from collections import namedtuple
+
+from sqlalchemy import event
+
+from superviseme import db
+
+logger = logging.getLogger(__name__)
+
+Scenario = namedtuple("Scenario", ["name", "role", "path"])
+
+# Paths may use {thesis_id} (a busy thesis of the benchmarked supervisor/student)
+# and {public_thesis_id} (an open thesis in the public catalogue).
+SCENARIOS = (
+    Scenario("admin_dashboard", "admin", "/admin/dashboard"),
+    Scenario("admin_theses_table", "admin", "/admin/theses_data?start=0&length=25"),
+    Scenario("admin_export_json", "admin", "/admin/api/export_data"),
+    Scenario("admin_export_csv", "admin", "/admin/api/export_data/csv"),
+    Scenario("admin_supervisor_analytics", "admin", "/admin/api/analytics/supervisors"),
+    Scenario("supervisor_dashboard", "supervisor", "/supervisor/dashboard"),
+    Scenario("supervisor_thesis_detail", "supervisor", "/supervisor/thesis/{thesis_id}"),
+    Scenario("supervisor_notifications", "supervisor", "/api/notifications"),
+    Scenario("student_dashboard", "student", "/student/dashboard"),
+    Scenario("student_thesis", "student", "/student/thesis"),
+    Scenario("student_notifications", "student", "/api/notifications"),
+    Scenario("student_unread_count", "student", "/api/notifications/unread_count"),
+    Scenario("public_catalogue", "anonymous", "/theses"),
+    Scenario("public_thesis_detail", "anonymous", "/theses/{public_thesis_id}"),
+)
+
+DEFAULT_REPEAT = 10
+DEFAULT_WARMUP = 2
+
+# Allowed growth over the baseline before a result counts as a regression:
+# relative for timings and memory (with an absolute floor, so fast endpoints do
+# not flap on scheduler noise), absolute for the deterministic query count.
+DEFAULT_TOLERANCE = {"p95_ms": 0.5, "p95_ms_abs": 25, "queries": 0, "peak_kib": 0.25, "peak_kib_abs": 256}
+
+
+class QueryCounter:
+    """Count SQL statements sent through the app's engine while active"""
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.engine = self.engine or db.engine
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        return False
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def measure_request(client, path, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """
+    Time repeated GETs of path and record queries and peak memory of one request
+
+    Returns:
+        dict: status, p50_ms, p95_ms, queries, peak_kib
+    """
+    status = None
+    for _ in range(warmup):
+        status = client.get(path).status_code
+
+    timings, queries = [], 0
+    for _ in range(repeat):
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            status = client.get(path).status_code
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = counter.count
+
+    # Memory is traced in a separate request; tracing slows everything down.
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline_memory = tracemalloc.get_traced_memory()[0]
+    client.get(path)
+    peak = tracemalloc.get_traced_memory()[1] - baseline_memory
+    if not already_tracing:
+        tracemalloc.stop()
+
+    return {
+        "status": status,
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "queries": queries,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def check_results(results, budgets=None, baseline=None):
+    """
+    Compare benchmark results with absolute budgets and a previous baseline
+
+    budgets: {"default": {"max_p95_ms": .., "max_queries": .., "max_peak_kib": ..},
+              "scenarios": {name: {...}}, "tolerance": {"p95_ms": .., "queries": .., "peak_kib": ..}}
+    baseline: {"scenarios": {name: result}} as written by a previous run
+
+    Returns:
+        list[str]: One message per violation
+    """
+    budgets = budgets or {}
+    tolerance = {**DEFAULT_TOLERANCE, **budgets.get("tolerance", {})}
+    previous = (baseline or {}).get("scenarios", {})
+    violations = []
+
+    for name, result in results.items():
+        if result["status"] != 200:
+            violations.append(f"{name}: HTTP {result['status']}")
+            continue
+
+        limits = {**budgets.get("default", {}), **budgets.get("scenarios", {}).get(name, {})}
+        for metric in ("p95_ms", "queries", "peak_kib"):
+            limit = limits.get(f"max_{metric}")
+            if limit is not None and result[metric] > limit:
+                violations.append(f"{name}: {metric} {result[metric]} exceeds budget {limit}")
+
+        base = previous.get(name)
+        if not base:
+            continue
+        if result["queries"] > base["queries"] + tolerance["queries"]:
+            violations.append(f"{name}: queries {result['queries']} > baseline {base['queries']}")
+        for metric in ("p95_ms", "peak_kib"):
+            allowed = max(base[metric] * (1 + tolerance[metric]), base[metric] + tolerance[f"{metric}_abs"])
+            if result[metric] > allowed:
+                violations.append(
+                    f"{name}: {metric} {result[metric]} > baseline {base[metric]} (+{tolerance[metric]:.0%})"
+                )
+    return violations
@@ -0,0 +1,363 @@
+"""
+Set-based cascading deletes for SuperviseMe
+Walks a declared dependency graph over the models and removes users, theses and
+research projects with bulk statements, in chunks, optionally in the background
+"""
+
+import logging
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import delete, func, select, update
+
+from superviseme import db
+from superviseme.utils.background_jobs import enqueue_job, get_job
+from superviseme.models import (
+    Analytics_Supervisor_Weekly,
+    Analytics_Thesis_Daily,
+    MeetingNote,
+    MeetingNoteReference,
+    Notification,
+    OrcidActivity,
+    ResearchProject,
+    ResearchProject_Collaborator,
+    ResearchProject_Hypothesis,
+    ResearchProject_MeetingNote,
+    ResearchProject_MeetingNoteReference,
+    ResearchProject_Objective,
+    ResearchProject_Resource,
+    ResearchProject_Status,
+    ResearchProject_Todo,
+    ResearchProject_TodoReference,
+    ResearchProject_Update,
+    Resource,
+    Supervisor_Role,
+    Thesis,
+    Thesis_Hypothesis,
+    Thesis_Interest,
+    Thesis_Objective,
+    Thesis_Status,
+    Thesis_Supervisor,
+    Thesis_Tag,
+    Thesis_Update,
+    Todo,
+    Todo_Reference,
+    Update_Tag,
+    User_mgmt,
+)
+
+logger = logging.getLogger(__name__)
+
+# Parent ids per IN (...) list, and per transaction when deleting in the background
+CASCADE_CHUNK_SIZE = 500
+
+# Owners with more direct dependents than this are deleted in the background
+CASCADE_BACKGROUND_THRESHOLD = 5000
+
+# Edge actions: remove the dependent rows, clear the reference, or hand the
+# reference over to another user (falls back to delete when nobody is given).
+DELETE = "delete"
+NULLIFY = "nullify"
+REASSIGN = "reassign"
+
+Edge = namedtuple("Edge", ["model", "column", "action"])
+
+# parent model -> rows that reference it. Children are always processed before
+# their parent, so every statement is valid under enforced foreign keys.
+CASCADE_GRAPH = {
+    Thesis_Update: (
+        Edge(Update_Tag, "update_id", DELETE),
+        Edge(Todo_Reference, "update_id", DELETE),
+        Edge(Thesis_Update, "parent_id", NULLIFY),
+    ),
+    Todo: (
+        Edge(Todo_Reference, "todo_id", DELETE),
+        Edge(MeetingNoteReference, "todo_id", DELETE),
+    ),
+    MeetingNote: (
+        Edge(MeetingNoteReference, "meeting_note_id", DELETE),
+    ),
+    Thesis: (
+        Edge(Thesis_Update, "thesis_id", DELETE),
+        Edge(Todo, "thesis_id", DELETE),
+        Edge(MeetingNote, "thesis_id", DELETE),
+        Edge(Notification, "thesis_id", DELETE),
+        Edge(Thesis_Status, "thesis_id", DELETE),
+        Edge(Thesis_Supervisor, "thesis_id", DELETE),
+        Edge(Thesis_Tag, "thesis_id", DELETE),
+        Edge(Thesis_Interest, "thesis_id", DELETE),
+        Edge(Resource, "thesis_id", DELETE),
+        Edge(Thesis_Objective, "thesis_id", DELETE),
+        Edge(Thesis_Hypothesis, "thesis_id", DELETE),
+        Edge(Analytics_Thesis_Daily, "thesis_id", DELETE),
+    ),
+    ResearchProject_Update: (
+        Edge(ResearchProject_TodoReference, "update_id", DELETE),
+        Edge(ResearchProject_Update, "parent_id", NULLIFY),
+    ),
+    ResearchProject_Todo: (
+        Edge(ResearchProject_TodoReference, "todo_id", DELETE),
+        Edge(ResearchProject_MeetingNoteReference, "todo_id", DELETE),
+    ),
+    ResearchProject_MeetingNote: (
+        Edge(ResearchProject_MeetingNoteReference, "meeting_note_id", DELETE),
+    ),
+    ResearchProject: (
+        Edge(ResearchProject_Update, "project_id", DELETE),
+        Edge(ResearchProject_Todo, "project_id", DELETE),
+        Edge(ResearchProject_MeetingNote, "project_id", DELETE),
+        Edge(ResearchProject_Collaborator, "project_id", DELETE),
+        Edge(ResearchProject_Status, "project_id", DELETE),
+        Edge(ResearchProject_Resource, "project_id", DELETE),
+        Edge(ResearchProject_Objective, "project_id", DELETE),
+        Edge(ResearchProject_Hypothesis, "project_id", DELETE),
+    ),
+    User_mgmt: (
+        # Theses outlive their student and publisher; removing a thesis is explicit.
+        Edge(Thesis, "author_id", NULLIFY),
+        Edge(Thesis, "publisher_id", NULLIFY),
+        Edge(Thesis_Supervisor, "supervisor_id", DELETE),
+        Edge(Thesis_Interest, "student_id", DELETE),
+        Edge(Thesis_Interest, "handled_by_id", NULLIFY),
+        Edge(Thesis_Update, "author_id", DELETE),
+        Edge(Todo, "author_id", DELETE),
+        Edge(Todo, "assigned_to_id", NULLIFY),
+        Edge(MeetingNote, "author_id", DELETE),
+        Edge(Thesis_Objective, "author_id", DELETE),
+        Edge(Thesis_Hypothesis, "author_id", DELETE),
+        Edge(Notification, "recipient_id", DELETE),
+        Edge(Notification, "actor_id", DELETE),
+        Edge(OrcidActivity, "user_id", DELETE),
+        Edge(Analytics_Supervisor_Weekly, "supervisor_id", DELETE),
+        Edge(ResearchProject, "researcher_id", DELETE),
+        Edge(ResearchProject_Collaborator, "collaborator_id", DELETE),
+        Edge(ResearchProject_Update, "author_id", DELETE),
+        Edge(ResearchProject_Todo, "author_id", DELETE),
+        Edge(ResearchProject_Todo, "assigned_to_id", NULLIFY),
+        Edge(ResearchProject_MeetingNote, "author_id", DELETE),
+        Edge(ResearchProject_Objective, "author_id", DELETE),
+        Edge(ResearchProject_Hypothesis, "author_id", DELETE),
+        Edge(Supervisor_Role, "researcher_id", DELETE),
+        Edge(Supervisor_Role, "granted_by", REASSIGN),
+    ),
+}
+
+
+def undeclared_foreign_keys():
+    """
+    List foreign keys into a cascade root or intermediate model that the graph
+    does not cover, as "table.column -> table" strings
+
+    New models referencing users, theses or projects must be added to CASCADE_GRAPH.
+    """
+    declared = {
+        (edge.model.__table__.name, edge.column, parent.__table__.name)
+        for parent, edges in CASCADE_GRAPH.items()
+        for edge in edges
+    }
+    parents = {model.__table__.name for model in CASCADE_GRAPH}
+    missing = []
+    for table in db.metadata.sorted_tables:
+        for fk in table.foreign_keys:
+            target = fk.column.table.name
+            if target in parents and (table.name, fk.parent.name, target) not in declared:
+                missing.append(f"{table.name}.{fk.parent.name} -> {target}")
+    return missing
+
+
+def _chunks(ids, size):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+class CascadeDeleter:
+    """
+    Deletes rows and everything that depends on them, following CASCADE_GRAPH
+
+    Each level issues one statement per edge and per chunk of parent ids, so
+    the number of round trips grows with the graph, not with the row count.
+    By default the caller commits; with ``commit_chunks`` every chunk is
+    committed on its own, keeping transactions and locks short for large owners.
+    """
+
+    def __init__(self, chunk_size=CASCADE_CHUNK_SIZE, reassign_to=None, commit_chunks=False, progress=None):
+        self.chunk_size = chunk_size
+        self.reassign_to = reassign_to
+        self.commit_chunks = commit_chunks
+        self.progress = progress
+        self.counts = OrderedDict()
+
+    def _count(self, model, action, rowcount):
+        if rowcount:
+            key = f"{model.__tablename__}.{action}"
+            self.counts[key] = self.counts.get(key, 0) + rowcount
+
+    def _chunk_done(self):
+        if self.commit_chunks:
+            db.session.commit()
+        if self.progress is not None:
+            self.progress(dict(self.counts))
+
+    def _execute(self, statement):
+        return db.session.execute(
+            statement.execution_options(synchronize_session=False)
+        ).rowcount
+
+    def _delete_dependents(self, model, parent_ids):
+        for edge in CASCADE_GRAPH.get(model, ()):
+            column = getattr(edge.model, edge.column)
+            action = edge.action
+            if action == REASSIGN and self.reassign_to is None:
+                action = DELETE
+
+            if action == NULLIFY:
+                rowcount = self._execute(update(edge.model).where(column.in_(parent_ids)).values({edge.column: None}))
+                self._count(edge.model, "nullified", rowcount)
+            elif action == REASSIGN:
+                rowcount = self._execute(
+                    update(edge.model).where(column.in_(parent_ids)).values({edge.column: self.reassign_to})
+                )
+                self._count(edge.model, "reassigned", rowcount)
+            elif edge.model in CASCADE_GRAPH:
+                child_ids = db.session.scalars(select(edge.model.id).where(column.in_(parent_ids))).all()
+                self.delete(edge.model, child_ids)
+            else:
+                self._count(edge.model, "deleted", self._execute(delete(edge.model).where(column.in_(parent_ids))))
+
+    def delete(self, model, ids):
+        """Delete the given rows of ``model`` and their dependents; returns the counts so far"""
+        ids = list(ids)
+        for chunk in _chunks(ids, self.chunk_size):
+            self._delete_dependents(model, chunk)
+            self._count(model, "deleted", self._execute(delete(model).where(model.id.in_(chunk))))
+            self._chunk_done()
+
+        if model is User_mgmt and ids:
+            _invalidate_user_caches(ids)
+        return dict(self.counts)
+
+
+def _invalidate_user_caches(user_ids):
+    # Bulk deletes bypass the ORM after_delete listeners that normally do this.
+    from superviseme.utils.telegram_service import get_telegram_service
+    from superviseme.utils.user_cache import invalidate_user
+
+    for user_id in user_ids:
+        invalidate_user(user_id)
+        get_telegram_service().invalidate_user_preferences(user_id)
+
+
+def _purge_search_documents(counts, commit=False):
+    # Bulk deletes bypass the search index's after_delete listeners too.
+    from superviseme.utils.search_index import purge_orphaned_documents
+
+    tables = {key.rsplit(".", 1)[0] for key in counts if key.endswith(".deleted")}
+    if tables and purge_orphaned_documents(tables) and commit:
+        db.session.commit()
+
+
+def _refresh_tag_counts(counts, commit=False):
+    # The deleted tag rows are gone, so recount every tag (one UPDATE).
+    from superviseme.utils.tags import refresh_tag_counts
+
+    if counts.get("thesis_tag.deleted") or counts.get("update_tag.deleted"):
+        refresh_tag_counts(db.session.connection())
+        if commit:
+            db.session.commit()
+
+
+def _invalidate_catalogue(counts, commit=False):
+    # Deleted or reassigned theses, links and users can change the public catalogue.
+    from superviseme.utils.thesis_catalogue import CATALOGUE_TABLES, invalidate_catalogue
+
+    if {key.rsplit(".", 1)[0] for key in counts} & CATALOGUE_TABLES:
+        invalidate_catalogue(deferred=not commit)
+
+
+def delete_records(model, ids, reassign_to=None, chunk_size=CASCADE_CHUNK_SIZE, commit_chunks=False, progress=None):
+    """
+    Delete rows of ``model`` and all dependent records
+
+    Args:
+        model: A model in CASCADE_GRAPH (User_mgmt, Thesis, ResearchProject, ...)
+        ids: Primary keys to delete
+        reassign_to: User id that takes over REASSIGN references (e.g. role grants)
+
+    Returns:
+        dict: Affected rows per "<table>.<action>"
+    """
+    deleter = CascadeDeleter(
+        chunk_size=chunk_size, reassign_to=reassign_to, commit_chunks=commit_chunks, progress=progress
+    )
+    counts = deleter.delete(model, ids)
+    _purge_search_documents(counts, commit=commit_chunks)
+    _refresh_tag_counts(counts, commit=commit_chunks)
+    _invalidate_catalogue(counts, commit=commit_chunks)
+    logger.info(f"Cascade delete of {model.__tablename__} {list(ids)[:10]}: {counts}")
+    return counts
+
+
+def estimate_cascade(model, ids):
+    """Count the rows directly referencing the given rows, one COUNT per edge"""
+    ids = list(ids)
+    total = 0
+    for edge in CASCADE_GRAPH.get(model, ()):
+        column = getattr(edge.model, edge.column)
+        for chunk in _chunks(ids, CASCADE_CHUNK_SIZE):
+            total += db.session.scalar(select(func.count()).select_from(edge.model).where(column.in_(chunk))) or 0
+    return total
+
+
+def run_delete_job(job):
+    """Background job handler: cascade delete the rows named in the job payload"""
+    models = {model.__tablename__: model for model in CASCADE_GRAPH}
+    model = models[job.payload["table"]]
+    return delete_records(
+        model, job.payload["ids"],
+        reassign_to=job.payload.get("reassign_to"),
+        commit_chunks=True,
+        progress=job.report_progress,
+    )
+
+
+def get_delete_job(job_id):
+    """
+    Progress of a background cascade delete
+
+    Returns:
+        dict | None: job_id, target, status, counts, created_at, started_at,
+        finished_at, error
+    """
+    job = get_job(job_id, kinds=("cascade_delete",))
+    if job is None:
+        return None
+    return {
+        "job_id": job["job_id"],
+        "target": job["label"],
+        "status": job["status"],
+        "counts": job["result"] or job["progress"] or {},
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"],
+    }
+
+
+def delete_or_schedule(model, ids, reassign_to=None, label=None, background=None):
+    """
+    Delete in this request, or queue a background job when the owner has more
+    than CASCADE_BACKGROUND_THRESHOLD direct dependents
+
+    Returns:
+        tuple[dict | None, str | None]: (counts, job_id); the caller commits
+        when counts is returned
+    """
+    if background is None:
+        background = estimate_cascade(model, ids) > CASCADE_BACKGROUND_THRESHOLD
+    if background:
+        job_id = enqueue_job(
+            "cascade_delete",
+            {"table": model.__tablename__, "ids": list(ids), "reassign_to": reassign_to},
+            label=label or model.__tablename__,
+        )
+        return None, job_id
+    return delete_records(model, ids, reassign_to=reassign_to), None
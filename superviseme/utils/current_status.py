@@ -0,0 +1,158 @@
+"""
+Materialized current status for SuperviseMe
+Keeps thesis.current_status and research_project.current_status in sync with
+their status history and checks/repairs the denormalized values
+"""
+
+import logging
+from collections import namedtuple
+
+from sqlalchemy import event, func, inspect, select, update
+
+from superviseme import db
+from superviseme.models import ResearchProject, ResearchProject_Status, Thesis, Thesis_Status
+
+logger = logging.getLogger(__name__)
+
+StatusSource = namedtuple("StatusSource", ["history", "fk"])
+
+# parent model -> status history rows it is materialized from
+STATUS_SOURCES = {
+    Thesis: StatusSource(Thesis_Status, "thesis_id"),
+    ResearchProject: StatusSource(ResearchProject_Status, "project_id"),
+}
+
+# Parent ids per IN (...) list when repairing
+REFRESH_CHUNK_SIZE = 500
+
+
+def _latest(parent_model, column_name):
+    """Correlated scalar subquery: the newest history value for each parent row"""
+    source = STATUS_SOURCES[parent_model]
+    history = source.history.__table__
+    parent = parent_model.__table__
+    return (
+        select(history.c[column_name])
+        .where(history.c[source.fk] == parent.c.id)
+        .order_by(history.c.updated_at.desc(), history.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def refresh_current_status(connection, parent_model, ids=None):
+    """
+    Recompute the materialized status of the given parents (all when ids is None)
+    with one UPDATE per chunk
+
+    Returns:
+        int: Rows updated
+    """
+    parent = parent_model.__table__
+    stmt = update(parent).values(
+        current_status=_latest(parent_model, "status"),
+        current_status_at=_latest(parent_model, "updated_at"),
+    )
+    if ids is None:
+        return connection.execute(stmt).rowcount
+
+    ids = sorted({parent_id for parent_id in ids if parent_id is not None})
+    updated = 0
+    for start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+        chunk = ids[start:start + REFRESH_CHUNK_SIZE]
+        updated += connection.execute(stmt.where(parent.c.id.in_(chunk))).rowcount
+    return updated
+
+
+def find_status_mismatches(parent_model, limit=None):
+    """
+    List parents whose materialized status differs from their history
+
+    Returns:
+        list[dict]: id, stored and expected status/timestamp per mismatched row
+    """
+    parent = parent_model.__table__
+    expected_status = _latest(parent_model, "status")
+    expected_at = _latest(parent_model, "updated_at")
+    stmt = (
+        select(parent.c.id, parent.c.current_status, parent.c.current_status_at,
+               expected_status.label("expected_status"), expected_at.label("expected_at"))
+        .where(
+            parent.c.current_status.is_distinct_from(expected_status)
+            | parent.c.current_status_at.is_distinct_from(expected_at)
+        )
+        .order_by(parent.c.id)
+    )
+    if limit:
+        stmt = stmt.limit(limit)
+    return [
+        {
+            "id": row.id,
+            "stored": row.current_status,
+            "stored_at": row.current_status_at,
+            "expected": row.expected_status,
+            "expected_at": row.expected_at,
+        }
+        for row in db.session.execute(stmt)
+    ]
+
+
+def check_current_status(repair=False):
+    """
+    Compare materialized statuses with the status history for theses and projects
+
+    Returns:
+        dict: Per table, rows checked, mismatches found (first 50 listed) and rows repaired
+    """
+    report = {}
+    for parent_model in STATUS_SOURCES:
+        mismatches = find_status_mismatches(parent_model)
+        repaired = 0
+        if repair and mismatches:
+            repaired = refresh_current_status(db.session.connection(), parent_model, [m["id"] for m in mismatches])
+            db.session.commit()
+        report[parent_model.__tablename__] = {
+            "checked": db.session.scalar(select(func.count()).select_from(parent_model.__table__)),
+            "mismatched": len(mismatches),
+            "mismatches": mismatches[:50],
+            "repaired": repaired,
+        }
+        if mismatches:
+            logger.warning(
+                f"{len(mismatches)} {parent_model.__tablename__} rows had a stale current_status"
+                + (f"; repaired {repaired}" if repair else "")
+            )
+    return report
+
+
+def _expire_parent(session, parent_model, parent_id):
+    # Keep an already loaded parent from serving the pre-write value.
+    if session is None:
+        return
+    parent = session.identity_map.get(session.identity_key(parent_model, parent_id))
+    if parent is not None:
+        session.expire(parent, ["current_status", "current_status_at"])
+
+
+def _make_listener(parent_model):
+    fk = STATUS_SOURCES[parent_model].fk
+
+    def _on_status_write(mapper, connection, target):
+        parent_ids = {getattr(target, fk)}
+        history = inspect(target).attrs[fk].history
+        parent_ids.update(history.deleted or ())
+        refresh_current_status(connection, parent_model, parent_ids)
+
+        session = inspect(target).session
+        for parent_id in parent_ids:
+            _expire_parent(session, parent_model, parent_id)
+
+    return _on_status_write
+
+
+# ORM status writes refresh the parent in the same transaction. Bulk Core
+# inserts (e.g. bulk_import) set current_status themselves.
+for _parent_model, _source in STATUS_SOURCES.items():
+    _listener = _make_listener(_parent_model)
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_source.history, _event_name, _listener)
@@ -0,0 +1,175 @@
+"""
+Database connection pool configuration for SuperviseMe
+Builds SQLAlchemy engine options from the environment, sized per worker
+process, and reports pool usage and checkout wait times for /health
+"""
+
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Connections the whole deployment may open (all gunicorn workers together);
+# keep it below PostgreSQL's max_connections minus admin/maintenance slots.
+DEFAULT_MAX_CONNECTIONS = 40
+
+# Share of a worker's connections kept open; the rest is burst overflow
+PERSISTENT_SHARE = 2 / 3
+
+DEFAULT_POOL_TIMEOUT = 10
+DEFAULT_POOL_RECYCLE = 1800
+
+POOL_MODES = ("internal", "external")
+
+
+def _env_int(name, default=None):
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring non-integer {name}={value!r}")
+        return default
+
+
+def _env_bool(name, default):
+    value = os.getenv(name, "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes")
+
+
+def worker_count():
+    """Processes sharing the connection budget (gunicorn honours WEB_CONCURRENCY)"""
+    return max(1, _env_int("WEB_CONCURRENCY") or _env_int("GUNICORN_WORKERS") or 1)
+
+
+def pool_sizing(workers=None, threads=None, max_connections=None):
+    """
+    Split the deployment-wide connection budget between worker processes
+
+    Each worker gets at least one connection per request thread so threads
+    never queue on the pool while the database still has capacity.
+
+    Returns:
+        dict: pool_size and max_overflow for one worker
+    """
+    workers = workers or worker_count()
+    threads = threads or max(1, _env_int("GUNICORN_THREADS", 1))
+    max_connections = max_connections or _env_int("DB_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+
+    per_worker = max(threads, max_connections // workers, 1)
+    pool_size = max(threads, int(per_worker * PERSISTENT_SHARE), 1)
+    return {"pool_size": pool_size, "max_overflow": max(per_worker - pool_size, 0)}
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait and how many time out"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._waits += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def wait_stats(self):
+        with self._stats_lock:
+            return {
+                "checkouts": self._waits,
+                "wait_ms_avg": round(self._wait_total * 1000 / self._waits, 3) if self._waits else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+                "timeouts": self._timeouts,
+            }
+
+
+def postgresql_engine_options(database_uri=None):
+    """
+    Engine options for PostgreSQL from DB_POOL_* settings
+
+    DB_POOL_MODE=external is for a transaction-pooling proxy such as PgBouncer:
+    connections are not kept in the process (NullPool) and server-side prepared
+    statements are disabled, since consecutive statements may reach different
+    backends.
+    """
+    mode = os.getenv("DB_POOL_MODE", "internal").strip().lower() or "internal"
+    if mode not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE must be one of {', '.join(POOL_MODES)}")
+
+    if mode == "external":
+        options = {"poolclass": NullPool}
+        # psycopg2 never prepares server-side; psycopg 3 does after a few executions.
+        if (database_uri or "").startswith("postgresql+psycopg:"):
+            options["connect_args"] = {"prepare_threshold": None}
+        logger.info("Database pool: external pooler, no connections kept in process")
+        return options
+
+    sizing = pool_sizing()
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": _env_int("DB_POOL_SIZE", sizing["pool_size"]),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", sizing["max_overflow"]),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", DEFAULT_POOL_RECYCLE),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+    logger.info(
+        f"Database pool: size {options['pool_size']} + overflow {options['max_overflow']} per worker "
+        f"({worker_count()} workers), timeout {options['pool_timeout']}s, recycle {options['pool_recycle']}s"
+    )
+    return options
+
+
+def sqlite_engine_options(database_uri):
+    """Engine options for SQLite; file databases get the instrumented default pool"""
+    options = {"connect_args": {"check_same_thread": False}}
+    if ":memory:" not in database_uri and "mode=memory" not in database_uri:
+        options["poolclass"] = TimedQueuePool
+    return options
+
+
+def pool_status(engine):
+    """
+    Current usage of an engine's pool (per process)
+
+    Returns:
+        dict: class, size, checked_out, checked_in, overflow, max_overflow and
+              checkout wait figures when the pool records them
+    """
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # overflow() starts at -size and counts up as connections are opened
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    if isinstance(pool, TimedQueuePool):
+        status.update(pool.wait_stats())
+    return status
@@ -0,0 +1,85 @@
+"""
+Leader lease for SuperviseMe background processes
+A row in scheduler_lease names the one process allowed to run scheduled jobs;
+the holder renews it periodically and anyone may take it over once it expires
+"""
+
+import logging
+import os
+import socket
+import time
+import uuid
+
+from sqlalchemy import case, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from superviseme import db
+from superviseme.models import Scheduler_Lease
+
+logger = logging.getLogger(__name__)
+
+
+def make_owner_id():
+    """Identify this process in the lease table"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lease(name, owner, ttl, now=None):
+    """
+    Take or renew the lease called name for ttl seconds
+
+    Succeeds when nobody holds it, owner already holds it, or the previous
+    holder let it expire. The conditional UPDATE is atomic on SQLite and
+    PostgreSQL, so two processes never both succeed.
+
+    Returns:
+        bool: True if owner holds the lease afterwards
+    """
+    now = int(now if now is not None else time.time())
+    table = Scheduler_Lease.__table__
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            update(table)
+            .where(table.c.name == name, or_(table.c.owner == owner, table.c.expires_at < now))
+            .values(
+                owner=owner,
+                expires_at=now + ttl,
+                acquired_at=case((table.c.owner == owner, table.c.acquired_at), else_=now),
+            )
+        )
+        if result.rowcount:
+            return True
+
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(insert(table).values(name=name, owner=owner, acquired_at=now, expires_at=now + ttl))
+        logger.info(f"Lease {name} created by {owner}")
+        return True
+    except IntegrityError:
+        return False
+
+
+def release_lease(name, owner):
+    """Expire the lease right away if owner holds it, so another process can take over"""
+    table = Scheduler_Lease.__table__
+    with db.engine.begin() as conn:
+        conn.execute(update(table).where(table.c.name == name, table.c.owner == owner).values(expires_at=0))
+
+
+def get_lease(name, now=None):
+    """
+    Returns:
+        dict or None: owner, acquired_at, expires_at and whether it is still active
+    """
+    now = int(now if now is not None else time.time())
+    table = Scheduler_Lease.__table__
+    with db.engine.connect() as conn:
+        row = conn.execute(select(table).where(table.c.name == name)).mappings().first()
+    if row is None:
+        return None
+    return {
+        "owner": row["owner"],
+        "acquired_at": row["acquired_at"],
+        "expires_at": row["expires_at"],
+        "active": row["expires_at"] >= now,
+    }
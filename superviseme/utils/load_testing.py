@@ -0,0 +1,267 @@
+"""
+Load testing for SuperviseMe
+Drives a running server with concurrent scripted sessions (students, supervisors,
+admins, anonymous visitors) and summarizes throughput, latency and errors
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+from superviseme.utils.benchmarks import percentile
+
+logger = logging.getLogger(__name__)
+
+# Share of virtual users per role during term-start peaks
+DEFAULT_ROLE_MIX = {"student": 0.6, "supervisor": 0.2, "admin": 0.05, "anonymous": 0.15}
+
+REQUEST_TIMEOUT = 30
+THINK_TIME = (0.05, 0.3)
+
+Sample = namedtuple("Sample", ["step", "status", "latency_ms", "error"])
+
+_CSRF_META = re.compile(r'name="csrf-token" content="([^"]+)"')
+
+
+class VirtualUser:
+    """One logged-in (or anonymous) browser session running a role script in a loop"""
+
+    def __init__(self, base_url, role, account, context, rng, think_time=THINK_TIME):
+        self.base_url = base_url.rstrip("/")
+        self.role = role
+        self.account = account
+        self.context = context
+        self.rng = rng
+        self.think_time = think_time
+        self.http = requests.Session()
+        self.csrf_token = None
+        self.samples = []
+
+    def _request(self, step, method, path, ok=(200,), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.http.request(
+                method, f"{self.base_url}{path}", timeout=REQUEST_TIMEOUT, allow_redirects=False, **kwargs
+            )
+            status, error = response.status_code, response.status_code not in ok
+        except requests.RequestException:
+            response, status, error = None, 0, True
+        self.samples.append(Sample(step, status, (time.perf_counter() - started) * 1000, error))
+        return response
+
+    def _post(self, step, path, data):
+        return self._request(step, "POST", path, ok=(200, 302), data=data,
+                             headers={"X-CSRFToken": self.csrf_token or ""})
+
+    def _pause(self):
+        low, high = self.think_time
+        if high:
+            time.sleep(self.rng.uniform(low, high))
+
+    def login(self):
+        page = self._request("login_page", "GET", "/login")
+        match = _CSRF_META.search(page.text) if page is not None else None
+        self.csrf_token = match.group(1) if match else None
+        if self.account:
+            self._post("login", "/login", {
+                "email": self.account["email"], "password": self.account["password"], "csrf_token": self.csrf_token,
+            })
+
+    def _student(self):
+        thesis_id = self.account["thesis_id"]
+        self._request("student_dashboard", "GET", "/student/dashboard")
+        self._pause()
+        self._request("student_thesis", "GET", "/student/thesis")
+        self._pause()
+        if self.rng.random() < 0.3:
+            self._post("student_post_update", "/student/post_update", {
+                "thesis_id": thesis_id, "content": f"Load test progress note {self.rng.randrange(10**6)}",
+            })
+        self._request("unread_count", "GET", "/api/notifications/unread_count")
+
+    def _supervisor(self):
+        thesis_id = self.rng.choice(self.account["thesis_ids"])
+        self._request("supervisor_dashboard", "GET", "/supervisor/dashboard")
+        self._pause()
+        self._request("supervisor_thesis_detail", "GET", f"/supervisor/thesis/{thesis_id}")
+        self._pause()
+        if self.rng.random() < 0.2:
+            self._post("supervisor_post_update", "/supervisor/post_update", {
+                "thesis_id": thesis_id, "content": f"Load test feedback {self.rng.randrange(10**6)}",
+            })
+        self._request("notifications", "GET", "/api/notifications")
+
+    def _admin(self):
+        self._request("admin_users", "GET", "/admin/users_data?start=0&length=25")
+        self._pause()
+        self._request("admin_theses", "GET", "/admin/theses_data?start=0&length=25")
+        self._pause()
+        self._request("admin_dashboard", "GET", "/admin/dashboard")
+
+    def _anonymous(self):
+        self._request("public_catalogue", "GET", "/theses")
+        self._pause()
+        public_ids = self.context.get("public_thesis_ids") or []
+        if public_ids:
+            self._request("public_thesis_detail", "GET", f"/theses/{self.rng.choice(public_ids)}")
+            self._pause()
+        self._request("public_search", "GET", f"/theses?q={self.rng.choice(('data', 'model', 'graph'))}")
+
+    def run(self, deadline):
+        self.login()
+        script = getattr(self, f"_{self.role}")
+        while time.monotonic() < deadline:
+            script()
+            self._pause()
+        return self.samples
+
+
+def _run_client_process(base_url, assignments, context, duration, seed, think_time, ramp_up, concurrency):
+    """Worker process: run a group of virtual users in threads until the deadline"""
+    deadline = time.monotonic() + duration
+    results = []
+    lock = threading.Lock()
+
+    def _run(index, role, account):
+        # Stagger logins so start-up does not look like a credential-stuffing burst
+        time.sleep(ramp_up * index / concurrency)
+        user = VirtualUser(base_url, role, account, context, random.Random(f"{seed}:{index}"), think_time)
+        samples = user.run(deadline)
+        with lock:
+            results.extend(samples)
+
+    threads = [threading.Thread(target=_run, args=assignment) for assignment in assignments]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def assign_roles(concurrency, accounts, role_mix=None, seed=0):
+    """
+    Deterministically spread virtual users over roles and accounts
+
+    accounts: {"student": [...], "supervisor": [...], "admin": [...]} (anonymous needs none)
+
+    Returns:
+        list[tuple]: (index, role, account) per virtual user
+    """
+    role_mix = {role: share for role, share in (role_mix or DEFAULT_ROLE_MIX).items()
+                if share > 0 and (role == "anonymous" or accounts.get(role))}
+    rng = random.Random(seed)
+    roles = list(role_mix)
+    assignments = []
+    for index in range(concurrency):
+        # The first users cover every role, the rest follow the mix.
+        role = roles[index] if index < len(roles) else rng.choices(roles, [role_mix[r] for r in roles])[0]
+        pool = accounts.get(role) or [None]
+        assignments.append((index, role, pool[index % len(pool)]))
+    return assignments
+
+
+def summarize(samples, elapsed):
+    """Throughput, error rate and latency percentiles overall and per step"""
+    def _stats(group):
+        latencies = [sample.latency_ms for sample in group]
+        errors = sum(1 for sample in group if sample.error)
+        stats = {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4) if group else 0.0,
+        }
+        for pct in (50, 95, 99):
+            value = percentile(latencies, pct)
+            stats[f"p{pct}_ms"] = round(value, 2) if value is not None else None
+        return stats
+
+    by_step = {}
+    for sample in samples:
+        by_step.setdefault(sample.step, []).append(sample)
+    summary = _stats(samples)
+    summary["throughput_rps"] = round(len(samples) / elapsed, 2) if elapsed else 0.0
+    summary["steps"] = {step: _stats(group) for step, group in sorted(by_step.items())}
+    return summary
+
+
+class HealthSampler(threading.Thread):
+    """Poll /health during a run and keep the database pool figures it reports"""
+
+    def __init__(self, base_url, interval=1.0):
+        super().__init__(daemon=True)
+        self.url = f"{base_url.rstrip('/')}/health"
+        self.interval = interval
+        self.samples = []
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                pool = requests.get(self.url, timeout=5).json().get("database", {}).get("pool")
+            except (requests.RequestException, ValueError):
+                continue
+            if pool:
+                self.samples.append(pool)
+
+    def stop(self):
+        self._stopped.set()
+        self.join(timeout=5)
+
+    def summary(self):
+        """Peak pool usage seen; None when the server does not report pool metrics"""
+        if not self.samples:
+            return None
+        peak = {}
+        for sample in self.samples:
+            for key, value in sample.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    peak[key] = max(peak.get(key, value), value)
+        size = peak.get("size") or 0
+        checked_out = peak.get("checked_out", 0)
+        peak["saturation"] = round(checked_out / (size + peak.get("max_overflow", 0)), 3) if size else None
+        return peak
+
+
+def run_load(base_url, accounts, context, concurrency=8, duration=30, processes=None, role_mix=None,
+             seed=0, think_time=THINK_TIME, ramp_up=None):
+    """
+    Run concurrent virtual users against base_url for duration seconds
+
+    Returns:
+        dict: Summary with throughput, latency percentiles, error rates and pool peaks
+    """
+    assignments = assign_roles(concurrency, accounts, role_mix, seed)
+    processes = max(1, min(processes or 1, len(assignments)))
+    groups = [assignments[i::processes] for i in range(processes)]
+    ramp_up = min(5.0, duration / 4) if ramp_up is None else ramp_up
+    args = (context, duration, seed, think_time, ramp_up, concurrency)
+
+    sampler = HealthSampler(base_url)
+    sampler.start()
+    started = time.monotonic()
+    samples = []
+    if processes == 1:
+        samples = _run_client_process(base_url, groups[0], *args)
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(_run_client_process, base_url, group, *args) for group in groups]
+            for future in futures:
+                samples.extend(future.result())
+    elapsed = time.monotonic() - started
+    sampler.stop()
+
+    summary = summarize(samples, elapsed)
+    summary["concurrency"] = concurrency
+    summary["roles"] = {role: sum(1 for _, r, _ in assignments if r == role) for role in DEFAULT_ROLE_MIX}
+    summary["pool"] = sampler.summary()
+    logger.info(
+        f"Load run: {summary['requests']} requests, {summary['throughput_rps']} req/s, "
+        f"p95 {summary['p95_ms']} ms, error rate {summary['error_rate']}"
+    )
+    return summary
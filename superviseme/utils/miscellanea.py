@@ -4,11 +4,18 @@ from superviseme.models import (
 )
 
 from flask import redirect, url_for, abort
+from flask_login import current_user
 from superviseme.utils.logging_config import log_privilege_escalation_attempt
+from superviseme.utils.user_cache import UserPrincipal
 
 
 def check_privileges(username, role="admin"):
-    user = User_mgmt.query.filter_by(username=username).first()
+    # The logged-in user's cached principal already carries type and grants.
+    principal = current_user._get_current_object() if current_user else None
+    if isinstance(principal, UserPrincipal) and principal.username == username:
+        user = principal
+    else:
+        user = User_mgmt.query.filter_by(username=username).first()
     
     if not user:
         abort(404)
@@ -16,10 +23,7 @@ def check_privileges(username, role="admin"):
     # Handle the special case where a researcher might have supervisor privileges
     if role == "supervisor" and user.user_type == "researcher":
         # Check if the researcher has been granted supervisor role
-        supervisor_role = Supervisor_Role.query.filter_by(
-            researcher_id=user.id, active=True
-        ).first()
-        if supervisor_role:
+        if user_has_supervisor_role(user):
             return True
 
     if user.user_type != role:
@@ -42,6 +46,8 @@ def check_privileges(username, role="admin"):
 
 def user_has_supervisor_role(user):
     """Check if a researcher user has been granted supervisor privileges"""
+    if isinstance(user, UserPrincipal):
+        return user.has_supervisor_role
     if user.user_type == "supervisor":
         return True
     elif user.user_type == "researcher":
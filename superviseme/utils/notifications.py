@@ -110,9 +110,10 @@ def create_thesis_interest_notification(thesis_id, student_id, interest_message=
     # Never notify the same student that just expressed interest.
     recipient_ids.discard(student_id)
 
+    notifications = []
     for recipient_id in recipient_ids:
         action_url = build_role_aware_url(recipient_id, "thesis", thesis_id)
-        create_notification(
+        notifications.append(create_notification(
             recipient_id=recipient_id,
             actor_id=student_id,
             notification_type="thesis_interest",
@@ -120,7 +121,8 @@ def create_thesis_interest_notification(thesis_id, student_id, interest_message=
             message=message,
             thesis_id=thesis_id,
             action_url=action_url,
-        )
+            send_telegram=False,
+        ))
 
         recipient = User_mgmt.query.get(recipient_id)
         if recipient and recipient.email:
@@ -137,9 +139,11 @@ def create_thesis_interest_notification(thesis_id, student_id, interest_message=
                 text_body=body,
             )
 
+    dispatch_telegram_notifications(notifications)
+
 
 def create_notification(recipient_id, actor_id, notification_type, title, message, 
-                       thesis_id=None, action_url=None):
+                       thesis_id=None, action_url=None, send_telegram=True):
     """
     Create a new notification and send via enabled channels (in-app, Telegram)
     
@@ -151,6 +155,8 @@ def create_notification(recipient_id, actor_id, notification_type, title, messag
         message: Detailed notification message
         thesis_id: Optional thesis ID if notification relates to a thesis
         action_url: Optional URL to relevant page
+        send_telegram: If False, leave Telegram delivery to the caller
+            (used by fan-out helpers that dispatch a whole batch at once)
     """
     notification = Notification(
         recipient_id=recipient_id,
@@ -165,25 +171,36 @@ def create_notification(recipient_id, actor_id, notification_type, title, messag
     
     db.session.add(notification)
     db.session.commit()
+
+    if not send_telegram:
+        return notification
+    
+    # Telegram delivery is queued; hourly/daily notifications stay pending
+    # and go out with the next digest.
+    dispatch_telegram_notifications([notification])
     
-    # Send Telegram notification if enabled for user
+    return notification
+
+
+def dispatch_telegram_notifications(notifications):
+    """
+    Queue Telegram messages for a batch of notifications; delivery (including
+    rate-limit waits) runs on the dispatcher's background worker, not in the
+    request
+
+    Args:
+        notifications: Notifications created with send_telegram=False
+    """
+    if not notifications:
+        return
     try:
-        from superviseme.utils.telegram_service import send_telegram_notification
-        telegram_sent = send_telegram_notification(
-            recipient_id, notification_type, title, message, action_url
-        )
-        
-        if telegram_sent:
-            notification.telegram_sent = True
-            notification.telegram_sent_at = int(time.time())
-            db.session.commit()
-            
+        from superviseme.utils.telegram_dispatch import dispatch_notifications
+        results = dispatch_notifications(notifications, background=True)
+        logger.info(f"Telegram fan-out queued: {results}")
     except ImportError:
         logger.warning("Telegram service not available")
     except Exception as e:
-        logger.error(f"Failed to send Telegram notification: {e}")
-    
-    return notification
+        logger.error(f"Failed to dispatch Telegram notifications: {e}")
 
 
 def create_thesis_update_notification(thesis_id, student_id, update_content):
@@ -205,17 +222,21 @@ def create_thesis_update_notification(thesis_id, student_id, update_content):
     message = f"{student_name} posted a new update: {update_content[:100]}..."
     
     # Create notification for each supervisor with role-aware URL
+    notifications = []
     for supervisor_rel in supervisors:
         action_url = build_role_aware_url(supervisor_rel.supervisor_id, 'thesis', thesis_id)
-        create_notification(
+        notifications.append(create_notification(
             recipient_id=supervisor_rel.supervisor_id,
             actor_id=student_id,
             notification_type="new_update",
             title=title,
             message=message,
             thesis_id=thesis_id,
-            action_url=action_url
-        )
+            action_url=action_url,
+            send_telegram=False
+        ))
+
+    dispatch_telegram_notifications(notifications)
 
 
 def create_supervisor_feedback_notification(thesis_id, supervisor_id, feedback_content):
@@ -285,18 +306,21 @@ def create_thesis_status_change_notification(thesis_id, changer_id, new_status):
     title = f"Thesis status updated: {thesis.title}"
     message = f"{changer_name} changed the status to '{new_status}'"
     
+    notifications = []
+
     # Notify student with role-aware URL
     if thesis.author_id:
         action_url = build_role_aware_url(thesis.author_id, 'thesis', thesis_id)
-        create_notification(
+        notifications.append(create_notification(
             recipient_id=thesis.author_id,
             actor_id=changer_id,
             notification_type="status_change",
             title=title,
             message=message,
             thesis_id=thesis_id,
-            action_url=action_url
-        )
+            action_url=action_url,
+            send_telegram=False
+        ))
     
     # Notify supervisors with role-aware URLs
     from superviseme.models import Thesis_Supervisor
@@ -305,15 +329,18 @@ def create_thesis_status_change_notification(thesis_id, changer_id, new_status):
     for supervisor_rel in supervisors:
         if supervisor_rel.supervisor_id != changer_id:  # Don't notify the person who made the change
             action_url = build_role_aware_url(supervisor_rel.supervisor_id, 'thesis', thesis_id)
-            create_notification(
+            notifications.append(create_notification(
                 recipient_id=supervisor_rel.supervisor_id,
                 actor_id=changer_id,
                 notification_type="status_change",
                 title=title,
                 message=message,
                 thesis_id=thesis_id,
-                action_url=action_url
-            )
+                action_url=action_url,
+                send_telegram=False
+            ))
+
+    dispatch_telegram_notifications(notifications)
 
 
 def get_user_notifications(user_id, limit=10, unread_only=False):
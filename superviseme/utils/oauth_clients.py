@@ -0,0 +1,59 @@
+"""
+OAuth clients for SuperviseMe
+Registers the Google and ORCID clients on first use, so processes that never
+handle a social login do not import authlib
+"""
+
+import logging
+import os
+import threading
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+_REGISTRY_KEY = "authlib.integrations.flask_client"
+_lock = threading.Lock()
+
+
+def _build_registry(app):
+    from authlib.integrations.flask_client import OAuth
+
+    registry = OAuth(app)
+
+    # Configure Google OAuth
+    registry.register(
+        name='google',
+        client_id=os.getenv("GOOGLE_CLIENT_ID"),
+        client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
+        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+        client_kwargs={'scope': 'openid email profile'}
+    )
+
+    # Configure ORCID OAuth
+    registry.register(
+        name='orcid',
+        client_id=os.getenv("ORCID_CLIENT_ID"),
+        client_secret=os.getenv("ORCID_CLIENT_SECRET"),
+        access_token_url='https://orcid.org/oauth/token',
+        authorize_url='https://orcid.org/oauth/authorize',
+        api_base_url='https://pub.orcid.org/v3.0/',
+        client_kwargs={'scope': app.config["ORCID_SCOPE"]}
+    )
+    logger.debug("OAuth clients registered")
+    return registry
+
+
+class LazyOAuth:
+    """
+    Stands in for authlib's OAuth registry (oauth.google, oauth.orcid) and
+    builds the current app's registry the first time a client is needed
+    """
+
+    def __getattr__(self, name):
+        app = current_app._get_current_object()
+        registry = app.extensions.get(_REGISTRY_KEY)
+        if registry is None:
+            with _lock:
+                registry = app.extensions.get(_REGISTRY_KEY) or _build_registry(app)
+        return getattr(registry, name)
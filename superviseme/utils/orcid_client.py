@@ -1,12 +1,50 @@
 import requests
 import json
+import logging
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from urllib3.util.retry import Retry
 from superviseme.models import OrcidActivity
 from superviseme import db
+from superviseme.utils.process_lifecycle import on_fork_child
 from flask import current_app
 
+logger = logging.getLogger(__name__)
+
 ORCID_API_BASE = "https://pub.orcid.org/v3.0"
 
+# Activity sections fetched on every sync, in display order
+ORCID_SECTIONS = ("works", "employments", "educations", "fundings")
+
+# Explicit (connect, read) timeouts so a slow ORCID never pins a web worker
+ORCID_CONNECT_TIMEOUT = 3.05
+ORCID_READ_TIMEOUT = 10
+
+# Retries for connection errors and 429/5xx responses, with exponential backoff
+ORCID_MAX_RETRIES = 3
+ORCID_BACKOFF_FACTOR = 0.5
+ORCID_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+ORCID_POOL_SIZE = 10
+
+SectionResult = namedtuple("SectionResult", ["status_code", "data", "error", "etag"])
+
+_session = None
+_session_lock = threading.Lock()
+
+def _put_code(summary):
+    put_code = summary.get('put-code')
+    return str(put_code) if put_code is not None else None
+
+
+def _last_modified(obj):
+    last_modified = (obj or {}).get('last-modified-date') or {}
+    return last_modified.get('value')
+
+
 def parse_works(user, data):
     activities = []
     groups = data.get('group', [])
@@ -53,6 +91,8 @@ def parse_works(user, data):
             publication_date=publication_date,
             url=url_val[:500] if url_val else None,
             external_ids=json.dumps(ext_ids),
+            put_code=_put_code(work),
+            last_modified=_last_modified(work),
             created_at=int(time.time()),
             updated_at=int(time.time())
         )
@@ -106,6 +146,8 @@ def parse_affiliations(user, data, type_category):
             publication_date=publication_date,
             url=url_val[:500] if url_val else None,
             external_ids=json.dumps([]),
+            put_code=_put_code(summary_obj),
+            last_modified=_last_modified(summary_obj),
             created_at=int(time.time()),
             updated_at=int(time.time())
         )
@@ -160,15 +202,199 @@ def parse_fundings(user, data):
             publication_date=publication_date,
             url=url_val[:500] if url_val else None,
             external_ids=json.dumps(ext_ids),
+            put_code=_put_code(summary),
+            last_modified=_last_modified(summary),
             created_at=int(time.time()),
             updated_at=int(time.time())
         )
         activities.append(activity)
     return activities
 
-def fetch_orcid_activities(user):
+def build_orcid_session(max_retries=ORCID_MAX_RETRIES, backoff_factor=ORCID_BACKOFF_FACTOR):
+    """
+    Build a pooled requests.Session that retries connection errors and
+    429/5xx responses with exponential backoff (honouring Retry-After).
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=ORCID_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = requests.adapters.HTTPAdapter(pool_connections=ORCID_POOL_SIZE, pool_maxsize=ORCID_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_orcid_session():
+    """Return the process-wide ORCID session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_orcid_session()
+        return _session
+
+
+@on_fork_child
+def _reset_orcid_session():
+    # Pooled keep-alive sockets must not be shared with the parent process
+    global _session, _session_lock
+    _session = None
+    _session_lock = threading.Lock()
+
+
+def _fetch_section(session, orcid_id, section, headers):
+    """
+    Fetch one ORCID activity section.
+
+    Returns a SectionResult. data is only set for 200 responses, a 304
+    (conditional request matched) carries neither data nor error, and
+    status_code is None when the request itself failed.
+    """
+    try:
+        resp = session.get(
+            f"{ORCID_API_BASE}/{orcid_id}/{section}",
+            headers=headers,
+            timeout=(ORCID_CONNECT_TIMEOUT, ORCID_READ_TIMEOUT),
+        )
+        etag = resp.headers.get("ETag") if resp.status_code in (200, 304) else None
+        if resp.status_code == 200:
+            return SectionResult(resp.status_code, resp.json(), None, etag)
+        if resp.status_code == 304:
+            return SectionResult(resp.status_code, None, None, etag)
+        return SectionResult(resp.status_code, None, f"HTTP {resp.status_code}", None)
+    except Exception as e:
+        logger.error(f"Error fetching ORCID {section} for {orcid_id}: {e}")
+        return SectionResult(None, None, str(e), None)
+
+
+def fetch_orcid_sections(orcid_id, headers, sections=ORCID_SECTIONS, session=None, section_headers=None):
+    """
+    Fetch several ORCID activity sections concurrently on a pooled session.
+
+    Sync latency is bounded by the slowest section rather than the sum of
+    all of them. A failing section does not affect the others.
+
+    Args:
+        section_headers: Optional per-section extra headers (e.g. conditional
+            If-None-Match / If-Modified-Since), merged over ``headers``
+
+    Returns:
+        dict: section name -> SectionResult
+    """
+    session = session or get_orcid_session()
+    section_headers = section_headers or {}
+    with ThreadPoolExecutor(max_workers=len(sections), thread_name_prefix="orcid-fetch") as pool:
+        futures = {
+            section: pool.submit(
+                _fetch_section, session, orcid_id, section, {**headers, **section_headers.get(section, {})}
+            )
+            for section in sections
+        }
+        return {section: future.result() for section, future in futures.items()}
+
+
+# Parser turning each section's JSON payload into OrcidActivity rows
+SECTION_PARSERS = {
+    "works": lambda user, data: parse_works(user, data),
+    "employments": lambda user, data: parse_affiliations(user, data, 'employment'),
+    "educations": lambda user, data: parse_affiliations(user, data, 'education'),
+    "fundings": lambda user, data: parse_fundings(user, data),
+}
+
+# Works are stored under their ORCID work type; everything else has a fixed type
+NON_WORK_TYPES = ('employment', 'education', 'funding')
+
+# Columns compared when deciding whether a stored activity needs an update
+SYNCED_FIELDS = ('title', 'type', 'organization', 'publication_date', 'url', 'external_ids', 'last_modified')
+
+
+def _section_filter(section):
+    """SQL filter selecting the stored activities that came from a section."""
+    if section == "works":
+        return OrcidActivity.type.notin_(NON_WORK_TYPES)
+    return OrcidActivity.type == section[:-1]
+
+
+def load_sync_state(user):
+    """Return the per-section sync state stored on the user (empty if unset)."""
+    try:
+        state = json.loads(user.orcid_sync_state or "{}")
+    except (TypeError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _conditional_headers(section_state):
+    """Build conditional request headers from a section's previous sync."""
+    headers = {}
+    if section_state.get("etag"):
+        headers["If-None-Match"] = section_state["etag"]
+    if section_state.get("last_modified"):
+        headers["If-Modified-Since"] = formatdate(section_state["last_modified"] / 1000, usegmt=True)
+    return headers
+
+
+def diff_section(existing, incoming):
+    """
+    Compare stored activities of one section against freshly parsed ones.
+
+    Items are matched on their ORCID put-code. Stored rows without a
+    put-code (synced before incremental sync existed) are always replaced.
+
+    Returns:
+        tuple: (activities to insert, update mappings, ids to delete)
+    """
+    stored_by_put_code = {}
+    removed_ids = []
+    for activity in existing:
+        if activity.put_code and activity.put_code not in stored_by_put_code:
+            stored_by_put_code[activity.put_code] = activity
+        else:
+            removed_ids.append(activity.id)
+
+    inserts = []
+    updates = []
+    seen = set()
+    now = int(time.time())
+    for activity in incoming:
+        stored = stored_by_put_code.get(activity.put_code) if activity.put_code else None
+        if stored is None or activity.put_code in seen:
+            inserts.append(activity)
+            continue
+        seen.add(activity.put_code)
+        changes = {
+            field: getattr(activity, field)
+            for field in SYNCED_FIELDS
+            if getattr(stored, field) != getattr(activity, field)
+        }
+        if changes:
+            changes.update(id=stored.id, updated_at=now)
+            updates.append(changes)
+
+    removed_ids.extend(a.id for put_code, a in stored_by_put_code.items() if put_code not in seen)
+    return inserts, updates, removed_ids
+
+
+def fetch_orcid_activities(user, force=False):
     """
     Fetches activities (works, affiliations, funding) from ORCID for the given user.
+
+    Sections are fetched concurrently with conditional requests; sections
+    that ORCID reports as unchanged are skipped. Changed sections are diffed
+    against stored activities by put-code and applied as bulk inserts,
+    updates and deletes, so unchanged rows keep their IDs. A section that
+    fails to fetch keeps its previously synced items.
+
+    Args:
+        force: Ignore the stored sync state and diff every section
     """
     if not user.orcid_id:
         return {"success": False, "message": "User has no ORCID iD linked."}
@@ -177,53 +403,101 @@ def fetch_orcid_activities(user):
     if user.orcid_access_token:
         headers["Authorization"] = f"Bearer {user.orcid_access_token}"
 
-    all_activities = []
+    state = {} if force else load_sync_state(user)
+    section_headers = {
+        section: _conditional_headers(state.get(section) or {}) for section in ORCID_SECTIONS
+    }
+
     errors = []
+    unchanged = []
+    changed = {}
+    new_state = dict(state)
 
-    # 1. Works
+    for section, result in fetch_orcid_sections(user.orcid_id, headers, section_headers=section_headers).items():
+        if result.status_code == 304:
+            unchanged.append(section)
+            continue
+        if result.data is not None:
+            last_modified = _last_modified(result.data)
+            previous = state.get(section) or {}
+            if last_modified and previous.get("last_modified") == last_modified:
+                unchanged.append(section)
+                continue
+            changed[section] = SECTION_PARSERS[section](user, result.data)
+            new_state[section] = {"etag": result.etag, "last_modified": last_modified}
+        elif result.status_code == 401:
+            errors.append(f"Unauthorized access for {section.capitalize()}")
+        elif result.status_code != 404:
+            errors.append(f"Could not fetch {section} ({result.error})")
+
+    if not changed and not unchanged:
+        return {"success": False, "message": "Failed to sync: " + ("; ".join(errors) or "no data returned")}
+
+    totals = {"inserted": 0, "updated": 0, "removed": 0}
     try:
-        resp = requests.get(f"{ORCID_API_BASE}/{user.orcid_id}/works", headers=headers)
-        if resp.status_code == 200:
-            all_activities.extend(parse_works(user, resp.json()))
-        elif resp.status_code == 401:
-            errors.append("Unauthorized access for Works")
-    except Exception as e:
-        current_app.logger.error(f"Error fetching works: {e}")
+        for section, incoming in changed.items():
+            existing = OrcidActivity.query.filter(OrcidActivity.user_id == user.id, _section_filter(section)).all()
+            inserts, updates, removed_ids = diff_section(existing, incoming)
+
+            if removed_ids:
+                OrcidActivity.query.filter(OrcidActivity.id.in_(removed_ids)).delete(synchronize_session="fetch")
+            if updates:
+                db.session.bulk_update_mappings(OrcidActivity, updates)
+            if inserts:
+                db.session.add_all(inserts)
+
+            totals["inserted"] += len(inserts)
+            totals["updated"] += len(updates)
+            totals["removed"] += len(removed_ids)
+
+        new_state["synced_at"] = int(time.time())
+        user.orcid_sync_state = json.dumps(new_state)
+        db.session.commit()
 
-    # 2. Employment
-    try:
-        resp = requests.get(f"{ORCID_API_BASE}/{user.orcid_id}/employments", headers=headers)
-        if resp.status_code == 200:
-            all_activities.extend(parse_affiliations(user, resp.json(), 'employment'))
+        message = (
+            f"Successfully synced ORCID activities: {totals['inserted']} added, "
+            f"{totals['updated']} updated, {totals['removed']} removed."
+        )
+        if unchanged:
+            message += f" {len(unchanged)} section(s) unchanged."
+        if errors:
+            message += " Some sections could not be refreshed: " + "; ".join(errors)
+        return {"success": True, "message": message, **totals}
     except Exception as e:
-        current_app.logger.error(f"Error fetching employments: {e}")
+        db.session.rollback()
+        current_app.logger.error(f"Database error: {e}")
+        return {"success": False, "message": "Database error during sync."}
 
-    # 3. Education
-    try:
-        resp = requests.get(f"{ORCID_API_BASE}/{user.orcid_id}/educations", headers=headers)
-        if resp.status_code == 200:
-            all_activities.extend(parse_affiliations(user, resp.json(), 'education'))
-    except Exception as e:
-        current_app.logger.error(f"Error fetching educations: {e}")
 
-    # 4. Funding
-    try:
-        resp = requests.get(f"{ORCID_API_BASE}/{user.orcid_id}/fundings", headers=headers)
-        if resp.status_code == 200:
-            all_activities.extend(parse_fundings(user, resp.json()))
-    except Exception as e:
-        current_app.logger.error(f"Error fetching fundings: {e}")
+def sync_all_orcid_profiles():
+    """
+    Incrementally sync every user with a linked ORCID iD.
 
-    if not all_activities and errors:
-        return {"success": False, "message": "Failed to sync: " + "; ".join(errors)}
+    Meant for the background scheduler, so connected profiles stay fresh
+    without users pressing "sync". Users are synced one at a time; each
+    sync already fetches its sections concurrently.
 
-    try:
-        OrcidActivity.query.filter_by(user_id=user.id).delete()
-        if all_activities:
-            db.session.add_all(all_activities)
-        db.session.commit()
-        return {"success": True, "message": f"Successfully synced {len(all_activities)} items (Works, Affiliations, Funding)."}
-    except Exception as e:
-        db.session.rollback()
-        current_app.logger.error(f"Database error: {e}")
-        return {"success": False, "message": "Database error during sync."}
+    Returns:
+        dict: Counts of synced/failed profiles and aggregated row changes
+    """
+    from superviseme.models import User_mgmt
+
+    results = {"profiles": 0, "synced": 0, "failed": 0, "inserted": 0, "updated": 0, "removed": 0}
+    user_ids = [
+        user_id for (user_id,) in
+        db.session.query(User_mgmt.id).filter(User_mgmt.orcid_id.isnot(None), User_mgmt.orcid_id != "").all()
+    ]
+    for user_id in user_ids:
+        user = db.session.get(User_mgmt, user_id)
+        if not user:
+            continue
+        results["profiles"] += 1
+        result = fetch_orcid_activities(user)
+        if result["success"]:
+            results["synced"] += 1
+            for key in ("inserted", "updated", "removed"):
+                results[key] += result.get(key, 0)
+        else:
+            results["failed"] += 1
+            logger.warning(f"ORCID sync failed for user {user_id}: {result['message']}")
+    return results
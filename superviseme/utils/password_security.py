@@ -0,0 +1,232 @@
+"""
+Password hashing and login throttling for SuperviseMe
+Rate limits login attempts per IP and per account and upgrades stored
+hashes to the configured cost
+"""
+
+import logging
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from superviseme import db
+from superviseme.models import Login_Rate_Limit
+from superviseme.utils.process_lifecycle import on_fork_child
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PASSWORD_HASH_METHOD = "pbkdf2:sha256"
+
+# "<attempts>/<seconds>": attempts allowed in a burst, refilled over the window
+DEFAULT_LOGIN_RATE_LIMIT_IP = "20/300"
+DEFAULT_LOGIN_RATE_LIMIT_ACCOUNT = "5/300"
+
+# Longer keys (e.g. a junk email) are truncated to the column size
+RATE_LIMIT_KEY_LENGTH = 255
+
+# Every Nth new bucket in a process deletes the buckets that have refilled
+# completely, which are equivalent to no row at all
+RATE_LIMIT_PRUNE_EVERY = 100
+
+# werkzeug's scrypt defaults, used to normalize a bare "scrypt" method
+SCRYPT_DEFAULTS = ("32768", "8", "1")
+
+
+def normalize_hash_method(method):
+    """
+    Expand a werkzeug hash method to the explicit form it stores in a hash,
+    e.g. "pbkdf2:sha256" -> "pbkdf2:sha256:1000000"
+    """
+    parts = (method or DEFAULT_PASSWORD_HASH_METHOD).split(":")
+    if parts[0] == "pbkdf2":
+        digest = parts[1] if len(parts) > 1 else "sha256"
+        iterations = parts[2] if len(parts) > 2 else str(DEFAULT_PBKDF2_ITERATIONS)
+        return f"pbkdf2:{digest}:{iterations}"
+    if parts[0] == "scrypt":
+        params = list(parts[1:]) + list(SCRYPT_DEFAULTS[len(parts) - 1:])
+        return "scrypt:" + ":".join(params[:3])
+    return method
+
+
+def get_hash_method():
+    return current_app.config.get("PASSWORD_HASH_METHOD") or DEFAULT_PASSWORD_HASH_METHOD
+
+
+def hash_password(password):
+    """Hash a password with the configured method and cost"""
+    return generate_password_hash(password, method=get_hash_method())
+
+
+def needs_rehash(pwhash):
+    """Check whether a stored hash uses a different method or cost than configured"""
+    if not pwhash or "$" not in pwhash:
+        return True
+    return pwhash.split("$", 1)[0] != normalize_hash_method(get_hash_method())
+
+
+class RateLimiter:
+    """
+    Non-blocking keyed token bucket shared by every worker
+
+    Each key starts with ``capacity`` tokens and regains them at
+    ``capacity / period`` tokens per second. Buckets are login_rate_limit
+    rows updated in one statement, so the limit holds across gunicorn
+    workers and hosts; they use wall-clock time, so keep hosts
+    NTP-synchronised. If the table cannot be reached the limiter lets
+    attempts through (the login itself needs the database anyway).
+    """
+
+    def __init__(self, scope, capacity, period):
+        self.scope = scope
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.rate = self.capacity / self.period
+        self._created = 0
+
+    def _row(self, key):
+        table = Login_Rate_Limit.__table__
+        return (table.c.scope == self.scope) & (table.c.key == key[:RATE_LIMIT_KEY_LENGTH])
+
+    def _take(self, key):
+        table = Login_Rate_Limit.__table__
+        now = time.time()
+        refilled = table.c.tokens + (now - table.c.updated_at) * self.rate
+        tokens = case((refilled > self.capacity, self.capacity), else_=refilled)
+        with db.engine.begin() as connection:
+            if connection.execute(
+                update(table).where(self._row(key), tokens >= 1).values(tokens=tokens - 1, updated_at=now)
+            ).rowcount:
+                return True
+            if connection.execute(select(table.c.tokens).where(self._row(key))).first() is not None:
+                return False
+            connection.execute(insert(table).values(
+                scope=self.scope, key=key[:RATE_LIMIT_KEY_LENGTH], tokens=self.capacity - 1, updated_at=now,
+            ))
+            self._created += 1
+            if self._created % RATE_LIMIT_PRUNE_EVERY == 0:
+                connection.execute(delete(table).where(
+                    table.c.scope == self.scope, table.c.updated_at < now - self.period,
+                ))
+            return True
+
+    def is_limited(self, key):
+        """Check whether a key has run out of tokens, without consuming one"""
+        table = Login_Rate_Limit.__table__
+        try:
+            with db.engine.connect() as connection:
+                row = connection.execute(select(table.c.tokens, table.c.updated_at).where(self._row(key))).first()
+        except SQLAlchemyError as e:
+            logger.warning(f"Login rate limit check failed: {e}")
+            return False
+        return row is not None and row.tokens + (time.time() - row.updated_at) * self.rate < 1
+
+    def hit(self, key):
+        """Consume a token; returns False if none was available"""
+        try:
+            try:
+                return self._take(key)
+            except IntegrityError:
+                # Another worker created the bucket first; take from that one
+                return self._take(key)
+        except SQLAlchemyError as e:
+            logger.warning(f"Login rate limit update failed: {e}")
+            return True
+
+    def reset(self, key=None):
+        table = Login_Rate_Limit.__table__
+        condition = self._row(key) if key is not None else table.c.scope == self.scope
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(delete(table).where(condition))
+        except SQLAlchemyError as e:
+            logger.warning(f"Login rate limit reset failed: {e}")
+
+
+def _parse_rate(value, default):
+    try:
+        attempts, seconds = (value or default).split("/")
+        return int(attempts), int(seconds)
+    except ValueError:
+        logger.warning(f"Ignoring malformed login rate limit {value!r}; using {default}")
+        attempts, seconds = default.split("/")
+        return int(attempts), int(seconds)
+
+
+class LoginGuard:
+    """
+    Login protection: IP and account limiters shared by all workers
+
+    Hashes are checked on the request thread. With sync gunicorn workers
+    the number of concurrent checks is already bounded by the worker count;
+    the limiters keep a burst from reaching the hash at all.
+    """
+
+    def __init__(self, config):
+        self.ip_limiter = RateLimiter(
+            "ip", *_parse_rate(config.get("LOGIN_RATE_LIMIT_IP"), DEFAULT_LOGIN_RATE_LIMIT_IP)
+        )
+        self.account_limiter = RateLimiter(
+            "account", *_parse_rate(config.get("LOGIN_RATE_LIMIT_ACCOUNT"), DEFAULT_LOGIN_RATE_LIMIT_ACCOUNT)
+        )
+
+    def check_rate_limit(self, ip_address, account):
+        """
+        Count a login attempt against the client IP and check the account
+
+        Returns:
+            None if the attempt may proceed, otherwise "ip" or "account"
+        """
+        if not self.ip_limiter.hit(ip_address or "unknown"):
+            return "ip"
+        if account and self.account_limiter.is_limited(account.lower()):
+            return "account"
+        return None
+
+    def record_failure(self, account):
+        """Only failed attempts count against an account, so its owner is not locked out by success"""
+        if account:
+            self.account_limiter.hit(account.lower())
+
+    def record_success(self, account):
+        if account:
+            self.account_limiter.reset(account.lower())
+
+    def verify_and_upgrade(self, user, password):
+        """
+        Verify a user's password and, on success, transparently rehash it
+        if it was stored with an outdated method or cost
+
+        The caller commits the session.
+        """
+        if not user.password or not check_password_hash(user.password, password):
+            return False
+
+        if needs_rehash(user.password):
+            user.password = hash_password(password)
+            logger.info(f"Upgraded password hash for user {user.id} to {get_hash_method()}")
+        return True
+
+
+_login_guard = None
+_login_guard_lock = threading.Lock()
+
+
+def get_login_guard():
+    """Get the per-process LoginGuard, configured from the current app (its buckets are shared)"""
+    global _login_guard
+    with _login_guard_lock:
+        if _login_guard is None:
+            _login_guard = LoginGuard(current_app.config)
+        return _login_guard
+
+
+@on_fork_child
+def _reset_login_guard():
+    # Locks are not shared across fork; build a new guard on first use
+    global _login_guard, _login_guard_lock
+    _login_guard = None
+    _login_guard_lock = threading.Lock()
@@ -0,0 +1,96 @@
+"""
+Process lifecycle hooks for SuperviseMe
+Lets gunicorn preload the app in the master: fork-sensitive resources
+(engine pools, scheduler, HTTP sessions, thread pools) start in each worker
+"""
+
+import logging
+import os
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+_apps = weakref.WeakSet()
+_child_resets = []
+_deferred = []
+_deferring = False
+_lock = threading.Lock()
+
+
+def register_app(app):
+    """Track an app so its engines can be disposed around fork"""
+    _apps.add(app)
+
+
+def on_fork_child(func):
+    """
+    Register func to run in every forked child before it does anything else
+
+    Used by modules holding per-process singletons (thread pools, sessions,
+    locks) to drop the copies inherited from the parent. Usable as a decorator.
+    """
+    _child_resets.append(func)
+    return func
+
+
+def defer_until_fork():
+    """Queue run_in_worker callbacks until post_fork_worker (gunicorn on_starting)"""
+    global _deferring
+    _deferring = True
+
+
+def run_in_worker(func, *args):
+    """Run func now, or in each worker after fork when the app is being preloaded"""
+    with _lock:
+        if _deferring:
+            _deferred.append((func, args))
+            return
+    func(*args)
+
+
+def _engines(app):
+    from superviseme import db
+
+    with app.app_context():
+        return list(db.engines.values())
+
+
+def dispose_in_parent():
+    """
+    Close every pooled connection the master opened while preloading, so no
+    worker inherits a socket the master (or a sibling) is also using
+    """
+    for app in list(_apps):
+        for engine in _engines(app):
+            engine.dispose()
+    logger.debug("Disposed database pools before forking workers")
+
+
+def _reset_in_child():
+    global _lock
+    _lock = threading.Lock()
+    for app in list(_apps):
+        for engine in _engines(app):
+            # close=False: the parent still owns those sockets; just forget them
+            engine.dispose(close=False)
+    for reset in _child_resets:
+        try:
+            reset()
+        except Exception as e:
+            logger.error(f"Fork reset {reset.__module__}.{reset.__name__} failed: {e}")
+
+
+def post_fork_worker():
+    """Start what run_in_worker deferred (gunicorn post_fork)"""
+    global _deferring
+    with _lock:
+        _deferring = False
+        pending = list(_deferred)
+        _deferred.clear()
+    for func, args in pending:
+        func(*args)
+    logger.info(f"Worker {os.getpid()} started {len(pending)} deferred service(s)")
+
+
+os.register_at_fork(after_in_child=_reset_in_child)
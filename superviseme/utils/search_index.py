@@ -0,0 +1,344 @@
+"""
+Full-text search for SuperviseMe
+Indexes updates, meeting notes, todos, objectives, hypotheses and resources of
+theses and research projects in search_document, and searches them with FTS5
+(SQLite) or tsvector (PostgreSQL) within what the user is allowed to see
+"""
+
+import logging
+import math
+import re
+import time
+import weakref
+from collections import namedtuple
+
+from markupsafe import Markup, escape
+from sqlalchemy import (
+    and_,
+    delete,
+    event,
+    false,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    union,
+)
+
+from superviseme import db
+from superviseme.models import (
+    MeetingNote,
+    ResearchProject,
+    ResearchProject_Collaborator,
+    ResearchProject_Hypothesis,
+    ResearchProject_MeetingNote,
+    ResearchProject_Objective,
+    ResearchProject_Resource,
+    ResearchProject_Todo,
+    ResearchProject_Update,
+    Resource,
+    Search_Document,
+    Thesis,
+    Thesis_Hypothesis,
+    Thesis_Objective,
+    Thesis_Supervisor,
+    Thesis_Update,
+    Todo,
+)
+from superviseme.utils.miscellanea import user_has_supervisor_role
+
+logger = logging.getLogger(__name__)
+
+# scope: "thesis" or "project"; title: attribute or None; body: attributes joined with a space
+SearchSource = namedtuple("SearchSource", ["model", "scope", "title", "body"])
+
+# source_type -> indexed model (migration 0012 backfills the same columns)
+SEARCH_SOURCES = {
+    "update": SearchSource(Thesis_Update, "thesis", None, ("content",)),
+    "meeting_note": SearchSource(MeetingNote, "thesis", "title", ("content",)),
+    "todo": SearchSource(Todo, "thesis", "title", ("description",)),
+    "objective": SearchSource(Thesis_Objective, "thesis", "title", ("description",)),
+    "hypothesis": SearchSource(Thesis_Hypothesis, "thesis", "title", ("description",)),
+    "resource": SearchSource(Resource, "thesis", "resource_type", ("description", "resource_url")),
+    "project_update": SearchSource(ResearchProject_Update, "project", None, ("content",)),
+    "project_meeting_note": SearchSource(ResearchProject_MeetingNote, "project", "title", ("content",)),
+    "project_todo": SearchSource(ResearchProject_Todo, "project", "title", ("description",)),
+    "project_objective": SearchSource(ResearchProject_Objective, "project", "title", ("description",)),
+    "project_hypothesis": SearchSource(ResearchProject_Hypothesis, "project", "title", ("description",)),
+    "project_resource": SearchSource(ResearchProject_Resource, "project", "resource_type",
+                                     ("description", "resource_url")),
+}
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 50
+MAX_QUERY_TERMS = 8
+SNIPPET_WORDS = 16
+
+# Thesis / user lists on the search pages are capped at this many rows
+SEARCH_LIST_LIMIT = 50
+
+# Private-use characters around matches; escaped text never contains them
+MATCH_START = "\ue000"
+MATCH_END = "\ue001"
+
+TERM_RE = re.compile(r"[^\W_]+")
+
+SearchPage = namedtuple("SearchPage", ["results", "total", "page", "per_page", "pages"])
+
+_search_document = Search_Document.__table__
+_search_fts = table("search_fts")
+_fts_tables = weakref.WeakKeyDictionary()
+
+
+def _document_values(source_type, target):
+    source = SEARCH_SOURCES[source_type]
+    body = " ".join(str(value) for value in (getattr(target, attr) for attr in source.body) if value)
+    title = getattr(target, source.title) if source.title else None
+    return {
+        "source_type": source_type,
+        "source_id": target.id,
+        "thesis_id": target.thesis_id if source.scope == "thesis" else None,
+        "project_id": target.project_id if source.scope == "project" else None,
+        "author_id": getattr(target, "author_id", None),
+        "title": title[:255] if title else None,
+        "body": body,
+        "created_at": target.created_at or int(time.time()),
+    }
+
+
+def _make_listeners(source_type):
+    def _on_write(mapper, connection, target):
+        # Delete + insert keeps the FTS5 triggers and the generated tsvector simple
+        connection.execute(delete(_search_document).where(
+            _search_document.c.source_type == source_type, _search_document.c.source_id == target.id
+        ))
+        connection.execute(insert(_search_document).values(_document_values(source_type, target)))
+
+    def _on_delete(mapper, connection, target):
+        connection.execute(delete(_search_document).where(
+            _search_document.c.source_type == source_type, _search_document.c.source_id == target.id
+        ))
+
+    return _on_write, _on_delete
+
+
+def purge_orphaned_documents(tables=None):
+    """
+    Remove documents whose source row no longer exists
+
+    Bulk deletes (e.g. cascade_delete) bypass the ORM listeners that normally
+    do this. Pass the affected table names to only check those sources.
+
+    Returns:
+        int: Documents removed
+    """
+    removed = 0
+    for source_type, source in SEARCH_SOURCES.items():
+        if tables is not None and source.model.__tablename__ not in tables:
+            continue
+        removed += db.session.execute(
+            delete(_search_document)
+            .where(
+                _search_document.c.source_type == source_type,
+                _search_document.c.source_id.notin_(select(source.model.id)),
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    return removed
+
+
+def rebuild_search_index():
+    """
+    Re-create every document from its source rows; the caller commits
+
+    Returns:
+        int: Documents indexed
+    """
+    db.session.execute(delete(_search_document).execution_options(synchronize_session=False))
+    indexed = 0
+    for source_type, source in SEARCH_SOURCES.items():
+        rows = [_document_values(source_type, target) for target in db.session.scalars(select(source.model))]
+        if rows:
+            db.session.execute(insert(_search_document), rows)
+        indexed += len(rows)
+    logger.info(f"Rebuilt search index: {indexed} documents")
+    return indexed
+
+
+def _query_terms(query):
+    return [term.lower() for term in TERM_RE.findall(query or "")][:MAX_QUERY_TERMS]
+
+
+def _scope_clause(user):
+    """What the user may see: everything for admins, else their theses and projects"""
+    if user.user_type == "admin":
+        return None
+
+    doc = _search_document.c
+    clauses = []
+    if user.user_type == "student":
+        clauses.append(doc.thesis_id.in_(select(Thesis.id).where(Thesis.author_id == user.id)))
+    if user.user_type == "supervisor" or (user.user_type == "researcher" and user_has_supervisor_role(user)):
+        clauses.append(doc.thesis_id.in_(
+            select(Thesis_Supervisor.thesis_id).where(Thesis_Supervisor.supervisor_id == user.id)
+        ))
+    if user.user_type == "researcher":
+        clauses.append(doc.project_id.in_(union(
+            select(ResearchProject.id).where(ResearchProject.researcher_id == user.id),
+            select(ResearchProject_Collaborator.project_id).where(
+                ResearchProject_Collaborator.collaborator_id == user.id
+            ),
+        )))
+    return or_(*clauses) if clauses else false()
+
+
+def _has_fts_table(connection):
+    # Checked once per engine; migration 0012 skips it when SQLite lacks FTS5
+    engine = connection.engine
+    if engine not in _fts_tables:
+        _fts_tables[engine] = inspect(connection).has_table("search_fts")
+    return _fts_tables[engine]
+
+
+def _match_sqlite(terms):
+    """FTS5: every term as a quoted prefix, title matches weigh double"""
+    match = " ".join(f'"{term}"*' for term in terms)
+    fts = literal_column("search_fts")
+    columns = (
+        func.highlight(fts, 0, MATCH_START, MATCH_END).label("title_match"),
+        func.snippet(fts, -1, MATCH_START, MATCH_END, "…", SNIPPET_WORDS).label("snippet"),
+    )
+    stmt = (
+        select(*columns)
+        .select_from(_search_fts.join(_search_document, _search_document.c.id == literal_column("search_fts.rowid")))
+        .where(text("search_fts MATCH :match").bindparams(match=match))
+    )
+    return stmt, func.bm25(fts, 2.0, 1.0).asc()
+
+
+def _match_postgresql(terms):
+    tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    vector = literal_column("search_document.search_vector")
+    markers = f'StartSel="{MATCH_START}", StopSel="{MATCH_END}"'
+    columns = (
+        func.ts_headline("simple", _search_document.c.title, tsquery, f"{markers}, HighlightAll=true")
+        .label("title_match"),
+        func.ts_headline("simple", _search_document.c.body, tsquery,
+                         f"{markers}, MaxWords={SNIPPET_WORDS * 2}, MinWords=8").label("snippet"),
+    )
+    stmt = select(*columns).select_from(_search_document).where(vector.op("@@")(tsquery))
+    return stmt, func.ts_rank(vector, tsquery).desc()
+
+
+def _match_like(terms):
+    """Fallback without a full-text index: every term in title or body, no ranking"""
+    doc = _search_document.c
+    conditions = [
+        or_(func.lower(doc.title).contains(term, autoescape=True), func.lower(doc.body).contains(term, autoescape=True))
+        for term in terms
+    ]
+    columns = (doc.title.label("title_match"), doc.body.label("snippet"))
+    return select(*columns).select_from(_search_document).where(and_(*conditions)), None
+
+
+def _highlight(value, terms=None):
+    """Escape value and turn the match markers (or, for LIKE results, the terms) into <mark>"""
+    if not value:
+        return Markup("")
+    if terms is not None:
+        value = _snippet_around(value, terms)
+    html = str(escape(value)).replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+    return Markup(html)
+
+
+def _snippet_around(value, terms):
+    lower = value.lower()
+    positions = [lower.find(term) for term in terms if term in lower]
+    start = max(0, min(positions, default=0) - 60)
+    excerpt = ("…" if start else "") + value[start:start + 200] + ("…" if start + 200 < len(value) else "")
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    return pattern.sub(lambda match: f"{MATCH_START}{match.group(0)}{MATCH_END}", excerpt)
+
+
+def search_content(user, query, page=1, per_page=DEFAULT_PER_PAGE, source_types=None):
+    """
+    Search the content of the theses and projects the user has access to
+
+    Args:
+        user: current user (admin, supervisor, researcher or student)
+        query: search text; every word must match, as a prefix
+        page: 1-based page number
+        per_page: results per page, capped at MAX_PER_PAGE
+        source_types: restrict to these SEARCH_SOURCES keys
+
+    Returns:
+        SearchPage: results are dicts with source_type, source_id, thesis_id,
+        project_id, context (thesis / project title), title and snippet (HTML
+        with <mark> around matches), author_id and created_at
+    """
+    page = max(1, int(page or 1))
+    per_page = max(1, min(int(per_page or DEFAULT_PER_PAGE), MAX_PER_PAGE))
+    terms = _query_terms(query)
+    if not terms:
+        return SearchPage([], 0, page, per_page, 0)
+
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        stmt, rank = _match_postgresql(terms)
+    elif dialect == "sqlite" and _has_fts_table(connection):
+        stmt, rank = _match_sqlite(terms)
+    else:
+        stmt, rank = _match_like(terms)
+
+    doc = _search_document.c
+    scope = _scope_clause(user)
+    if scope is not None:
+        stmt = stmt.where(scope)
+    if source_types:
+        stmt = stmt.where(doc.source_type.in_(list(source_types)))
+
+    total = db.session.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+    order = [doc.created_at.desc(), doc.id.desc()]
+    if rank is not None:
+        order.insert(0, rank)
+    stmt = (
+        stmt.add_columns(
+            doc.source_type, doc.source_id, doc.thesis_id, doc.project_id, doc.author_id, doc.created_at,
+            func.coalesce(Thesis.title, ResearchProject.title).label("context"),
+        )
+        .outerjoin(Thesis, Thesis.id == doc.thesis_id)
+        .outerjoin(ResearchProject, ResearchProject.id == doc.project_id)
+        .order_by(*order)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    )
+
+    like_terms = terms if rank is None else None
+    results = [
+        {
+            "source_type": row.source_type,
+            "source_id": row.source_id,
+            "thesis_id": row.thesis_id,
+            "project_id": row.project_id,
+            "context": row.context,
+            "title": _highlight(row.title_match, like_terms),
+            "snippet": _highlight(row.snippet, like_terms),
+            "author_id": row.author_id,
+            "created_at": row.created_at,
+        }
+        for row in db.session.execute(stmt)
+    ]
+    return SearchPage(results, total, page, per_page, math.ceil(total / per_page))
+
+
+# ORM writes to indexed models update search_document in the same transaction
+for _source_type, _source in SEARCH_SOURCES.items():
+    _on_write, _on_delete = _make_listeners(_source_type)
+    event.listen(_source.model, "after_insert", _on_write)
+    event.listen(_source.model, "after_update", _on_write)
+    event.listen(_source.model, "after_delete", _on_delete)
@@ -0,0 +1,26 @@
+"""
+Startup timing for SuperviseMe
+Records how long each phase of the application factory takes
+"""
+
+import time
+
+
+class StartupTimer:
+    """Wall-clock time per create_app phase, in milliseconds"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 1)
+        self._last = now
+
+    def report(self):
+        return {
+            "total_ms": round((self._last - self.started) * 1000, 1),
+            "phases": dict(self.phases),
+        }
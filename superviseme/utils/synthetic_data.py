@@ -0,0 +1,446 @@
+"""
+Synthetic data generator for SuperviseMe
+Fills an empty database with a large, deterministic dataset (users, theses,
+threaded updates, todos, notifications) for load and regression testing
+"""
+
+import bisect
+import logging
+import random
+import time
+from collections import namedtuple
+
+from sqlalchemy import func, insert, select, text
+
+from superviseme import db
+from superviseme.models import (
+    Notification,
+    Thesis,
+    Thesis_Status,
+    Thesis_Supervisor,
+    Thesis_Tag,
+    Thesis_Update,
+    Todo,
+    Todo_Reference,
+    User_mgmt,
+)
+from superviseme.utils.password_security import hash_password
+from superviseme.utils.tags import ensure_tags, refresh_tag_counts
+from superviseme.utils.thesis_catalogue import invalidate_catalogue
+from superviseme.utils.todo_queries import priority_rank, status_rank
+
+logger = logging.getLogger(__name__)
+
+SyntheticScale = namedtuple("SyntheticScale", ["users", "theses", "updates", "todos", "notifications"])
+
+FULL_SCALE = SyntheticScale(users=50_000, theses=20_000, updates=2_000_000, todos=400_000, notifications=5_000_000)
+
+# Rows are generated in blocks with their own RNG, so any block can be
+# regenerated identically when a run is resumed.
+GENERATION_BLOCK = 1000
+DEFAULT_CHUNK_SIZE = 10 * GENERATION_BLOCK
+
+HISTORY_SECONDS = 3 * 365 * 86400
+
+SYNTHETIC_ADMIN = "synth_admin"
+SYNTHETIC_PASSWORD = "synthetic"
+EMAIL_DOMAIN = "synthetic.supervise.me"
+
+SUPERVISOR_SHARE = 0.04
+RESEARCHER_SHARE = 0.01
+ASSIGNED_THESIS_SHARE = 0.85
+CO_SUPERVISED_SHARE = 0.2
+REPLY_SHARE = 0.3
+TODO_REFERENCE_SHARE = 0.5
+
+STATUS_FLOW = (
+    "thesis proposed", "thesis accepted", "in progress", "writing phase",
+    "review phase", "final review", "completed",
+)
+DEGREE_PROGRAMMES = (("CS", 30), ("DS", 20), ("AI", 15), ("MATH", 10), ("PHYS", 10), ("ECON", 10), ("BIO", 5))
+LEVELS = ("bachelor", "master", "other")
+TAGS = ("nlp", "graphs", "vision", "databases", "security", "hci", "theory", "networks", "robotics", "bio")
+NOTIFICATION_TYPES = ("new_update", "new_feedback", "todo_assigned", "thesis_status_change", "thesis_interest")
+FIRST_NAMES = ("Ada", "Alan", "Grace", "Linus", "Marie", "Enrico", "Rita", "Carlo", "Elena", "Luca", "Sara", "Marco")
+LAST_NAMES = ("Rossi", "Bianchi", "Turing", "Hopper", "Curie", "Fermi", "Levi", "Conti", "Greco", "Ricci", "Gallo")
+WORDS = (
+    "model", "data", "results", "draft", "chapter", "experiment", "baseline", "related", "work", "evaluation",
+    "dataset", "analysis", "figure", "section", "method", "review", "feedback", "plan", "meeting", "paper",
+)
+
+ThesisPlan = namedtuple("ThesisPlan", ["id", "author_id", "supervisor_ids", "created_at", "statuses"])
+
+
+def scaled(factor, base=FULL_SCALE):
+    """A copy of base with every count multiplied by factor"""
+    return SyntheticScale(*(max(1, round(value * factor)) for value in base))
+
+
+def _split(total, weights):
+    """Distribute total over weights (largest remainder); returns (starts, counts)"""
+    weight_sum = sum(weights) or 1
+    raw = [total * weight / weight_sum for weight in weights]
+    counts = [int(value) for value in raw]
+    by_remainder = sorted(range(len(raw)), key=lambda i: counts[i] - raw[i])
+    for i in by_remainder[:total - sum(counts)]:
+        counts[i] += 1
+    starts, position = [], 0
+    for count in counts:
+        starts.append(position)
+        position += count
+    return starts, counts
+
+
+def _sentence(rng, low, high):
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize() + "."
+
+
+class SyntheticDataGenerator:
+    """
+    Deterministic bulk generator
+
+    Every row is a function of (seed, table, row index), and ids are assigned
+    explicitly, so an interrupted run resumes from the highest committed id of
+    each table and produces exactly the data an uninterrupted run would.
+    """
+
+    STAGES = ("users", "theses", "updates", "todos", "notifications")
+
+    def __init__(self, scale=FULL_SCALE, seed=42, chunk_size=DEFAULT_CHUNK_SIZE, now=None, progress=None):
+        if scale.users < 3:
+            raise ValueError("At least 3 users are needed (admin, supervisor, student)")
+        self.scale = scale
+        self.seed = seed
+        self.chunk_size = max(GENERATION_BLOCK, chunk_size // GENERATION_BLOCK * GENERATION_BLOCK)
+        self.now = now
+        self.progress = progress
+
+        self.supervisor_count = max(1, int(scale.users * SUPERVISOR_SHARE))
+        self.researcher_count = int(scale.users * RESEARCHER_SHARE)
+        self.first_student_id = 2 + self.supervisor_count + self.researcher_count
+        self.student_count = max(0, scale.users - self.first_student_id + 1)
+        self.anchor = None
+        self.plans = None
+        self.tag_ids = None
+
+    def _rng(self, stage, block):
+        return random.Random(f"{self.seed}:{stage}:{block}")
+
+    # -- setup -------------------------------------------------------------
+
+    def _resolve_anchor(self):
+        """Reuse the reference time of an earlier run so a resumed run generates the same timestamps"""
+        first = db.session.execute(select(User_mgmt.username, User_mgmt.joined_on).where(User_mgmt.id == 1)).first()
+        if first is not None:
+            if first.username != SYNTHETIC_ADMIN:
+                raise ValueError("Database already contains non-synthetic users; use an empty database")
+            return first.joined_on + HISTORY_SECONDS
+        now = int(self.now or time.time())
+        return now - now % 86400
+
+    def _plan(self):
+        """Per-thesis layout shared by every stage: author, supervisors, dates, status history, row ranges"""
+        rng = self._rng("plan", 0)
+        supervisor_weights = [rng.paretovariate(1.5) for _ in range(self.supervisor_count)]
+        supervisor_cumulative = []
+        running = 0.0
+        for weight in supervisor_weights:
+            running += weight
+            supervisor_cumulative.append(running)
+
+        plans, activity = [], []
+        for index in range(self.scale.theses):
+            thesis_rng = self._rng("thesis", index)
+            assigned = index < self.student_count and thesis_rng.random() < ASSIGNED_THESIS_SHARE
+            supervisor_ids = []
+            for _ in range(2 if thesis_rng.random() < CO_SUPERVISED_SHARE else 1):
+                pick = bisect.bisect_left(supervisor_cumulative, thesis_rng.random() * running)
+                supervisor_id = 2 + min(pick, self.supervisor_count - 1)
+                if supervisor_id not in supervisor_ids:
+                    supervisor_ids.append(supervisor_id)
+
+            created_at = self.anchor - int(thesis_rng.random() * HISTORY_SECONDS * 0.95) - 86400
+            if assigned:
+                age = (self.anchor - created_at) / HISTORY_SECONDS
+                reached = min(len(STATUS_FLOW), 1 + int(age * len(STATUS_FLOW) * thesis_rng.uniform(0.8, 1.6)))
+                flow = list(STATUS_FLOW[:reached])
+                if flow[-1] != "completed" and thesis_rng.random() < 0.05:
+                    flow.append(thesis_rng.choice(("suspended", "cancelled")))
+                step = (self.anchor - created_at) // (len(flow) + 1)
+                statuses = [(status, created_at + step * (position + 1)) for position, status in enumerate(flow)]
+            else:
+                statuses = [("thesis proposed", created_at)]
+
+            plans.append(ThesisPlan(
+                id=index + 1,
+                author_id=self.first_student_id + index if assigned else None,
+                supervisor_ids=tuple(supervisor_ids),
+                created_at=created_at,
+                statuses=tuple(statuses),
+            ))
+            activity.append(thesis_rng.lognormvariate(0, 1.2) if assigned else 0.0)
+
+        self.plans = plans
+        self.update_starts, self.update_counts = _split(self.scale.updates, activity)
+        self.todo_starts, self.todo_counts = _split(self.scale.todos, activity)
+        self.notification_cumulative = []
+        running = 0.0
+        for weight in activity:
+            running += weight
+            self.notification_cumulative.append(running)
+
+    def _thesis_at(self, starts, index):
+        """Plan owning global row index in a per-thesis contiguous layout, and the row's position in it"""
+        # Theses without rows share their start with the next one; bisect_right skips them.
+        position = bisect.bisect_right(starts, index) - 1
+        return self.plans[position], index - starts[position]
+
+    # -- row builders --------------------------------------------------------
+
+    def _user_rows(self, start, stop, password):
+        rows = []
+        rng = None
+        for index in range(start, stop):
+            if rng is None or index % GENERATION_BLOCK == 0:
+                rng = self._rng("users", index // GENERATION_BLOCK)
+            user_id = index + 1
+            if user_id == 1:
+                user_type, username = "admin", SYNTHETIC_ADMIN
+            elif user_id < 2 + self.supervisor_count:
+                user_type, username = "supervisor", f"synth_sup_{user_id}"
+            elif user_id < self.first_student_id:
+                user_type, username = "researcher", f"synth_res_{user_id}"
+            else:
+                user_type, username = "student", f"synth_stu_{user_id}"
+            rows.append({
+                "id": user_id,
+                "username": username,
+                "name": rng.choice(FIRST_NAMES),
+                "surname": rng.choice(LAST_NAMES),
+                "cdl": rng.choices([p for p, _ in DEGREE_PROGRAMMES], [w for _, w in DEGREE_PROGRAMMES])[0]
+                if user_type == "student" else None,
+                "email": f"{username}@{EMAIL_DOMAIN}",
+                "password": password,
+                "user_type": user_type,
+                "joined_on": self.anchor - HISTORY_SECONDS if user_id == 1
+                else self.anchor - int(rng.random() * HISTORY_SECONDS),
+                "is_enabled": True,
+                "telegram_enabled": False,
+                "last_activity": self.anchor - int(rng.expovariate(1 / (7 * 86400))),
+            })
+        return {User_mgmt: rows}
+
+    def _thesis_rows(self, start, stop):
+        theses, supervisors, statuses, tags = [], [], [], []
+        for index in range(start, stop):
+            plan = self.plans[index]
+            rng = self._rng("thesis_rows", index)
+            title = f"{_sentence(rng, 3, 8)[:-1]} #{plan.id}"[:100]
+            final_status, final_at = plan.statuses[-1]
+            theses.append({
+                "id": plan.id,
+                "title": title,
+                "description": _sentence(rng, 20, 80),
+                "topic": rng.choice(TAGS),
+                "is_public": plan.author_id is None and rng.random() < 0.7,
+                "publisher_id": plan.supervisor_ids[0],
+                "author_id": plan.author_id,
+                "frozen": final_status in ("completed", "cancelled"),
+                "level": rng.choice(LEVELS),
+                "created_at": plan.created_at,
+                # Core inserts bypass the status listeners
+                "current_status": final_status,
+                "current_status_at": final_at,
+            })
+            supervisors.extend(
+                {"thesis_id": plan.id, "supervisor_id": supervisor_id, "assigned_at": plan.created_at}
+                for supervisor_id in plan.supervisor_ids
+            )
+            statuses.extend(
+                {"thesis_id": plan.id, "status": status, "updated_at": updated_at}
+                for status, updated_at in plan.statuses
+            )
+            tags.extend(
+                {"thesis_id": plan.id, "tag_id": self.tag_ids[tag], "tag": tag}
+                for tag in rng.sample(TAGS, rng.randint(0, 3))
+            )
+        return {Thesis: theses, Thesis_Supervisor: supervisors, Thesis_Status: statuses, Thesis_Tag: tags}
+
+    def _update_rows(self, start, stop):
+        rows = []
+        rng = None
+        for index in range(start, stop):
+            if rng is None or index % GENERATION_BLOCK == 0:
+                rng = self._rng("updates", index // GENERATION_BLOCK)
+            plan, position = self._thesis_at(self.update_starts, index)
+            count = self.update_counts[plan.id - 1]
+            first_id = self.update_starts[plan.id - 1] + 1
+            span = self.anchor - plan.created_at
+            supervisor_id = rng.choice(plan.supervisor_ids)
+
+            parent_id = None
+            if position and rng.random() < REPLY_SHARE:
+                parent_id = first_id + rng.randrange(position)
+            by_student = rng.random() < (0.5 if parent_id else 0.7)
+            kind = "comment" if parent_id else "update"
+            rows.append({
+                "id": index + 1,
+                "thesis_id": plan.id,
+                "author_id": plan.author_id if by_student else supervisor_id,
+                "update_type": f"{'student' if by_student else 'supervisor'}_{kind}",
+                "parent_id": parent_id,
+                "status": "active",
+                "content": _sentence(rng, 5, 60),
+                "created_at": plan.created_at + int((position + rng.random()) / count * span),
+            })
+        return {Thesis_Update: rows}
+
+    def _todo_rows(self, start, stop):
+        todos, references = [], []
+        rng = None
+        for index in range(start, stop):
+            if rng is None or index % GENERATION_BLOCK == 0:
+                rng = self._rng("todos", index // GENERATION_BLOCK)
+            plan, position = self._thesis_at(self.todo_starts, index)
+            count = self.todo_counts[plan.id - 1]
+            span = self.anchor - plan.created_at
+            created_at = plan.created_at + int((position + rng.random()) / count * span)
+            due_date = created_at + rng.randint(3, 45) * 86400
+            roll = rng.random()
+            status = "completed" if roll < 0.6 else ("pending" if roll < 0.95 else "cancelled")
+            completed_at = min(self.anchor, created_at + int(rng.random() * (due_date - created_at) * 1.3)) \
+                if status == "completed" else None
+            todos.append({
+                "id": index + 1,
+                "thesis_id": plan.id,
+                "author_id": rng.choice(plan.supervisor_ids),
+                "title": _sentence(rng, 2, 8)[:200],
+                "description": _sentence(rng, 5, 30) if rng.random() < 0.5 else None,
+                "status": status,
+                "priority": rng.choice(("low", "medium", "medium", "high")),
+                "assigned_to_id": plan.author_id,
+                "due_date": due_date,
+                "completed_at": completed_at,
+                "created_at": created_at,
+                "updated_at": completed_at or created_at,
+            })
+            # Core inserts bypass the rank listeners
+            todos[-1]["status_rank"] = status_rank(status)
+            todos[-1]["priority_rank"] = priority_rank(todos[-1]["priority"])
+            update_count = self.update_counts[plan.id - 1]
+            if update_count and rng.random() < TODO_REFERENCE_SHARE:
+                references.append({
+                    "update_id": self.update_starts[plan.id - 1] + 1 + rng.randrange(update_count),
+                    "todo_id": index + 1,
+                    "created_at": created_at,
+                })
+        return {Todo: todos, Todo_Reference: references}
+
+    def _notification_rows(self, start, stop):
+        rows = []
+        rng = None
+        total_weight = self.notification_cumulative[-1] if self.notification_cumulative else 0
+        for index in range(start, stop):
+            if rng is None or index % GENERATION_BLOCK == 0:
+                rng = self._rng("notifications", index // GENERATION_BLOCK)
+            position = bisect.bisect_left(self.notification_cumulative, rng.random() * total_weight)
+            plan = self.plans[min(position, len(self.plans) - 1)]
+            supervisor_id = rng.choice(plan.supervisor_ids)
+            student_id = plan.author_id or supervisor_id
+            to_student = rng.random() < 0.5
+            notification_type = rng.choice(NOTIFICATION_TYPES)
+            created_at = plan.created_at + int(rng.random() * (self.anchor - plan.created_at))
+            rows.append({
+                "id": index + 1,
+                "recipient_id": student_id if to_student else supervisor_id,
+                "actor_id": supervisor_id if to_student else student_id,
+                "thesis_id": plan.id,
+                "notification_type": notification_type,
+                "title": notification_type.replace("_", " ").capitalize(),
+                "message": _sentence(rng, 5, 20),
+                "action_url": f"/thesis/{plan.id}",
+                # Older notifications have mostly been read
+                "is_read": rng.random() < min(0.98, (self.anchor - created_at) / (14 * 86400)),
+                "created_at": created_at,
+                "telegram_sent": False,
+            })
+        return {Notification: rows}
+
+    # -- driver ----------------------------------------------------------------
+
+    def _stage(self, name, model, total, build):
+        done = db.session.scalar(select(func.coalesce(func.max(model.id), 0)))
+        if done >= total:
+            return 0
+        if done % GENERATION_BLOCK:
+            raise ValueError(
+                f"{model.__tablename__} ends at id {done}, not at a block boundary; "
+                "it was not written by this generator"
+            )
+
+        started, written = time.monotonic(), 0
+        for start in range(done, total, self.chunk_size):
+            stop = min(start + self.chunk_size, total)
+            for target, rows in build(start, stop).items():
+                if rows:
+                    db.session.execute(insert(target.__table__), rows)
+            db.session.commit()
+            written += stop - start
+            if self.progress:
+                self.progress(name, stop, total)
+        logger.info(f"Synthetic {name}: {written} rows in {time.monotonic() - started:.1f}s")
+        return written
+
+    def _reset_sequences(self):
+        # Explicit ids leave PostgreSQL sequences behind
+        if db.engine.dialect.name != "postgresql":
+            return
+        for model in (User_mgmt, Thesis, Thesis_Update, Todo, Notification):
+            table = model.__tablename__
+            db.session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+            ))
+        db.session.commit()
+
+    def run(self, stages=None):
+        """
+        Generate (or finish generating) the dataset
+
+        Returns:
+            dict: Rows written per stage and total duration
+        """
+        started = time.monotonic()
+        self.anchor = self._resolve_anchor()
+        self._plan()
+        password = hash_password(SYNTHETIC_PASSWORD)
+        # Core inserts bypass the tag listeners: create the tags up front and
+        # count them once the theses are written
+        self.tag_ids = ensure_tags(db.session.connection(), TAGS)
+        db.session.commit()
+
+        builders = {
+            "users": (User_mgmt, self.scale.users, lambda a, b: self._user_rows(a, b, password)),
+            "theses": (Thesis, self.scale.theses, self._thesis_rows),
+            "updates": (Thesis_Update, self.scale.updates, self._update_rows),
+            "todos": (Todo, self.scale.todos, self._todo_rows),
+            "notifications": (Notification, self.scale.notifications, self._notification_rows),
+        }
+        written = {}
+        for name in self.STAGES:
+            if stages and name not in stages:
+                continue
+            model, total, build = builders[name]
+            written[name] = self._stage(name, model, total, build)
+        if written.get("theses"):
+            refresh_tag_counts(db.session.connection())
+            invalidate_catalogue()
+            db.session.commit()
+        self._reset_sequences()
+
+        return {
+            "success": True,
+            "seed": self.seed,
+            "scale": self.scale._asdict(),
+            "written": written,
+            "duration_seconds": round(time.monotonic() - started, 1),
+        }
@@ -0,0 +1,296 @@
+"""
+Tag dictionary for SuperviseMe
+Thesis and update tags point at one Tag row per case- and accent-folded key;
+tag filters resolve terms to tag ids and combine the tagged theses as sets,
+and per-tag counts are kept current for facets and autocomplete
+"""
+
+import logging
+import unicodedata
+
+from sqlalchemy import (
+    and_,
+    distinct,
+    event,
+    func,
+    inspect,
+    intersect,
+    select,
+    union,
+    update,
+)
+
+from superviseme import db
+from superviseme.models import Tag, Thesis, Thesis_Tag, Update_Tag
+
+logger = logging.getLogger(__name__)
+
+TAG_KEY_LENGTH = 50
+
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+MATCH_MODES = (MATCH_ANY, MATCH_ALL)
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+
+# Tag ids per IN (...) list when refreshing counts
+REFRESH_CHUNK_SIZE = 500
+
+# Thesis fields that decide whether a thesis is in the public catalogue
+CATALOGUE_FIELDS = ("is_public", "author_id", "frozen")
+
+
+def fold_text(value):
+    """Accents stripped, case folded and whitespace collapsed"""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def fold_tag(value):
+    """
+    Lookup key for a tag: folded text, cut to the tag length
+
+    Returns:
+        str: e.g. "Réseaux  Complexes" -> "reseaux complexes"
+    """
+    return fold_text(value)[:TAG_KEY_LENGTH]
+
+
+def public_catalogue_clause():
+    """Theses listed in the public catalogue: public, unassigned and not frozen"""
+    return and_(Thesis.is_public.is_(True), Thesis.author_id.is_(None), Thesis.frozen.is_(False))
+
+
+def _insert(connection):
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _lookup(connection, keys):
+    tag = Tag.__table__
+    found = {}
+    for start in range(0, len(keys), REFRESH_CHUNK_SIZE):
+        chunk = keys[start:start + REFRESH_CHUNK_SIZE]
+        found.update(connection.execute(select(tag.c.key, tag.c.id).where(tag.c.key.in_(chunk))).all())
+    return found
+
+
+def ensure_tags(connection, names):
+    """
+    Get or create the Tag rows for the given tag names; concurrent writers
+    creating the same key are absorbed by the unique constraint
+
+    Returns:
+        dict: Folded key -> tag id
+    """
+    wanted = {}
+    for name in names:
+        wanted.setdefault(fold_tag(name), (name or "").strip()[:TAG_KEY_LENGTH])
+    if not wanted:
+        return {}
+
+    found = _lookup(connection, sorted(wanted))
+    missing = sorted(key for key in wanted if key not in found)
+    if missing:
+        stmt = _insert(connection)(Tag.__table__).on_conflict_do_nothing(index_elements=["key"])
+        connection.execute(stmt, [{"key": key, "name": wanted[key]} for key in missing])
+        found.update(_lookup(connection, missing))
+    return found
+
+
+def refresh_tag_counts(connection, tag_ids=None):
+    """
+    Recompute thesis, public thesis and update counts of the given tags (all
+    when tag_ids is None) with one UPDATE per chunk
+
+    Returns:
+        int: Rows updated
+    """
+    tag = Tag.__table__
+    thesis_tag = Thesis_Tag.__table__
+    update_tag = Update_Tag.__table__
+    thesis = Thesis.__table__
+    stmt = update(tag).values(
+        thesis_count=(
+            select(func.count(distinct(thesis_tag.c.thesis_id)))
+            .where(thesis_tag.c.tag_id == tag.c.id)
+            .scalar_subquery()
+        ),
+        public_thesis_count=(
+            select(func.count(distinct(thesis_tag.c.thesis_id)))
+            .select_from(thesis_tag.join(thesis, thesis.c.id == thesis_tag.c.thesis_id))
+            .where(thesis_tag.c.tag_id == tag.c.id, public_catalogue_clause())
+            .scalar_subquery()
+        ),
+        update_count=(
+            select(func.count(distinct(update_tag.c.update_id)))
+            .where(update_tag.c.tag_id == tag.c.id)
+            .scalar_subquery()
+        ),
+    )
+    if tag_ids is None:
+        return connection.execute(stmt).rowcount
+
+    tag_ids = sorted({tag_id for tag_id in tag_ids if tag_id is not None})
+    updated = 0
+    for start in range(0, len(tag_ids), REFRESH_CHUNK_SIZE):
+        chunk = tag_ids[start:start + REFRESH_CHUNK_SIZE]
+        updated += connection.execute(stmt.where(tag.c.id.in_(chunk))).rowcount
+    return updated
+
+
+def _key_clause(term, prefix):
+    key = fold_tag(term)
+    if not prefix:
+        return Tag.key == key
+    # The range is served by the unique key index; LIKE keeps the match exact
+    # under any collation
+    escaped = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    upper = key[:-1] + chr(ord(key[-1]) + 1)
+    return and_(Tag.key >= key, Tag.key < upper, Tag.key.like(f"{escaped}%", escape="\\"))
+
+
+def parse_tag_terms(raw_terms):
+    """Comma separated filter input -> distinct folded terms, in order"""
+    terms = []
+    for piece in (raw_terms or "").split(","):
+        key = fold_tag(piece)
+        if key and key not in terms:
+            terms.append(key)
+    return terms
+
+
+def thesis_ids_for_tags(terms, match=MATCH_ANY, prefix=True):
+    """
+    Theses tagged with the given terms: each term resolves to tag ids through
+    the key index (exact or prefix) and the per-term thesis sets are combined
+    with UNION (match="any") or INTERSECT (match="all")
+
+    Returns:
+        Select | None: Thesis ids, usable in Thesis.id.in_(...); None for no terms
+    """
+    per_term = [
+        select(Thesis_Tag.thesis_id)
+        .join(Tag, Tag.id == Thesis_Tag.tag_id)
+        .where(_key_clause(term, prefix))
+        for term in terms if fold_tag(term)
+    ]
+    if not per_term:
+        return None
+    if len(per_term) == 1:
+        return per_term[0]
+    return intersect(*per_term) if match == MATCH_ALL else union(*per_term)
+
+
+def _count_column(public):
+    return Tag.public_thesis_count if public else Tag.thesis_count
+
+
+def suggest_tags(term, limit=DEFAULT_SUGGESTIONS, public=True):
+    """
+    Autocomplete: tags whose key starts with the folded term, most used first
+
+    Returns:
+        list[dict]: id, name, key and count per tag
+    """
+    key = fold_tag(term)
+    if not key:
+        return []
+    limit = max(1, min(int(limit or DEFAULT_SUGGESTIONS), MAX_SUGGESTIONS))
+    count = _count_column(public)
+    rows = db.session.execute(
+        select(Tag.id, Tag.name, Tag.key, count.label("count"))
+        .where(_key_clause(key, prefix=True), count > 0)
+        .order_by(count.desc(), Tag.key)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def tag_facets(limit=DEFAULT_SUGGESTIONS, public=True):
+    """
+    Most used tags with their precomputed thesis counts
+
+    Returns:
+        list[dict]: id, name, key and count per tag
+    """
+    count = _count_column(public)
+    rows = db.session.execute(
+        select(Tag.id, Tag.name, Tag.key, count.label("count"))
+        .where(count > 0)
+        .order_by(count.desc(), Tag.key)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def _find_tag(model, owner_column, owner_id, name):
+    return (
+        model.query.join(Tag, Tag.id == model.tag_id)
+        .filter(owner_column == owner_id, Tag.key == fold_tag(name))
+        .first()
+    )
+
+
+def find_thesis_tag(thesis_id, name):
+    """The thesis tag matching name after folding, if any"""
+    return _find_tag(Thesis_Tag, Thesis_Tag.thesis_id, thesis_id, name)
+
+
+def find_update_tag(update_id, name):
+    """The update tag matching name after folding, if any"""
+    return _find_tag(Update_Tag, Update_Tag.update_id, update_id, name)
+
+
+def _expire_tags(session, tag_ids):
+    # Keep already loaded Tag rows from serving pre-write counts.
+    if session is None:
+        return
+    for tag_id in tag_ids:
+        loaded = session.identity_map.get(session.identity_key(Tag, tag_id))
+        if loaded is not None:
+            session.expire(loaded, ["thesis_count", "public_thesis_count", "update_count"])
+
+
+def _assign_tag_id(mapper, connection, target):
+    state = inspect(target)
+    if target.tag_id is None or state.attrs.tag.history.has_changes():
+        target.tag_id = ensure_tags(connection, [target.tag])[fold_tag(target.tag)]
+
+
+def _on_tag_write(mapper, connection, target):
+    tag_ids = {target.tag_id}
+    state = inspect(target)
+    tag_ids.update(state.attrs.tag_id.history.deleted or ())
+    refresh_tag_counts(connection, tag_ids)
+    _expire_tags(state.session, tag_ids)
+
+
+def _on_thesis_update(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in CATALOGUE_FIELDS):
+        return
+    thesis_tag = Thesis_Tag.__table__
+    tag_ids = connection.execute(
+        select(thesis_tag.c.tag_id).where(thesis_tag.c.thesis_id == target.id)
+    ).scalars().all()
+    if tag_ids:
+        refresh_tag_counts(connection, tag_ids)
+        _expire_tags(state.session, tag_ids)
+
+
+# ORM tag writes resolve the tag id and refresh its counts in the same
+# transaction. Bulk Core writes (bulk_import, synthetic data, cascade deletes)
+# call ensure_tags / refresh_tag_counts themselves.
+for _model in (Thesis_Tag, Update_Tag):
+    event.listen(_model, "before_insert", _assign_tag_id)
+    event.listen(_model, "before_update", _assign_tag_id)
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _on_tag_write)
+event.listen(Thesis, "after_update", _on_thesis_update)
+
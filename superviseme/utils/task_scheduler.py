@@ -3,73 +3,315 @@ Task scheduler service for SuperviseMe application
 Handles background tasks like weekly email notifications
 """
 import atexit
+import json
 import logging
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import insert, select, update
+
+from superviseme import db
+from superviseme.models import Scheduler_Job, Scheduler_Job_Run
+from superviseme.utils.leader_lease import acquire_lease, get_lease, make_owner_id, release_lease
+from superviseme.utils.process_lifecycle import on_fork_child
 from superviseme.utils.weekly_notifications import send_all_weekly_supervisor_reports
 
 logger = logging.getLogger(__name__)
 
 scheduler = None
+leader = None
+
+SCHEDULER_LEASE_NAME = "scheduler"
+
+# Seconds a leader lease lasts; the holder renews it every third of that
+DEFAULT_LEASE_TTL = 60
+
+# A run missed while no process held the lease (restart, failover) still fires
+# if it is at most this late; several missed runs are coalesced into one.
+DEFAULT_MISFIRE_GRACE = 3600
+
+JOB_RESULT_MAX_LENGTH = 2000
+
+
+def _job_definitions():
+    """(id, name, func, trigger) of every scheduled job"""
+    return (
+        # Weekly supervisor reports every Monday at 9:00 AM
+        ('weekly_supervisor_reports', 'Send weekly supervisor reports', scheduled_weekly_reports,
+         CronTrigger(day_of_week='mon', hour=9, minute=0)),
+        # Flush hourly/daily Telegram digests at the top of every hour
+        ('telegram_digests', 'Send Telegram notification digests', scheduled_telegram_digests,
+         CronTrigger(minute=0)),
+        # Keep connected ORCID profiles fresh with a nightly incremental sync
+        ('orcid_sync', 'Sync connected ORCID profiles', scheduled_orcid_sync,
+         CronTrigger(hour=3, minute=30)),
+        # Roll up new activity into the analytics tables every hour
+        ('analytics_rollups', 'Build analytics rollups', scheduled_analytics_rollups,
+         CronTrigger(minute=15)),
+        # Pick up queued admin jobs (large deletes, uploaded imports) within seconds
+        ('background_jobs', 'Run queued background jobs', scheduled_background_jobs,
+         CronTrigger(second='*/10')),
+    )
+
+
+def _sync_jobs():
+    """
+    Make the job store match the job definitions
+
+    Persisted jobs whose trigger is unchanged are kept as they are, so their
+    next run time (possibly in the past, after downtime) survives restarts.
+    """
+    defined = set()
+    for job_id, name, func, trigger in _job_definitions():
+        defined.add(job_id)
+        existing = scheduler.get_job(job_id)
+        if existing is not None and existing.func is func and str(existing.trigger) == str(trigger):
+            continue
+        scheduler.add_job(func=func, trigger=trigger, id=job_id, name=name, replace_existing=True)
+        logger.info(f"Scheduled job {job_id} ({trigger})")
+    for job in scheduler.get_jobs():
+        if job.id not in defined:
+            scheduler.remove_job(job.id)
+            logger.info(f"Removed obsolete scheduled job {job.id}")
+
+
+class LeaderElector(threading.Thread):
+    """
+    Keep trying to hold the scheduler lease; the scheduler only processes
+    jobs while this process is the leader
+    """
+
+    def __init__(self, app, ttl=DEFAULT_LEASE_TTL, name=SCHEDULER_LEASE_NAME):
+        super().__init__(daemon=True, name="scheduler-leader")
+        self.app = app
+        self.ttl = ttl
+        self.lease_name = name
+        self.owner = make_owner_id()
+        self.is_leader = False
+        self._stopped = threading.Event()
+
+    def run(self):
+        while True:
+            self.tick()
+            if self._stopped.wait(self.ttl / 3):
+                break
+
+    def tick(self):
+        with self.app.app_context():
+            try:
+                held = acquire_lease(self.lease_name, self.owner, self.ttl)
+            except Exception as e:
+                # Without a renewal the lease runs out; step down before it does
+                logger.error(f"Could not renew the scheduler lease: {str(e)}")
+                held = False
+
+            if held and not self.is_leader:
+                self.is_leader = True
+                logger.info(f"Scheduler lease acquired by {self.owner}; running jobs")
+                _sync_jobs()
+                scheduler.resume()
+            elif not held and self.is_leader:
+                self.is_leader = False
+                logger.warning(f"Scheduler lease lost by {self.owner}; pausing jobs")
+                scheduler.pause()
+
+    def confirm(self):
+        """Check with the database that this process still holds the lease"""
+        lease = get_lease(self.lease_name)
+        return self.is_leader and lease is not None and lease["owner"] == self.owner and lease["active"]
+
+    def stop(self):
+        self._stopped.set()
+        if self.is_leader:
+            self.is_leader = False
+            with self.app.app_context():
+                try:
+                    release_lease(self.lease_name, self.owner)
+                except Exception as e:
+                    logger.error(f"Could not release the scheduler lease: {str(e)}")
 
 
 def init_scheduler(app):
     """
     Initialize the background scheduler with the Flask app context
-    
+
+    Every process that calls this competes for the scheduler lease; only the
+    holder runs jobs, the others wait paused and take over if it goes away.
+
     Args:
         app: Flask application instance
     """
-    global scheduler
-    
+    global scheduler, leader
+
     if scheduler is None:
-        scheduler = BackgroundScheduler(daemon=True)
-        
-        # Schedule weekly supervisor reports to run every Monday at 9:00 AM
-        scheduler.add_job(
-            func=scheduled_weekly_reports,
-            trigger=CronTrigger(day_of_week='mon', hour=9, minute=0),
-            id='weekly_supervisor_reports',
-            name='Send weekly supervisor reports',
-            replace_existing=True
+        jobstores = {}
+        if os.getenv("SCHEDULER_JOBSTORE", "database").lower() == "database":
+            with app.app_context():
+                jobstores["default"] = SQLAlchemyJobStore(engine=db.engine, tablename=Scheduler_Job.__tablename__)
+
+        scheduler = BackgroundScheduler(
+            daemon=True,
+            jobstores=jobstores,
+            job_defaults={
+                'coalesce': True,
+                'max_instances': 1,
+                'misfire_grace_time': int(os.getenv("SCHEDULER_MISFIRE_GRACE", DEFAULT_MISFIRE_GRACE)),
+            },
         )
-        
+
         # Store app context for use in scheduled jobs
         scheduler._app_context = app
-        
+
         try:
-            scheduler.start()
-            logger.info("Background scheduler started successfully")
+            # Start paused; the leader elector resumes it once the lease is held
+            scheduler.start(paused=True)
+            leader = LeaderElector(app, ttl=int(os.getenv("SCHEDULER_LEASE_TTL", DEFAULT_LEASE_TTL)))
+            leader.start()
+            logger.info("Background scheduler started, waiting for the scheduler lease")
         except Exception as e:
             logger.error(f"Failed to start scheduler: {str(e)}")
-        
+
         # Shut down the scheduler when exiting the app
         atexit.register(lambda: shutdown_scheduler())
 
 
+def run_scheduler(app):
+    """
+    Run the scheduler as a standalone process until SIGTERM/SIGINT, so web
+    workers can run with ENABLE_SCHEDULER=false
+    """
+    stopped = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopped.set())
+
+    init_scheduler(app)
+    logger.info("Standalone scheduler running")
+    while not stopped.wait(1):
+        pass
+    shutdown_scheduler()
+
+
+def _record_run_start(job_id, owner):
+    with db.engine.begin() as conn:
+        return conn.execute(
+            insert(Scheduler_Job_Run.__table__).values(
+                job_id=job_id, owner=owner, started_at=int(time.time()), status="running",
+            )
+        ).inserted_primary_key[0]
+
+
+def _record_run_end(run_id, status, result, duration):
+    if not isinstance(result, str):
+        result = json.dumps(result, default=str)
+    table = Scheduler_Job_Run.__table__
+    with db.engine.begin() as conn:
+        conn.execute(
+            update(table).where(table.c.id == run_id).values(
+                status=status,
+                finished_at=int(time.time()),
+                duration_ms=int(duration * 1000),
+                result=result[:JOB_RESULT_MAX_LENGTH] if result else None,
+            )
+        )
+
+
+def _run_tracked(job_id, func):
+    """Run a job in the app context if this process is still the leader, and record the run"""
+    if not (scheduler and hasattr(scheduler, '_app_context')):
+        logger.error("App context not available for scheduled job")
+        return
+
+    with scheduler._app_context.app_context():
+        if leader is not None and not leader.confirm():
+            logger.warning(f"Skipping {job_id}: this process no longer holds the scheduler lease")
+            return
+
+        owner = leader.owner if leader is not None else make_owner_id()
+        run_id = _record_run_start(job_id, owner)
+        started = time.perf_counter()
+        try:
+            results = func()
+            status = "success"
+            logger.info(f"Scheduled job {job_id} completed: {results}")
+        except Exception as e:
+            db.session.rollback()
+            results, status = str(e), "error"
+            logger.error(f"Error in scheduled job {job_id}: {str(e)}")
+        _record_run_end(run_id, status, results, time.perf_counter() - started)
+
+
 def scheduled_weekly_reports():
     """
     Scheduled job to send weekly supervisor reports
     This runs every Monday morning at 9:00 AM
     """
-    if scheduler and hasattr(scheduler, '_app_context'):
-        with scheduler._app_context.app_context():
-            try:
-                logger.info("Starting scheduled weekly supervisor reports")
-                results = send_all_weekly_supervisor_reports()
-                logger.info(f"Weekly reports completed: {results}")
-            except Exception as e:
-                logger.error(f"Error in scheduled weekly reports: {str(e)}")
-    else:
+    _run_tracked('weekly_supervisor_reports', send_all_weekly_supervisor_reports)
+
+
+def scheduled_telegram_digests():
+    """
+    Scheduled job to send batched Telegram digests
+    This runs at the top of every hour
+    """
+    from superviseme.utils.telegram_digest import send_due_telegram_digests
+    _run_tracked('telegram_digests', send_due_telegram_digests)
+
+
+def scheduled_orcid_sync():
+    """
+    Scheduled job to incrementally sync every linked ORCID profile
+    This runs every night at 3:30 AM
+    """
+    from superviseme.utils.orcid_client import sync_all_orcid_profiles
+    _run_tracked('orcid_sync', sync_all_orcid_profiles)
+
+
+def scheduled_analytics_rollups():
+    """
+    Scheduled job to incrementally build supervisor/department analytics rollups
+    This runs every hour at a quarter past
+    """
+    from superviseme.utils.analytics_rollups import build_rollups
+    _run_tracked('analytics_rollups', build_rollups)
+
+
+def scheduled_background_jobs():
+    """
+    Scheduled job to run queued background jobs
+    This runs every 10 seconds and is only recorded when there is work
+    """
+    from superviseme.utils.background_jobs import has_pending_jobs, run_pending_jobs
+    if not (scheduler and hasattr(scheduler, '_app_context')):
         logger.error("App context not available for scheduled job")
+        return
+    with scheduler._app_context.app_context():
+        if not has_pending_jobs():
+            return
+    _run_tracked('background_jobs', run_pending_jobs)
+
+
+@on_fork_child
+def _reset_scheduler():
+    # Scheduler and elector threads do not survive fork; the child starts its own
+    global scheduler, leader
+    scheduler = None
+    leader = None
 
 
 def shutdown_scheduler():
     """
-    Shutdown the background scheduler
+    Shutdown the background scheduler and hand the lease over
     """
     global scheduler
-    if scheduler:
+    if leader is not None:
+        leader.stop()
+    if scheduler and scheduler.running:
         scheduler.shutdown()
         logger.info("Background scheduler shut down")
 
@@ -91,31 +333,93 @@ def trigger_weekly_reports_now():
         return {'error': str(e)}
 
 
+def get_job_runs(job_id=None, limit=20):
+    """
+    Most recent scheduled job runs, newest first
+
+    Returns:
+        list[dict]: job_id, owner, started_at, finished_at, duration_ms, status, result
+    """
+    query = select(Scheduler_Job_Run).order_by(Scheduler_Job_Run.id.desc()).limit(limit)
+    if job_id:
+        query = query.where(Scheduler_Job_Run.job_id == job_id)
+    return [
+        {
+            'id': run.id,
+            'job_id': run.job_id,
+            'owner': run.owner,
+            'started_at': run.started_at,
+            'finished_at': run.finished_at,
+            'duration_ms': run.duration_ms,
+            'status': run.status,
+            'result': run.result,
+        }
+        for run in db.session.scalars(query)
+    ]
+
+
+def _stored_jobs():
+    """Jobs as persisted in the database job store, for processes not running the scheduler"""
+    definitions = {job_id: (name, trigger) for job_id, name, _, trigger in _job_definitions()}
+    jobs = []
+    for job_id, next_run_time in db.session.execute(
+        select(Scheduler_Job.id, Scheduler_Job.next_run_time).order_by(Scheduler_Job.next_run_time)
+    ):
+        name, trigger = definitions.get(job_id, (job_id, None))
+        jobs.append({
+            'id': job_id,
+            'name': name,
+            'next_run_time': str(datetime.fromtimestamp(next_run_time).astimezone()) if next_run_time else None,
+            'trigger': str(trigger) if trigger else None,
+        })
+    return jobs
+
+
 def get_scheduler_status():
     """
     Get the current status of the scheduler and its jobs
-    
+
+    The scheduler may run in another process (a standalone scheduler or
+    another worker); the lease tells which one, if any, is running jobs.
+
     Returns:
         dict: Scheduler status information
     """
-    if scheduler is None:
-        return {'status': 'not_initialized', 'jobs': []}
-    
-    if not scheduler.running:
-        return {'status': 'stopped', 'jobs': []}
-    
+    try:
+        lease = get_lease(SCHEDULER_LEASE_NAME)
+        recent_runs = get_job_runs(limit=10)
+    except Exception as e:
+        logger.error(f"Could not read scheduler lease/history: {str(e)}")
+        lease, recent_runs = None, []
+
+    local_running = scheduler is not None and scheduler.running
+    if lease and lease['active']:
+        status = 'running'
+    elif scheduler is None:
+        status = 'not_initialized'
+    elif not local_running:
+        status = 'stopped'
+    else:
+        status = 'waiting_for_lease'
+
     jobs = []
-    for job in scheduler.get_jobs():
-        jobs.append({
-            'id': job.id,
-            'name': job.name,
-            'next_run_time': str(job.next_run_time) if job.next_run_time else None,
-            'trigger': str(job.trigger)
-        })
-    
+    if local_running:
+        for job in scheduler.get_jobs():
+            jobs.append({
+                'id': job.id,
+                'name': job.name,
+                'next_run_time': str(job.next_run_time) if job.next_run_time else None,
+                'trigger': str(job.trigger)
+            })
+    if not jobs and status == 'running':
+        jobs = _stored_jobs()
+
     return {
-        'status': 'running',
-        'jobs': jobs
+        'status': status,
+        'jobs': jobs,
+        'leader': lease,
+        'is_leader': bool(leader is not None and leader.is_leader),
+        'recent_runs': recent_runs,
     }
 
 
@@ -0,0 +1,281 @@
+"""
+Telegram digest delivery for SuperviseMe
+Batches pending notifications per chat according to frequency settings
+"""
+
+import html
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import current_app
+
+from superviseme import db
+from superviseme.models import Notification, TelegramDigestRun, User_mgmt
+
+logger = logging.getLogger(__name__)
+
+FREQUENCIES = ("immediate", "hourly", "daily")
+
+DEFAULT_FREQUENCY_SETTINGS = {
+    "default": "immediate",
+    "types": {},
+    "daily_hour": 8,
+}
+
+# Each run covers the notifications created since the previous run's
+# watermark, however long ago that was (e.g. after an outage). Without a
+# watermark (the first run) only this window is eligible, so enabling digests
+# never replays the whole historical backlog to Telegram.
+DIGEST_LOOKBACK_SECONDS = {
+    "hourly": 2 * 60 * 60,
+    "daily": 2 * 24 * 60 * 60,
+}
+
+# Telegram rejects messages longer than 4096 characters.
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+
+def normalize_frequency(value: Optional[str]) -> Optional[str]:
+    """Return a known frequency name, or None for empty/unknown values"""
+    value = (value or "").strip().lower()
+    return value if value in FREQUENCIES else None
+
+
+def parse_frequency_settings(raw) -> Dict:
+    """
+    Parse TelegramBotConfig.frequency_settings into a normalized dict
+
+    Accepts a JSON string or an already decoded dict. Unknown keys and
+    invalid values fall back to DEFAULT_FREQUENCY_SETTINGS.
+    """
+    settings = {
+        "default": DEFAULT_FREQUENCY_SETTINGS["default"],
+        "types": {},
+        "daily_hour": DEFAULT_FREQUENCY_SETTINGS["daily_hour"],
+    }
+
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw) if raw.strip() else {}
+        except ValueError:
+            logger.warning("Ignoring malformed Telegram frequency settings")
+            raw = {}
+    if not isinstance(raw, dict):
+        return settings
+
+    settings["default"] = normalize_frequency(raw.get("default")) or settings["default"]
+
+    types = raw.get("types") or {}
+    if isinstance(types, dict):
+        for notification_type, frequency in types.items():
+            frequency = normalize_frequency(frequency)
+            if frequency:
+                settings["types"][str(notification_type)] = frequency
+
+    try:
+        daily_hour = int(raw.get("daily_hour", settings["daily_hour"]))
+        if 0 <= daily_hour <= 23:
+            settings["daily_hour"] = daily_hour
+    except (TypeError, ValueError):
+        pass
+
+    return settings
+
+
+def get_frequency_settings() -> Dict:
+    """Load frequency settings from the (cached) active Telegram bot configuration"""
+    from superviseme.utils.telegram_service import get_telegram_service
+
+    config = get_telegram_service().get_config()
+    return parse_frequency_settings(config.frequency_settings if config else None)
+
+
+def resolve_frequency(notification_type: str, user_frequency: Optional[str], settings: Dict) -> str:
+    """
+    Resolve the delivery frequency for one notification
+
+    Precedence: the user's own override, then the per-type global setting,
+    then the global default. Test messages are always immediate.
+    """
+    if notification_type == "test":
+        return "immediate"
+    return (
+        normalize_frequency(user_frequency)
+        or settings["types"].get(notification_type)
+        or settings["default"]
+    )
+
+
+def should_send_immediately(user_id: int, notification_type: str) -> bool:
+    """Check whether a new notification should bypass the digest queue"""
+    from superviseme.utils.telegram_service import get_telegram_service
+
+    preferences = get_telegram_service().get_user_preferences(user_id)
+    settings = get_frequency_settings()
+    user_frequency = preferences.frequency if preferences else None
+    return resolve_frequency(notification_type, user_frequency, settings) == "immediate"
+
+
+def _format_digest(notifications: List[Notification], frequency: str) -> str:
+    """Format a list of notifications as a single Telegram message"""
+    base_url = current_app.config.get("BASE_URL") or ""
+    label = "Hourly" if frequency == "hourly" else "Daily"
+    header = f"<b>🔔 {label} digest: {len(notifications)} new notification(s)</b>\n\n"
+    footer = "\n<i>📚 SuperviseMe</i>"
+
+    lines = []
+    for notification in notifications:
+        # Messages are sent with parse_mode="HTML": a bare < or & in a title
+        # makes Telegram reject the whole digest
+        line = f"• {html.escape(notification.title or '')}"
+        if notification.action_url and notification.action_url != "#":
+            url = notification.action_url
+            if url.startswith("/"):
+                url = f"{base_url}{url}"
+            line += f" (<a href='{html.escape(url)}'>open</a>)"
+        lines.append(line)
+
+    body = ""
+    for index, line in enumerate(lines):
+        remaining = len(lines) - index
+        tail = f"… and {remaining} more\n"
+        if len(header) + len(body) + len(line) + 1 + len(tail) + len(footer) > TELEGRAM_MESSAGE_LIMIT:
+            body += tail
+            break
+        body += line + "\n"
+
+    return header + body + footer
+
+
+def send_telegram_digests(frequency: str, now: Optional[int] = None) -> Dict[str, int]:
+    """
+    Send one digest message per chat for every pending notification whose
+    resolved frequency matches ``frequency`` and that was created since the
+    last run's watermark; a completed run advances the watermark to ``now``
+
+    Returns:
+        Dict with counts of chats, digests sent/failed and notifications delivered
+    """
+    from superviseme.utils.telegram_dispatch import (
+        TelegramMessage,
+        get_telegram_dispatcher,
+        record_delivery_results,
+    )
+    from superviseme.utils.telegram_service import parse_notification_types, get_telegram_service
+
+    results = {"chats": 0, "digests_sent": 0, "digests_failed": 0, "notifications_sent": 0}
+    if frequency not in DIGEST_LOOKBACK_SECONDS:
+        raise ValueError(f"Unsupported digest frequency: {frequency}")
+
+    now = now or int(time.time())
+    settings = get_frequency_settings()
+    run = db.session.get(TelegramDigestRun, frequency)
+    since = run.watermark if run else now - DIGEST_LOOKBACK_SECONDS[frequency]
+
+    rows = (
+        db.session.query(
+            Notification,
+            User_mgmt.telegram_user_id,
+            User_mgmt.telegram_notification_types,
+            User_mgmt.telegram_frequency,
+        )
+        .join(User_mgmt, User_mgmt.id == Notification.recipient_id)
+        .filter(
+            Notification.telegram_sent.is_(False),
+            Notification.created_at >= since,
+            # Notifications created during this second belong to the next run
+            Notification.created_at < now,
+            User_mgmt.telegram_enabled.is_(True),
+            User_mgmt.telegram_user_id.isnot(None),
+            User_mgmt.telegram_user_id != "",
+        )
+        .order_by(Notification.recipient_id, Notification.created_at)
+        .all()
+    )
+
+    pending_by_chat = {}
+    enabled_types_cache = {}
+    for notification, chat_id, raw_types, user_frequency in rows:
+        if resolve_frequency(notification.notification_type, user_frequency, settings) != frequency:
+            continue
+
+        if raw_types not in enabled_types_cache:
+            enabled_types_cache[raw_types] = parse_notification_types(raw_types)
+        enabled_types = enabled_types_cache[raw_types]
+        if enabled_types is not None and notification.notification_type not in enabled_types:
+            continue
+
+        pending_by_chat.setdefault(chat_id, []).append(notification)
+
+    results["chats"] = len(pending_by_chat)
+    if not pending_by_chat:
+        _record_digest_run(frequency, now, now)
+        return results
+
+    bot = get_telegram_service().get_bot()
+    if not bot:
+        logger.warning("Telegram bot not configured; %s digests postponed", frequency)
+        results["digests_failed"] = len(pending_by_chat)
+        return results
+
+    messages = [
+        TelegramMessage(chat_id, _format_digest(notifications, frequency), [n.id for n in notifications])
+        for chat_id, notifications in pending_by_chat.items()
+    ]
+    deliveries = get_telegram_dispatcher().dispatch(bot, messages)
+    record_delivery_results(deliveries)
+    # Failed chats keep the watermark at their oldest notification, so the
+    # next run retries them
+    watermark = now
+    for delivery in deliveries:
+        if delivery.success:
+            results["digests_sent"] += 1
+            results["notifications_sent"] += len(delivery.notification_ids)
+        else:
+            results["digests_failed"] += 1
+            watermark = min([watermark, *(n.created_at for n in pending_by_chat[delivery.chat_id])])
+    _record_digest_run(frequency, watermark, now)
+
+    logger.info(f"Telegram {frequency} digests completed: {results}")
+    return results
+
+
+def _record_digest_run(frequency: str, watermark: int, now: int) -> None:
+    row = db.session.get(TelegramDigestRun, frequency)
+    if row is None:
+        db.session.add(TelegramDigestRun(frequency=frequency, watermark=watermark, last_run_at=now))
+    else:
+        row.watermark = watermark
+        row.last_run_at = now
+    db.session.commit()
+
+
+def daily_digest_due(now: datetime) -> bool:
+    """
+    Whether today's daily digest is due: ``daily_hour`` has passed and no
+    daily run completed since, so a missed hour is caught up on the next run
+    """
+    due_at = now.replace(hour=get_frequency_settings()["daily_hour"], minute=0, second=0, microsecond=0)
+    if now < due_at:
+        return False
+    run = db.session.get(TelegramDigestRun, "daily")
+    return run is None or run.last_run_at < int(due_at.timestamp())
+
+
+def send_due_telegram_digests(now: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Send all digests due at the given time
+
+    Hourly digests go out on every run; daily digests once a day, on the
+    first run after the configured ``daily_hour``. Meant to be called once
+    per hour.
+    """
+    now = now or datetime.now()
+    timestamp = int(now.timestamp())
+    results = {"hourly": send_telegram_digests("hourly", now=timestamp)}
+    if daily_digest_due(now):
+        results["daily"] = send_telegram_digests("daily", now=timestamp)
+    return results
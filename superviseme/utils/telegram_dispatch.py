@@ -0,0 +1,402 @@
+"""
+Concurrent Telegram delivery for SuperviseMe
+Sends batches of messages through a bounded worker pool while respecting
+Bot API rate limits, and records delivery results on notifications
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from flask import current_app
+from telebot.apihelper import ApiTelegramException
+
+from superviseme import db
+from superviseme.models import Notification
+from superviseme.utils.process_lifecycle import on_fork_child
+
+logger = logging.getLogger(__name__)
+
+# Bot API limits: about 30 messages per second overall and about one message
+# per second to the same chat. Stay slightly below the global limit.
+GLOBAL_RATE_PER_SECOND = 25
+PER_CHAT_RATE_PER_SECOND = 1
+PER_CHAT_BURST = 1
+
+MAX_WORKERS = 8
+MAX_ATTEMPTS = 4
+BASE_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 8.0
+
+# A 429 asking us to wait longer than this gives up on the message instead of
+# holding a worker (and possibly a web request) hostage.
+MAX_RETRY_AFTER_SECONDS = 30
+
+# Rows marked as sent per UPDATE statement.
+MARK_SENT_BATCH_SIZE = 500
+
+# Batches waiting for the background worker; further batches are dropped and
+# logged instead of piling up in memory while Telegram is slow or down.
+MAX_BACKGROUND_BATCHES = 100
+
+# Per-chat buckets unused for this long are dropped (a refilled bucket is
+# equivalent to a new one); the map is also capped in size.
+CHAT_BUCKET_IDLE_SECONDS = 300
+MAX_CHAT_BUCKETS = 10000
+
+TelegramMessage = namedtuple("TelegramMessage", ["chat_id", "text", "notification_ids"])
+
+DeliveryResult = namedtuple(
+    "DeliveryResult",
+    ["chat_id", "notification_ids", "success", "attempts", "error", "sent_at"],
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_time(self) -> float:
+        """Consume a token if possible; otherwise return how long to wait"""
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                wait = self._wait_time()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def is_blocked(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._blocked_until
+
+    def pause(self, seconds: float) -> None:
+        """Block the bucket for ``seconds`` (used to honour retry_after)"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated_at = self._blocked_until
+
+
+def _retry_after(error: ApiTelegramException) -> Optional[int]:
+    parameters = (getattr(error, "result_json", None) or {}).get("parameters") or {}
+    retry_after = parameters.get("retry_after")
+    return int(retry_after) if retry_after is not None else None
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors and network errors are retryable; 4xx are not"""
+    if isinstance(error, ApiTelegramException):
+        return error.error_code == 429 or error.error_code >= 500
+    return True
+
+
+class TelegramDispatcher:
+    """
+    Bounded-concurrency Telegram sender
+
+    Messages to the same chat are sent in order by a single worker, while
+    different chats proceed in parallel. A global bucket and one bucket per
+    chat keep the bot inside the Bot API limits. submit() queues a batch on a
+    background worker so web requests never wait on delivery.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        global_rate: float = GLOBAL_RATE_PER_SECOND,
+        per_chat_rate: float = PER_CHAT_RATE_PER_SECOND,
+        per_chat_burst: float = PER_CHAT_BURST,
+        max_attempts: int = MAX_ATTEMPTS,
+        base_backoff: float = BASE_BACKOFF_SECONDS,
+        max_retry_after: int = MAX_RETRY_AFTER_SECONDS,
+        max_background_batches: int = MAX_BACKGROUND_BATCHES,
+    ):
+        self.max_workers = max_workers
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_retry_after = max_retry_after
+        self.max_background_batches = max_background_batches
+        self._global_bucket = TokenBucket(global_rate)
+        # chat id -> (bucket, last used), least recently used first
+        self._chat_buckets = OrderedDict()
+        self._chat_buckets_lock = threading.Lock()
+        self._background = None
+        self._background_pending = 0
+        self._background_lock = threading.Lock()
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        now = time.monotonic()
+        with self._chat_buckets_lock:
+            entry = self._chat_buckets.pop(chat_id, None)
+            bucket = entry[0] if entry else TokenBucket(self.per_chat_rate, self.per_chat_burst)
+            self._chat_buckets[chat_id] = (bucket, now)
+            self._evict_idle_buckets(now)
+            return bucket
+
+    def _evict_idle_buckets(self, now: float) -> None:
+        while len(self._chat_buckets) > 1:
+            chat_id, (bucket, last_used) = next(iter(self._chat_buckets.items()))
+            over_capacity = len(self._chat_buckets) > MAX_CHAT_BUCKETS
+            if not over_capacity and (now - last_used < CHAT_BUCKET_IDLE_SECONDS or bucket.is_blocked()):
+                break
+            self._chat_buckets.pop(chat_id)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        ceiling = min(MAX_BACKOFF_SECONDS, self.base_backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def _send_one(self, bot, message: TelegramMessage) -> DeliveryResult:
+        chat_bucket = self._chat_bucket(message.chat_id)
+        error = None
+        attempt = 0
+        while attempt < self.max_attempts:
+            attempt += 1
+            chat_bucket.acquire()
+            self._global_bucket.acquire()
+            try:
+                bot.send_message(
+                    chat_id=message.chat_id,
+                    text=message.text,
+                    parse_mode="HTML",
+                    disable_web_page_preview=True,
+                )
+                return DeliveryResult(
+                    message.chat_id, message.notification_ids, True, attempt, None, int(time.time())
+                )
+            except Exception as e:
+                error = e
+                if not _is_retryable(e):
+                    break
+
+                retry_after = _retry_after(e) if isinstance(e, ApiTelegramException) else None
+                if retry_after is not None:
+                    if retry_after > self.max_retry_after:
+                        logger.warning(
+                            f"Telegram asked to retry chat {message.chat_id} after {retry_after}s; giving up"
+                        )
+                        break
+                    # retry_after applies to the bot, not only to this chat
+                    chat_bucket.pause(retry_after)
+                    self._global_bucket.pause(retry_after)
+                elif attempt < self.max_attempts:
+                    time.sleep(self._backoff(attempt))
+
+        logger.error(f"Telegram delivery to chat {message.chat_id} failed after {attempt} attempt(s): {error}")
+        return DeliveryResult(message.chat_id, message.notification_ids, False, attempt, str(error), None)
+
+    def _send_chat(self, bot, messages: List[TelegramMessage]) -> List[DeliveryResult]:
+        return [self._send_one(bot, message) for message in messages]
+
+    def dispatch(self, bot, messages: Iterable[TelegramMessage]) -> List[DeliveryResult]:
+        """Send all messages and return one DeliveryResult per message"""
+        by_chat = OrderedDict()
+        for message in messages:
+            by_chat.setdefault(message.chat_id, []).append(message)
+        if not by_chat:
+            return []
+
+        if len(by_chat) == 1 or self.max_workers <= 1:
+            return [result for chat_messages in by_chat.values() for result in self._send_chat(bot, chat_messages)]
+
+        results = []
+        workers = min(self.max_workers, len(by_chat))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="telegram-dispatch") as pool:
+            futures = [pool.submit(self._send_chat, bot, chat_messages) for chat_messages in by_chat.values()]
+            for future in futures:
+                results.extend(future.result())
+        return results
+
+    def submit(self, app, messages: List[TelegramMessage], bot=None):
+        """
+        Queue messages for delivery on the background worker and return
+        immediately; results are recorded on the notifications when done
+
+        Args:
+            app: Flask app the worker runs in
+            messages: Messages to send
+            bot: Client to send with; by default the service's bot, resolved
+                on the worker since creating it calls the Bot API
+
+        Returns:
+            Future | None: resolves to the record_delivery_results() summary;
+            None if MAX_BACKGROUND_BATCHES batches are already waiting and
+            this one was dropped
+        """
+        with self._background_lock:
+            if self._background_pending >= self.max_background_batches:
+                logger.warning(
+                    f"Telegram background queue full ({self._background_pending} batches); "
+                    f"dropping {len(messages)} message(s)"
+                )
+                return None
+            if self._background is None:
+                self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telegram-background")
+            self._background_pending += 1
+            return self._background.submit(self._run_background, app, list(messages), bot)
+
+    def _run_background(self, app, messages: List[TelegramMessage], bot=None) -> Dict[str, int]:
+        from superviseme.utils.telegram_service import get_telegram_service
+
+        try:
+            with app.app_context():
+                try:
+                    bot = bot or get_telegram_service().get_bot()
+                    if not bot:
+                        logger.warning(f"Telegram bot not available; {len(messages)} message(s) not sent")
+                        return {"delivered": 0, "failed": len(messages)}
+                    summary = record_delivery_results(self.dispatch(bot, messages))
+                    logger.info(f"Telegram background delivery completed: {summary}")
+                    return summary
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Telegram background delivery failed: {e}")
+                    raise
+                finally:
+                    db.session.remove()
+        finally:
+            with self._background_lock:
+                self._background_pending -= 1
+
+
+def record_delivery_results(results: Iterable[DeliveryResult]) -> Dict[str, int]:
+    """
+    Mark delivered notifications as sent, grouped by send time and batched so
+    each UPDATE touches at most MARK_SENT_BATCH_SIZE rows
+    """
+    ids_by_sent_at = {}
+    summary = {"delivered": 0, "failed": 0}
+    for result in results:
+        if result.success:
+            summary["delivered"] += 1
+            if result.notification_ids:
+                ids_by_sent_at.setdefault(result.sent_at, []).extend(result.notification_ids)
+        else:
+            summary["failed"] += 1
+
+    for sent_at, notification_ids in ids_by_sent_at.items():
+        mark_notifications_sent(notification_ids, sent_at)
+    return summary
+
+
+def mark_notifications_sent(notification_ids: List[int], sent_at: int) -> None:
+    """Set telegram_sent/telegram_sent_at with one UPDATE per batch"""
+    if not notification_ids:
+        return
+    for start in range(0, len(notification_ids), MARK_SENT_BATCH_SIZE):
+        batch = notification_ids[start:start + MARK_SENT_BATCH_SIZE]
+        Notification.query.filter(Notification.id.in_(batch)).update(
+            {
+                Notification.telegram_sent: True,
+                Notification.telegram_sent_at: sent_at,
+            },
+            synchronize_session=False,
+        )
+    db.session.commit()
+
+
+def dispatch_notifications(notifications: Iterable[Notification], background: bool = False) -> Dict[str, int]:
+    """
+    Deliver freshly created notifications to Telegram in one concurrent batch
+
+    Notifications whose recipient has Telegram disabled, has opted out of the
+    type, or receives it through a digest are skipped (digests pick them up).
+    With background=True the batch is queued on the dispatcher's background
+    worker (as web requests do) and counted as queued, or as dropped when
+    that queue is full.
+
+    Returns:
+        Dict with counts of delivered, failed, queued, dropped and skipped
+        notifications
+    """
+    from superviseme.utils.telegram_digest import should_send_immediately
+    from superviseme.utils.telegram_service import get_telegram_service
+
+    service = get_telegram_service()
+    summary = {"delivered": 0, "failed": 0, "queued": 0, "dropped": 0, "skipped": 0}
+    messages = []
+    for notification in notifications:
+        preferences = service.get_user_preferences(notification.recipient_id)
+        if (
+            not preferences
+            or not preferences.enabled
+            or not preferences.chat_id
+            or (
+                preferences.notification_types is not None
+                and notification.notification_type not in preferences.notification_types
+            )
+            or not should_send_immediately(notification.recipient_id, notification.notification_type)
+        ):
+            summary["skipped"] += 1
+            continue
+
+        # Format in the calling thread: it needs the Flask app config.
+        text = service.format_message(notification.title, notification.message, notification.action_url)
+        messages.append(TelegramMessage(preferences.chat_id, text, [notification.id]))
+
+    if not messages:
+        return summary
+
+    if not service.get_config():
+        logger.warning("Telegram bot not configured; skipping dispatch")
+        summary["skipped"] += len(messages)
+        return summary
+
+    dispatcher = get_telegram_dispatcher()
+    if background:
+        # The worker resolves the bot: creating it calls getMe, which the
+        # request must not wait for
+        if dispatcher.submit(current_app._get_current_object(), messages) is None:
+            summary["dropped"] = len(messages)
+        else:
+            summary["queued"] = len(messages)
+        return summary
+
+    bot = service.get_bot()
+    if not bot:
+        logger.warning("Telegram bot not available; skipping dispatch")
+        summary["skipped"] += len(messages)
+        return summary
+    summary.update(record_delivery_results(dispatcher.dispatch(bot, messages)))
+    return summary
+
+
+# Shared dispatcher so rate-limit state is common to all callers in a worker
+_dispatcher = TelegramDispatcher()
+
+
+def get_telegram_dispatcher() -> TelegramDispatcher:
+    """Get singleton Telegram dispatcher instance"""
+    return _dispatcher
+
+
+@on_fork_child
+def _reset_dispatcher():
+    # The background worker thread does not survive fork
+    global _dispatcher
+    _dispatcher = TelegramDispatcher()
@@ -3,20 +3,65 @@ Telegram notification service for SuperviseMe
 Handles sending notifications via Telegram bot
 """
 
+import html
 import json
 import logging
+import sys
+import threading
 import time
-from typing import Dict, List, Optional, Union
+from collections import namedtuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-import telebot
+import requests
 from flask import current_app
-from telebot.apihelper import ApiTelegramException
+from requests.adapters import HTTPAdapter
+from sqlalchemy import event
 
 from superviseme.models import TelegramBotConfig, User_mgmt
 from superviseme import db
+from superviseme.utils.process_lifecycle import on_fork_child
+
+if TYPE_CHECKING:
+    import telebot
 
 logger = logging.getLogger(__name__)
 
+# How long a worker trusts its cached bot config / user preferences before
+# re-reading them. Writes made in this process invalidate immediately; writes
+# made by other workers become visible after at most one TTL.
+CONFIG_CACHE_TTL_SECONDS = 60
+USER_PREFERENCES_CACHE_TTL_SECONDS = 300
+
+# Keep-alive connection pool shared by every thread talking to the Bot API.
+TELEGRAM_HTTP_POOL_SIZE = 10
+
+TelegramConfigSnapshot = namedtuple(
+    "TelegramConfigSnapshot",
+    ["id", "bot_token", "bot_username", "notification_types", "frequency_settings", "version"],
+)
+
+TelegramUserPreferences = namedtuple(
+    "TelegramUserPreferences",
+    ["user_id", "chat_id", "enabled", "notification_types", "frequency"],
+)
+
+
+def parse_notification_types(raw: Optional[str]) -> Optional[frozenset]:
+    """Parse a JSON list of notification types; None means all types are allowed"""
+    if not raw:
+        return None
+    try:
+        return frozenset(json.loads(raw))
+    except (TypeError, ValueError):
+        logger.warning("Ignoring malformed telegram_notification_types value")
+        return None
+
+
+def _is_api_error(error):
+    """True for errors reported by the Bot API"""
+    from telebot.apihelper import ApiTelegramException
+    return isinstance(error, ApiTelegramException)
+
 
 class TelegramService:
     """Service for managing Telegram bot notifications"""
@@ -24,13 +69,114 @@ class TelegramService:
     def __init__(self):
         self.bot = None
         self._bot_token = None
+        self._config = None
+        self._config_loaded_at = 0.0
+        self._config_version = 0
+        self._user_preferences = {}
+        self._http_session = None
+        self._lock = threading.RLock()
+
+    def invalidate_config(self) -> None:
+        """Drop the cached bot configuration and client so the next call reloads them"""
+        with self._lock:
+            self._config = None
+            self._config_loaded_at = 0.0
+            self._config_version += 1
+            self.bot = None
+            self._bot_token = None
+
+    def invalidate_user_preferences(self, user_id: Optional[int] = None) -> None:
+        """Drop cached Telegram preferences for one user, or for everyone"""
+        if user_id is None:
+            self._user_preferences.clear()
+        else:
+            self._user_preferences.pop(user_id, None)
+
+    def reset_after_fork(self) -> None:
+        """Forget the HTTP session and bot inherited from the parent process"""
+        self._lock = threading.RLock()
+        self.bot = None
+        self._bot_token = None
+        self._http_session = None
+        telebot = sys.modules.get("telebot")
+        if telebot is not None:
+            telebot.apihelper.session = None
+
+    def get_config_version(self) -> int:
+        """Version stamp bumped every time the cached configuration is invalidated"""
+        return self._config_version
+
+    def _get_config(self) -> Optional[TelegramConfigSnapshot]:
+        """Get active Telegram bot configuration (cached)"""
+        now = time.monotonic()
+        with self._lock:
+            if self._config_loaded_at and now - self._config_loaded_at < CONFIG_CACHE_TTL_SECONDS:
+                return self._config
+
+            config = TelegramBotConfig.query.filter_by(is_active=True).first()
+            self._config = TelegramConfigSnapshot(
+                id=config.id,
+                bot_token=config.bot_token,
+                bot_username=config.bot_username,
+                notification_types=config.notification_types,
+                frequency_settings=config.frequency_settings,
+                version=self._config_version,
+            ) if config else None
+            self._config_loaded_at = now
+            return self._config
+
+    def get_config(self) -> Optional[TelegramConfigSnapshot]:
+        """Public accessor for the cached active bot configuration"""
+        return self._get_config()
+
+    def get_user_preferences(self, user_id: int) -> Optional[TelegramUserPreferences]:
+        """
+        Get a user's Telegram delivery preferences (cached)
+
+        Only the Telegram columns are loaded, and the notification type list is
+        parsed once per cache entry rather than once per message.
+        """
+        now = time.monotonic()
+        cached = self._user_preferences.get(user_id)
+        if cached and now - cached[0] < USER_PREFERENCES_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        row = (
+            db.session.query(
+                User_mgmt.telegram_user_id,
+                User_mgmt.telegram_enabled,
+                User_mgmt.telegram_notification_types,
+                User_mgmt.telegram_frequency,
+            )
+            .filter(User_mgmt.id == user_id)
+            .first()
+        )
+        preferences = TelegramUserPreferences(
+            user_id=user_id,
+            chat_id=row.telegram_user_id,
+            enabled=bool(row.telegram_enabled),
+            notification_types=parse_notification_types(row.telegram_notification_types),
+            frequency=row.telegram_frequency,
+        ) if row else None
+        self._user_preferences[user_id] = (now, preferences)
+        return preferences
+
+    def _get_http_session(self) -> requests.Session:
+        """Shared keep-alive HTTP session used by the TeleBot client"""
+        if self._http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=TELEGRAM_HTTP_POOL_SIZE,
+            )
+            session.mount("https://", adapter)
+            self._http_session = session
+            # telebot is imported on first use; it adds ~0.2 s to every worker boot
+            import telebot
+            telebot.apihelper.session = session
+        return self._http_session
     
-    def _get_config(self) -> Optional[TelegramBotConfig]:
-        """Get active Telegram bot configuration"""
-        # Query every time so admin-side config changes are reflected immediately.
-        return TelegramBotConfig.query.filter_by(is_active=True).first()
-    
-    def _get_bot(self) -> Optional[telebot.TeleBot]:
+    def _get_bot(self) -> Optional["telebot.TeleBot"]:
         """Get Telegram bot instance"""
         config = self._get_config()
         if not config:
@@ -39,19 +185,27 @@ class TelegramService:
             return None
         
         # Recreate client if token changed or client isn't initialized.
-        if not self.bot or self._bot_token != config.bot_token:
-            try:
-                self.bot = telebot.TeleBot(config.bot_token)
-                self._bot_token = config.bot_token
-                # Test bot connection
-                self.bot.get_me()
-            except Exception as e:
-                logger.error(f"Failed to initialize Telegram bot: {e}")
-                self.bot = None
-                self._bot_token = None
-                return None
+        with self._lock:
+            if not self.bot or self._bot_token != config.bot_token:
+                try:
+                    self._get_http_session()
+                    import telebot
+                    bot = telebot.TeleBot(config.bot_token)
+                    # Test bot connection once per token, not once per message
+                    bot.get_me()
+                    self.bot = bot
+                    self._bot_token = config.bot_token
+                except Exception as e:
+                    logger.error(f"Failed to initialize Telegram bot: {e}")
+                    self.bot = None
+                    self._bot_token = None
+                    return None
         
         return self.bot
+
+    def get_bot(self) -> Optional["telebot.TeleBot"]:
+        """Public accessor for the cached bot client (None when not configured)"""
+        return self._get_bot()
     
     def test_bot_connection(self) -> Dict[str, Union[bool, str]]:
         """Test Telegram bot connection and return status"""
@@ -103,18 +257,17 @@ class TelegramService:
         """
         try:
             # Get user's Telegram configuration
-            user = User_mgmt.query.get(user_id)
-            if not user:
+            preferences = self.get_user_preferences(user_id)
+            if not preferences:
                 return {'success': False, 'message': 'User not found'}
             
-            if not user.telegram_enabled or not user.telegram_user_id:
+            if not preferences.enabled or not preferences.chat_id:
                 return {'success': False, 'message': 'Telegram notifications not enabled for user'}
             
             # Check if user wants this type of notification.
             # "test" notifications are always allowed so users can validate setup.
-            if notification_type != "test" and user.telegram_notification_types:
-                enabled_types = json.loads(user.telegram_notification_types)
-                if notification_type not in enabled_types:
+            if notification_type != "test" and preferences.notification_types is not None:
+                if notification_type not in preferences.notification_types:
                     return {'success': False, 'message': f'Notification type {notification_type} not enabled for user'}
             
             # Get bot instance
@@ -127,7 +280,7 @@ class TelegramService:
             
             # Send message
             bot.send_message(
-                chat_id=user.telegram_user_id,
+                chat_id=preferences.chat_id,
                 text=telegram_message,
                 parse_mode='HTML',
                 disable_web_page_preview=True
@@ -136,26 +289,30 @@ class TelegramService:
             logger.info(f"Telegram notification sent to user {user_id} ({notification_type})")
             return {'success': True, 'message': 'Notification sent successfully'}
             
-        except ApiTelegramException as e:
-            logger.error(f"Telegram API error sending notification to user {user_id}: {e}")
-            return {'success': False, 'message': f'Telegram API error: {str(e)}'}
         except Exception as e:
+            if _is_api_error(e):
+                logger.error(f"Telegram API error sending notification to user {user_id}: {e}")
+                return {'success': False, 'message': f'Telegram API error: {str(e)}'}
             logger.error(f"Error sending Telegram notification to user {user_id}: {e}")
             return {'success': False, 'message': f'Error: {str(e)}'}
     
     def _format_message(self, title: str, message: str, action_url: Optional[str] = None) -> str:
         """Format notification message for Telegram"""
-        formatted_message = f"<b>🔔 {title}</b>\n\n{message}"
+        formatted_message = f"<b>🔔 {html.escape(title or '')}</b>\n\n{html.escape(message or '')}"
         
         if action_url and action_url != '#':
             # Build full URL if it's a relative path
             if action_url.startswith('/'):
                 base_url = current_app.config.get('BASE_URL', 'https://superviseme.local')
                 action_url = f"{base_url}{action_url}"
-            formatted_message += f"\n\n<a href='{action_url}'>🔗 View Details</a>"
+            formatted_message += f"\n\n<a href='{html.escape(action_url)}'>🔗 View Details</a>"
         
         formatted_message += "\n\n<i>📚 SuperviseMe</i>"
         return formatted_message
+
+    def format_message(self, title: str, message: str, action_url: Optional[str] = None) -> str:
+        """Public accessor for the HTML notification format (needs an app context for BASE_URL)"""
+        return self._format_message(title, message, action_url)
     
     def verify_user_chat(self, telegram_user_id: str) -> Dict[str, Union[bool, str, Dict]]:
         """
@@ -187,15 +344,14 @@ class TelegramService:
                 }
             }
             
-        except ApiTelegramException as e:
-            if 'chat not found' in str(e).lower():
-                return {
-                    'success': False,
-                    'message': 'Chat not found. Please make sure you have started a conversation with the bot.'
-                }
-            else:
-                return {'success': False, 'message': f'Telegram API error: {str(e)}'}
         except Exception as e:
+            if _is_api_error(e):
+                if 'chat not found' in str(e).lower():
+                    return {
+                        'success': False,
+                        'message': 'Chat not found. Please make sure you have started a conversation with the bot.'
+                    }
+                return {'success': False, 'message': f'Telegram API error: {str(e)}'}
             logger.error(f"Error verifying Telegram chat {telegram_user_id}: {e}")
             return {'success': False, 'message': f'Error: {str(e)}'}
     
@@ -224,6 +380,25 @@ class TelegramService:
 _telegram_service = TelegramService()
 
 
+def _invalidate_config_cache(mapper, connection, target):
+    _telegram_service.invalidate_config()
+
+
+def _invalidate_user_preferences_cache(mapper, connection, target):
+    _telegram_service.invalidate_user_preferences(target.id)
+
+
+# Any write to the bot configuration or to a user row in this process drops
+# the matching cache entry, so admin/profile saves take effect immediately.
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(TelegramBotConfig, _event_name, _invalidate_config_cache)
+event.listen(User_mgmt, "after_update", _invalidate_user_preferences_cache)
+event.listen(User_mgmt, "after_delete", _invalidate_user_preferences_cache)
+
+
+on_fork_child(_telegram_service.reset_after_fork)
+
+
 def get_telegram_service() -> TelegramService:
     """Get singleton Telegram service instance"""
     return _telegram_service
@@ -0,0 +1,120 @@
+"""
+Template compilation cache and render timing for SuperviseMe
+Compiled templates are kept in a bytecode cache directory shared by all
+workers, precompiled by the init phase, and render times are tracked per template
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from flask import before_render_template, template_rendered
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIXES = (".html",)
+
+
+def template_cache_dir():
+    """Bytecode cache directory; every process of a deployment must see the same one"""
+    return os.getenv("TEMPLATE_CACHE_DIR") or os.path.join(
+        tempfile.gettempdir(), f"superviseme-jinja-{os.getuid() if hasattr(os, 'getuid') else 'user'}"
+    )
+
+
+def configure_template_cache(app):
+    """
+    Point the app's Jinja environment at the shared bytecode cache and start
+    timing renders. Must run before app.jinja_env is first used.
+    """
+    if os.getenv("TEMPLATE_BYTECODE_CACHE", "true").lower() == "true":
+        directory = template_cache_dir()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Entries are keyed by template name and source checksum, so edited
+        # templates never load stale bytecode.
+        app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache(directory)}
+        app.config["TEMPLATE_CACHE_DIR"] = directory
+
+    app.extensions["template_render_stats"] = TemplateRenderStats()
+    before_render_template.connect(_render_started, app)
+    template_rendered.connect(_render_finished, app)
+
+
+def warm_templates(app):
+    """
+    Compile every template now, filling the bytecode cache (and this
+    process's template cache, which preloaded workers then share)
+
+    Returns:
+        dict: compiled count, failed template names and elapsed ms
+    """
+    started = time.perf_counter()
+    compiled, failed = 0, []
+    for name in app.jinja_env.list_templates():
+        if not name.endswith(TEMPLATE_SUFFIXES):
+            continue
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except Exception as e:
+            failed.append(name)
+            logger.error(f"Template {name} failed to compile: {e}")
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Warmed {compiled} templates in {elapsed_ms} ms ({len(failed)} failed)")
+    return {"compiled": compiled, "failed": failed, "elapsed_ms": elapsed_ms}
+
+
+class TemplateRenderStats:
+    """Render count and time per template name (per process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, seconds):
+        with self._lock:
+            entry = self._stats.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def snapshot(self):
+        """Templates by total render time, slowest first"""
+        with self._lock:
+            items = [(name, list(entry)) for name, entry in self._stats.items()]
+        return [
+            {
+                "template": name,
+                "renders": count,
+                "total_ms": round(total * 1000, 3),
+                "avg_ms": round(total * 1000 / count, 3),
+                "max_ms": round(slowest * 1000, 3),
+            }
+            for name, (count, total, slowest) in sorted(items, key=lambda item: item[1][1], reverse=True)
+        ]
+
+
+_render_starts = threading.local()
+
+
+def _render_started(app, template, context, **extra):
+    stack = getattr(_render_starts, "stack", None)
+    if stack is None:
+        stack = _render_starts.stack = []
+    stack.append(time.perf_counter())
+
+
+def _render_finished(app, template, context, **extra):
+    stack = getattr(_render_starts, "stack", None)
+    if not stack:
+        return
+    elapsed = time.perf_counter() - stack.pop()
+    app.extensions["template_render_stats"].record(template.name or "<string>", elapsed)
+
+
+def render_stats(app):
+    stats = app.extensions.get("template_render_stats")
+    return stats.snapshot() if stats else []
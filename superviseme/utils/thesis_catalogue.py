@@ -0,0 +1,620 @@
+"""
+Public thesis catalogue index for SuperviseMe
+Keeps the public, unassigned, unfrozen theses in memory with one bitset per
+facet value (level, topic, supervisor, tag), so catalogue filters and facet
+counts are answered without querying the database. A shared change log
+tells each worker which theses another one changed.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from superviseme import db
+from superviseme.models import Catalogue_Change, Tag, Thesis, Thesis_Supervisor, Thesis_Tag, User_mgmt
+from superviseme.utils.tags import (
+    CATALOGUE_FIELDS,
+    MATCH_ALL,
+    MATCH_ANY,
+    fold_text,
+    parse_tag_terms,
+    public_catalogue_clause,
+)
+
+logger = logging.getLogger(__name__)
+
+FACETS = ("level", "topic", "supervisor", "tag")
+# Facets whose values are ids rather than folded text keys
+ID_FACETS = ("supervisor", "tag")
+
+FACET_LIMIT = 20
+
+# Tables whose bulk writes can change the catalogue (see invalidate_catalogue)
+CATALOGUE_TABLES = {"thesis", "thesis_supervisor", "thesis_tag", "user_mgmt"}
+
+# Thesis columns copied into a CatalogueEntry
+INDEXED_FIELDS = (
+    "title", "short_description", "description", "long_description", "topic", "prerequisites", "level",
+    "created_at",
+)
+
+# How often a worker reads the catalogue_change rows other workers added, to
+# reload the theses they list
+CATALOGUE_CHANGE_CHECK_SECONDS = 2
+
+# Ids skipped by the newest row read may belong to transactions that commit
+# out of order; they are looked up again for this long. Larger jumps (e.g. a
+# sequence skipping ahead after a crash) are not tracked.
+CATALOGUE_CHANGE_GAP_SECONDS = 30
+CATALOGUE_CHANGE_MAX_GAP = 100
+
+# Every Nth change deletes rows past the retention, which must outlast
+# CATALOGUE_MAX_AGE_SECONDS (a worker rebuilds at least that often)
+CATALOGUE_CHANGE_PRUNE_EVERY = 100
+CATALOGUE_CHANGE_RETENTION_SECONDS = 24 * 3600
+
+# Safety net for writes that bypass the change log (e.g. manual SQL)
+CATALOGUE_MAX_AGE_SECONDS = 3600
+
+# Thesis ids per IN (...) list when reloading entries
+LOAD_CHUNK_SIZE = 500
+
+# session.info keys: theses touched by the transaction / full rebuild requested
+PENDING_KEY = "thesis_catalogue_pending"
+REBUILD_KEY = "thesis_catalogue_rebuild"
+
+CatalogueEntry = namedtuple(
+    "CatalogueEntry",
+    ["id", "title", "summary", "topic", "level", "created_at", "supervisor_ids", "tag_ids", "text"],
+)
+
+CatalogueQuery = namedtuple("CatalogueQuery", ["q", "keywords", "match", "selected"])
+
+CataloguePage = namedtuple("CataloguePage", ["theses", "total", "facets", "supervisors_by_thesis", "tags_by_thesis"])
+
+
+def _bits(slot):
+    return 1 << slot
+
+
+def _slots_of(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class CatalogueIndex:
+    """
+    In-memory inverted index of the public catalogue
+
+    Each catalogue thesis holds a slot; every facet value maps to an int
+    bitset over those slots. Values are ORed within a facet and facets are
+    ANDed; a facet's counts ignore its own selection so alternatives stay
+    visible.
+    """
+
+    def __init__(self, max_age=CATALOGUE_MAX_AGE_SECONDS, change_check=CATALOGUE_CHANGE_CHECK_SECONDS):
+        self.max_age = max_age
+        self.change_check = change_check
+        self._lock = threading.RLock()
+        self._own_changes = set()
+        self._reset()
+
+    def _reset(self):
+        self.entries = {}
+        self.postings = {facet: {} for facet in FACETS}
+        self.labels = {facet: {} for facet in FACETS}
+        self.tag_keys = {}
+        self._slots = {}
+        self._slot_ids = []
+        self._free = []
+        self._all = 0
+        self._pending = set()
+        self._pending_supervisors = set()
+        self.built_at = None
+        self.change_id = None
+        self.changes_checked_at = None
+        self._gaps = {}
+
+    # -- maintenance -----------------------------------------------------------
+
+    def invalidate(self):
+        """Drop everything; the next read rebuilds from the database"""
+        with self._lock:
+            self.built_at = None
+
+    def mark_stale(self, thesis_ids=(), supervisor_ids=()):
+        """Reload these theses (and those of these supervisors) on the next read"""
+        with self._lock:
+            self._pending.update(thesis_ids)
+            self._pending_supervisors.update(supervisor_ids)
+
+    def note_change(self, change_id):
+        """This process recorded change_id and already applied it; skip it when reading the log"""
+        with self._lock:
+            self._own_changes.add(change_id)
+
+    def _read_changes(self, now):
+        """
+        Queue the theses other workers changed since the last read
+
+        Returns:
+            bool: True if one of the changes asks for a full rebuild
+        """
+        if self.changes_checked_at is not None and now - self.changes_checked_at < self.change_check:
+            return False
+        self.changes_checked_at = now
+        self._gaps = {
+            change_id: seen for change_id, seen in self._gaps.items() if now - seen < CATALOGUE_CHANGE_GAP_SECONDS
+        }
+        rebuild = False
+        for change in read_catalogue_changes(self.change_id, self._gaps):
+            if change.id > self.change_id:
+                if change.id - self.change_id <= CATALOGUE_CHANGE_MAX_GAP:
+                    self._gaps.update(dict.fromkeys(range(self.change_id + 1, change.id), now))
+                self.change_id = change.id
+            else:
+                self._gaps.pop(change.id, None)
+            if change.id in self._own_changes:
+                continue
+            rebuild = rebuild or change.rebuild
+            self._pending.update(_load_ids(change.thesis_ids))
+            self._pending_supervisors.update(_load_ids(change.supervisor_ids))
+        self._own_changes = {
+            change_id for change_id in self._own_changes if change_id > self.change_id or change_id in self._gaps
+        }
+        return rebuild
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        if self.built_at is None or now - self.built_at > self.max_age or self._read_changes(now):
+            self._rebuild()
+        elif self._pending or self._pending_supervisors:
+            ids = set(self._pending)
+            for supervisor_id in self._pending_supervisors:
+                ids.update(self._slot_ids[slot] for slot in _slots_of(self.postings["supervisor"].get(supervisor_id, 0)))
+            self._pending.clear()
+            self._pending_supervisors.clear()
+            self._refresh(ids)
+
+    def _rebuild(self):
+        started = time.monotonic()
+        self._reset()
+        # Read before loading, so changes committed meanwhile are replayed
+        self.change_id = latest_catalogue_change()
+        self.changes_checked_at = started
+        for entry, labels in self._load():
+            self._add(entry, labels)
+        self.built_at = time.monotonic()
+        logger.info(f"Catalogue index built: {len(self.entries)} theses in {self.built_at - started:.3f}s")
+
+    def _refresh(self, thesis_ids):
+        thesis_ids = sorted(thesis_id for thesis_id in thesis_ids if thesis_id is not None)
+        for start in range(0, len(thesis_ids), LOAD_CHUNK_SIZE):
+            chunk = thesis_ids[start:start + LOAD_CHUNK_SIZE]
+            for thesis_id in chunk:
+                self._remove(thesis_id)
+            for entry, labels in self._load(chunk):
+                self._add(entry, labels)
+
+    def _load(self, thesis_ids=None):
+        """Catalogue theses (all, or those among thesis_ids) with their facet labels"""
+        filters = [public_catalogue_clause()]
+        if thesis_ids is not None:
+            filters.append(Thesis.id.in_(thesis_ids))
+        scope = select(Thesis.id).where(*filters)
+
+        theses = db.session.execute(
+            select(Thesis.id, Thesis.title, Thesis.short_description, Thesis.description, Thesis.long_description,
+                   Thesis.topic, Thesis.prerequisites, Thesis.level, Thesis.created_at)
+            .where(*filters)
+        ).all()
+        if not theses:
+            return []
+
+        supervisors = {}
+        for row in db.session.execute(
+            select(Thesis_Supervisor.thesis_id, User_mgmt.id, User_mgmt.name, User_mgmt.surname)
+            .join(User_mgmt, User_mgmt.id == Thesis_Supervisor.supervisor_id)
+            .where(Thesis_Supervisor.thesis_id.in_(scope))
+            .order_by(Thesis_Supervisor.id)
+        ):
+            supervisors.setdefault(row.thesis_id, {})[row.id] = f"{row.name} {row.surname}"
+
+        tags = {}
+        for row in db.session.execute(
+            select(Thesis_Tag.thesis_id, Tag.id, Tag.name, Tag.key)
+            .join(Tag, Tag.id == Thesis_Tag.tag_id)
+            .where(Thesis_Tag.thesis_id.in_(scope))
+            .order_by(Thesis_Tag.id)
+        ):
+            tags.setdefault(row.thesis_id, {})[row.id] = (row.name, row.key)
+
+        loaded = []
+        for row in theses:
+            thesis_supervisors = supervisors.get(row.id, {})
+            thesis_tags = tags.get(row.id, {})
+            text = "\n".join(fold_text(value) for value in (
+                row.title, row.short_description, row.long_description, row.description, row.topic,
+                row.prerequisites, *thesis_supervisors.values(), *(name for name, _ in thesis_tags.values()),
+            ) if value)
+            entry = CatalogueEntry(
+                id=row.id,
+                title=row.title,
+                summary=row.short_description or row.description,
+                topic=row.topic,
+                level=row.level,
+                created_at=row.created_at or 0,
+                supervisor_ids=tuple(thesis_supervisors),
+                tag_ids=tuple(thesis_tags),
+                text=text,
+            )
+            loaded.append((entry, {"supervisor": thesis_supervisors, "tag": thesis_tags}))
+        return loaded
+
+    def _values(self, entry):
+        values = {facet: () for facet in FACETS}
+        for facet in ("level", "topic"):
+            key = fold_text(getattr(entry, facet))
+            if key:
+                values[facet] = (key,)
+        values["supervisor"] = entry.supervisor_ids
+        values["tag"] = entry.tag_ids
+        return values
+
+    def _add(self, entry, labels):
+        slot = self._free.pop() if self._free else len(self._slot_ids)
+        if slot == len(self._slot_ids):
+            self._slot_ids.append(entry.id)
+        else:
+            self._slot_ids[slot] = entry.id
+        self._slots[entry.id] = slot
+        self.entries[entry.id] = entry
+        bit = _bits(slot)
+        self._all |= bit
+
+        for facet, values in self._values(entry).items():
+            postings = self.postings[facet]
+            for value in values:
+                postings[value] = postings.get(value, 0) | bit
+                if facet == "tag":
+                    self.labels[facet][value], self.tag_keys[value] = labels[facet][value]
+                elif facet == "supervisor":
+                    self.labels[facet][value] = labels[facet][value]
+                else:
+                    self.labels[facet].setdefault(value, getattr(entry, facet).strip())
+
+    def _remove(self, thesis_id):
+        slot = self._slots.pop(thesis_id, None)
+        if slot is None:
+            return
+        entry = self.entries.pop(thesis_id)
+        bit = _bits(slot)
+        self._all &= ~bit
+        for facet, values in self._values(entry).items():
+            postings = self.postings[facet]
+            for value in values:
+                remaining = postings.get(value, 0) & ~bit
+                if remaining:
+                    postings[value] = remaining
+                else:
+                    del postings[value]
+                    self.labels[facet].pop(value, None)
+                    if facet == "tag":
+                        self.tag_keys.pop(value, None)
+        self._slot_ids[slot] = None
+        self._free.append(slot)
+
+    # -- queries ---------------------------------------------------------------
+
+    def _text_bits(self, q):
+        needle = fold_text(q)
+        if not needle:
+            return self._all
+        bits = 0
+        for thesis_id, entry in self.entries.items():
+            if needle in entry.text:
+                bits |= _bits(self._slots[thesis_id])
+        return bits
+
+    def _keyword_bits(self, keywords, match):
+        terms = parse_tag_terms(keywords)
+        if not terms:
+            return self._all
+        combined = None
+        for term in terms:
+            term_bits = 0
+            for tag_id, key in self.tag_keys.items():
+                if key.startswith(term):
+                    term_bits |= self.postings["tag"][tag_id]
+            if combined is None:
+                combined = term_bits
+            elif match == MATCH_ALL:
+                combined &= term_bits
+            else:
+                combined |= term_bits
+        return combined
+
+    def _facet_values(self, facet, base, selected, limit):
+        postings = self.postings[facet]
+        counted = []
+        for value, bits in postings.items():
+            count = (base & bits).bit_count()
+            if count or value in selected:
+                counted.append({
+                    "value": value,
+                    "label": self.labels[facet].get(value, str(value)),
+                    "count": count,
+                    "selected": value in selected,
+                })
+        counted.sort(key=lambda item: (-item["count"], item["label"].casefold()))
+        shown = counted[:limit]
+        shown.extend(item for item in counted[limit:] if item["selected"])
+        return shown
+
+    def search(self, query, facet_limit=FACET_LIMIT):
+        """
+        Filter the catalogue and count every facet value under the other
+        facets' selections
+
+        Returns:
+            CataloguePage: Matching entries (newest first), their total, facet
+            values per facet, and supervisor/tag labels per listed thesis
+        """
+        with self._lock:
+            self._ensure_current()
+
+            selected = {
+                facet: {value for value in query.selected.get(facet, ()) if value in self.postings[facet]}
+                for facet in FACETS
+            }
+            base = self._text_bits(query.q) & self._keyword_bits(query.keywords, query.match or MATCH_ANY)
+            per_facet = {}
+            for facet, values in selected.items():
+                if values:
+                    bits = 0
+                    for value in values:
+                        bits |= self.postings[facet][value]
+                    per_facet[facet] = bits
+
+            matched = base
+            for bits in per_facet.values():
+                matched &= bits
+
+            facets = {}
+            for facet in FACETS:
+                others = base
+                for other, bits in per_facet.items():
+                    if other != facet:
+                        others &= bits
+                facets[facet] = self._facet_values(facet, others, selected[facet], facet_limit)
+
+            theses = sorted(
+                (self.entries[self._slot_ids[slot]] for slot in _slots_of(matched)),
+                key=lambda entry: (entry.created_at, entry.id),
+                reverse=True,
+            )
+            supervisor_labels = self.labels["supervisor"]
+            tag_labels = self.labels["tag"]
+            return CataloguePage(
+                theses=theses,
+                total=len(theses),
+                facets=facets,
+                supervisors_by_thesis={
+                    entry.id: [supervisor_labels[sid] for sid in entry.supervisor_ids] for entry in theses
+                },
+                tags_by_thesis={entry.id: [tag_labels[tid] for tid in entry.tag_ids] for entry in theses},
+            )
+
+
+def get_catalogue():
+    """The current app's catalogue index"""
+    return current_app.extensions.setdefault("thesis_catalogue", CatalogueIndex())
+
+
+def parse_catalogue_query(args):
+    """
+    Catalogue filters from request args: q, keywords, match and the
+    repeatable facet parameters level, topic, supervisor and tag
+
+    Returns:
+        CatalogueQuery
+    """
+    selected = {}
+    for facet in FACETS:
+        values = []
+        for raw in args.getlist(facet):
+            if facet in ID_FACETS:
+                if str(raw).strip().isdigit():
+                    values.append(int(raw))
+            elif fold_text(raw):
+                values.append(fold_text(raw))
+        selected[facet] = tuple(dict.fromkeys(values))
+    match = args.get("match", MATCH_ANY)
+    return CatalogueQuery(
+        q=(args.get("q") or "").strip(),
+        keywords=(args.get("keywords") or "").strip(),
+        match=match if match in (MATCH_ANY, MATCH_ALL) else MATCH_ANY,
+        selected=selected,
+    )
+
+
+def search_catalogue(query, facet_limit=FACET_LIMIT):
+    """Filter the public catalogue of the current app; see CatalogueIndex.search"""
+    return get_catalogue().search(query, facet_limit=facet_limit)
+
+
+def invalidate_catalogue(deferred=True):
+    """
+    Rebuild the index of every worker after bulk Core writes: on the first
+    read after the current transaction commits, or right away with
+    deferred=False (for writes that are already committed)
+    """
+    if deferred:
+        db.session.info[REBUILD_KEY] = True
+    elif has_app_context():
+        catalogue = get_catalogue()
+        catalogue.invalidate()
+        _publish(catalogue, rebuild=True)
+
+
+def latest_catalogue_change():
+    """Id of the newest catalogue change (0 before the first one)"""
+    return db.session.execute(select(func.max(Catalogue_Change.id))).scalar() or 0
+
+
+def read_catalogue_changes(after_id, also_ids=()):
+    """Catalogue changes newer than after_id, plus those in also_ids, oldest first"""
+    condition = Catalogue_Change.id > after_id
+    if also_ids:
+        condition = or_(condition, Catalogue_Change.id.in_(list(also_ids)))
+    return db.session.execute(
+        select(Catalogue_Change.id, Catalogue_Change.thesis_ids, Catalogue_Change.supervisor_ids,
+               Catalogue_Change.rebuild)
+        .where(condition)
+        .order_by(Catalogue_Change.id)
+    ).all()
+
+
+def record_catalogue_change(thesis_ids=(), supervisor_ids=(), rebuild=False):
+    """
+    Tell the other workers which theses (or supervisors' theses) changed, or
+    that everything did, in its own transaction since the change is already
+    committed
+
+    Returns:
+        int | None: The change id, or None if it could not be written
+    """
+    table = Catalogue_Change.__table__
+    now = int(time.time())
+    try:
+        with db.engine.begin() as connection:
+            change_id = connection.execute(insert(table).values(
+                thesis_ids=_dump_ids(thesis_ids),
+                supervisor_ids=_dump_ids(supervisor_ids),
+                rebuild=rebuild,
+                created_at=now,
+            )).inserted_primary_key[0]
+            if change_id % CATALOGUE_CHANGE_PRUNE_EVERY == 0:
+                connection.execute(delete(table).where(table.c.created_at < now - CATALOGUE_CHANGE_RETENTION_SECONDS))
+            return change_id
+    except Exception as e:
+        # Other workers still catch up with their next full rebuild
+        logger.warning(f"Could not record the catalogue change: {e}")
+        return None
+
+
+def _dump_ids(ids):
+    ids = sorted(value for value in ids if value is not None)
+    return json.dumps(ids) if ids else None
+
+
+def _load_ids(raw):
+    return json.loads(raw) if raw else ()
+
+
+def _publish(catalogue, thesis_ids=(), supervisor_ids=(), rebuild=False):
+    change_id = record_catalogue_change(thesis_ids, supervisor_ids, rebuild=rebuild)
+    if change_id is not None:
+        catalogue.note_change(change_id)
+
+
+# ORM writes that can change the catalogue queue the affected theses on the
+# session; they are reloaded on the first catalogue read after the commit.
+# Bulk Core writes call invalidate_catalogue(). Either way the commit records
+# a catalogue_change row, which other workers replay on their next read.
+
+def _queue(target, thesis_ids=(), supervisor_ids=()):
+    session = inspect(target).session
+    if session is None:
+        return
+    pending = session.info.setdefault(PENDING_KEY, (set(), set()))
+    pending[0].update(thesis_ids)
+    pending[1].update(supervisor_ids)
+
+
+def _listed(state, previous=False):
+    """
+    Whether the thesis is (or with previous=True was, before this flush) in
+    the catalogue, as in public_catalogue_clause; unloaded fields count as
+    listed
+    """
+    values = {}
+    for field in CATALOGUE_FIELDS:
+        history = state.attrs[field].history
+        value = (history.deleted if previous else history.added) if history.added else history.unchanged
+        if not value:
+            return True
+        values[field] = value[0]
+    return bool(values["is_public"]) and values["author_id"] is None and values["frozen"] is False
+
+
+def _on_thesis_insert(mapper, connection, target):
+    if _listed(inspect(target)):
+        _queue(target, thesis_ids=(target.id,))
+
+
+def _on_thesis_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in CATALOGUE_FIELDS):
+        changed = _listed(state, previous=True) or _listed(state)
+    else:
+        changed = any(state.attrs[field].history.has_changes() for field in INDEXED_FIELDS) and _listed(state)
+    if changed:
+        _queue(target, thesis_ids=(target.id,))
+
+
+def _on_thesis_delete(mapper, connection, target):
+    state = inspect(target)
+    if _listed(state, previous=True) or _listed(state):
+        _queue(target, thesis_ids=(target.id,))
+
+
+def _on_link_write(mapper, connection, target):
+    state = inspect(target)
+    thesis_ids = {target.thesis_id}
+    thesis_ids.update(state.attrs.thesis_id.history.deleted or ())
+    _queue(target, thesis_ids=thesis_ids)
+
+
+def _on_user_update(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.name.history.has_changes() or state.attrs.surname.history.has_changes():
+        _queue(target, supervisor_ids=(target.id,))
+
+
+def _after_commit(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    rebuild = session.info.pop(REBUILD_KEY, False)
+    if not (rebuild or pending) or not has_app_context():
+        return
+    catalogue = get_catalogue()
+    if rebuild:
+        catalogue.invalidate()
+        _publish(catalogue, rebuild=True)
+        return
+    catalogue.mark_stale(*pending)
+    _publish(catalogue, *pending)
+
+
+def _after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(REBUILD_KEY, None)
+
+
+event.listen(Thesis, "after_insert", _on_thesis_insert)
+event.listen(Thesis, "after_update", _on_thesis_update)
+event.listen(Thesis, "after_delete", _on_thesis_delete)
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Thesis_Supervisor, _event_name, _on_link_write)
+    event.listen(Thesis_Tag, _event_name, _on_link_write)
+event.listen(User_mgmt, "after_update", _on_user_update)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
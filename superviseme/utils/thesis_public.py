@@ -1,3 +1,6 @@
+from superviseme.utils.tags import fold_tag
+
+
 def parse_bool(value):
     if value is None:
         return False
@@ -28,7 +31,7 @@ def parse_keywords(raw_keywords):
         keyword = piece.strip()
         if not keyword:
             continue
-        token = keyword.lower()
+        token = fold_tag(keyword)
         if token in seen:
             continue
         seen.add(token)
@@ -37,7 +40,9 @@ def parse_keywords(raw_keywords):
 
 
 def set_thesis_keywords(db, Thesis_Tag, thesis_id, raw_keywords):
-    Thesis_Tag.query.filter_by(thesis_id=thesis_id).delete()
+    # Row by row so the tag dictionary counts follow (superviseme.utils.tags)
+    for existing in Thesis_Tag.query.filter_by(thesis_id=thesis_id).all():
+        db.session.delete(existing)
     for keyword in parse_keywords(raw_keywords):
         db.session.add(Thesis_Tag(thesis_id=thesis_id, tag=keyword))
 
@@ -0,0 +1,266 @@
+"""
+Todo list queries for SuperviseMe
+Filtered, keyset-paginated todo pages across one or more theses and
+per-thesis todo counts in one grouped query, served by the
+(thesis_id, status_rank, priority_rank, created_at, id) index
+"""
+
+import logging
+import time
+from collections import namedtuple
+
+from sqlalchemy import and_, case, event, func, select, tuple_
+from sqlalchemy.orm import joinedload
+
+from superviseme import db
+from superviseme.models import Todo
+
+logger = logging.getLogger(__name__)
+
+# Display order: open work first, most urgent first
+TODO_STATUSES = ("pending", "completed", "cancelled")
+TODO_PRIORITIES = ("high", "medium", "low")
+UNASSIGNED = "none"
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+TodoFilters = namedtuple(
+    "TodoFilters",
+    ["statuses", "priorities", "assignee_id", "overdue", "thesis_ids"],
+    defaults=((), (), None, False, ()),
+)
+TodoPage = namedtuple("TodoPage", ["todos", "next_cursor"])
+
+SUMMARY_FIELDS = ("total", "pending", "completed", "cancelled", "overdue", "high_priority")
+
+
+def _rank(values, value):
+    # Higher ranks list first; unknown values sort last
+    return len(values) - values.index(value) if value in values else 0
+
+
+def status_rank(status):
+    return _rank(TODO_STATUSES, status)
+
+
+def priority_rank(priority):
+    return _rank(TODO_PRIORITIES, priority)
+
+
+def _split(raw):
+    values = []
+    for piece in (raw or "").split(","):
+        value = piece.strip().lower()
+        if value and value not in values:
+            values.append(value)
+    return values
+
+
+def parse_todo_filters(args):
+    """
+    Filters from a query string: status and priority (comma separated),
+    assignee (user id or "none"), overdue (1/true) and thesis (comma separated
+    ids). Unknown values are ignored.
+
+    Returns:
+        TodoFilters
+    """
+    assignee = (args.get("assignee") or "").strip().lower()
+    if assignee == UNASSIGNED:
+        assignee_id = UNASSIGNED
+    else:
+        assignee_id = int(assignee) if assignee.isdigit() else None
+    return TodoFilters(
+        statuses=tuple(value for value in _split(args.get("status")) if value in TODO_STATUSES),
+        priorities=tuple(value for value in _split(args.get("priority")) if value in TODO_PRIORITIES),
+        assignee_id=assignee_id,
+        overdue=(args.get("overdue") or "").strip().lower() in ("1", "true", "yes"),
+        thesis_ids=tuple(int(value) for value in _split(args.get("thesis")) if value.isdigit()),
+    )
+
+
+def page_size(args):
+    """limit from a query string, clamped to 1..MAX_PAGE_SIZE"""
+    limit = args.get("limit", DEFAULT_PAGE_SIZE, type=int) or DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(todo):
+    """Opaque position after todo in the list order"""
+    return f"{todo.status_rank}.{todo.priority_rank}.{todo.created_at}.{todo.id}"
+
+
+def decode_cursor(cursor):
+    """
+    Returns:
+        tuple: (status rank, priority rank, created_at, id)
+
+    Raises:
+        ValueError: cursor was not produced by encode_cursor
+    """
+    parts = (cursor or "").split(".")
+    if len(parts) != 4:
+        raise ValueError("invalid cursor")
+    return tuple(int(part) for part in parts)
+
+
+# The list order: every key descending, so one index range scan serves it
+LIST_ORDER = (Todo.status_rank, Todo.priority_rank, Todo.created_at, Todo.id)
+
+
+def _after(cursor):
+    # Rows strictly after the cursor in LIST_ORDER, as one row-value comparison
+    return tuple_(*LIST_ORDER) < tuple_(*decode_cursor(cursor))
+
+
+def _overdue_clause(now):
+    return and_(Todo.status == "pending", Todo.due_date.isnot(None), Todo.due_date < now)
+
+
+def scoped_thesis_ids(thesis_ids, filters):
+    """The visible theses, narrowed to the thesis filter when one is given"""
+    visible = [thesis_id for thesis_id in dict.fromkeys(thesis_ids) if thesis_id is not None]
+    if filters.thesis_ids:
+        visible = [thesis_id for thesis_id in visible if thesis_id in filters.thesis_ids]
+    return visible
+
+
+def query_todos(thesis_ids, filters=None, after=None, limit=DEFAULT_PAGE_SIZE, now=None):
+    """
+    One page of todos of the given theses, pending and high priority first,
+    newest first within each (status, priority) group
+
+    Args:
+        thesis_ids: theses the caller may see; filters.thesis_ids narrows them
+        filters: TodoFilters (default: none)
+        after: cursor returned with the previous page
+        limit: page size, capped at MAX_PAGE_SIZE
+
+    Returns:
+        TodoPage: todos (assignee loaded) and the cursor of the next page, or None
+
+    Raises:
+        ValueError: after is not a valid cursor
+    """
+    filters = filters or TodoFilters()
+    limit = max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    thesis_ids = scoped_thesis_ids(thesis_ids, filters)
+    if not thesis_ids:
+        return TodoPage([], None)
+
+    stmt = select(Todo).where(Todo.thesis_id.in_(thesis_ids))
+    if filters.statuses:
+        stmt = stmt.where(Todo.status_rank.in_([status_rank(status) for status in filters.statuses]))
+    if filters.priorities:
+        stmt = stmt.where(Todo.priority_rank.in_([priority_rank(priority) for priority in filters.priorities]))
+    if filters.assignee_id == UNASSIGNED:
+        stmt = stmt.where(Todo.assigned_to_id.is_(None))
+    elif filters.assignee_id is not None:
+        stmt = stmt.where(Todo.assigned_to_id == filters.assignee_id)
+    if filters.overdue:
+        stmt = stmt.where(_overdue_clause(int(time.time()) if now is None else now))
+    if after:
+        stmt = stmt.where(_after(after))
+
+    stmt = (
+        stmt.options(joinedload(Todo.assigned_to))
+        .order_by(*(column.desc() for column in LIST_ORDER))
+        .limit(limit + 1)
+    )
+    todos = db.session.execute(stmt).scalars().unique().all()
+    if len(todos) > limit:
+        todos = todos[:limit]
+        return TodoPage(todos, encode_cursor(todos[-1]))
+    return TodoPage(todos, None)
+
+
+def _flag(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def todo_summary(thesis_ids, now=None):
+    """
+    Todo counts per thesis in one grouped query; theses without todos get zeros
+
+    Returns:
+        dict: thesis id -> {total, pending, completed, cancelled, overdue, high_priority}
+    """
+    thesis_ids = [thesis_id for thesis_id in dict.fromkeys(thesis_ids) if thesis_id is not None]
+    summary = {thesis_id: dict.fromkeys(SUMMARY_FIELDS, 0) for thesis_id in thesis_ids}
+    if not thesis_ids:
+        return summary
+
+    now = int(time.time()) if now is None else now
+    rows = db.session.execute(
+        select(
+            Todo.thesis_id,
+            func.count().label("total"),
+            _flag(Todo.status == "pending").label("pending"),
+            _flag(Todo.status == "completed").label("completed"),
+            _flag(Todo.status == "cancelled").label("cancelled"),
+            _flag(_overdue_clause(now)).label("overdue"),
+            _flag(and_(Todo.status == "pending", Todo.priority == "high")).label("high_priority"),
+        )
+        .where(Todo.thesis_id.in_(thesis_ids))
+        .group_by(Todo.thesis_id)
+    )
+    for row in rows:
+        summary[row.thesis_id] = {field: int(getattr(row, field)) for field in SUMMARY_FIELDS}
+    return summary
+
+
+def todo_totals(summary):
+    """Counts of a todo_summary() added up over all theses"""
+    return {field: sum(counts[field] for counts in summary.values()) for field in SUMMARY_FIELDS}
+
+
+def todo_to_dict(todo, now=None):
+    now = int(time.time()) if now is None else now
+    assignee = todo.assigned_to
+    return {
+        "id": todo.id,
+        "thesis_id": todo.thesis_id,
+        "title": todo.title,
+        "description": todo.description,
+        "status": todo.status,
+        "priority": todo.priority,
+        "assigned_to_id": todo.assigned_to_id,
+        "assigned_to": f"{assignee.name} {assignee.surname}" if assignee else None,
+        "due_date": todo.due_date,
+        "completed_at": todo.completed_at,
+        "created_at": todo.created_at,
+        "overdue": todo.status == "pending" and todo.due_date is not None and todo.due_date < now,
+    }
+
+
+def todo_page_response(thesis_ids, args):
+    """
+    JSON body for a todo list endpoint: one page under the filters in args
+    (plus after and limit) and the counts of every visible thesis
+
+    Raises:
+        ValueError: args["after"] is not a valid cursor
+    """
+    filters = parse_todo_filters(args)
+    now = int(time.time())
+    page = query_todos(thesis_ids, filters, after=args.get("after"), limit=page_size(args), now=now)
+    summary = todo_summary(scoped_thesis_ids(thesis_ids, filters), now=now)
+    return {
+        "results": [todo_to_dict(todo, now=now) for todo in page.todos],
+        "next_cursor": page.next_cursor,
+        "summary": [{"thesis_id": thesis_id, **counts} for thesis_id, counts in summary.items()],
+        "totals": todo_totals(summary),
+    }
+
+
+def _assign_ranks(mapper, connection, target):
+    # Column defaults are applied after this hook; rank the values they will store
+    target.status_rank = status_rank(target.status or "pending")
+    target.priority_rank = priority_rank(target.priority or "medium")
+
+
+# ORM todo writes keep the sort ranks in step with status and priority. Bulk
+# Core inserts (e.g. synthetic_data) set the ranks themselves.
+event.listen(Todo, "before_insert", _assign_ranks)
+event.listen(Todo, "before_update", _assign_ranks)
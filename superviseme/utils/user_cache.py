@@ -0,0 +1,197 @@
+"""
+User session cache for SuperviseMe
+Keeps a compact per-user principal in an in-process TTL cache so Flask-Login
+does not load the full User_mgmt row on every authenticated request
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import event, inspect
+
+from superviseme import db
+from superviseme.models import Supervisor_Role, User_mgmt
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_MAX_ENTRIES = 5000
+
+# User_mgmt columns copied into the principal; changing any of them invalidates it
+PRINCIPAL_COLUMNS = ("id", "username", "user_type", "name", "surname", "orcid_id", "is_enabled")
+
+_CachedPrincipal = namedtuple(
+    "_CachedPrincipal", PRINCIPAL_COLUMNS + ("has_supervisor_role", "version", "loaded_at")
+)
+
+
+class UserPrincipal:
+    """
+    Lightweight stand-in for User_mgmt used as ``current_user``
+
+    Holds the fields most requests need. Any other attribute (relationships,
+    Telegram settings, OAuth tokens, ...) is read from, and written to, the
+    full User_mgmt row, which is loaded lazily at most once per request.
+    """
+
+    __slots__ = PRINCIPAL_COLUMNS + ("has_supervisor_role", "version", "_user")
+
+    def __init__(self, cached):
+        for field in PRINCIPAL_COLUMNS + ("has_supervisor_role", "version"):
+            object.__setattr__(self, field, getattr(cached, field))
+        object.__setattr__(self, "_user", None)
+
+    # Flask-Login interface (same semantics as UserMixin)
+    @property
+    def is_active(self):
+        return True
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    def get_id(self):
+        return str(self.id)
+
+    def __eq__(self, other):
+        if hasattr(other, "get_id"):
+            return self.get_id() == other.get_id()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.get_id())
+
+    def get_user(self):
+        """Return the full User_mgmt row for this principal, loading it if needed"""
+        user = object.__getattribute__(self, "_user")
+        if user is None:
+            user = db.session.get(User_mgmt, self.id)
+            if user is None:
+                raise AttributeError(f"User {self.id} no longer exists")
+            object.__setattr__(self, "_user", user)
+        return user
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.get_user(), name)
+
+    def __setattr__(self, name, value):
+        # Writes always go to the mapped row so they are persisted on commit.
+        setattr(self.get_user(), name, value)
+        if name in PRINCIPAL_COLUMNS:
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"<UserPrincipal {self.id} {self.username} ({self.user_type})>"
+
+
+_cache = OrderedDict()
+_versions = {}
+_lock = threading.Lock()
+
+
+def _current_version(user_id):
+    return _versions.get(user_id, 0)
+
+
+def invalidate_user(user_id=None):
+    """Drop cached principals for one user, or for everyone when user_id is None"""
+    with _lock:
+        if user_id is None:
+            for cached_id in list(_versions) + list(_cache):
+                _versions[cached_id] = _versions.get(cached_id, 0) + 1
+            _cache.clear()
+        else:
+            _versions[user_id] = _versions.get(user_id, 0) + 1
+            _cache.pop(user_id, None)
+
+
+def _load_principal(user_id, version):
+    row = (
+        db.session.query(*(getattr(User_mgmt, column) for column in PRINCIPAL_COLUMNS))
+        .filter(User_mgmt.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    values = dict(zip(PRINCIPAL_COLUMNS, row))
+    if values["user_type"] == "supervisor":
+        has_supervisor_role = True
+    elif values["user_type"] == "researcher":
+        has_supervisor_role = db.session.query(
+            Supervisor_Role.query.filter_by(researcher_id=user_id, active=True).exists()
+        ).scalar()
+    else:
+        has_supervisor_role = False
+
+    return _CachedPrincipal(
+        **values,
+        has_supervisor_role=bool(has_supervisor_role),
+        version=version,
+        loaded_at=time.monotonic(),
+    )
+
+
+def get_user_principal(user_id, ttl=USER_CACHE_TTL_SECONDS):
+    """
+    Return a UserPrincipal for user_id, or None if the user does not exist
+
+    Served from the in-process cache; the database is only queried on a
+    miss, after the TTL expires, or when the user's version has changed.
+    The TTL bounds how long changes made by other worker processes can
+    take to show up.
+    """
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(user_id)
+        version = _current_version(user_id)
+        if cached is not None and cached.version == version and now - cached.loaded_at < ttl:
+            _cache.move_to_end(user_id)
+            return UserPrincipal(cached)
+
+    cached = _load_principal(user_id, version)
+    if cached is None:
+        return None
+
+    with _lock:
+        # Skip storing if the user was invalidated while we were loading.
+        if _current_version(user_id) == version:
+            _cache[user_id] = cached
+            _cache.move_to_end(user_id)
+            while len(_cache) > USER_CACHE_MAX_ENTRIES:
+                _cache.popitem(last=False)
+    return UserPrincipal(cached)
+
+
+def _principal_changed(target):
+    state = inspect(target)
+    return any(state.attrs[column].history.has_changes() for column in PRINCIPAL_COLUMNS)
+
+
+def _invalidate_updated_user(mapper, connection, target):
+    if _principal_changed(target):
+        invalidate_user(target.id)
+
+
+def _invalidate_deleted_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+
+def _invalidate_supervisor_grant(mapper, connection, target):
+    invalidate_user(target.researcher_id)
+
+
+# ORM writes (admin update_user / users_data, profile edits, role grants and
+# revocations) invalidate the affected principal immediately in this process.
+event.listen(User_mgmt, "after_update", _invalidate_updated_user)
+event.listen(User_mgmt, "after_delete", _invalidate_deleted_user)
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Supervisor_Role, _event_name, _invalidate_supervisor_grant)
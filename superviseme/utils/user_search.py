@@ -0,0 +1,169 @@
+"""
+User typeahead search for SuperviseMe
+Prefix search on name, surname and username by role and assignment status,
+backed by lower() indexes and cached briefly in process
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import and_, event, exists, func, or_, select
+
+from superviseme import db
+from superviseme.models import Thesis, Thesis_Supervisor, User_mgmt
+
+logger = logging.getLogger(__name__)
+
+USER_ROLES = ("student", "supervisor", "researcher", "admin")
+ASSIGNMENT_FILTERS = ("assigned", "unassigned")
+SEARCH_FIELDS = ("name", "surname", "username")
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MAX_QUERY_TERMS = 3
+SEARCH_CACHE_TTL_SECONDS = 30
+SEARCH_CACHE_MAX_ENTRIES = 1000
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix_match(column, prefix):
+    """
+    lower(column) starts with prefix, in a form the ix_user_mgmt_*_prefix
+    indexes serve: LIKE on PostgreSQL (text_pattern_ops) and a range on SQLite,
+    which only uses expression indexes for comparisons
+    """
+    expr = func.lower(column)
+    condition = expr.like(f"{_escape_like(prefix)}%", escape="\\")
+    if db.engine.dialect.name == "sqlite":
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        condition = and_(expr >= prefix, expr < upper, condition)
+    return condition
+
+
+def _assignment_clause(assignment):
+    """Students are assigned when they author a thesis, supervisors when they supervise one"""
+    authors = exists().where(Thesis.author_id == User_mgmt.id)
+    supervises = exists().where(Thesis_Supervisor.supervisor_id == User_mgmt.id)
+    assigned = or_(
+        and_(User_mgmt.user_type == "student", authors),
+        and_(User_mgmt.user_type != "student", supervises),
+    )
+    return assigned if assignment == "assigned" else ~assigned
+
+
+def _label(row):
+    full_name = " ".join(part for part in (row.name, row.surname) if part) or row.username
+    return f"{full_name} ({row.email})"
+
+
+def search_users(query, roles=None, assignment=None, exclude_ids=(), limit=DEFAULT_LIMIT):
+    """
+    Users whose name, surname or username start with every term of query
+
+    Args:
+        query: search text; each whitespace-separated term must prefix-match one field
+        roles: user types to include (default: all)
+        assignment: "assigned", "unassigned" or None for both
+        exclude_ids: user ids to leave out (e.g. the thesis' current supervisors)
+        limit: maximum number of results, capped at MAX_LIMIT
+
+    Returns:
+        list: dicts with id, label, name, surname, username, email and user_type
+    """
+    terms = [term for term in (query or "").lower().split() if term][:MAX_QUERY_TERMS]
+    roles = tuple(role for role in (roles or USER_ROLES) if role in USER_ROLES)
+    limit = max(1, min(int(limit or DEFAULT_LIMIT), MAX_LIMIT))
+    if not terms or not roles:
+        return []
+
+    stmt = select(
+        User_mgmt.id, User_mgmt.name, User_mgmt.surname, User_mgmt.username, User_mgmt.email, User_mgmt.user_type
+    ).where(User_mgmt.user_type.in_(roles), User_mgmt.is_enabled.is_(True))
+    for term in terms:
+        stmt = stmt.where(or_(*(_prefix_match(getattr(User_mgmt, field), term) for field in SEARCH_FIELDS)))
+    if assignment in ASSIGNMENT_FILTERS:
+        stmt = stmt.where(_assignment_clause(assignment))
+    if exclude_ids:
+        stmt = stmt.where(User_mgmt.id.notin_(list(exclude_ids)))
+    stmt = stmt.order_by(User_mgmt.surname, User_mgmt.name, User_mgmt.id).limit(limit)
+
+    return [
+        {
+            "id": row.id,
+            "label": _label(row),
+            "name": row.name,
+            "surname": row.surname,
+            "username": row.username,
+            "email": row.email,
+            "user_type": row.user_type,
+        }
+        for row in db.session.execute(stmt)
+    ]
+
+
+def typeahead_args(args):
+    """q, limit and exclude (comma-separated ids) from a typeahead request's query string"""
+    return {
+        "query": args.get("q", ""),
+        "limit": args.get("limit", DEFAULT_LIMIT, type=int) or DEFAULT_LIMIT,
+        "exclude_ids": tuple(int(value) for value in args.get("exclude", "").split(",") if value.strip().isdigit()),
+    }
+
+
+_cache = OrderedDict()
+_generation = 0
+_lock = threading.Lock()
+
+
+def invalidate_search_cache():
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
+
+
+def cached_search_users(query, roles=None, assignment=None, exclude_ids=(), limit=DEFAULT_LIMIT,
+                        ttl=SEARCH_CACHE_TTL_SECONDS):
+    """
+    search_users() behind a short in-process TTL cache: typeahead fires a
+    request per keystroke and many users type the same prefixes
+    """
+    key = (
+        (query or "").strip().lower(),
+        tuple(sorted(roles or ())),
+        assignment,
+        tuple(sorted(exclude_ids)),
+        limit,
+    )
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            _cache.move_to_end(key)
+            return cached[1]
+        generation = _generation
+
+    results = search_users(query, roles=roles, assignment=assignment, exclude_ids=exclude_ids, limit=limit)
+    with _lock:
+        # Skip storing if a write invalidated the cache while we were querying
+        if generation != _generation:
+            return results
+        _cache[key] = (now, results)
+        while len(_cache) > SEARCH_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return results
+
+
+def _invalidate(mapper, connection, target):
+    invalidate_search_cache()
+
+
+# Writes in this process show up right away; other workers see them within the TTL
+for _model in (User_mgmt, Thesis, Thesis_Supervisor):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _invalidate)
@@ -12,6 +12,14 @@ Strategy:
 2. An autouse fixture restores every entry in that snapshot that has since
    been replaced with a MagicMock, and removes any new MagicMock sub-entries
    that were created while the mocks were active.
+3. The same fixture restores ``superviseme.db.session`` when a test has
+   replaced it with a MagicMock (test_orcid.py assigns it on the real
+   SQLAlchemy instance), so later tests hit the real database.
+
+It also provides the shared ``app`` fixture: a fresh SQLite app per test with
+every per-process cache and singleton reset. Test files adjust it by
+overriding ``app_env`` (extra environment) or ``app`` (extra setup on top of
+the shared one). ``make_users`` adds the users a test needs in one call.
 """
 
 import sys
@@ -30,12 +38,19 @@ def pytest_configure(config):
         import flask_migrate          # noqa: F401
         import flask_sqlalchemy.cli   # noqa: F401
         import superviseme.models     # noqa: F401
+        import superviseme.utils.notifications  # noqa: F401
     except Exception:
         pass
 
     # Full snapshot after submodules are loaded.
     config._real_modules_snapshot = dict(sys.modules)
 
+    try:
+        from superviseme import db
+        config._real_db_session = db.session
+    except Exception:
+        config._real_db_session = None
+
 
 @pytest.fixture(autouse=True)
 def _restore_real_modules(request):
@@ -62,4 +77,88 @@ def _restore_real_modules(request):
         if key not in snapshot and isinstance(sys.modules.get(key), MagicMock):
             del sys.modules[key]
 
+    real_session = getattr(request.config, "_real_db_session", None)
+    superviseme_pkg = snapshot.get("superviseme")
+    if real_session is not None and superviseme_pkg is not None:
+        if isinstance(superviseme_pkg.db.session, MagicMock):
+            superviseme_pkg.db.session = real_session
+
     yield
+
+
+@pytest.fixture()
+def app_env(tmp_path):
+    """Environment for the shared app fixture; override to add or change variables"""
+    return {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "SECRET_KEY": "test-secret-key",
+        "FLASK_ENV": "development",
+        "FLASK_SKIP_USER_INIT": "1",
+        "ENABLE_SCHEDULER": "false",
+        "PASSWORD_HASH_METHOD": "pbkdf2:sha256:1000",
+    }
+
+
+def _reset_process_state(monkeypatch):
+    """Drop the per-process caches and singletons a previous test may have filled"""
+    from superviseme.utils import (
+        orcid_client,
+        password_security,
+        task_scheduler,
+    )
+    from superviseme.utils.telegram_service import get_telegram_service
+    from superviseme.utils.user_cache import invalidate_user
+    from superviseme.utils.user_search import invalidate_search_cache
+
+    # Rebuilt from the current app's config on first use
+    monkeypatch.setattr(password_security, "_login_guard", None)
+    monkeypatch.setattr(orcid_client, "_session", None)
+    monkeypatch.setattr(task_scheduler, "scheduler", None)
+    monkeypatch.setattr(task_scheduler, "leader", None)
+    invalidate_user()
+    invalidate_search_cache()
+    service = get_telegram_service()
+    service.invalidate_config()
+    service.invalidate_user_preferences()
+
+
+@pytest.fixture()
+def app(app_env, monkeypatch):
+    """A fresh app on its own SQLite file, with CSRF off and clean process state"""
+    for name, value in app_env.items():
+        monkeypatch.setenv(name, value)
+
+    from superviseme import create_app
+
+    app = create_app(db_type="sqlite", skip_user_init=True)
+    app.config["WTF_CSRF_ENABLED"] = False
+    _reset_process_state(monkeypatch)
+    return app
+
+
+@pytest.fixture()
+def make_users():
+    """Add users inside the current app context and flush; returns {username: User_mgmt}
+
+    Each spec is ``(username, user_type)``, optionally followed by a dict of
+    extra columns. Users get ``<username>@example.com``, the password "pw",
+    ``Username.title()``/"Test" as name and surname, and ``joined_on=1``.
+    """
+    from werkzeug.security import generate_password_hash
+
+    password = generate_password_hash("pw", method="pbkdf2:sha256:1000")
+
+    def make_users(*specs):
+        from superviseme import db
+        from superviseme.models import User_mgmt
+
+        users = {}
+        for username, user_type, *extra in specs:
+            columns = {"email": f"{username}@example.com", "password": password, "name": username.title(),
+                       "surname": "Test", "joined_on": 1, **(extra[0] if extra else {})}
+            users[username] = User_mgmt(username=username, user_type=user_type, **columns)
+        db.session.add_all(users.values())
+        db.session.flush()
+        return users
+
+    return make_users
@@ -0,0 +1,129 @@
+"""Tests for the analytics rollups (superviseme/utils/analytics_rollups.py).
+
+Covers:
+1. A first build aggregates thesis days, supervisor weeks and department
+   weeks, including time to completion and current-week snapshots.
+2. Later builds only re-aggregate from the watermark and agree with a full rebuild.
+3. Admin and supervisor endpoints return the time series.
+"""
+import time
+
+DAY = 86400
+# Monday 2026-10-05 00:00 UTC
+MONDAY = 1791158400
+
+
+def _seed(app, make_users):
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Status, Thesis_Supervisor, Thesis_Update, Todo
+
+    with app.app_context():
+        users = make_users(("admin", "admin"), ("sup", "supervisor"), ("stu", "student", {"cdl": "CS"}))
+        supervisor, student = users["sup"], users["stu"]
+
+        thesis = Thesis(title="T", description="D", author_id=student.id, created_at=MONDAY - 30 * DAY)
+        idle = Thesis(title="Idle", description="D", author_id=student.id, created_at=MONDAY - 60 * DAY)
+        db.session.add_all([thesis, idle])
+        db.session.flush()
+        db.session.add_all([
+            Thesis_Supervisor(thesis_id=thesis.id, supervisor_id=supervisor.id, assigned_at=1),
+            Thesis_Supervisor(thesis_id=idle.id, supervisor_id=supervisor.id, assigned_at=1),
+            Thesis_Update(thesis_id=thesis.id, author_id=student.id, content="a", update_type="progress",
+                          created_at=MONDAY + 3600),
+            Thesis_Update(thesis_id=thesis.id, author_id=student.id, content="b", update_type="progress",
+                          created_at=MONDAY + 7200),
+            Thesis_Update(thesis_id=thesis.id, author_id=supervisor.id, content="c", update_type="feedback",
+                          created_at=MONDAY + DAY),
+            Todo(thesis_id=thesis.id, author_id=supervisor.id, title="done", status="completed",
+                 created_at=MONDAY + 3600, completed_at=MONDAY + DAY + 60, updated_at=MONDAY + DAY + 60),
+            Todo(thesis_id=thesis.id, author_id=supervisor.id, title="late", status="pending",
+                 created_at=MONDAY + 3600, due_date=MONDAY + DAY, updated_at=MONDAY + 3600),
+            Thesis_Status(thesis_id=thesis.id, status="completed", updated_at=MONDAY + 2 * DAY),
+        ])
+        db.session.commit()
+        return {"supervisor": supervisor.id, "thesis": thesis.id, "idle": idle.id}
+
+
+def test_first_build_aggregates_all_levels(app, make_users):
+    from superviseme.models import Analytics_Department_Weekly, Analytics_Supervisor_Weekly, Analytics_Thesis_Daily
+    from superviseme.utils.analytics_rollups import build_rollups, week_start
+
+    ids = _seed(app, make_users)
+    now = MONDAY + 3 * DAY
+    assert week_start(now) == MONDAY
+
+    with app.app_context():
+        summary = build_rollups(now=now)
+        assert summary["success"] and summary["full"]
+
+        days = {row.day: row for row in Analytics_Thesis_Daily.query.filter_by(thesis_id=ids["thesis"]).all()}
+        assert (days[MONDAY].student_updates, days[MONDAY].todos_created) == (2, 2)
+        assert (days[MONDAY + DAY].supervisor_updates, days[MONDAY + DAY].todos_completed) == (1, 1)
+        assert days[MONDAY + 2 * DAY].status_changes == 1
+
+        week = Analytics_Supervisor_Weekly.query.filter_by(supervisor_id=ids["supervisor"], week_start=MONDAY).one()
+        assert (week.theses, week.student_updates, week.supervisor_updates) == (1, 2, 1)
+        assert (week.todos_created, week.todos_completed) == (2, 1)
+        assert (week.todos_overdue, week.inactive_theses) == (1, 1)
+
+        dept = Analytics_Department_Weekly.query.filter_by(department="CS", week_start=MONDAY).one()
+        assert (dept.completed_theses, dept.completion_days_total) == (1, 32)
+
+
+def test_incremental_build_matches_full_rebuild(app, make_users):
+    from superviseme import db
+    from superviseme.models import Analytics_Thesis_Daily, Thesis_Update
+    from superviseme.utils.analytics_rollups import build_rollups, supervisor_series
+
+    ids = _seed(app, make_users)
+    with app.app_context():
+        build_rollups(now=MONDAY + 3 * DAY)
+        old_day = Analytics_Thesis_Daily.query.filter_by(thesis_id=ids["thesis"], day=MONDAY).one()
+        old_day_id = old_day.id
+
+        db.session.add(Thesis_Update(thesis_id=ids["thesis"], author_id=ids["supervisor"], content="d",
+                                     update_type="feedback", created_at=MONDAY + 8 * DAY))
+        db.session.commit()
+
+        summary = build_rollups(now=MONDAY + 9 * DAY)
+        assert not summary["full"]
+        assert summary["since"] == MONDAY + 2 * DAY
+        # Days before the watermark grace window are left untouched.
+        assert db.session.get(Analytics_Thesis_Daily, old_day_id) is not None
+
+        incremental = supervisor_series(ids["supervisor"], weeks=2, now=MONDAY + 9 * DAY)
+        build_rollups(now=MONDAY + 9 * DAY, full=True)
+        full = supervisor_series(ids["supervisor"], weeks=2, now=MONDAY + 9 * DAY)
+
+    assert incremental == full
+    assert [point["supervisor_updates"] for point in full] == [1, 1]
+    assert full[0]["week"] == "2026-10-05"
+
+
+def test_analytics_endpoints(app, make_users):
+    from superviseme.utils.analytics_rollups import build_rollups
+
+    ids = _seed(app, make_users)
+    with app.app_context():
+        build_rollups(now=int(time.time()))
+
+    client = app.test_client()
+    client.post("/login", data={"email": "admin@example.com", "password": "pw"})
+
+    departments = client.get("/admin/api/analytics/departments?weeks=4").get_json()
+    assert departments["status"] == "success"
+    assert set(departments["data"]) == {"CS"}
+    assert len(departments["data"]["CS"]) == 4
+    assert departments["last_built_at"] is not None
+
+    supervisors = client.get("/admin/api/analytics/supervisors").get_json()
+    assert [row["supervisor_id"] for row in supervisors["data"]] == [ids["supervisor"]]
+
+    rebuilt = client.post("/admin/api/analytics/rebuild", data={"full": "1"}).get_json()
+    assert rebuilt["summary"]["full"] is True
+
+    client.get("/logout")
+    client.post("/login", data={"email": "sup@example.com", "password": "pw"})
+    series = client.get("/supervisor/api/analytics?weeks=3").get_json()
+    assert len(series["data"]) == 3
+    assert series["data"][-1]["inactive_theses"] == 1
@@ -0,0 +1,104 @@
+"""Tests for the static asset pipeline (superviseme/utils/assets.py).
+
+Covers:
+1. The build fingerprints files, rewrites stylesheet url() references to the
+   fingerprinted names, precompresses and writes the manifest.
+2. static_url() resolves through the manifest, and fingerprinted files are
+   served precompressed with immutable cache headers.
+"""
+import gzip
+import json
+
+import pytest
+
+STYLESHEET = (
+    "@font-face{src:url(../webfonts/icons.woff2) format('woff2'),url('../webfonts/icons.ttf?#iefix')}"
+    ".hero{background:url(data:image/png;base64,AAAA)}"
+    ".missing{background:url(../img/none.png)}"
+    ".pad{}" * 200
+)
+
+
+@pytest.fixture()
+def static_dir(tmp_path):
+    static = tmp_path / "static"
+    for relpath, content in {
+        "assets/css/site.css": STYLESHEET.encode(),
+        "assets/webfonts/icons.woff2": b"\x00font-woff2",
+        "assets/webfonts/icons.ttf": b"\x00font-ttf" * 200,
+        "assets/scss/site.scss": b".pad{}",
+    }.items():
+        path = static / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return static
+
+
+def test_build_fingerprints_and_rewrites_stylesheets(static_dir):
+    from superviseme.utils.assets import build_assets
+
+    summary = build_assets(str(static_dir), brotli_quality=None)
+    manifest = json.loads((static_dir / "dist" / "manifest.json").read_text())
+
+    assert sorted(manifest) == ["assets/css/site.css", "assets/webfonts/icons.ttf", "assets/webfonts/icons.woff2"]
+    assert summary["files"] == 3
+    font = manifest["assets/webfonts/icons.woff2"]
+    assert font.startswith("dist/assets/webfonts/icons.") and font.endswith(".woff2")
+
+    css = (static_dir / manifest["assets/css/site.css"]).read_text()
+    woff2 = font.rsplit("/", 1)[1]
+    ttf = manifest["assets/webfonts/icons.ttf"].rsplit("/", 1)[1]
+    assert f"url(../webfonts/{woff2})" in css
+    assert f"url('../webfonts/{ttf}?#iefix')" in css
+    assert "url(../img/none.png)" in css
+    assert "url(data:image/png;base64,AAAA)" in css
+
+    # Originals stay next to the fingerprinted copies; only large text files are compressed
+    assert (static_dir / "dist" / "assets" / "css" / "site.css").read_text() == css
+    assert gzip.decompress((static_dir / (manifest["assets/css/site.css"] + ".gz")).read_bytes()).decode() == css
+    assert not (static_dir / (font + ".gz")).exists()
+    assert summary["gz"] == 2 and summary["br"] == 0
+
+    # Same content, same names
+    build_assets(str(static_dir), brotli_quality=None)
+    assert json.loads((static_dir / "dist" / "manifest.json").read_text()) == manifest
+
+
+def test_fingerprinted_assets_served_immutable(static_dir, tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'assets_test.db'}")
+    monkeypatch.setenv("SECRET_KEY", "assets-test-secret-key")
+    monkeypatch.setenv("FLASK_ENV", "development")
+    monkeypatch.setenv("FLASK_SKIP_USER_INIT", "1")
+    monkeypatch.setenv("ENABLE_SCHEDULER", "false")
+    monkeypatch.setenv("TEMPLATE_WARMUP", "false")
+
+    from superviseme import create_app
+    from superviseme.utils.assets import AssetManifest, build_assets, static_url
+
+    build_assets(str(static_dir), brotli_quality=None)
+    app = create_app(db_type="sqlite", skip_user_init=True)
+    app.static_folder = str(static_dir)
+    app.extensions["asset_manifest"] = AssetManifest.load(str(static_dir / "dist" / "manifest.json"))
+    hashed = app.extensions["asset_manifest"].files["assets/css/site.css"]
+
+    with app.test_request_context():
+        assert static_url("assets/css/site.css") == f"/static/{hashed}"
+        assert static_url("assets/js/unknown.js") == "/static/assets/js/unknown.js"
+
+    client = app.test_client()
+    response = client.get(f"/static/{hashed}", headers={"Accept-Encoding": "br, gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.mimetype == "text/css"
+    assert "immutable" in response.headers["Cache-Control"]
+    assert "max-age=31536000" in response.headers["Cache-Control"]
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data).decode().startswith("@font-face")
+
+    plain = client.get(f"/static/{hashed}", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.data.decode().startswith("@font-face")
+
+    unversioned = client.get("/static/assets/css/site.css")
+    assert unversioned.status_code == 200
+    assert "immutable" not in unversioned.headers.get("Cache-Control", "")
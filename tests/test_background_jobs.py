@@ -0,0 +1,106 @@
+"""Tests for the database-backed job queue (superviseme/utils/background_jobs.py).
+
+Covers:
+1. A queued job is claimed by exactly one runner, and its result and the
+   cleared inputs are visible to every process.
+2. A failing handler marks the job failed with its error.
+3. Running jobs that stopped reporting progress are failed, old finished
+   jobs are pruned.
+"""
+import time
+
+import pytest
+
+
+_calls = []
+
+
+def _echo_handler(job):
+    _calls.append(job.id)
+    job.report_progress({"seen": len(job.data or b"")})
+    return {"payload": job.payload, "size": len(job.data or b"")}
+
+
+def _broken_handler(job):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture()
+def handlers(monkeypatch):
+    from superviseme.utils import background_jobs
+
+    monkeypatch.setitem(background_jobs.JOB_HANDLERS, "echo", f"{__name__}._echo_handler")
+    monkeypatch.setitem(background_jobs.JOB_HANDLERS, "broken", f"{__name__}._broken_handler")
+    _calls.clear()
+    return _calls
+
+
+def test_job_runs_once_and_is_visible_everywhere(app, handlers):
+    from superviseme.models import Background_Job
+    from superviseme.utils.background_jobs import enqueue_job, get_job, run_pending_jobs
+    from superviseme import db
+
+    with app.app_context():
+        job_id = enqueue_job("echo", {"rows": 3}, data=b"abc", label="echo.csv")
+        assert get_job(job_id)["status"] == "queued"
+        assert get_job(job_id)["payload"] == {"rows": 3}
+        assert get_job(job_id, kinds=("broken",)) is None
+
+        assert run_pending_jobs(owner="a") == {"done": 1, "failed": 0, "expired": 0}
+        assert run_pending_jobs(owner="b") == {"done": 0, "failed": 0, "expired": 0}
+        assert handlers == [job_id]
+
+        job = get_job(job_id)
+        assert job["status"] == "done"
+        assert job["label"] == "echo.csv"
+        assert job["progress"] == {"seen": 3}
+        assert job["result"] == {"payload": {"rows": 3}, "size": 3}
+        assert job["finished_at"] >= job["started_at"] >= job["created_at"]
+        assert job["payload"] is None
+        assert db.session.get(Background_Job, job_id).data is None
+
+
+def test_failing_job_is_recorded(app, handlers):
+    from superviseme.utils.background_jobs import enqueue_job, get_job, run_pending_jobs
+
+    with app.app_context():
+        job_id = enqueue_job("broken")
+        assert run_pending_jobs() == {"done": 0, "failed": 1, "expired": 0}
+        job = get_job(job_id)
+        assert job["status"] == "failed"
+        assert job["error"] == "boom"
+
+        with pytest.raises(ValueError):
+            enqueue_job("missing")
+
+
+def test_stale_and_old_jobs_expire(app, handlers):
+    from sqlalchemy import update
+
+    from superviseme import db
+    from superviseme.models import Background_Job
+    from superviseme.utils.background_jobs import (
+        JOB_RETENTION_SECONDS,
+        JOB_STALE_SECONDS,
+        _expire_jobs,
+        enqueue_job,
+        get_job,
+    )
+
+    now = int(time.time())
+    with app.app_context():
+        stale_id = enqueue_job("echo")
+        old_id = enqueue_job("echo")
+        db.session.execute(
+            update(Background_Job).where(Background_Job.id == stale_id)
+            .values(status="running", heartbeat_at=now - JOB_STALE_SECONDS - 1)
+        )
+        db.session.execute(
+            update(Background_Job).where(Background_Job.id == old_id)
+            .values(status="done", finished_at=now - JOB_RETENTION_SECONDS - 1)
+        )
+        db.session.commit()
+
+        assert _expire_jobs(now) == 1
+        assert get_job(stale_id)["status"] == "failed"
+        assert get_job(old_id) is None
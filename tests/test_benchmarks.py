@@ -0,0 +1,50 @@
+"""Tests for the endpoint benchmark helpers (superviseme/utils/benchmarks.py).
+
+Covers:
+1. measure_request reports status, timings, SQL query count and memory.
+2. check_results flags budget overruns and regressions against a baseline.
+"""
+
+
+def test_measure_request_counts_queries(app):
+    from superviseme.utils.benchmarks import QueryCounter, measure_request
+
+    client = app.test_client()
+    with app.app_context():
+        # /theses itself is served from the in-memory catalogue index
+        result = measure_request(client, "/theses/api/tags?q=a", repeat=3, warmup=1)
+        with QueryCounter() as counter:
+            client.get("/theses/api/tags?q=a")
+
+    assert result["status"] == 200
+    assert result["queries"] == counter.count > 0
+    assert 0 < result["p50_ms"] <= result["p95_ms"]
+    assert result["peak_kib"] > 0
+
+
+def test_check_results_budgets_and_baseline():
+    from superviseme.utils.benchmarks import check_results
+
+    results = {
+        "fast": {"status": 200, "p50_ms": 5, "p95_ms": 10, "queries": 3, "peak_kib": 100},
+        "slow": {"status": 200, "p50_ms": 900, "p95_ms": 1200, "queries": 12, "peak_kib": 100},
+        "broken": {"status": 500, "p50_ms": 1, "p95_ms": 1, "queries": 1, "peak_kib": 1},
+    }
+    budgets = {"default": {"max_p95_ms": 1000, "max_queries": 20}, "scenarios": {"slow": {"max_p95_ms": 2000}}}
+    baseline = {"scenarios": {
+        "fast": {"p95_ms": 4, "queries": 2, "peak_kib": 90},
+        "slow": {"p95_ms": 600, "queries": 12, "peak_kib": 100},
+    }}
+
+    violations = check_results(results, budgets=budgets, baseline=baseline)
+
+    # fast: one extra query is a regression; +6 ms is within the absolute floor.
+    assert violations == [
+        "fast: queries 3 > baseline 2",
+        "slow: p95_ms 1200 > baseline 600 (+50%)",
+        "broken: HTTP 500",
+    ]
+    assert check_results(results, budgets={"default": {"max_queries": 5}}) == [
+        "slow: queries 12 exceeds budget 5",
+        "broken: HTTP 500",
+    ]
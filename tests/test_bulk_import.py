@@ -0,0 +1,172 @@
+"""Tests for bulk user and thesis import (superviseme/utils/bulk_import.py).
+
+Covers:
+1. Valid rows are inserted in chunks while invalid and duplicate rows are
+   reported with their line numbers.
+2. Passwords are hashed with the configured method, also through the pool.
+3. Thesis rows resolve students/supervisors and create tags and statuses.
+4. The admin upload endpoint queues a background job in the database whose
+   progress URL reports the import, including undecodable files.
+"""
+import io
+import json
+
+
+USERS_CSV = """email,username,name,surname,user_type,password
+alice@example.com,alice,Alice,Rossi,student,pw-alice
+bob@example.com,bob,Bob,Bianchi,supervisor,
+not-an-email,carol,Carol,Verdi,student,pw
+alice@example.com,alice2,Alice,Again,student,pw
+dave@example.com,dave,Dave,Neri,wizard,pw
+taken@example.com,existing,Eve,Gialli,student,pw
+"""
+
+
+def test_import_users_reports_row_errors(app, make_users):
+    from superviseme import db
+    from superviseme.models import User_mgmt
+    from superviseme.utils.bulk_import import import_users
+    from werkzeug.security import check_password_hash
+
+    with app.app_context():
+        make_users(("existing", "student"))
+        db.session.commit()
+        report = import_users(io.StringIO(USERS_CSV), "csv", default_password="shared", chunk_size=2)
+
+        assert (report["total_rows"], report["imported"], report["failed"]) == (6, 2, 4)
+        assert [error["line"] for error in report["errors"]] == [4, 5, 6, 7]
+        assert "Duplicate email in import file" in report["errors"][1]["errors"]
+        assert report["errors"][3]["errors"] == ["Username already exists"]
+
+        alice = User_mgmt.query.filter_by(username="alice").one()
+        bob = User_mgmt.query.filter_by(username="bob").one()
+        assert alice.password.startswith("pbkdf2:sha256:1000$")
+        assert check_password_hash(alice.password, "pw-alice")
+        assert check_password_hash(bob.password, "shared")
+        assert bob.user_type == "supervisor"
+
+
+def test_import_users_matches_existing_email_case_insensitively(app, make_users):
+    from superviseme import db
+    from superviseme.models import User_mgmt
+    from superviseme.utils.bulk_import import import_users
+
+    with app.app_context():
+        make_users(("john", "student", {"email": "John@Example.com"}))
+        db.session.commit()
+
+        payload = "email,username,password\njohn@example.com,john2,pw\n"
+        report = import_users(io.StringIO(payload), "csv")
+        assert (report["imported"], report["failed"]) == (0, 1)
+        assert report["errors"][0]["errors"] == ["Email address already exists"]
+        assert User_mgmt.query.count() == 1
+
+
+def test_import_users_hashes_in_process_pool_and_dry_run(app):
+    from superviseme.models import User_mgmt
+    from superviseme.utils.bulk_import import HASH_POOL_MIN_ROWS, import_users
+    from werkzeug.security import check_password_hash
+
+    lines = [
+        json.dumps({"email": f"user{i}@example.com", "username": f"user{i}", "password": f"pw{i}"})
+        for i in range(HASH_POOL_MIN_ROWS + 4)
+    ]
+    payload = "\n".join(lines[:3] + ["{not json"] + lines[3:]) + "\n"
+
+    with app.app_context():
+        dry = import_users(io.StringIO(payload), "jsonl", dry_run=True)
+        assert (dry["imported"], dry["failed"], dry["dry_run"]) == (len(lines), 1, True)
+        assert User_mgmt.query.count() == 0
+
+        report = import_users(io.StringIO(payload), "jsonl", processes=2)
+        assert report["imported"] == len(lines)
+        assert report["errors"][0]["line"] == 4
+        user = User_mgmt.query.filter_by(username=f"user{HASH_POOL_MIN_ROWS}").one()
+        assert check_password_hash(user.password, f"pw{HASH_POOL_MIN_ROWS}")
+
+
+def test_import_theses_creates_related_rows(app, make_users):
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Status, Thesis_Supervisor, Thesis_Tag
+    from superviseme.utils.bulk_import import import_theses
+
+    with app.app_context():
+        users = make_users(("admin", "admin"), ("stud", "student"), ("prof", "supervisor"))
+        db.session.commit()
+        admin_id, student_id, supervisor_id = (users[name].id for name in ("admin", "stud", "prof"))
+    rows = [
+        {"title": "Graph mining", "description": "Community discovery", "keywords": "graphs, networks",
+         "student": "stud@example.com", "supervisor": "prof", "is_public": "yes"},
+        {"title": "Open topic", "short_description": "Anything goes", "keywords": ["ml"]},
+        {"title": "Bad supervisor", "description": "x", "supervisor": "stud"},
+        {"description": "No title"},
+    ]
+    payload = "\n".join(json.dumps(row) for row in rows)
+
+    with app.app_context():
+        report = import_theses(io.StringIO(payload), "jsonl", publisher_id=admin_id)
+        assert (report["imported"], report["failed"]) == (2, 2)
+        assert report["errors"][0]["errors"] == ["Unknown supervisor stud"]
+
+        thesis = Thesis.query.filter_by(title="Graph mining").one()
+        assert (thesis.author_id, thesis.publisher_id, thesis.is_public) == (student_id, admin_id, True)
+        assert sorted(tag.tag for tag in Thesis_Tag.query.filter_by(thesis_id=thesis.id)) == ["graphs", "networks"]
+        assert Thesis_Supervisor.query.filter_by(thesis_id=thesis.id).one().supervisor_id == supervisor_id
+        assert Thesis_Status.query.count() == 2
+
+        open_topic = Thesis.query.filter_by(title="Open topic").one()
+        assert open_topic.author_id is None
+        assert open_topic.description == "Anything goes"
+
+
+def _run_job(app, client, progress_url):
+    from superviseme.utils.background_jobs import run_pending_jobs
+
+    assert client.get(progress_url).get_json()["job"]["status"] == "queued"
+    with app.app_context():
+        run_pending_jobs()
+    return client.get(progress_url).get_json()["job"]
+
+
+def test_admin_import_endpoint(app, make_users, monkeypatch):
+    from superviseme import db
+    from superviseme.models import User_mgmt
+    from superviseme.utils import bulk_import
+
+    hashers = []
+    original_hasher = bulk_import._PasswordHasher
+
+    def _hasher(method, processes):
+        hashers.append(processes)
+        return original_hasher(method, processes)
+
+    monkeypatch.setattr(bulk_import, "_PasswordHasher", _hasher)
+
+    with app.app_context():
+        make_users(("admin", "admin"))
+        db.session.commit()
+    client = app.test_client()
+    client.post("/login", data={"email": "admin@example.com", "password": "pw"})
+
+    data = {"file": (io.BytesIO(USERS_CSV.encode("utf-8-sig")), "users.csv"), "default_password": "shared"}
+    resp = client.post("/admin/import/users", data=data, content_type="multipart/form-data")
+    assert resp.status_code == 202
+    job = _run_job(app, client, resp.get_json()["progress_url"])
+    assert job["status"] == "done", job
+    assert (job["filename"], job["dry_run"]) == ("users.csv", False)
+    assert (job["report"]["imported"], job["report"]["failed"]) == (3, 3)
+    # The job runner is not a web worker, so it hashes in the process pool
+    assert hashers == [bulk_import.DEFAULT_HASH_PROCESSES]
+
+    data = {"file": (io.BytesIO(b"x"), "users.xlsx")}
+    resp = client.post("/admin/import/users", data=data, content_type="multipart/form-data")
+    assert resp.status_code == 400
+
+    data = {"file": (io.BytesIO(b"email\n\xff\xfe\n"), "users.csv")}
+    resp = client.post("/admin/import/users", data=data, content_type="multipart/form-data")
+    job = _run_job(app, client, resp.get_json()["progress_url"])
+    assert (job["status"], job["error"]) == ("failed", "Import file must be UTF-8 encoded")
+
+    assert client.get("/admin/import/jobs/unknown").status_code == 404
+    with app.app_context():
+        assert User_mgmt.query.filter_by(username="existing").count() == 1
@@ -0,0 +1,199 @@
+"""Tests for set-based cascading deletes (superviseme/utils/cascade_delete.py).
+
+Covers:
+1. The declared graph covers every foreign key into a cascade parent.
+2. Deleting a user removes what they own or authored, clears references on
+   surviving rows and reassigns role grants, with foreign keys enforced.
+3. Thesis deletion issues the same number of statements regardless of size.
+4. Background deletion is queued in the database and reports progress through
+   the admin endpoint.
+"""
+import time
+
+import pytest
+
+
+@pytest.fixture()
+def app(app):
+    from sqlalchemy import event
+
+    from superviseme import db
+
+    def _enforce_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    with app.app_context():
+        event.listen(db.engine, "connect", _enforce_foreign_keys)
+        db.engine.dispose()
+    return app
+    with app.app_context():
+        event.remove(db.engine, "connect", _enforce_foreign_keys)
+
+
+def _populate(app, make_users, updates=3):
+    """A supervised thesis with content authored by both the student and the supervisor"""
+    from superviseme import db
+    from superviseme.models import (
+        Notification, OrcidActivity, ResearchProject, ResearchProject_Todo, ResearchProject_Update,
+        ResearchProject_TodoReference, Supervisor_Role, Thesis, Thesis_Supervisor, Thesis_Update,
+        Todo, Todo_Reference, Update_Tag,
+    )
+
+    now = int(time.time())
+    with app.app_context():
+        users = make_users(("admin", "admin"), ("prof", "researcher"), ("stud", "student"))
+        admin, supervisor, student = users["admin"], users["prof"], users["stud"]
+
+        thesis = Thesis(title="T", description="D", author_id=student.id, publisher_id=supervisor.id, created_at=now)
+        db.session.add(thesis)
+        db.session.flush()
+        db.session.add(Thesis_Supervisor(thesis_id=thesis.id, supervisor_id=supervisor.id, assigned_at=now))
+
+        first = None
+        for i in range(updates):
+            upd = Thesis_Update(thesis_id=thesis.id, author_id=supervisor.id, update_type="progress", content=f"u{i}",
+                                parent_id=first.id if first else None, created_at=now)
+            db.session.add(upd)
+            db.session.flush()
+            first = first or upd
+            db.session.add(Update_Tag(update_id=upd.id, tag="t"))
+        reply = Thesis_Update(thesis_id=thesis.id, author_id=student.id, update_type="feedback", content="reply",
+                              parent_id=first.id, created_at=now)
+        todo = Todo(thesis_id=thesis.id, author_id=supervisor.id, assigned_to_id=student.id,
+                    title="todo", status="pending", created_at=now, updated_at=now)
+        db.session.add_all([reply, todo])
+        db.session.flush()
+        db.session.add(Todo_Reference(todo_id=todo.id, update_id=first.id, created_at=now))
+        db.session.add(Notification(recipient_id=student.id, actor_id=supervisor.id, thesis_id=thesis.id,
+                                    notification_type="new_update", title="n", message="m", created_at=now))
+
+        project = ResearchProject(researcher_id=supervisor.id, title="P", description="PD", created_at=now)
+        db.session.add(project)
+        db.session.flush()
+        project_update = ResearchProject_Update(project_id=project.id, author_id=supervisor.id,
+                                                update_type="progress", content="pu", created_at=now)
+        project_todo = ResearchProject_Todo(project_id=project.id, author_id=supervisor.id, title="pt",
+                                            status="pending", created_at=now, updated_at=now)
+        db.session.add_all([project_update, project_todo])
+        db.session.flush()
+        db.session.add(ResearchProject_TodoReference(todo_id=project_todo.id, update_id=project_update.id,
+                                                     created_at=now))
+        db.session.add(OrcidActivity(user_id=supervisor.id, title="paper", type="work", created_at=now, updated_at=now))
+        db.session.add(Supervisor_Role(researcher_id=student.id, granted_by=supervisor.id, granted_at=now,
+                                       active=True, created_at=now, updated_at=now))
+        db.session.commit()
+        return {"admin": admin.id, "supervisor": supervisor.id, "student": student.id,
+                "thesis": thesis.id, "reply": reply.id, "todo": todo.id}
+
+
+def test_graph_covers_all_foreign_keys(app):
+    from superviseme.utils.cascade_delete import undeclared_foreign_keys
+
+    with app.app_context():
+        assert undeclared_foreign_keys() == []
+
+
+def test_delete_user_cascades_and_keeps_theses(app, make_users):
+    from superviseme import db
+    from superviseme.models import (
+        Notification, OrcidActivity, ResearchProject, ResearchProject_TodoReference, Supervisor_Role, Thesis,
+        Thesis_Supervisor, Thesis_Update, Todo, Todo_Reference, Update_Tag, User_mgmt,
+    )
+    from superviseme.utils.cascade_delete import delete_records
+
+    ids = _populate(app, make_users)
+    with app.app_context():
+        assert db.session.execute(db.text("PRAGMA foreign_keys")).scalar() == 1
+        counts = delete_records(User_mgmt, [ids["supervisor"]], reassign_to=ids["admin"])
+        db.session.commit()
+
+        assert counts["user_mgmt.deleted"] == 1
+        assert db.session.get(User_mgmt, ids["supervisor"]) is None
+        thesis = db.session.get(Thesis, ids["thesis"])
+        assert (thesis.author_id, thesis.publisher_id) == (ids["student"], None)
+        assert Thesis_Supervisor.query.count() == 0
+        assert [u.id for u in Thesis_Update.query.all()] == [ids["reply"]]
+        assert Thesis_Update.query.get(ids["reply"]).parent_id is None
+        for model in (Update_Tag, Todo, Todo_Reference, Notification, OrcidActivity,
+                      ResearchProject, ResearchProject_TodoReference):
+            assert model.query.count() == 0, model.__tablename__
+        assert Supervisor_Role.query.one().granted_by == ids["admin"]
+
+
+def _count_statements(app, fn):
+    from sqlalchemy import event
+
+    from superviseme import db
+
+    statements = []
+
+    def _on_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith(("DELETE", "UPDATE")):
+            statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _on_execute)
+        try:
+            fn()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _on_execute)
+    return len(statements)
+
+
+def test_thesis_delete_is_set_based(tmp_path, monkeypatch, make_users):
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Update
+    from superviseme.utils.thesis_management import delete_thesis_with_dependencies
+
+    counts = []
+    for size in (2, 40):
+        monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / f'set_based_{size}.db'}")
+        monkeypatch.setenv("SECRET_KEY", "cascade-test-secret-key")
+        monkeypatch.setenv("FLASK_SKIP_USER_INIT", "1")
+        monkeypatch.setenv("ENABLE_SCHEDULER", "false")
+        from superviseme import create_app
+
+        app = create_app(db_type="sqlite", skip_user_init=True)
+        ids = _populate(app, make_users, updates=size)
+
+        def _delete():
+            assert delete_thesis_with_dependencies(ids["thesis"]) == (True, None)
+            db.session.commit()
+
+        counts.append(_count_statements(app, _delete))
+        with app.app_context():
+            assert Thesis.query.count() == 0
+            assert Thesis_Update.query.count() == 0
+
+    assert counts[0] == counts[1]
+
+
+def test_background_delete_reports_progress(app, make_users):
+    from superviseme.models import ResearchProject, User_mgmt
+    from superviseme.utils import cascade_delete
+    from superviseme.utils.background_jobs import run_pending_jobs
+
+    ids = _populate(app, make_users)
+    client = app.test_client()
+    client.post("/login", data={"email": "admin@example.com", "password": "pw"})
+
+    original = cascade_delete.CASCADE_BACKGROUND_THRESHOLD
+    cascade_delete.CASCADE_BACKGROUND_THRESHOLD = 0
+    try:
+        resp = client.delete(f"/admin/delete_user/{ids['supervisor']}")
+    finally:
+        cascade_delete.CASCADE_BACKGROUND_THRESHOLD = original
+    assert resp.status_code == 202
+    progress_url = resp.get_json()["progress_url"]
+    assert client.get(progress_url).get_json()["job"]["status"] == "queued"
+
+    with app.app_context():
+        assert run_pending_jobs() == {"done": 1, "failed": 0, "expired": 0}
+
+    job = client.get(progress_url).get_json()["job"]
+    assert job["status"] == "done", job
+    assert job["counts"]["research_project.deleted"] == 1
+
+    with app.app_context():
+        assert User_mgmt.query.filter_by(id=ids["supervisor"]).count() == 0
+        assert ResearchProject.query.count() == 0
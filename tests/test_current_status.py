@@ -0,0 +1,108 @@
+"""Tests for materialized thesis/project statuses (superviseme/utils/current_status.py).
+
+Covers:
+1. Status inserts, edits and deletes keep current_status in sync, with
+   ties on updated_at resolved by insertion order.
+2. The consistency checker finds and repairs stale values.
+3. Admin listings and exports filter on the materialized status.
+"""
+import time
+
+
+def _thesis(app, title="T"):
+    from superviseme import db
+    from superviseme.models import Thesis
+
+    with app.app_context():
+        thesis = Thesis(title=title, description="D", created_at=int(time.time()))
+        db.session.add(thesis)
+        db.session.commit()
+        return thesis.id
+
+
+def test_status_writes_refresh_current_status(app, make_users):
+    from superviseme import db
+    from superviseme.models import ResearchProject, ResearchProject_Status, Thesis, Thesis_Status
+
+    thesis_id = _thesis(app)
+    with app.app_context():
+        thesis = db.session.get(Thesis, thesis_id)
+        assert thesis.current_status is None
+
+        first = Thesis_Status(thesis_id=thesis_id, status="proposed", updated_at=100)
+        db.session.add(first)
+        db.session.commit()
+        assert (thesis.current_status, thesis.current_status_at) == ("proposed", 100)
+
+        # Same timestamp: the later entry wins, like thesis.status[-1].
+        second = Thesis_Status(thesis_id=thesis_id, status="in-progress", updated_at=100)
+        db.session.add(second)
+        db.session.flush()
+        assert thesis.current_status == "in-progress"
+        db.session.commit()
+
+        first.updated_at = 200
+        db.session.commit()
+        assert thesis.current_status == "proposed"
+
+        db.session.delete(first)
+        db.session.commit()
+        assert thesis.current_status == "in-progress"
+
+        researcher = make_users(("r", "researcher"))["r"]
+        project = ResearchProject(title="P", description="PD", researcher_id=researcher.id, created_at=1)
+        db.session.add(project)
+        db.session.flush()
+        db.session.add(ResearchProject_Status(project_id=project.id, status="active", updated_at=300))
+        db.session.commit()
+        assert (project.current_status, project.current_status_at) == ("active", 300)
+
+
+def test_checker_repairs_stale_rows(app):
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Status
+    from superviseme.utils.current_status import check_current_status
+
+    thesis_id = _thesis(app)
+    with app.app_context():
+        db.session.add(Thesis_Status(thesis_id=thesis_id, status="approved", updated_at=100))
+        db.session.commit()
+        db.session.execute(
+            db.update(Thesis).where(Thesis.id == thesis_id).values(current_status="stale")
+        )
+        db.session.commit()
+
+        report = check_current_status()
+        assert report["thesis"]["mismatched"] == 1
+        assert report["thesis"]["mismatches"][0]["expected"] == "approved"
+        assert report["research_project"]["mismatched"] == 0
+
+        report = check_current_status(repair=True)
+        assert report["thesis"]["repaired"] == 1
+        assert check_current_status()["thesis"]["mismatched"] == 0
+        db.session.expire_all()
+        assert db.session.get(Thesis, thesis_id).current_status == "approved"
+
+
+def test_admin_listing_filters_by_status(app, make_users):
+    from superviseme import db
+    from superviseme.models import Thesis_Status
+
+    accepted, other = _thesis(app, "Accepted"), _thesis(app, "Other")
+    with app.app_context():
+        make_users(("admin", "admin"))
+        db.session.add(Thesis_Status(thesis_id=accepted, status="thesis accepted", updated_at=100))
+        db.session.add(Thesis_Status(thesis_id=other, status="proposed", updated_at=100))
+        db.session.commit()
+
+    client = app.test_client()
+    client.post("/login", data={"email": "admin@example.com", "password": "pw"})
+
+    data = client.get("/admin/theses_data?status=thesis accepted").get_json()
+    assert data["total"] == 1
+    assert data["data"][0]["thesis_id"] == accepted
+    assert data["data"][0]["status"] == "thesis accepted"
+
+    export = client.get("/admin/api/export_data?status=proposed").get_json()
+    assert [t["title"] for t in export["data"]["theses"]] == ["Other"]
+    assert export["data"]["theses"][0]["status"] == "proposed"
@@ -0,0 +1,74 @@
+"""Tests for database pool configuration (superviseme/utils/db_pool.py).
+
+Covers:
+1. The connection budget is split between workers, with explicit overrides
+   and NullPool for an external pooler.
+2. The instrumented pool counts checkout waits and timeouts and /health
+   reports them.
+"""
+import pytest
+
+
+def test_postgresql_options_sized_per_worker(monkeypatch):
+    from sqlalchemy.pool import NullPool
+
+    from superviseme.utils.db_pool import TimedQueuePool, pool_sizing, postgresql_engine_options
+
+    for name in ("DB_POOL_MODE", "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "GUNICORN_WORKERS", "GUNICORN_THREADS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    monkeypatch.setenv("DB_MAX_CONNECTIONS", "40")
+
+    options = postgresql_engine_options("postgresql://u:p@db/app")
+    assert options["poolclass"] is TimedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (6, 4)
+    assert options["pool_pre_ping"] is True
+    assert pool_sizing(workers=16, threads=4, max_connections=40) == {"pool_size": 4, "max_overflow": 0}
+
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    options = postgresql_engine_options("postgresql://u:p@db/app")
+    assert (options["pool_size"], options["max_overflow"], options["pool_pre_ping"]) == (3, 4, False)
+
+    monkeypatch.setenv("DB_POOL_MODE", "external")
+    assert postgresql_engine_options("postgresql://u:p@db/app") == {"poolclass": NullPool}
+    assert postgresql_engine_options("postgresql+psycopg://u:p@db/app")["connect_args"] == {"prepare_threshold": None}
+
+    monkeypatch.setenv("DB_POOL_MODE", "bouncer")
+    with pytest.raises(ValueError):
+        postgresql_engine_options("postgresql://u:p@db/app")
+
+
+def test_pool_telemetry_and_health(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine, exc
+
+    from superviseme.utils.db_pool import TimedQueuePool, pool_status
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.05)
+    held = engine.connect()
+    status = pool_status(engine)
+    assert (status["size"], status["checked_out"], status["overflow"], status["max_overflow"]) == (1, 1, 0, 0)
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+
+    status = pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 2
+    assert status["timeouts"] == 1
+    assert status["wait_ms_max"] >= 50
+    engine.dispose()
+
+    monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'health.db'}")
+    monkeypatch.setenv("SECRET_KEY", "db-pool-test-secret-key")
+    monkeypatch.setenv("FLASK_ENV", "development")
+    monkeypatch.setenv("ENABLE_SCHEDULER", "false")
+
+    from superviseme import create_app
+
+    app = create_app(db_type="sqlite", skip_user_init=True)
+    payload = app.test_client().get("/health").get_json()
+    assert payload["status"] == "healthy"
+    assert payload["database"]["pool"]["class"] == "TimedQueuePool"
+    assert {"size", "checked_out", "overflow", "max_overflow", "wait_ms_max", "timeouts"} <= set(payload["database"]["pool"])
@@ -0,0 +1,80 @@
+"""Tests for the load-test harness (superviseme/utils/load_testing.py).
+
+Covers:
+1. Virtual users are spread over every available role following the mix.
+2. A short run against a live threaded server logs in, runs every role
+   script and reports no errors.
+"""
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture()
+def app_env(app_env):
+    return {**app_env, "LOGIN_RATE_LIMIT_IP": "1000/60"}
+
+
+@pytest.fixture()
+def app(app):
+    # The harness logs in through the real form, CSRF token included
+    app.config["WTF_CSRF_ENABLED"] = True
+    return app
+
+
+def test_assign_roles_covers_available_roles():
+    from superviseme.utils.load_testing import assign_roles
+
+    accounts = {"student": [{"email": "s1"}, {"email": "s2"}], "supervisor": [{"email": "p"}], "admin": []}
+    assignments = assign_roles(20, accounts, seed=1)
+
+    roles = [role for _, role, _ in assignments]
+    assert roles[:3] == ["student", "supervisor", "anonymous"]
+    assert "admin" not in roles
+    assert roles.count("student") > roles.count("supervisor")
+    assert {account["email"] for _, role, account in assignments if role == "student"} == {"s1", "s2"}
+    assert assign_roles(20, accounts, seed=1) == assignments
+
+
+def test_short_run_against_live_server(app, make_users):
+    from werkzeug.serving import make_server
+
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Supervisor
+    from superviseme.utils.load_testing import run_load
+
+    with app.app_context():
+        users = make_users(("admin", "admin"), ("supervisor", "supervisor"), ("student", "student"))
+        thesis = Thesis(title="T", description="D", author_id=users["student"].id, created_at=int(time.time()))
+        open_thesis = Thesis(title="Open", description="D", is_public=True, created_at=int(time.time()))
+        db.session.add_all([thesis, open_thesis])
+        db.session.flush()
+        db.session.add(Thesis_Supervisor(thesis_id=thesis.id, supervisor_id=users["supervisor"].id, assigned_at=1))
+        db.session.commit()
+        accounts = {
+            "student": [{"email": "student@example.com", "password": "pw", "thesis_id": thesis.id}],
+            "supervisor": [{"email": "supervisor@example.com", "password": "pw", "thesis_ids": [thesis.id]}],
+            "admin": [{"email": "admin@example.com", "password": "pw"}],
+        }
+        context = {"public_thesis_ids": [open_thesis.id]}
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        summary = run_load(
+            f"http://127.0.0.1:{server.server_port}", accounts, context,
+            concurrency=4, duration=1.5, processes=1, think_time=(0, 0), ramp_up=0,
+        )
+    finally:
+        server.shutdown()
+
+    assert summary["roles"] == {"student": 1, "supervisor": 1, "admin": 1, "anonymous": 1}
+    assert summary["errors"] == 0, {k: v for k, v in summary["steps"].items() if v["errors"]}
+    assert summary["steps"]["login"]["requests"] == 3
+    for step in ("student_thesis", "supervisor_thesis_detail", "admin_users", "public_thesis_detail"):
+        assert summary["steps"][step]["requests"] > 0
+    assert summary["throughput_rps"] > 0
+    assert summary["pool"]["size"] >= 1
+    assert 0 <= summary["pool"]["saturation"] <= 1
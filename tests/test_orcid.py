@@ -76,6 +76,7 @@ def test_fetch_orcid_activities_success(orcid_modules):
     # Mock requests response
     mock_response = MagicMock()
     mock_response.status_code = 200
+    mock_response.headers = {}
     mock_response.json.return_value = {
         "group": [{
             "work-summary": [{
@@ -88,9 +89,10 @@ def test_fetch_orcid_activities_success(orcid_modules):
         }]
     }
 
-    # Since requests is mocked in sys.modules, we use that mock
-    # client.requests is the Mock object
-    client.requests.get.return_value = mock_response
+    # Since requests is mocked in sys.modules, the pooled session is
+    # client.requests.Session.return_value
+    session = client.requests.Session.return_value
+    session.get.return_value = mock_response
 
     # Mock DB
     client.OrcidActivity = MagicMock()
@@ -105,9 +107,11 @@ def test_fetch_orcid_activities_success(orcid_modules):
     assert client.db.session.add_all.called
     assert client.db.session.commit.called
 
-    # Verify requests called with token
-    args, kwargs = client.requests.get.call_args
+    # Verify requests called with token and explicit timeouts
+    args, kwargs = session.get.call_args
     assert kwargs['headers']['Authorization'] == "Bearer access_token"
+    assert kwargs['timeout'] == (client.ORCID_CONNECT_TIMEOUT, client.ORCID_READ_TIMEOUT)
+    assert session.get.call_count == len(client.ORCID_SECTIONS)
 
 def test_fetch_orcid_activities_no_orcid(orcid_modules):
     client, bibtex = orcid_modules
@@ -126,7 +130,7 @@ def test_fetch_orcid_activities_unauthorized(orcid_modules):
 
     mock_response = MagicMock()
     mock_response.status_code = 401
-    client.requests.get.return_value = mock_response
+    client.requests.Session.return_value.get.return_value = mock_response
 
     result = client.fetch_orcid_activities(user)
     assert result["success"] is False
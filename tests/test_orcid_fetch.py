@@ -0,0 +1,182 @@
+"""Tests for the concurrent ORCID fetcher (superviseme/utils/orcid_client.py).
+
+Runs fetch_orcid_sections() against a local mock ORCID server:
+1. Sections are fetched concurrently (latency ~ slowest section, not the sum).
+2. 5xx responses are retried and then reported without failing other sections.
+3. Incremental sync diffs by put-code, keeps row IDs stable and skips
+   sections the server reports as unchanged (304); a forced sync re-reads
+   every section, and the profile "full" resync passes force through.
+"""
+import copy
+import importlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+SECTION_DELAY = 0.4
+
+PAYLOADS = {
+    "works": {"group": [{"work-summary": [{"title": {"title": {"value": "Paper"}}, "type": "journal-article"}]}]},
+    "employments": {"affiliation-group": []},
+    "educations": {"affiliation-group": []},
+}
+
+
+class _MockOrcidHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        section = self.path.rstrip("/").rsplit("/", 1)[-1]
+        with server.lock:
+            server.hits[section] = server.hits.get(section, 0) + 1
+        time.sleep(server.delay)
+
+        etag = f'"{section}-{server.versions.get(section, 0)}"'
+        if section in server.payloads and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        elif section in server.payloads:
+            status, body = 200, json.dumps(server.payloads[section]).encode()
+        else:
+            status, body = 503, b'{"error": "unavailable"}'
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def orcid_server(monkeypatch):
+    # Resolve through sys.modules: tests/test_orcid.py re-imports this module
+    # under mocks, which can leave a stale attribute on superviseme.utils.
+    orcid_client = importlib.import_module("superviseme.utils.orcid_client")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockOrcidHandler)
+    server.lock = threading.Lock()
+    server.hits = {}
+    server.delay = SECTION_DELAY
+    server.payloads = copy.deepcopy(PAYLOADS)
+    server.versions = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(orcid_client, "ORCID_API_BASE", f"http://127.0.0.1:{server.server_port}/v3.0")
+    try:
+        yield server, orcid_client
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_sections_fetched_concurrently(orcid_server):
+    server, client = orcid_server
+
+    session = client.build_orcid_session(max_retries=0)
+    started = time.monotonic()
+    results = client.fetch_orcid_sections("0000-0001-2345-6789", {"Accept": "application/json"}, session=session)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < SECTION_DELAY * 2.5
+    assert results["works"][0] == 200
+    assert results["works"][1]["group"][0]["work-summary"][0]["title"]["title"]["value"] == "Paper"
+
+
+def test_failing_section_is_retried_and_partial(orcid_server):
+    server, client = orcid_server
+
+    session = client.build_orcid_session(max_retries=2, backoff_factor=0)
+    results = client.fetch_orcid_sections("0000-0001-2345-6789", {"Accept": "application/json"}, session=session)
+
+    status_code, data, error, _ = results["fundings"]
+    assert status_code == 503
+    assert data is None and error == "HTTP 503"
+    assert server.hits["fundings"] == 3
+    for section in ("works", "employments", "educations"):
+        assert results[section][0] == 200
+        assert server.hits[section] == 1
+
+
+def _work(put_code, title, last_modified):
+    return {"work-summary": [{
+        "put-code": put_code,
+        "title": {"title": {"value": title}},
+        "type": "journal-article",
+        "last-modified-date": {"value": last_modified},
+    }]}
+
+
+@pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+def test_incremental_sync_diffs_by_put_code(app, orcid_server, monkeypatch, make_users):
+    server, client = orcid_server
+    server.delay = 0
+    server.payloads["fundings"] = {"group": []}
+    server.payloads["works"] = {
+        "last-modified-date": {"value": 1000},
+        "group": [_work(1, "Kept", 1000), _work(2, "Edited", 1000), _work(3, "Dropped", 1000)],
+    }
+    monkeypatch.setattr(client, "_session", client.build_orcid_session(max_retries=0))
+
+    from superviseme import db
+    from superviseme.models import OrcidActivity
+
+    with app.app_context():
+        user = make_users(("researcher", "researcher", {"orcid_id": "0000-0001-2345-6789"}))["researcher"]
+        db.session.commit()
+
+        first = client.fetch_orcid_activities(user)
+        assert first["success"] is True
+        assert (first["inserted"], first["updated"], first["removed"]) == (3, 0, 0)
+        ids = {a.put_code: a.id for a in OrcidActivity.query.filter_by(user_id=user.id)}
+
+        # Nothing changed upstream: every section answers 304.
+        hits_before = dict(server.hits)
+        second = client.fetch_orcid_activities(user)
+        assert (second["inserted"], second["updated"], second["removed"]) == (0, 0, 0)
+        assert "4 section(s) unchanged" in second["message"]
+        assert all(server.hits[s] == hits_before[s] + 1 for s in client.ORCID_SECTIONS)
+
+        server.payloads["works"] = {
+            "last-modified-date": {"value": 2000},
+            "group": [_work(1, "Kept", 1000), _work(2, "Edited title", 2000), _work(4, "New", 2000)],
+        }
+        server.versions["works"] = 1
+        third = client.fetch_orcid_activities(user)
+        assert (third["inserted"], third["updated"], third["removed"]) == (1, 1, 1)
+
+        db.session.expire_all()
+        stored = {a.put_code: a for a in OrcidActivity.query.filter_by(user_id=user.id)}
+        assert set(stored) == {"1", "2", "4"}
+        assert stored["1"].id == ids["1"]
+        assert stored["2"].id == ids["2"]
+        assert stored["2"].title == "Edited title"
+        assert stored["2"].last_modified == 2000
+
+        forced = client.fetch_orcid_activities(user, force=True)
+        assert (forced["inserted"], forced["updated"], forced["removed"]) == (0, 0, 0)
+        assert "unchanged" not in forced["message"]
+
+
+def test_full_resync_route_forces_sync(app, monkeypatch, make_users):
+    from superviseme import db
+
+    orcid_client = importlib.import_module("superviseme.utils.orcid_client")
+    calls = []
+    monkeypatch.setattr(
+        orcid_client, "fetch_orcid_activities",
+        lambda user, force=False: calls.append(force) or {"success": True, "message": "ok"},
+    )
+
+    with app.app_context():
+        make_users(("researcher", "researcher", {"orcid_id": "0000-0001-2345-6789"}))
+        db.session.commit()
+
+    web = app.test_client()
+    web.post("/login", data={"email": "researcher@example.com", "password": "pw"})
+    assert web.post("/profile/orcid/sync").status_code == 302
+    assert web.post("/profile/orcid/sync", data={"full": "1"}).status_code == 302
+    assert calls == [False, True]
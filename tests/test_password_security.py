@@ -0,0 +1,126 @@
+"""Tests for login hardening (superviseme/utils/password_security.py).
+
+Covers:
+1. Hash method normalization and rehash detection.
+2. Keyed rate limiter refill, with buckets shared by every worker.
+3. The login route: transparent rehash to the configured cost and
+   per-account throttling of failed attempts.
+4. Behind the proxy, the per-IP limit keys on X-Forwarded-For, not nginx.
+"""
+import time
+
+import pytest
+
+
+@pytest.fixture()
+def app_env(app_env):
+    return {**app_env, "LOGIN_RATE_LIMIT_ACCOUNT": "2/300"}
+
+
+class TestHashMethods:
+    def test_normalize_hash_method(self):
+        from superviseme.utils.password_security import normalize_hash_method
+        from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+
+        assert normalize_hash_method("pbkdf2:sha256") == f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"
+        assert normalize_hash_method("pbkdf2:sha256:1000") == "pbkdf2:sha256:1000"
+        assert normalize_hash_method("scrypt") == "scrypt:32768:8:1"
+        assert normalize_hash_method("scrypt:16384") == "scrypt:16384:8:1"
+
+    def test_needs_rehash(self, app):
+        from superviseme.utils.password_security import needs_rehash
+        from werkzeug.security import generate_password_hash
+
+        with app.app_context():
+            assert needs_rehash(generate_password_hash("pw", method="pbkdf2:sha256:1000")) is False
+            assert needs_rehash(generate_password_hash("pw", method="pbkdf2:sha256:2000")) is True
+            assert needs_rehash("") is True
+
+
+class TestThrottling:
+    def test_rate_limiter_refills(self, app):
+        from superviseme.utils.password_security import RateLimiter
+
+        with app.app_context():
+            limiter = RateLimiter("test", capacity=2, period=0.2)
+            assert limiter.hit("a") and limiter.hit("a")
+            assert limiter.hit("a") is False
+            assert limiter.is_limited("a") is True
+            assert limiter.hit("b") is True
+            time.sleep(0.15)
+            assert limiter.hit("a") is True
+
+    def test_buckets_are_shared_between_workers(self, app):
+        from superviseme.utils.password_security import RateLimiter
+
+        with app.app_context():
+            # Two limiters stand for the same limit in two gunicorn workers
+            first, second = RateLimiter("ip", 3, 300), RateLimiter("ip", 3, 300)
+            assert first.hit("203.0.113.5") and second.hit("203.0.113.5") and first.hit("203.0.113.5")
+            assert second.hit("203.0.113.5") is False
+            assert first.is_limited("203.0.113.5") is True
+            assert RateLimiter("account", 3, 300).is_limited("203.0.113.5") is False
+
+            second.reset("203.0.113.5")
+            assert first.hit("203.0.113.5") is True
+
+
+class TestLoginRoute:
+    def _create_user(self, app, method):
+        from superviseme import db
+        from superviseme.models import User_mgmt
+        from werkzeug.security import generate_password_hash
+
+        with app.app_context():
+            user = User_mgmt(
+                username="supervisor1", email="supervisor1@example.com",
+                password=generate_password_hash("correct horse", method=method),
+                user_type="supervisor", joined_on=int(time.time()),
+            )
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+
+    def test_successful_login_rehashes_to_configured_cost(self, app):
+        from superviseme import db
+        from superviseme.models import User_mgmt
+        from werkzeug.security import check_password_hash
+
+        user_id = self._create_user(app, "pbkdf2:sha256:1500")
+        client = app.test_client()
+        resp = client.post("/login", data={"email": "supervisor1@example.com", "password": "correct horse"})
+        assert resp.status_code == 302
+
+        with app.app_context():
+            stored = db.session.get(User_mgmt, user_id).password
+            assert stored.startswith("pbkdf2:sha256:1000$")
+            assert check_password_hash(stored, "correct horse")
+
+    def test_failed_attempts_throttle_account(self, app):
+        self._create_user(app, "pbkdf2:sha256:1000")
+        client = app.test_client()
+        for _ in range(2):
+            resp = client.post("/login", data={"email": "supervisor1@example.com", "password": "wrong"})
+            assert resp.status_code == 302
+
+        resp = client.post("/login", data={"email": "supervisor1@example.com", "password": "correct horse"})
+        assert resp.status_code == 429
+
+
+class TestForwardedClientIp:
+    @pytest.fixture()
+    def app_env(self, app_env):
+        return {**app_env, "USE_PROXY_FIX": "true", "TRUSTED_PROXY_COUNT": "1", "LOGIN_RATE_LIMIT_IP": "1/300"}
+
+    def test_ip_limit_keys_on_forwarded_client(self, app):
+        client = app.test_client()
+
+        def attempt(client_ip):
+            return client.post(
+                "/login", data={"email": "nobody@example.com", "password": "wrong"},
+                headers={"X-Forwarded-For": client_ip}, environ_base={"REMOTE_ADDR": "10.0.0.2"},
+            ).status_code
+
+        assert attempt("203.0.113.5") == 302
+        assert attempt("203.0.113.6") == 302
+        assert attempt("203.0.113.5") == 429
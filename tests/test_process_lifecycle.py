@@ -0,0 +1,95 @@
+"""Tests for the fork hooks that make gunicorn --preload safe (superviseme/utils/process_lifecycle.py).
+
+Covers:
+1. A forked child does not reuse database connections pooled by its parent
+   and drops per-process singletons; the parent's pool is left intact.
+2. Services started through run_in_worker wait for post_fork_worker while
+   the app is being preloaded.
+"""
+import json
+import os
+
+
+def _in_child(check):
+    """Run check() in a forked child and return its JSON-serialisable result"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            payload = {"result": check()}
+        except Exception as e:
+            payload = {"error": repr(e)}
+        os.write(write_fd, json.dumps(payload).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as reader:
+        payload = json.loads(reader.read() or "{}")
+    os.waitpid(pid, 0)
+    assert "error" not in payload, payload.get("error")
+    return payload["result"]
+
+
+def test_child_does_not_inherit_connections(app):
+    from sqlalchemy import event, text
+
+    from superviseme import db
+    from superviseme.utils import orcid_client, password_security
+
+    with app.app_context():
+        engine = db.engine
+        connects = []
+        event.listen(engine, "connect", lambda dbapi_connection, record: connects.append(os.getpid()))
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        parent_connection = engine.raw_connection()
+        parent_id = id(parent_connection.dbapi_connection)
+        parent_connection.close()
+        orcid_client.get_orcid_session()
+        password_security.get_login_guard()
+    assert engine.pool.checkedin() == 1
+
+    def check():
+        with app.app_context():
+            inherited = engine.pool.checkedin()
+            connection = engine.raw_connection()
+            reused = id(connection.dbapi_connection) == parent_id
+            connection.close()
+        return {
+            "inherited": inherited,
+            "reused": reused,
+            "connected_in_child": os.getpid() in connects,
+            "orcid_session": orcid_client._session is not None,
+            "login_guard": password_security._login_guard is not None,
+        }
+
+    assert _in_child(check) == {
+        "inherited": 0,
+        "reused": False,
+        "connected_in_child": True,
+        "orcid_session": False,
+        "login_guard": False,
+    }
+    # The parent keeps its own connection and can still use it
+    assert engine.pool.checkedin() == 1
+    with app.app_context():
+        assert db.session.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_run_in_worker_waits_for_post_fork(monkeypatch):
+    from superviseme.utils import process_lifecycle
+
+    monkeypatch.setattr(process_lifecycle, "_deferring", False)
+    monkeypatch.setattr(process_lifecycle, "_deferred", [])
+    started = []
+
+    process_lifecycle.run_in_worker(started.append, "direct")
+    process_lifecycle.defer_until_fork()
+    process_lifecycle.run_in_worker(started.append, "scheduler")
+    assert started == ["direct"]
+
+    process_lifecycle.post_fork_worker()
+    assert started == ["direct", "scheduler"]
+    process_lifecycle.run_in_worker(started.append, "later")
+    assert started == ["direct", "scheduler", "later"]
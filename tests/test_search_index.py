@@ -0,0 +1,166 @@
+"""Tests for full-text search (superviseme/utils/search_index.py).
+
+Covers:
+1. ORM writes keep search_document and the FTS index in sync; results carry
+   escaped snippets with the matches highlighted and are paginated.
+2. Access filters: students see their thesis, supervisors the theses they
+   supervise, researchers their projects (and supervised theses with the role).
+3. Cascade deletes purge orphaned documents; a rebuild re-indexes everything.
+4. The role search pages render content results.
+"""
+import pytest
+
+
+@pytest.fixture()
+def seeded(app, make_users):
+    from superviseme import db
+    from superviseme.models import (
+        MeetingNote,
+        ResearchProject,
+        ResearchProject_Collaborator,
+        ResearchProject_Update,
+        Thesis,
+        Thesis_Supervisor,
+        Thesis_Update,
+        Todo,
+    )
+
+    with app.app_context():
+        users = make_users(
+            ("admin", "admin"), ("sup", "supervisor"), ("stu", "student"), ("other", "student"),
+            ("res", "researcher"), ("collab", "researcher"),
+        )
+        ids = {username: user.id for username, user in users.items()}
+
+        mine = Thesis(title="Graph mining", description="D", author_id=ids["stu"], created_at=1)
+        theirs = Thesis(title="Other thesis", description="D", author_id=ids["other"], created_at=1)
+        db.session.add_all([mine, theirs])
+        db.session.flush()
+        ids.update(mine=mine.id, theirs=theirs.id)
+        db.session.add(Thesis_Supervisor(thesis_id=mine.id, supervisor_id=ids["sup"], assigned_at=1))
+        db.session.add_all([
+            Thesis_Update(thesis_id=mine.id, author_id=ids["stu"], update_type="progress", created_at=10,
+                          content="Implemented community detection with <script>Louvain</script>"),
+            MeetingNote(thesis_id=mine.id, author_id=ids["sup"], title="Community review",
+                        content="Discussed modularity", created_at=20, updated_at=20),
+            Todo(thesis_id=mine.id, author_id=ids["sup"], title="Benchmark communities", created_at=30,
+                 updated_at=30),
+            Thesis_Update(thesis_id=theirs.id, author_id=ids["other"], update_type="progress", created_at=40,
+                          content="Community structure in citation networks"),
+        ])
+
+        project = ResearchProject(title="Networks lab", description="D", researcher_id=ids["res"], created_at=1)
+        db.session.add(project)
+        db.session.flush()
+        ids["project"] = project.id
+        db.session.add_all([
+            ResearchProject_Collaborator(project_id=project.id, collaborator_id=ids["collab"], added_at=1),
+            ResearchProject_Update(project_id=project.id, author_id=ids["res"], update_type="progress",
+                                   content="Community datasets collected", created_at=50),
+        ])
+        db.session.commit()
+        return ids
+
+
+def _search(app, username, query, **kwargs):
+    from superviseme.models import User_mgmt
+    from superviseme.utils.search_index import search_content
+
+    with app.app_context():
+        user = User_mgmt.query.filter_by(username=username).one()
+        return search_content(user, query, **kwargs)
+
+
+def _sources(page):
+    return sorted((result["source_type"], result["context"]) for result in page.results)
+
+
+def test_index_follows_writes(app, seeded):
+    from superviseme import db
+    from superviseme.models import Search_Document, Thesis_Update
+
+    page = _search(app, "admin", "communit")
+    assert page.total == 5
+    # Title matches rank first
+    assert _search(app, "admin", "community").results[0]["source_type"] == "meeting_note"
+
+    hit = _search(app, "admin", "louvain").results[0]
+    assert hit["source_type"] == "update" and hit["context"] == "Graph mining"
+    assert "<mark>Louvain</mark>" in hit["snippet"]
+    assert "&lt;script&gt;" in hit["snippet"] and "<script>" not in hit["snippet"]
+    assert _search(app, "admin", "review modul").results[0]["title"] == "Community <mark>review</mark>"
+
+    paged = _search(app, "admin", "community", page=2, per_page=2)
+    assert (paged.total, paged.pages, len(paged.results)) == (4, 2, 2)
+    assert _search(app, "admin", 'NEAR("x" OR *').total == 0
+    assert _search(app, "admin", "   ").results == []
+
+    with app.app_context():
+        update = Thesis_Update.query.filter(Thesis_Update.content.contains("Louvain")).one()
+        update.content = "Switched to Leiden"
+        db.session.commit()
+    assert _search(app, "admin", "louvain").total == 0
+    assert _search(app, "admin", "leiden").total == 1
+
+    with app.app_context():
+        db.session.delete(Thesis_Update.query.filter_by(content="Switched to Leiden").one())
+        db.session.commit()
+        assert Search_Document.query.filter_by(source_type="update").count() == 1
+    assert _search(app, "admin", "leiden").total == 0
+
+
+def test_access_filters(app, seeded):
+    from superviseme import db
+    from superviseme.models import Supervisor_Role, Thesis_Supervisor
+
+    assert _sources(_search(app, "stu", "community")) == [
+        ("meeting_note", "Graph mining"), ("update", "Graph mining"),
+    ]
+    assert _sources(_search(app, "other", "community")) == [("update", "Other thesis")]
+    assert _search(app, "sup", "community").total == 2
+    assert _sources(_search(app, "res", "community")) == [("project_update", "Networks lab")]
+    assert _sources(_search(app, "collab", "community")) == [("project_update", "Networks lab")]
+
+    with app.app_context():
+        db.session.add(Supervisor_Role(researcher_id=seeded["res"], granted_by=seeded["admin"], granted_at=1,
+                                       created_at=1, updated_at=1))
+        db.session.add(Thesis_Supervisor(thesis_id=seeded["theirs"], supervisor_id=seeded["res"], assigned_at=1))
+        db.session.commit()
+    assert _sources(_search(app, "res", "community")) == [("project_update", "Networks lab"), ("update", "Other thesis")]
+    assert _search(app, "collab", "citation").total == 0
+
+
+def test_cascade_delete_and_rebuild(app, seeded):
+    from superviseme import db
+    from superviseme.models import Search_Document, Thesis
+    from superviseme.utils.cascade_delete import delete_records
+    from superviseme.utils.search_index import rebuild_search_index
+
+    with app.app_context():
+        delete_records(Thesis, [seeded["mine"]])
+        db.session.commit()
+        assert Search_Document.query.filter_by(thesis_id=seeded["mine"]).count() == 0
+    assert _search(app, "admin", "community").total == 2
+
+    with app.app_context():
+        db.session.execute(db.delete(Search_Document))
+        db.session.commit()
+        assert rebuild_search_index() == 2
+        db.session.commit()
+    assert _search(app, "admin", "community").total == 2
+
+
+def test_search_pages(app, seeded):
+    client = app.test_client()
+    client.post("/login", data={"email": "stu@example.com", "password": "pw"})
+    response = client.post("/student/search", data={"search_term": "louvain"})
+    assert response.status_code == 200
+    assert b"<mark>Louvain</mark>" in response.data
+    assert b"Content (1 found)" in response.data
+
+    client.post("/logout")
+    client.get("/logout")
+    client.post("/login", data={"email": "res@example.com", "password": "pw"})
+    response = client.get("/researcher/supervisor/search?search_term=datasets")
+    assert response.status_code == 200
+    assert b"<mark>datasets</mark>" in response.data
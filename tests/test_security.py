@@ -8,6 +8,10 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 def mock_url_for(endpoint, **values):
     return f"/{endpoint}"
 
+# Mock `static_url` (fingerprinted asset URLs)
+def mock_static_url(filename):
+    return f"/static/{filename}"
+
 # Mock `get_flashed_messages`
 def mock_get_flashed_messages():
     return []
@@ -36,6 +40,7 @@ def test_project_update_detail_xss_fix():
 
     # Add globals that might be used in templates
     env.globals['url_for'] = mock_url_for
+    env.globals['static_url'] = mock_static_url
     env.globals['get_flashed_messages'] = mock_get_flashed_messages
     env.globals['csrf_token'] = mock_csrf_token
     env.globals['current_user'] = MagicMock(id=1, name="Test User")
@@ -0,0 +1,73 @@
+"""Tests for the init/runtime split of the application factory.
+
+Covers:
+1. A runtime-only boot neither touches the database nor imports the heavy
+   optional packages, and reports its phase timings.
+2. The init phase bootstraps the database and the admin user; OAuth clients
+   are registered on first use.
+"""
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY_MODULES = ("authlib", "telebot", "flask_migrate", "alembic", "markdown", "bleach", "requests", "apscheduler")
+
+
+def _env(monkeypatch, db_file):
+    monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", f"sqlite:///{db_file}")
+    monkeypatch.setenv("SECRET_KEY", "startup-test-secret-key")
+    monkeypatch.setenv("FLASK_ENV", "development")
+    monkeypatch.setenv("ENABLE_SCHEDULER", "false")
+    monkeypatch.delenv("FLASK_SKIP_USER_INIT", raising=False)
+
+
+def test_runtime_boot_is_lean(tmp_path, monkeypatch):
+    db_file = tmp_path / "lean.db"
+    _env(monkeypatch, db_file)
+    monkeypatch.setenv("APP_INIT_ON_STARTUP", "false")
+
+    snippet = (
+        "import json, sys, superviseme\n"
+        "app = superviseme.create_app(db_type='sqlite')\n"
+        f"print(json.dumps({{'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules],"
+        " 'report': app.config['STARTUP_REPORT'], 'migrate': 'migrate' in app.extensions}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=REPO_ROOT, env=dict(os.environ), capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    payload = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert payload["loaded"] == []
+    assert payload["migrate"] is False
+    assert "init" not in payload["report"]["phases"]
+    assert {"config", "extensions", "blueprints"} <= set(payload["report"]["phases"])
+    assert payload["report"]["total_ms"] > 0
+    assert not db_file.exists()
+
+
+def test_init_phase_and_lazy_oauth(tmp_path, monkeypatch):
+    _env(monkeypatch, tmp_path / "init.db")
+    monkeypatch.setenv("ADMIN_BOOTSTRAP_PASSWORD", "bootstrap-pw")
+    monkeypatch.setenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+
+    from superviseme import create_app, db, initialize_app, oauth
+    from superviseme.models import User_mgmt
+
+    app = create_app(db_type="sqlite", run_init=False)
+    assert not (tmp_path / "init.db").exists()
+
+    initialize_app(app)
+    with app.app_context():
+        version = db.session.execute(db.text("SELECT version_num FROM alembic_version")).scalar()
+        assert version is not None
+        assert db.session.query(User_mgmt).filter_by(username="admin").count() == 1
+
+    assert "authlib.integrations.flask_client" not in app.extensions
+    with app.test_request_context():
+        assert oauth.google.name == "google"
+        assert oauth.orcid.name == "orcid"
+    assert "authlib.integrations.flask_client" in app.extensions
@@ -0,0 +1,126 @@
+"""Tests for the tag dictionary (superviseme/utils/tags.py).
+
+Covers:
+1. Tag writes resolve case- and accent-folded keys to one Tag row and keep
+   the thesis, public thesis and update counts current, including when a
+   thesis leaves the public catalogue and after cascade deletes.
+2. Keyword filters match tag keys by prefix and combine theses with ANY/ALL
+   semantics; autocomplete and facets read the precomputed counts.
+3. The public catalogue filters by keywords and serves tag suggestions.
+"""
+import pytest
+
+
+@pytest.fixture()
+def theses(app):
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Tag
+    from superviseme.utils.thesis_public import set_thesis_keywords
+
+    with app.app_context():
+        rows = {
+            name: Thesis(title=name, description="D", is_public=True, frozen=False, created_at=index)
+            for index, name in enumerate(("graphs", "nlp", "both", "hidden"))
+        }
+        rows["hidden"].is_public = False
+        db.session.add_all(rows.values())
+        db.session.flush()
+        set_thesis_keywords(db, Thesis_Tag, rows["graphs"].id, "Réseaux Complexes, Graph theory")
+        set_thesis_keywords(db, Thesis_Tag, rows["nlp"].id, "NLP, Language models")
+        set_thesis_keywords(db, Thesis_Tag, rows["both"].id, "reseaux  complexes, nlp, graphs")
+        set_thesis_keywords(db, Thesis_Tag, rows["hidden"].id, "NLP")
+        db.session.commit()
+        return {name: thesis.id for name, thesis in rows.items()}
+
+
+def _counts(key):
+    from superviseme.models import Tag
+
+    tag = Tag.query.filter_by(key=key).one()
+    return tag.thesis_count, tag.public_thesis_count, tag.update_count
+
+
+def test_folded_keys_and_counts(app, theses, make_users):
+    from superviseme import db
+    from superviseme.models import Tag, Thesis, Thesis_Tag, Thesis_Update, Update_Tag
+    from superviseme.utils.cascade_delete import delete_records
+    from superviseme.utils.tags import find_thesis_tag, fold_tag
+
+    assert fold_tag("  Réseaux   COMPLEXES ") == "reseaux complexes"
+    with app.app_context():
+        complexes = Tag.query.filter_by(key="reseaux complexes").one()
+        assert complexes.name == "Réseaux Complexes"
+        assert Thesis_Tag.query.filter_by(tag_id=complexes.id).count() == 2
+        assert _counts("nlp") == (3, 2, 0)
+        assert find_thesis_tag(theses["nlp"], "nlp").tag == "NLP"
+
+        # Assigning a thesis takes it out of the public catalogue
+        student = make_users(("s", "student"))["s"]
+        db.session.get(Thesis, theses["both"]).author_id = student.id
+        db.session.commit()
+        assert _counts("nlp") == (3, 1, 0)
+        assert _counts("reseaux complexes") == (2, 1, 0)
+
+        update = Thesis_Update(thesis_id=theses["both"], author_id=student.id, update_type="progress",
+                               content="x", created_at=1)
+        db.session.add(update)
+        db.session.flush()
+        db.session.add(Update_Tag(update_id=update.id, tag="Nlp"))
+        db.session.commit()
+        assert _counts("nlp") == (3, 1, 1)
+
+        tag = Thesis_Tag.query.filter_by(thesis_id=theses["nlp"], tag="NLP").one()
+        tag.tag = "Graph Theory"
+        db.session.commit()
+        assert _counts("nlp") == (2, 0, 1)
+        assert _counts("graph theory") == (2, 2, 0)
+
+        delete_records(Thesis, [theses["both"]])
+        db.session.commit()
+        assert _counts("nlp") == (1, 0, 0)
+        assert _counts("graphs") == (0, 0, 0)
+
+
+def test_tag_filters_and_suggestions(app, theses):
+    from superviseme import db
+    from superviseme.models import Thesis
+    from superviseme.utils.tags import MATCH_ALL, parse_tag_terms, suggest_tags, tag_facets, thesis_ids_for_tags
+
+    def matching(raw, match="any"):
+        ids = thesis_ids_for_tags(parse_tag_terms(raw), match=match)
+        titles = db.session.scalars(db.select(Thesis.title).where(Thesis.id.in_(ids)).order_by(Thesis.title))
+        return list(titles)
+
+    with app.app_context():
+        assert parse_tag_terms("NLP, nlp ,, Réseaux") == ["nlp", "reseaux"]
+        assert thesis_ids_for_tags(parse_tag_terms(" , ")) is None
+        assert matching("RESEAUX") == ["both", "graphs"]
+        assert matching("graph") == ["both", "graphs"]
+        assert matching("reseaux, nlp") == ["both", "graphs", "hidden", "nlp"]
+        assert matching("reseaux, nlp", match=MATCH_ALL) == ["both"]
+        assert matching("reseaux, graph theory, nlp", match=MATCH_ALL) == []
+        assert matching("50%") == []
+
+        assert [(row["name"], row["count"]) for row in suggest_tags("G")] == [
+            ("Graph theory", 1), ("graphs", 1),
+        ]
+        assert [row["name"] for row in suggest_tags("n", public=False)] == ["NLP"]
+        assert suggest_tags("") == []
+        assert [(row["key"], row["count"]) for row in tag_facets(limit=2)] == [
+            ("nlp", 2), ("reseaux complexes", 2),
+        ]
+
+
+def test_public_catalogue(app, theses):
+    client = app.test_client()
+
+    response = client.get("/theses?keywords=reseaux,nlp&match=all")
+    assert response.status_code == 200
+    assert b"1 result" in response.data
+
+    response = client.get("/theses?keywords=reseaux,nlp&match=bogus")
+    assert b"3 results" in response.data
+    assert b"2 results" in client.get("/theses?q=graph").data
+
+    results = client.get("/theses/api/tags?q=nl").get_json()["results"]
+    assert [(row["name"], row["count"]) for row in results] == [("NLP", 2)]
@@ -0,0 +1,115 @@
+"""Tests for the cluster-safe scheduler (superviseme/utils/task_scheduler.py, leader_lease.py).
+
+Covers:
+1. Only one owner holds the lease; it can be renewed, taken over after
+   expiry and handed over on release.
+2. Job runs are recorded with duration and outcome, and skipped when the
+   process no longer holds the lease.
+3. The scheduler persists its jobs in the database once it becomes leader
+   and releases the lease on shutdown.
+"""
+import time
+
+
+def test_lease_has_a_single_holder(app):
+    from superviseme.utils.leader_lease import acquire_lease, get_lease, release_lease
+
+    with app.app_context():
+        assert acquire_lease("scheduler", "a", ttl=60, now=1000)
+        assert not acquire_lease("scheduler", "b", ttl=60, now=1010)
+        assert acquire_lease("scheduler", "a", ttl=60, now=1030)
+        assert get_lease("scheduler", now=1030) == {
+            "owner": "a", "acquired_at": 1000, "expires_at": 1090, "active": True,
+        }
+
+        # a stopped renewing: b takes over once the lease has expired
+        assert not acquire_lease("scheduler", "b", ttl=60, now=1090)
+        assert acquire_lease("scheduler", "b", ttl=60, now=1091)
+        assert get_lease("scheduler", now=1091)["acquired_at"] == 1091
+
+        release_lease("scheduler", "a")  # not the holder: no effect
+        assert not acquire_lease("scheduler", "a", ttl=60, now=1100)
+        release_lease("scheduler", "b")
+        assert acquire_lease("scheduler", "a", ttl=60, now=1100)
+
+
+def test_job_runs_are_recorded(app, monkeypatch):
+    from superviseme.utils import task_scheduler
+    from superviseme.utils.task_scheduler import LeaderElector, _run_tracked, get_job_runs
+
+    class _Scheduler:
+        _app_context = app
+
+        def resume(self):
+            pass
+
+        def pause(self):
+            pass
+
+    monkeypatch.setattr(task_scheduler, "scheduler", _Scheduler())
+    monkeypatch.setattr(task_scheduler, "_sync_jobs", lambda: None)
+    elector = LeaderElector(app, ttl=60)
+    monkeypatch.setattr(task_scheduler, "leader", elector)
+    elector.tick()
+    assert elector.is_leader
+
+    def _failing():
+        raise RuntimeError("mail server down")
+
+    _run_tracked("telegram_digests", lambda: {"sent": 3})
+    _run_tracked("weekly_supervisor_reports", _failing)
+
+    with app.app_context():
+        runs = get_job_runs()
+        assert [(run["job_id"], run["status"]) for run in runs] == [
+            ("weekly_supervisor_reports", "error"), ("telegram_digests", "success"),
+        ]
+        assert runs[0]["result"] == "mail server down"
+        assert runs[1]["result"] == '{"sent": 3}'
+        assert all(run["owner"] == elector.owner and run["duration_ms"] >= 0 for run in runs)
+
+        # Another process took the lease over: this one must not run jobs any more
+        from superviseme.utils.leader_lease import acquire_lease, release_lease
+        release_lease("scheduler", elector.owner)
+        assert acquire_lease("scheduler", "other", ttl=60)
+
+    _run_tracked("telegram_digests", lambda: {"sent": 1})
+    with app.app_context():
+        assert len(get_job_runs(job_id="telegram_digests")) == 1
+
+
+def test_leader_persists_jobs_and_releases_lease(app, monkeypatch):
+    from superviseme import db
+    from superviseme.models import Scheduler_Job
+    from superviseme.utils import task_scheduler
+    from superviseme.utils.leader_lease import get_lease
+
+    monkeypatch.setenv("SCHEDULER_JOBSTORE", "database")
+    task_scheduler.init_scheduler(app)
+    try:
+        deadline = time.monotonic() + 5
+        while not task_scheduler.leader.is_leader and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert task_scheduler.leader.is_leader
+
+        with app.app_context():
+            stored = set(db.session.scalars(db.select(Scheduler_Job.id)))
+            assert stored == {
+                "weekly_supervisor_reports", "telegram_digests", "orcid_sync", "analytics_rollups", "background_jobs",
+            }
+
+            status = task_scheduler.get_scheduler_status()
+            assert status["status"] == "running"
+            assert status["is_leader"] is True
+            assert len(status["jobs"]) == 5
+
+            # An unchanged job keeps its persisted next run time when jobs are synced again
+            job = task_scheduler.scheduler.get_job("orcid_sync")
+            task_scheduler.scheduler.modify_job("orcid_sync", next_run_time=job.next_run_time.replace(year=2030))
+            task_scheduler._sync_jobs()
+            assert task_scheduler.scheduler.get_job("orcid_sync").next_run_time.year == 2030
+    finally:
+        task_scheduler.shutdown_scheduler()
+
+    with app.app_context():
+        assert get_lease("scheduler")["active"] is False
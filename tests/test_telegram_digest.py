@@ -0,0 +1,175 @@
+"""Tests for Telegram digest delivery (superviseme/utils/telegram_digest.py).
+
+Covers:
+1. Parsing/normalizing TelegramBotConfig.frequency_settings.
+2. Frequency precedence (user override > per-type setting > global default).
+3. send_telegram_digests() sends one message per chat and marks every
+   aggregated notification as sent; runs continue from the last watermark,
+   and failed chats are retried on the next run.
+4. A missed daily hour is caught up on the next run, once per day.
+5. Titles and links are HTML-escaped for parse_mode="HTML".
+"""
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+
+class TestFrequencySettings:
+    def test_parse_defaults_for_empty_or_malformed(self):
+        from superviseme.utils.telegram_digest import parse_frequency_settings
+
+        for raw in (None, "", "{not json", "[]"):
+            settings = parse_frequency_settings(raw)
+            assert settings == {"default": "immediate", "types": {}, "daily_hour": 8}
+
+    def test_parse_drops_unknown_values(self):
+        from superviseme.utils.telegram_digest import parse_frequency_settings
+
+        settings = parse_frequency_settings(json.dumps({
+            "default": "Daily",
+            "types": {"new_update": "hourly", "weekly_summary": "monthly"},
+            "daily_hour": 30,
+        }))
+        assert settings == {"default": "daily", "types": {"new_update": "hourly"}, "daily_hour": 8}
+
+    def test_resolve_precedence(self):
+        from superviseme.utils.telegram_digest import resolve_frequency
+
+        settings = {"default": "daily", "types": {"new_update": "hourly"}, "daily_hour": 8}
+        assert resolve_frequency("new_update", "immediate", settings) == "immediate"
+        assert resolve_frequency("new_update", None, settings) == "hourly"
+        assert resolve_frequency("todo_assigned", "", settings) == "daily"
+        assert resolve_frequency("test", "daily", settings) == "immediate"
+
+
+class TestSendDigests:
+    def test_one_message_per_chat_and_bulk_mark_sent(self, app, make_users):
+        from superviseme import db
+        from superviseme.models import Notification, TelegramBotConfig
+        from superviseme.utils.telegram_digest import send_telegram_digests
+        from superviseme.utils.telegram_service import get_telegram_service
+
+        now = int(time.time())
+        with app.app_context():
+            db.session.add(TelegramBotConfig(
+                bot_token="token",
+                bot_username="bot",
+                notification_types="[]",
+                frequency_settings=json.dumps({"default": "hourly"}),
+            ))
+            users = make_users(
+                ("actor", "supervisor"),
+                ("alice", "supervisor", {"telegram_enabled": True, "telegram_user_id": "111"}),
+                ("bob", "supervisor", {"telegram_enabled": True, "telegram_user_id": "222",
+                                       "telegram_notification_types": json.dumps(["new_update"])}),
+                ("carol", "supervisor", {"telegram_enabled": True, "telegram_user_id": "333",
+                                         "telegram_frequency": "daily"}),
+            )
+            actor, alice, bob, carol = (users[name] for name in ("actor", "alice", "bob", "carol"))
+
+            def notify(recipient, notification_type="new_update", created_at=now - 60):
+                n = Notification(
+                    recipient_id=recipient.id, actor_id=actor.id,
+                    notification_type=notification_type, title=f"{notification_type} for {recipient.username}",
+                    message="m", action_url="/supervisor/thesis/1", created_at=created_at,
+                )
+                db.session.add(n)
+                return n
+
+            alice_notes = [notify(alice), notify(alice, "todo_assigned")]
+            bob_update = notify(bob)
+            bob_disabled = notify(bob, "todo_assigned")
+            carol_note = notify(carol)
+            stale_note = notify(alice, created_at=now - 10 * 24 * 3600)
+            db.session.commit()
+
+            bot = MagicMock()
+            with patch.object(get_telegram_service(), "get_bot", return_value=bot):
+                results = send_telegram_digests("hourly", now=now)
+
+            assert results["digests_sent"] == 2
+            assert results["notifications_sent"] == 3
+            sent_chats = sorted(call.kwargs["chat_id"] for call in bot.send_message.call_args_list)
+            assert sent_chats == ["111", "222"]
+            alice_text = next(
+                call.kwargs["text"] for call in bot.send_message.call_args_list
+                if call.kwargs["chat_id"] == "111"
+            )
+            assert "2 new notification(s)" in alice_text
+
+            db.session.expire_all()
+            for n in alice_notes + [bob_update]:
+                assert db.session.get(Notification, n.id).telegram_sent is True
+            for n in (bob_disabled, carol_note, stale_note):
+                assert db.session.get(Notification, n.id).telegram_sent is False
+
+            # The next run starts from this run's watermark, however late it comes
+            db.session.get(Notification, stale_note.id).created_at = now + 60
+            db.session.commit()
+            with patch.object(get_telegram_service(), "get_bot", return_value=bot):
+                results = send_telegram_digests("hourly", now=now + 10 * 24 * 3600)
+            assert results["notifications_sent"] == 1
+            assert db.session.get(Notification, stale_note.id).telegram_sent is True
+
+    def test_failed_chats_hold_the_watermark(self, app, make_users):
+        from superviseme import db
+        from superviseme.models import Notification, TelegramBotConfig, TelegramDigestRun
+        from superviseme.utils.telegram_digest import send_telegram_digests
+        from superviseme.utils.telegram_service import get_telegram_service
+
+        now = int(time.time())
+        with app.app_context():
+            db.session.add(TelegramBotConfig(bot_token="token", bot_username="bot", notification_types="[]",
+                                             frequency_settings=json.dumps({"default": "hourly"})))
+            user = make_users(("alice", "student", {"telegram_enabled": True, "telegram_user_id": "111"}))["alice"]
+            db.session.add(TelegramDigestRun(frequency="hourly", watermark=now - 5 * 24 * 3600, last_run_at=1))
+            db.session.add(Notification(recipient_id=user.id, actor_id=user.id, notification_type="new_update",
+                                        title="during outage", message="m", created_at=now - 3 * 24 * 3600))
+            db.session.commit()
+
+            bot = MagicMock()
+            bot.send_message.side_effect = ValueError("network down")
+            with patch.object(get_telegram_service(), "get_bot", return_value=bot), \
+                    patch("superviseme.utils.telegram_dispatch.time.sleep"):
+                assert send_telegram_digests("hourly", now=now)["digests_failed"] == 1
+            run = db.session.get(TelegramDigestRun, "hourly")
+            assert (run.watermark, run.last_run_at) == (now - 3 * 24 * 3600, now)
+
+            bot.send_message.side_effect = None
+            with patch.object(get_telegram_service(), "get_bot", return_value=bot):
+                assert send_telegram_digests("hourly", now=now + 3600)["notifications_sent"] == 1
+            assert db.session.get(TelegramDigestRun, "hourly").watermark == now + 3600
+
+
+def test_daily_digest_catches_up_after_missed_hour(app):
+    from datetime import datetime
+
+    from superviseme import db
+    from superviseme.models import TelegramDigestRun
+    from superviseme.utils.telegram_digest import daily_digest_due
+
+    with app.app_context():
+        # daily_hour defaults to 8
+        assert daily_digest_due(datetime(2026, 10, 19, 7, 59)) is False
+        assert daily_digest_due(datetime(2026, 10, 19, 15)) is True
+
+        run = TelegramDigestRun(frequency="daily", watermark=0, last_run_at=int(datetime(2026, 10, 18, 8).timestamp()))
+        db.session.add(run)
+        db.session.commit()
+        assert daily_digest_due(datetime(2026, 10, 19, 11)) is True
+
+        run.last_run_at = int(datetime(2026, 10, 19, 11).timestamp())
+        db.session.commit()
+        assert daily_digest_due(datetime(2026, 10, 19, 12)) is False
+        assert daily_digest_due(datetime(2026, 10, 20, 8)) is True
+
+
+def test_digest_escapes_html(app):
+    from superviseme.models import Notification
+    from superviseme.utils.telegram_digest import _format_digest
+
+    note = Notification(title="Fix <b> & </b> in R&D", action_url="/thesis?a=1&b='2'")
+    with app.app_context():
+        text = _format_digest([note], "daily")
+    assert "• Fix &lt;b&gt; &amp; &lt;/b&gt; in R&amp;D" in text
+    assert "<a href='/thesis?a=1&amp;b=&#x27;2&#x27;'>open</a>" in text
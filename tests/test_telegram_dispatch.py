@@ -0,0 +1,213 @@
+"""Tests for concurrent Telegram delivery (superviseme/utils/telegram_dispatch.py).
+
+Runs the dispatcher against a local stub of the Bot API so the real telebot
+HTTP path (including ApiTelegramException parsing) is exercised:
+1. 429 responses are retried after the advertised retry_after, which pauses
+   the global bucket as well as the chat's.
+2. 4xx errors are not retried.
+3. Delivery results are written back to Notification.telegram_sent/_at,
+   also when the batch is queued on the background worker, which resolves
+   the bot itself and drops batches once its queue is full.
+4. Idle per-chat buckets are evicted.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import telebot
+from telebot import apihelper
+
+
+class _StubTelegramHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        params = parse_qs(urlparse(self.path).query)
+        params.update(parse_qs(self.rfile.read(length).decode()) if length else {})
+        chat_id = params.get("chat_id", [""])[0]
+
+        server = self.server
+        with server.lock:
+            server.calls.append((chat_id, time.monotonic()))
+            attempt = sum(1 for call_chat, _ in server.calls if call_chat == chat_id)
+
+        if chat_id == "429" and attempt == 1:
+            return self._respond(429, {
+                "ok": False, "error_code": 429,
+                "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": 1},
+            })
+        if chat_id == "403":
+            return self._respond(403, {
+                "ok": False, "error_code": 403, "description": "Forbidden: bot was blocked by the user",
+            })
+        return self._respond(200, {
+            "ok": True,
+            "result": {"message_id": attempt, "date": int(time.time()), "chat": {"id": 1, "type": "private"}},
+        })
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+@pytest.fixture()
+def stub_api(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubTelegramHandler)
+    server.lock = threading.Lock()
+    server.calls = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(apihelper, "API_URL", f"http://127.0.0.1:{server.server_port}/bot{{0}}/{{1}}")
+    monkeypatch.setattr(apihelper, "RETRY_ON_ERROR", False)
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _dispatcher():
+    from superviseme.utils.telegram_dispatch import TelegramDispatcher
+
+    # Fast per-chat bucket so only retry_after introduces delays.
+    return TelegramDispatcher(max_workers=4, per_chat_rate=50, per_chat_burst=5, base_backoff=0.01)
+
+
+class TestTelegramDispatcher:
+    def test_retry_after_is_honoured(self, stub_api):
+        from superviseme.utils.telegram_dispatch import TelegramMessage
+
+        bot = telebot.TeleBot("123:stub", threaded=False)
+        results = _dispatcher().dispatch(bot, [
+            TelegramMessage("429", "rate limited", [1]),
+            TelegramMessage("200", "first", [2]),
+            TelegramMessage("200", "second", [3]),
+        ])
+
+        assert [r.success for r in results] == [True, True, True]
+        limited = next(r for r in results if r.chat_id == "429")
+        assert limited.attempts == 2
+        times = [t for chat, t in stub_api.calls if chat == "429"]
+        assert times[1] - times[0] >= 0.9
+
+    def test_retry_after_pauses_the_whole_bot(self, stub_api):
+        from superviseme.utils.telegram_dispatch import TelegramDispatcher, TelegramMessage
+
+        dispatcher = TelegramDispatcher(max_workers=1, max_attempts=1)
+        [result] = dispatcher.dispatch(telebot.TeleBot("123:stub", threaded=False), [
+            TelegramMessage("429", "rate limited", [1]),
+        ])
+
+        assert result.success is False
+        assert dispatcher._global_bucket.is_blocked()
+
+    def test_idle_chat_buckets_are_evicted(self, monkeypatch):
+        from superviseme.utils import telegram_dispatch
+
+        dispatcher = _dispatcher()
+        for chat_id in range(5):
+            dispatcher._chat_bucket(chat_id)
+        assert list(dispatcher._chat_buckets) == [0, 1, 2, 3, 4]
+
+        monkeypatch.setattr(telegram_dispatch, "MAX_CHAT_BUCKETS", 3)
+        dispatcher._chat_bucket(1)
+        assert list(dispatcher._chat_buckets) == [3, 4, 1]
+
+        monkeypatch.setattr(telegram_dispatch, "CHAT_BUCKET_IDLE_SECONDS", 0)
+        dispatcher._chat_bucket(5)
+        assert list(dispatcher._chat_buckets) == [5]
+
+    def test_client_errors_are_not_retried(self, stub_api):
+        from superviseme.utils.telegram_dispatch import TelegramMessage
+
+        bot = telebot.TeleBot("123:stub", threaded=False)
+        [result] = _dispatcher().dispatch(bot, [TelegramMessage("403", "blocked", [1])])
+
+        assert result.success is False
+        assert result.attempts == 1
+        assert "403" in result.error
+
+    def test_results_recorded_on_notifications(self, app, stub_api, make_users):
+        from superviseme import db
+        from superviseme.models import Notification
+        from superviseme.utils.telegram_dispatch import TelegramMessage, record_delivery_results
+
+        with app.app_context():
+            user = make_users(("recipient", "student"))["recipient"]
+            notifications = [
+                Notification(
+                    recipient_id=user.id, actor_id=user.id, notification_type="new_update",
+                    title=f"n{i}", message="m", created_at=int(time.time()),
+                )
+                for i in range(3)
+            ]
+            db.session.add_all(notifications)
+            db.session.commit()
+            ok_ids = [notifications[0].id, notifications[1].id]
+            blocked_id = notifications[2].id
+
+            bot = telebot.TeleBot("123:stub", threaded=False)
+            results = _dispatcher().dispatch(bot, [
+                TelegramMessage("200", "digest", ok_ids),
+                TelegramMessage("403", "blocked", [blocked_id]),
+            ])
+            summary = record_delivery_results(results)
+
+            assert summary == {"delivered": 1, "failed": 1}
+            db.session.expire_all()
+            for notification_id in ok_ids:
+                notification = db.session.get(Notification, notification_id)
+                assert notification.telegram_sent is True
+                assert notification.telegram_sent_at
+            assert db.session.get(Notification, blocked_id).telegram_sent is False
+
+    def test_background_delivery_records_results(self, app, stub_api, make_users, monkeypatch):
+        from superviseme import db
+        from superviseme.models import Notification
+        from superviseme.utils.telegram_dispatch import TelegramMessage
+        from superviseme.utils.telegram_service import get_telegram_service
+
+        with app.app_context():
+            user = make_users(("recipient", "student"))["recipient"]
+            notification = Notification(
+                recipient_id=user.id, actor_id=user.id, notification_type="new_update",
+                title="n", message="m", created_at=int(time.time()),
+            )
+            db.session.add(notification)
+            db.session.commit()
+            notification_id = notification.id
+
+        # The bot is resolved on the background worker, not by the caller
+        service = get_telegram_service()
+        resolved_in = []
+
+        def get_bot():
+            resolved_in.append(threading.current_thread().name)
+            return telebot.TeleBot("123:stub", threaded=False)
+
+        monkeypatch.setattr(service, "get_bot", get_bot)
+        future = _dispatcher().submit(app, [TelegramMessage("200", "queued", [notification_id])])
+        assert future.result(timeout=5) == {"delivered": 1, "failed": 0}
+        assert resolved_in and resolved_in[0].startswith("telegram-background")
+
+        with app.app_context():
+            assert db.session.get(Notification, notification_id).telegram_sent is True
+
+    def test_full_background_queue_drops_batches(self, app):
+        from superviseme.utils.telegram_dispatch import TelegramDispatcher, TelegramMessage
+
+        dispatcher = TelegramDispatcher(max_background_batches=0)
+        assert dispatcher.submit(app, [TelegramMessage("200", "dropped", [1])]) is None
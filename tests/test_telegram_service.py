@@ -39,6 +39,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # Patch sys.modules to mock dependencies during import
 with patch.dict(sys.modules, mocks):
+    import superviseme.utils.telegram_service as telegram_service_module
     from superviseme.utils.telegram_service import TelegramService
 
 def test_format_message_basic():
@@ -50,6 +51,13 @@ def test_format_message_basic():
     expected = "<b>🔔 Test Title</b>\n\nTest Message\n\n<i>📚 SuperviseMe</i>"
     assert service._format_message(title, message) == expected
 
+def test_format_message_escapes_html():
+    """Titles and messages are escaped for parse_mode='HTML'"""
+    service = TelegramService()
+
+    expected = "<b>🔔 a &lt; b</b>\n\nR&amp;D\n\n<i>📚 SuperviseMe</i>"
+    assert service._format_message("a < b", "R&D") == expected
+
 def test_format_message_with_absolute_url():
     """Test message formatting with an absolute URL"""
     service = TelegramService()
@@ -105,3 +113,44 @@ def test_format_message_with_none_url():
 
     expected = "<b>🔔 Test Title</b>\n\nTest Message\n\n<i>📚 SuperviseMe</i>"
     assert service._format_message(title, message, action_url=url) == expected
+
+def test_config_is_cached_until_invalidated():
+    """Bot config is read once and reused until explicitly invalidated"""
+    service = TelegramService()
+    config_query = mock_models.TelegramBotConfig.query.filter_by.return_value
+    config_query.first.reset_mock()
+
+    first = service._get_config()
+    second = service._get_config()
+    assert first is second
+    assert config_query.first.call_count == 1
+
+    version = service.get_config_version()
+    service.invalidate_config()
+    assert service.get_config_version() == version + 1
+    service._get_config()
+    assert config_query.first.call_count == 2
+
+def test_user_preferences_are_cached_and_parsed_once():
+    """User preferences are loaded with one query and reused across messages"""
+    service = TelegramService()
+    row = MagicMock()
+    row.telegram_user_id = "12345"
+    row.telegram_enabled = True
+    row.telegram_notification_types = '["new_update"]'
+    row.telegram_frequency = None
+
+    with patch.object(telegram_service_module, "db") as mock_service_db:
+        user_query = mock_service_db.session.query.return_value.filter.return_value
+        user_query.first.return_value = row
+
+        for _ in range(5):
+            preferences = service.get_user_preferences(7)
+
+        assert user_query.first.call_count == 1
+        assert preferences.chat_id == "12345"
+        assert preferences.notification_types == frozenset({"new_update"})
+
+        service.invalidate_user_preferences(7)
+        service.get_user_preferences(7)
+        assert user_query.first.call_count == 2
@@ -0,0 +1,57 @@
+"""Tests for the template bytecode cache and render timing (superviseme/utils/template_cache.py).
+
+Covers:
+1. The init phase compiles every template into the shared cache directory,
+   and a later app loads them from there.
+2. Rendering a page records its render time under the template name.
+"""
+import pytest
+
+
+@pytest.fixture()
+def env(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'template_cache_test.db'}")
+    monkeypatch.setenv("SECRET_KEY", "template-cache-test-secret-key")
+    monkeypatch.setenv("FLASK_ENV", "development")
+    monkeypatch.setenv("FLASK_SKIP_USER_INIT", "1")
+    monkeypatch.setenv("ENABLE_SCHEDULER", "false")
+    monkeypatch.setenv("TEMPLATE_CACHE_DIR", str(tmp_path / "jinja"))
+    return tmp_path
+
+
+def test_init_warms_shared_bytecode_cache(env):
+    from superviseme import create_app
+    from superviseme.utils.template_cache import warm_templates
+
+    app = create_app(db_type="sqlite", skip_user_init=True)
+    report = app.config["TEMPLATE_WARMUP_REPORT"]
+    assert report["failed"] == []
+    assert report["compiled"] == len([name for name in app.jinja_env.list_templates() if name.endswith(".html")])
+    assert "templates" in app.config["STARTUP_REPORT"]["phases"]
+    cached = list((env / "jinja").iterdir())
+    assert len(cached) == report["compiled"]
+
+    # A fresh worker finds the bytecode and never compiles
+    worker = create_app(db_type="sqlite", skip_user_init=True, run_init=False)
+    assert "TEMPLATE_WARMUP_REPORT" not in worker.config
+    dumped = []
+    worker.jinja_env.bytecode_cache.dump_bytecode = lambda bucket: dumped.append(bucket.key)
+    assert warm_templates(worker)["failed"] == []
+    assert dumped == []
+
+
+def test_render_times_recorded_per_template(env, monkeypatch):
+    monkeypatch.setenv("TEMPLATE_WARMUP", "false")
+
+    from superviseme import create_app
+    from superviseme.utils.template_cache import render_stats
+
+    app = create_app(db_type="sqlite", skip_user_init=True)
+    assert "TEMPLATE_WARMUP_REPORT" not in app.config
+    client = app.test_client()
+    assert client.get("/login").status_code == 200
+    assert client.get("/login").status_code == 200
+
+    stats = {entry["template"]: entry for entry in render_stats(app)}
+    assert stats["login.html"]["renders"] == 2
+    assert 0 < stats["login.html"]["avg_ms"] <= stats["login.html"]["max_ms"]
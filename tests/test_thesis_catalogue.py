@@ -0,0 +1,205 @@
+"""Tests for the in-memory public catalogue (superviseme/utils/thesis_catalogue.py).
+
+Covers:
+1. Facet filters combine as OR within a facet and AND across facets; each
+   facet's counts follow the other filters; free text and keywords narrow
+   the base set.
+2. Committed thesis, supervisor, tag and user writes reload only the touched
+   theses; rolled back writes are ignored; searches issue no SQL once the
+   index is current; cascade deletes trigger a rebuild.
+3. Commits that change the catalogue record the touched theses in the
+   change log; other workers reload just those, and rebuild only when a
+   change asks for it, including changes committed out of order.
+4. /theses renders the facets with counts and toggle links.
+"""
+import pytest
+
+
+@pytest.fixture()
+def seeded(app, make_users):
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Supervisor, Thesis_Tag
+    from superviseme.utils.thesis_public import set_thesis_keywords
+
+    with app.app_context():
+        users = make_users(
+            ("rossi", "supervisor", {"name": "Marta", "surname": "Rossi"}),
+            ("bianchi", "supervisor", {"name": "Luca", "surname": "Bianchi"}),
+            ("stu", "student", {"name": "Anna", "surname": "Verdi"}),
+        )
+
+        specs = (
+            # title, level, topic, supervisors, keywords
+            ("Graph mining", "Master", "Networks", ("rossi",), "graphs, mining"),
+            ("Link prediction", "master", "networks", ("rossi", "bianchi"), "graphs"),
+            ("Topic models", "Bachelor", "NLP", ("bianchi",), "nlp, mining"),
+            ("Parsing", "Bachelor", "NLP", (), "nlp"),
+        )
+        ids = {username: user.id for username, user in users.items()}
+        for index, (title, level, topic, supervisors, keywords) in enumerate(specs):
+            thesis = Thesis(title=title, description=f"{title} description", level=level, topic=topic,
+                            is_public=True, frozen=False, created_at=index)
+            db.session.add(thesis)
+            db.session.flush()
+            ids[title] = thesis.id
+            for username in supervisors:
+                db.session.add(Thesis_Supervisor(thesis_id=thesis.id, supervisor_id=ids[username], assigned_at=1))
+            set_thesis_keywords(db, Thesis_Tag, thesis.id, keywords)
+
+        hidden = Thesis(title="Assigned", description="D", topic="NLP", author_id=ids["stu"],
+                        is_public=True, frozen=False, created_at=9)
+        db.session.add(hidden)
+        db.session.commit()
+        return ids
+
+
+def _search(q="", keywords="", match="any", **selected):
+    from superviseme.utils.thesis_catalogue import CatalogueQuery, search_catalogue
+
+    return search_catalogue(CatalogueQuery(q=q, keywords=keywords, match=match, selected=selected))
+
+
+def _titles(page):
+    return [entry.title for entry in page.theses]
+
+
+def _counts(page, facet):
+    return {item["label"]: item["count"] for item in page.facets[facet]}
+
+
+def test_facet_counts_follow_filters(app, seeded):
+    from superviseme.models import Tag
+
+    with app.app_context():
+        page = _search()
+        assert _titles(page) == ["Parsing", "Topic models", "Link prediction", "Graph mining"]
+        # Levels and topics group case-insensitively under the first spelling seen
+        assert _counts(page, "level") == {"Master": 2, "Bachelor": 2}
+        assert _counts(page, "topic") == {"Networks": 2, "NLP": 2}
+        assert _counts(page, "supervisor") == {"Luca Bianchi": 2, "Marta Rossi": 2}
+        assert page.supervisors_by_thesis[seeded["Link prediction"]] == ["Marta Rossi", "Luca Bianchi"]
+
+        nlp = Tag.query.filter_by(key="nlp").one().id
+        page = _search(topic=("networks",), supervisor=(seeded["bianchi"],))
+        assert _titles(page) == ["Link prediction"]
+        # A facet's counts ignore its own selection
+        assert _counts(page, "supervisor") == {"Luca Bianchi": 1, "Marta Rossi": 2}
+        assert _counts(page, "topic") == {"Networks": 1, "NLP": 1}
+        assert [item["selected"] for item in page.facets["topic"]] == [True, False]
+
+        page = _search(tag=(nlp,), level=("master", "bachelor"))
+        assert _titles(page) == ["Parsing", "Topic models"]
+        assert _counts(page, "tag") == {"nlp": 2, "mining": 2, "graphs": 2}
+
+        assert _titles(_search(q="ROSSI")) == ["Link prediction", "Graph mining"]
+        assert _titles(_search(keywords="min, nlp", match="all")) == ["Topic models"]
+        assert _titles(_search(keywords="min, nlp")) == ["Parsing", "Topic models", "Graph mining"]
+        assert _search(supervisor=(999,)).total == 4
+
+
+def test_incremental_updates(app, seeded):
+    from sqlalchemy import event
+
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Supervisor, User_mgmt
+    from superviseme.utils.cascade_delete import delete_records
+    from superviseme.utils.thesis_catalogue import get_catalogue
+
+    with app.app_context():
+        assert _search().total == 4
+        built_at = get_catalogue().built_at
+
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        _search(topic=("nlp",))
+        assert statements == []
+
+        thesis = db.session.get(Thesis, seeded["Parsing"])
+        thesis.frozen = True
+        db.session.rollback()
+        assert _search().total == 4
+
+        thesis = db.session.get(Thesis, seeded["Parsing"])
+        thesis.frozen = True
+        db.session.add(Thesis_Supervisor(thesis_id=seeded["Graph mining"], supervisor_id=seeded["bianchi"],
+                                         assigned_at=2))
+        db.session.commit()
+        page = _search()
+        assert _titles(page) == ["Topic models", "Link prediction", "Graph mining"]
+        assert _counts(page, "supervisor") == {"Luca Bianchi": 3, "Marta Rossi": 2}
+
+        db.session.get(User_mgmt, seeded["rossi"]).surname = "Rossini"
+        db.session.commit()
+        assert "Marta Rossini" in _counts(_search(), "supervisor")
+        assert get_catalogue().built_at == built_at
+
+        delete_records(Thesis, [seeded["Graph mining"]])
+        db.session.commit()
+        assert _titles(_search()) == ["Topic models", "Link prediction"]
+        assert get_catalogue().built_at != built_at
+
+
+def test_other_workers_replay_the_change_log(app, seeded):
+    from superviseme import db
+    from superviseme.models import Catalogue_Change, Thesis
+    from superviseme.utils.thesis_catalogue import (
+        CatalogueIndex,
+        CatalogueQuery,
+        get_catalogue,
+        invalidate_catalogue,
+        latest_catalogue_change,
+    )
+
+    everything = CatalogueQuery(q="", keywords="", match="any", selected={})
+    with app.app_context():
+        local = get_catalogue()
+        local.change_check = 0
+        # The index of another gunicorn worker
+        other = CatalogueIndex(change_check=0)
+        assert local.search(everything).total == other.search(everything).total == 4
+        local_built_at, other_built_at = local.built_at, other.built_at
+        latest = latest_catalogue_change()
+
+        # Fields the catalogue does not show record nothing
+        db.session.get(Thesis, seeded["Parsing"]).current_status = "in-progress"
+        db.session.commit()
+        assert latest_catalogue_change() == latest
+
+        db.session.get(Thesis, seeded["Parsing"]).frozen = True
+        db.session.get(Thesis, seeded["Graph mining"]).title = "Graph mining revisited"
+        db.session.commit()
+        assert latest_catalogue_change() == latest + 1
+
+        assert _titles(other.search(everything)) == ["Topic models", "Link prediction", "Graph mining revisited"]
+        assert local.search(everything).total == 3
+        assert (local.built_at, other.built_at) == (local_built_at, other_built_at)
+
+        # A change committed after a newer one is still picked up
+        db.session.add(Catalogue_Change(id=latest + 3, thesis_ids=None, supervisor_ids=None, created_at=1))
+        db.session.commit()
+        assert other.search(everything).total == 3
+        db.session.add(Catalogue_Change(id=latest + 2, thesis_ids=None, supervisor_ids=None, rebuild=True,
+                                        created_at=1))
+        db.session.commit()
+        other.search(everything)
+        assert other.built_at != other_built_at
+
+        other_built_at = other.built_at
+        invalidate_catalogue(deferred=False)
+        assert other.search(everything).total == 3
+        assert other.built_at != other_built_at
+
+
+def test_catalogue_page(app, seeded):
+    client = app.test_client()
+
+    response = client.get("/theses?topic=nlp")
+    assert response.status_code == 200
+    assert b"2 results" in response.data
+    html = response.data.decode()
+    # Values without matches under the current filters are left out
+    assert "Luca Bianchi" in html and "Marta Rossi" not in html
+    assert "level=bachelor" in html and "topic=nlp" in html
+
+    response = client.get("/theses?topic=nlp&topic=networks&level=master&supervisor=x")
+    assert b"2 results" in response.data
@@ -0,0 +1,183 @@
+"""Tests for the todo list queries (superviseme/utils/todo_queries.py).
+
+Covers:
+1. Pages order pending and high priority todos first, filter by status,
+   priority, assignee, overdue and thesis, and keyset cursors walk the whole
+   list without gaps or repeats.
+2. Stored sort ranks follow status and priority edits, and a one-thesis
+   page is read in index order without a sort step.
+3. Per-thesis counts come from one grouped query, with zeros for theses
+   without todos.
+4. The supervisor and student JSON endpoints only list the caller's theses
+   and reject bad cursors; the dashboards render one page with counts.
+"""
+import pytest
+
+NOW = 1_000_000
+
+
+@pytest.fixture()
+def seeded(app, make_users):
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Supervisor, Todo
+
+    with app.app_context():
+        users = make_users(
+            ("sup", "supervisor"), ("other", "supervisor"), ("stu1", "student"), ("stu2", "student"),
+            ("stu3", "student"),
+        )
+        ids = {username: user.id for username, user in users.items()}
+
+        for title, author, supervisor in (("T1", "stu1", "sup"), ("T2", "stu2", "sup"), ("T3", "stu3", "other")):
+            thesis = Thesis(title=title, description="D", author_id=ids[author], frozen=False, created_at=1)
+            db.session.add(thesis)
+            db.session.flush()
+            ids[title] = thesis.id
+            db.session.add(Thesis_Supervisor(thesis_id=thesis.id, supervisor_id=ids[supervisor], assigned_at=1))
+
+        specs = (
+            # title, thesis, status, priority, created_at, due_date, assignee
+            ("old low", "T1", "pending", "low", 10, None, None),
+            ("late high", "T1", "pending", "high", 20, NOW - 1, "stu1"),
+            ("done high", "T1", "completed", "high", 30, NOW - 1, None),
+            ("new medium", "T2", "pending", "medium", 40, NOW + 1, "sup"),
+            ("same time a", "T2", "pending", "medium", 40, None, None),
+            ("dropped", "T2", "cancelled", "high", 50, None, None),
+            ("new high", "T2", "pending", "high", 60, None, "stu2"),
+            ("foreign", "T3", "pending", "high", 70, None, None),
+        )
+        for title, thesis, status, priority, created_at, due_date, assignee in specs:
+            todo = Todo(thesis_id=ids[thesis], author_id=ids["sup"], title=title, status=status, priority=priority,
+                        created_at=created_at, updated_at=created_at, due_date=due_date,
+                        assigned_to_id=ids[assignee] if assignee else None)
+            db.session.add(todo)
+            db.session.flush()
+            ids[title] = todo.id
+        db.session.commit()
+        return ids
+
+
+def _titles(page):
+    return [todo.title for todo in page.todos]
+
+
+def test_order_filters_and_cursor(app, seeded):
+    from superviseme.utils.todo_queries import TodoFilters, query_todos
+
+    theses = [seeded["T1"], seeded["T2"]]
+    with app.app_context():
+        page = query_todos(theses, limit=100)
+        assert _titles(page) == [
+            "new high", "late high", "same time a", "new medium", "old low", "done high", "dropped",
+        ]
+        assert page.next_cursor is None
+
+        walked, cursor = [], None
+        while True:
+            page = query_todos(theses, after=cursor, limit=2)
+            walked.extend(_titles(page))
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert walked == [
+            "new high", "late high", "same time a", "new medium", "old low", "done high", "dropped",
+        ]
+
+        def titles(**filters):
+            return _titles(query_todos(theses, TodoFilters(**filters), now=NOW))
+
+        assert titles(statuses=("completed", "cancelled")) == ["done high", "dropped"]
+        assert titles(priorities=("medium",)) == ["same time a", "new medium"]
+        assert titles(assignee_id=seeded["stu1"]) == ["late high"]
+        assert titles(assignee_id="none", statuses=("pending",)) == ["same time a", "old low"]
+        assert titles(overdue=True) == ["late high"]
+        assert titles(thesis_ids=(seeded["T1"], seeded["T3"])) == ["late high", "old low", "done high"]
+
+        with pytest.raises(ValueError):
+            query_todos(theses, after="1.2.x")
+
+
+def test_ranks_follow_edits_and_page_uses_index(app, seeded):
+    from sqlalchemy import text
+
+    from superviseme import db
+    from superviseme.models import Todo
+    from superviseme.utils.todo_queries import LIST_ORDER, _after, query_todos
+
+    with app.app_context():
+        todo = db.session.get(Todo, seeded["old low"])
+        assert (todo.status_rank, todo.priority_rank) == (3, 1)
+        todo.status, todo.priority = "completed", "high"
+        db.session.commit()
+        assert (todo.status_rank, todo.priority_rank) == (2, 3)
+        assert _titles(query_todos([seeded["T1"]])) == ["late high", "done high", "old low"]
+
+        stmt = (
+            db.select(Todo)
+            .where(Todo.thesis_id == seeded["T1"], _after("3.3.20.0"))
+            .order_by(*(column.desc() for column in LIST_ORDER))
+        )
+        sql = str(stmt.compile(db.engine, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(row[-1] for row in db.session.execute(text("EXPLAIN QUERY PLAN " + sql)))
+        assert "ix_todo_thesis_id_status_rank_priority_rank_created_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_summary_in_one_query(app, seeded):
+    from sqlalchemy import event
+
+    from superviseme import db
+    from superviseme.utils.todo_queries import (
+        parse_todo_filters,
+        todo_summary,
+        todo_totals,
+    )
+
+    with app.app_context():
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        summary = todo_summary([seeded["T1"], seeded["T2"], seeded["T3"] + 100], now=NOW)
+        assert len(statements) == 1
+
+        assert summary[seeded["T1"]] == {
+            "total": 3, "pending": 2, "completed": 1, "cancelled": 0, "overdue": 1, "high_priority": 1,
+        }
+        assert summary[seeded["T2"]]["cancelled"] == 1
+        assert summary[seeded["T2"]]["high_priority"] == 1
+        assert summary[seeded["T3"] + 100]["total"] == 0
+        assert todo_totals(summary)["total"] == 7
+
+    filters = parse_todo_filters({"status": "Pending,bogus", "priority": "high,", "assignee": "none",
+                                  "overdue": "true", "thesis": "3,x"})
+    assert filters == (("pending",), ("high",), "none", True, (3,))
+
+
+def test_endpoints_and_dashboards(app, seeded):
+    client = app.test_client()
+    client.post("/login", data={"email": "sup@example.com", "password": "pw"})
+
+    body = client.get("/supervisor/api/todos?limit=3").get_json()
+    assert [row["title"] for row in body["results"]] == ["new high", "late high", "same time a"]
+    assert body["totals"]["total"] == 7
+    assert {row["thesis_id"] for row in body["summary"]} == {seeded["T1"], seeded["T2"]}
+
+    body = client.get(f"/supervisor/api/todos?limit=3&after={body['next_cursor']}").get_json()
+    assert [row["title"] for row in body["results"]] == ["new medium", "old low", "done high"]
+
+    assert client.get(f"/supervisor/api/todos?thesis={seeded['T3']}").get_json()["results"] == []
+    assert client.get("/supervisor/api/todos?after=bogus").status_code == 400
+
+    response = client.get("/supervisor/dashboard")
+    assert response.status_code == 200
+    assert b"2 open / 3" in response.data
+
+    client.get("/logout")
+    client.post("/login", data={"email": "stu1@example.com", "password": "pw"})
+    body = client.get("/student/api/todos?overdue=1").get_json()
+    assert [row["title"] for row in body["results"]] == ["late high"]
+    assert body["results"][0]["assigned_to"] == "Stu1 Test"
+
+    response = client.get("/student/dashboard")
+    assert response.status_code == 200
+    assert b"done high" not in response.data and b"late high" in response.data
+    assert client.get("/student/thesis").status_code == 200
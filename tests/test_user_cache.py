@@ -0,0 +1,113 @@
+"""Tests for the Flask-Login user cache (superviseme/utils/user_cache.py).
+
+Covers:
+1. Cache hits are served without touching the database.
+2. ORM updates to cached columns and supervisor role grants invalidate
+   the principal; unrelated columns (e.g. last_activity) do not.
+3. Attributes outside the principal are read from and written to the
+   full User_mgmt row.
+"""
+import time
+
+import pytest
+
+
+@pytest.fixture()
+def researcher_id(app):
+    from superviseme import db
+    from superviseme.models import User_mgmt
+
+    with app.app_context():
+        user = User_mgmt(
+            username="researcher1", email="researcher1@example.com", password="x",
+            name="Ada", surname="Lovelace", user_type="researcher", joined_on=int(time.time()),
+        )
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+class _QueryCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        self._engine = engine
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def close(self):
+        from sqlalchemy import event
+
+        event.remove(self._engine, "before_cursor_execute", self._on_execute)
+
+
+def test_cache_hit_skips_database(app, researcher_id):
+    from superviseme import db
+    from superviseme.utils.user_cache import UserPrincipal, get_user_principal
+
+    with app.app_context():
+        principal = get_user_principal(researcher_id)
+        assert isinstance(principal, UserPrincipal)
+        assert (principal.username, principal.user_type, principal.has_supervisor_role) == (
+            "researcher1", "researcher", False
+        )
+
+        counter = _QueryCounter(db.engine)
+        try:
+            again = get_user_principal(researcher_id)
+        finally:
+            counter.close()
+        assert counter.count == 0
+        assert again.get_id() == str(researcher_id)
+        assert get_user_principal(researcher_id + 999) is None
+
+
+def test_updates_and_grants_invalidate(app, researcher_id):
+    from superviseme import db
+    from superviseme.models import Supervisor_Role, User_mgmt
+    from superviseme.utils.user_cache import _cache, get_user_principal
+
+    with app.app_context():
+        get_user_principal(researcher_id)
+
+        user = db.session.get(User_mgmt, researcher_id)
+        user.last_activity = int(time.time())
+        db.session.commit()
+        assert researcher_id in _cache
+
+        now = int(time.time())
+        db.session.add(Supervisor_Role(
+            researcher_id=researcher_id, granted_by=researcher_id, granted_at=now,
+            active=True, created_at=now, updated_at=now,
+        ))
+        db.session.commit()
+        assert researcher_id not in _cache
+        assert get_user_principal(researcher_id).has_supervisor_role is True
+
+        user.user_type = "supervisor"
+        db.session.commit()
+        assert get_user_principal(researcher_id).user_type == "supervisor"
+
+
+def test_principal_delegates_to_full_row(app, researcher_id):
+    from superviseme import db
+    from superviseme.models import User_mgmt
+    from superviseme.utils.user_cache import get_user_principal
+
+    with app.app_context():
+        principal = get_user_principal(researcher_id)
+        assert principal.email == "researcher1@example.com"
+        assert principal.telegram_enabled is False
+
+        principal.name = "Augusta"
+        principal.telegram_frequency = "daily"
+        db.session.commit()
+        assert principal.name == "Augusta"
+
+        db.session.expire_all()
+        user = db.session.get(User_mgmt, researcher_id)
+        assert (user.name, user.telegram_frequency) == ("Augusta", "daily")
+        assert get_user_principal(researcher_id).name == "Augusta"
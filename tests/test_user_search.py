@@ -0,0 +1,108 @@
+"""Tests for the typeahead user search (superviseme/utils/user_search.py).
+
+Covers:
+1. Prefix search across name, surname and username filtered by role,
+   assignment status and excluded ids, with the limit applied; SQLite
+   serves the prefix condition from the lower() expression index.
+2. Cached results are dropped when users or assignments change.
+3. The admin and supervisor endpoints return JSON and enforce roles.
+"""
+import pytest
+
+
+@pytest.fixture()
+def app(app, make_users):
+    from superviseme import db
+    from superviseme.models import Thesis, Thesis_Supervisor
+
+    with app.app_context():
+        users = make_users(*(
+            (username, user_type, {"name": name, "surname": surname})
+            for username, name, surname, user_type in (
+                ("admin", "Root", "Admin", "admin"),
+                ("sup", "Marta", "Rossi", "supervisor"),
+                ("sup2", "Mario", "Bianchi", "supervisor"),
+                ("mrossi", "Mario", "Rossi", "student"),
+                ("mverdi", "Maria", "Verdi", "student"),
+                ("lneri", "Luca", "Neri", "student"),
+                ("mbanned", "Mario", "Gialli", "student"),
+            )
+        ))
+        users["mbanned"].is_enabled = False
+        thesis = Thesis(title="T", description="D", author_id=users["mverdi"].id, created_at=1)
+        db.session.add(thesis)
+        db.session.flush()
+        db.session.add(Thesis_Supervisor(thesis_id=thesis.id, supervisor_id=users["sup"].id, assigned_at=1))
+        db.session.commit()
+    return app
+
+
+def _usernames(results):
+    return [row["username"] for row in results]
+
+
+def test_prefix_search_filters(app):
+    from superviseme import db
+    from superviseme.models import User_mgmt
+    from superviseme.utils.user_search import search_users
+
+    with app.app_context():
+        assert _usernames(search_users("mar", roles=("student",))) == ["mrossi", "mverdi"]
+        assert _usernames(search_users("MAR")) == ["sup2", "mrossi", "sup", "mverdi"]
+        assert _usernames(search_users("mario ros")) == ["mrossi"]
+        assert _usernames(search_users("ma", roles=("student",), assignment="unassigned")) == ["mrossi"]
+        assert _usernames(search_users("m", roles=("supervisor",), assignment="assigned")) == ["sup"]
+        assert _usernames(search_users("ro", roles=("student", "supervisor"), limit=1)) == ["mrossi"]
+        sup2 = db.session.execute(db.select(User_mgmt.id).filter_by(username="sup2")).scalar_one()
+        assert _usernames(search_users("mari", roles=("supervisor",), exclude_ids=(sup2,))) == []
+        assert search_users("%", roles=("student",)) == []
+        assert search_users("  ") == []
+
+        row = search_users("luca")[0]
+        assert row["label"] == "Luca Neri (lneri@example.com)"
+        assert row["user_type"] == "student"
+
+        # The migration's expression index answers the prefix condition on SQLite
+        db.session.execute(db.text("CREATE INDEX IF NOT EXISTS ix_user_mgmt_surname_prefix ON user_mgmt (user_type, lower(surname))"))
+        plan = db.session.execute(db.text(
+            "EXPLAIN QUERY PLAN SELECT id FROM user_mgmt WHERE user_type = 'student' "
+            "AND lower(surname) >= 'ro' AND lower(surname) < 'rp'"
+        )).all()
+        assert any("ix_user_mgmt_surname_prefix" in row[-1] for row in plan)
+
+
+def test_cache_invalidated_on_writes(app):
+    from superviseme import db
+    from superviseme.models import Thesis, User_mgmt
+    from superviseme.utils.user_search import cached_search_users
+
+    with app.app_context():
+        assert _usernames(cached_search_users("luca", roles=("student",), assignment="unassigned")) == ["lneri"]
+
+        luca = User_mgmt.query.filter_by(username="lneri").one()
+        db.session.add(Thesis(title="Luca's", description="D", author_id=luca.id, created_at=2))
+        db.session.commit()
+        assert cached_search_users("luca", roles=("student",), assignment="unassigned") == []
+
+        luca.name = "Lucia"
+        db.session.commit()
+        assert _usernames(cached_search_users("lucia", roles=("student",))) == ["lneri"]
+
+
+def test_typeahead_endpoints(app):
+    client = app.test_client()
+    client.post("/login", data={"email": "admin@example.com", "password": "pw"})
+
+    response = client.get("/admin/api/users/search?q=mar&role=student,supervisor&assignment=unassigned")
+    assert response.status_code == 200
+    assert _usernames(response.get_json()["results"]) == ["sup2", "mrossi"]
+    assert client.get("/admin/api/users/search?q=mar&assignment=maybe").status_code == 400
+
+    # Admins do not get the supervisor endpoint
+    assert client.get("/supervisor/api/students/search?q=m").status_code == 302
+
+    client.get("/logout")
+    client.post("/login", data={"email": "sup@example.com", "password": "pw"})
+    results = client.get("/supervisor/api/students/search?q=m&limit=5").get_json()["results"]
+    assert _usernames(results) == ["mrossi"]
+    assert client.get("/admin/api/users/search?q=m").status_code == 302